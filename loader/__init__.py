@@ -12,9 +12,11 @@ from .exceptions import (
     PackageLoadError,
     VersionNotFound,
 )
+from .decode import decode_package_json
 from .factory import create_package_loader
 from .interfaces import PackageLoader
 from .package_loader import DefaultPackageLoader
+from .stream import STREAM_CHUNK_SIZE, LoadProgress, read_package_stream
 
 __all__ = [
     "PackageLoader",
@@ -26,4 +28,8 @@ __all__ = [
     "VersionNotFound",
     "DatasetNotFound",
     "LoaderValidationError",
+    "LoadProgress",
+    "decode_package_json",
+    "STREAM_CHUNK_SIZE",
+    "read_package_stream",
 ]
@@ -0,0 +1,95 @@
+"""
+Single-pass Package JSON decoding.
+
+json.loads with an object hook that builds Point / EnvelopeRecord models
+while the text is parsed, applying the published_dataset ``$defs`` rules
+for Point (exactly ``x``, ``y``; both numbers) and EnvelopeRecord (exactly
+``strategyRef`` (non-empty string), ``target`` (Point), ``cueSet`` and
+``secondSet`` (non-empty Point arrays)). Objects that do not satisfy a rule
+stay plain JSON, so the Loader can still report them through the
+Validation Layer. Structure only: no Package / Manifest / Version checks.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Tuple
+
+from models import EnvelopeRecord, Point, StrategyRef
+
+# JSON Schema "number": int or float, never bool.
+_NUMBER_TYPES = (int, float)
+_MISSING = object()
+
+
+def _is_point_set(value: Any) -> bool:
+    return type(value) is list and bool(value) and all(type(item) is Point for item in value)
+
+
+def envelope_object_hook(obj: Dict[str, Any]) -> Any:
+    """json object_hook: Point / EnvelopeRecord for objects that satisfy their rules."""
+    size = len(obj)
+    if size == 2:
+        x, y = obj.get("x", _MISSING), obj.get("y", _MISSING)
+        if type(x) in _NUMBER_TYPES and type(y) in _NUMBER_TYPES:
+            return Point(x=float(x), y=float(y))
+    elif size == 4:
+        ref, target = obj.get("strategyRef"), obj.get("target")
+        cue, second = obj.get("cueSet"), obj.get("secondSet")
+        if (
+            type(ref) is str
+            and ref
+            and type(target) is Point
+            and _is_point_set(cue)
+            and _is_point_set(second)
+        ):
+            return EnvelopeRecord(
+                strategy_ref=StrategyRef(ref),
+                target=target,
+                cue_set=cue,
+                second_set=second,
+            )
+    return obj
+
+
+_DECODER = json.JSONDecoder(object_hook=envelope_object_hook)
+
+
+def to_plain_json(value: Any) -> Any:
+    """``value`` with decoded Point / EnvelopeRecord models turned back into JSON objects."""
+    if type(value) is Point:
+        return {"x": value.x, "y": value.y}
+    if type(value) is EnvelopeRecord:
+        return {
+            "strategyRef": str(value.strategy_ref),
+            "target": to_plain_json(value.target),
+            "cueSet": [to_plain_json(item) for item in value.cue_set],
+            "secondSet": [to_plain_json(item) for item in value.second_set],
+        }
+    if type(value) is dict:
+        return {key: to_plain_json(item) for key, item in value.items()}
+    if type(value) is list:
+        return [to_plain_json(item) for item in value]
+    return value
+
+
+def decode_package_json(text: str) -> Tuple[Any, List[Any]]:
+    """
+    Decode Package JSON ``text`` in one pass.
+
+    Returns ``(package, records)``: ``records`` is ``dataset.records`` with
+    each item an EnvelopeRecord, or plain JSON where the item breaks the
+    EnvelopeRecord rules; ``package`` is the rest as plain JSON with
+    ``dataset.records`` emptied. When the root, ``dataset`` or ``records``
+    has the wrong shape, ``package`` is returned whole and ``records`` is
+    empty. Syntax errors raise json.JSONDecodeError.
+    """
+    data = _DECODER.decode(text)
+    if type(data) is not dict:
+        return to_plain_json(data), []
+    dataset = data.get("dataset")
+    if type(dataset) is not dict or type(dataset.get("records")) is not list:
+        return to_plain_json(data), []
+    records = dataset["records"]
+    shell = dict(data, dataset=dict(dataset, records=[]))
+    return to_plain_json(shell), records
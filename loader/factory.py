@@ -6,10 +6,46 @@ Creates the default PackageLoader instance.
 
 from __future__ import annotations
 
+from typing import Callable, Optional
+
+from search.prepared import PreparedDatasetCache
+
 from .interfaces import PackageLoader
 from .package_loader import DefaultPackageLoader
+from .stream import STREAM_CHUNK_SIZE, LoadProgress
+
 
+def create_package_loader(
+    *,
+    verified: bool = False,
+    columnar: bool = False,
+    gc_freeze: bool = False,
+    stream: bool = False,
+    fused: bool = False,
+    progress: Optional[Callable[[LoadProgress], None]] = None,
+    stream_chunk_size: int = STREAM_CHUNK_SIZE,
+    prepared_cache: Optional[PreparedDatasetCache] = None,
+) -> PackageLoader:
+    """
+    Return the repository Package Reader / Dataset Provider.
 
-def create_package_loader() -> PackageLoader:
-    """Return the repository Package Reader / Dataset Provider."""
-    return DefaultPackageLoader()
+    ``verified=True`` returns VerifiedDataset (read-only, records checked once).
+    ``columnar=True`` returns ColumnarDataset (a VerifiedDataset held as columns).
+    ``gc_freeze=True`` gc.freeze()s the process after each load (see DefaultPackageLoader).
+    ``stream=True`` makes load_path() decode records incrementally (bounded
+    parse memory); ``progress`` receives a LoadProgress per chunk of
+    ``stream_chunk_size`` bytes read.
+    ``fused=True`` makes load_path() build records while parsing package.json
+    (single pass, record schema rules still enforced).
+    ``prepared_cache`` is seeded by load_path() from the package index sidecar.
+    """
+    return DefaultPackageLoader(
+        verified=verified,
+        columnar=columnar,
+        gc_freeze=gc_freeze,
+        stream=stream,
+        fused=fused,
+        progress=progress,
+        stream_chunk_size=stream_chunk_size,
+        prepared_cache=prepared_cache,
+    )
@@ -6,7 +6,13 @@ Contract: Architecture/SEARCH_LOADER_SSOT.md
 Flow:
   Package JSON → Validation → Package Model
   → Manifest confirm → Version confirm
-  → PublishedDataset return
+  → PublishedDataset return (VerifiedDataset when ``verified=True``,
+    ColumnarDataset when ``columnar=True``)
+  → (load_path + prepared_cache) index sidecar mmap → PreparedDatasetCache
+
+``stream=True``: load_path() decodes package.json chunk by chunk and
+validates / builds each record as it is read (see loader.stream).
+``fused=True``: load_path() builds records while parsing (see loader.decode).
 
 Does not call Runtime, Membership, Resolve, Strategy, Modal, or Generator.
 Read-only: never mutates Package / Manifest / Version / Dataset.
@@ -14,13 +20,38 @@ Read-only: never mutates Package / Manifest / Version / Dataset.
 
 from __future__ import annotations
 
+import gc
 import json
+import mmap
+import os
+import sys
+from array import array
 from pathlib import Path
-from typing import Any, Mapping, Optional, Union
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, List, Mapping, Optional, Union
 
-from models import Manifest, Package, PublishedDataset, Version
+from models import (
+    ColumnarDataset,
+    DatasetIdentity,
+    EnvelopeRecord,
+    Manifest,
+    Package,
+    PublishedDataset,
+    RecordIdentity,
+    StrategyRef,
+    VerifiedDataset,
+    Version,
+)
+from search.prepared import (
+    INDEX_SIDECAR_DIRNAME,
+    INDEX_SIDECAR_FILENAME,
+    PreparedDatasetCache,
+    StaleIndexSidecar,
+    decode_index_sidecar,
+)
 from validation import (
     ValidationError as SchemaValidationError,
+    validate_envelope_record,
     validate_manifest,
     validate_package,
     validate_version,
@@ -33,7 +64,10 @@ from .exceptions import (
     PackageLoadError,
     VersionNotFound,
 )
+from .decode import decode_package_json, envelope_object_hook, to_plain_json
+from .stream import STREAM_CHUNK_SIZE, LoadProgress, read_package_stream
 from .utils import (
+    envelope_record_from_json,
     manifest_from_json,
     package_from_json,
     version_from_json,
@@ -42,13 +76,144 @@ from .utils import (
 PathLike = Union[str, Path]
 
 
+class _RecordSink:
+    """
+    Sink for records decoded one at a time (streamed or fused): validates
+    each record JSON, then keeps it as an EnvelopeRecord, or appends it
+    straight to columns when ``columnar``. EnvelopeRecords built by the
+    fused decoder already satisfy the record schema and are kept as they are.
+    """
+
+    def __init__(self, *, columnar: bool) -> None:
+        self.columnar = columnar
+        self.count = 0
+        self.records: List[EnvelopeRecord] = []
+        self.target_xy, self.cue_xy, self.second_xy = array("d"), array("d"), array("d")
+        self.cue_offsets, self.second_offsets = array("q", [0]), array("q", [0])
+        self.strategy_refs: List[StrategyRef] = []
+
+    def add(self, index: int, data: Any) -> None:
+        if type(data) is EnvelopeRecord:
+            if self.columnar:
+                self._add_record_columns(data)
+            else:
+                self.records.append(data)
+            self.count += 1
+            return
+        # Plain JSON again if the fused decoder built models inside it.
+        data = to_plain_json(data)
+        try:
+            validate_envelope_record(data)
+        except SchemaValidationError as exc:
+            raise LoaderValidationError(
+                f"Package validation failed: dataset.records[{index}]: {exc}",
+                cause=exc,
+            ) from exc
+        try:
+            if self.columnar:
+                self._add_columns(data)
+            else:
+                self.records.append(envelope_record_from_json(data))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise PackageLoadError(
+                f"Failed to build dataset.records[{index}]: {exc}", cause=exc
+            ) from exc
+        self.count += 1
+
+    def _add_columns(self, data: Mapping[str, Any]) -> None:
+        # Same float() conversion as point_from_json.
+        target = data["target"]
+        self.target_xy.extend((float(target["x"]), float(target["y"])))
+        for point in data["cueSet"]:
+            self.cue_xy.extend((float(point["x"]), float(point["y"])))
+        for point in data["secondSet"]:
+            self.second_xy.extend((float(point["x"]), float(point["y"])))
+        self.cue_offsets.append(len(self.cue_xy) >> 1)
+        self.second_offsets.append(len(self.second_xy) >> 1)
+        self.strategy_refs.append(StrategyRef(sys.intern(str(data["strategyRef"]))))
+
+    def _add_record_columns(self, record: EnvelopeRecord) -> None:
+        self.target_xy.extend((record.target.x, record.target.y))
+        for point in record.cue_set:
+            self.cue_xy.extend((point.x, point.y))
+        for point in record.second_set:
+            self.second_xy.extend((point.x, point.y))
+        self.cue_offsets.append(len(self.cue_xy) >> 1)
+        self.second_offsets.append(len(self.second_xy) >> 1)
+        self.strategy_refs.append(StrategyRef(sys.intern(str(record.strategy_ref))))
+
+    def columnar_dataset(self, identity: Optional[DatasetIdentity]) -> ColumnarDataset:
+        return ColumnarDataset(
+            target_xy=self.target_xy,
+            cue_xy=self.cue_xy,
+            cue_offsets=self.cue_offsets,
+            second_xy=self.second_xy,
+            second_offsets=self.second_offsets,
+            strategy_refs=self.strategy_refs,
+            dataset_identity=identity,
+        )
+
+
 class DefaultPackageLoader:
     """
     Concrete PackageLoader.
 
     Always routes JSON through the Validation Layer before Model construction.
+    ``verified=True`` returns a frozen VerifiedDataset (records checked once,
+    record-ordinal table attached) so engines can skip per-query record scans.
+    ``columnar=True`` returns the same as a ColumnarDataset: records packed
+    into float columns, which engines read without per-record objects.
+
+    ``gc_freeze=True`` ends each load with gc.freeze(): the loaded dataset
+    (and its prepared indexes, after load_path) move to the permanent
+    generation, so later collections stop traversing the large, immutable
+    record graph. This freezes every object alive in the process at that
+    point, not just the dataset.
+
+    ``stream=True`` makes load_path() read package.json incrementally:
+    records are validated one by one (published_dataset EnvelopeRecord) and
+    built as they are decoded (straight into columns with ``columnar``), so
+    parse memory stays bounded whatever the corpus size; ``progress`` is
+    called with a LoadProgress after every ``stream_chunk_size`` bytes.
+    load() is unaffected.
+
+    ``fused=True`` makes load_path() decode package.json in a single pass:
+    the json decoder builds Point / EnvelopeRecord models directly under the
+    published_dataset record rules (loader.decode), so well-formed records
+    skip the dict tree, the per-record schema walk and the model mapping
+    pass; records that break the rules are still validated and reported as
+    a LoaderValidationError. The rest of the package is validated as usual.
+    Combined with ``stream``, each streamed record is decoded the same way.
+
+    With ``prepared_cache``, load_path() also seeds that cache for the
+    returned dataset: from the package's index sidecar (memory-mapped) when
+    it is present and matches the dataset, otherwise by preparing the
+    dataset. The returned dataset is the same either way.
     """
 
+    def __init__(
+        self,
+        *,
+        verified: bool = False,
+        columnar: bool = False,
+        gc_freeze: bool = False,
+        stream: bool = False,
+        fused: bool = False,
+        progress: Optional[Callable[[LoadProgress], None]] = None,
+        stream_chunk_size: int = STREAM_CHUNK_SIZE,
+        prepared_cache: Optional[PreparedDatasetCache] = None,
+    ) -> None:
+        if stream_chunk_size < 1:
+            raise ValueError("stream_chunk_size must be >= 1")
+        self._verified = verified
+        self._columnar = columnar
+        self._gc_freeze = gc_freeze
+        self._stream = stream
+        self._fused = fused
+        self._progress = progress
+        self._stream_chunk_size = stream_chunk_size
+        self._prepared_cache = prepared_cache
+
     def load(
         self,
         package_data: Mapping[str, Any],
@@ -56,10 +221,11 @@ class DefaultPackageLoader:
         manifest_data: Optional[Mapping[str, Any]] = None,
         version_data: Optional[Mapping[str, Any]] = None,
     ) -> PublishedDataset:
-        package = self._validate_and_build_package(package_data)
-        self._confirm_manifest(package, manifest_data)
-        self._confirm_version(package, version_data, manifest_data)
-        return self._extract_dataset(package)
+        dataset = self._load(
+            package_data, manifest_data=manifest_data, version_data=version_data
+        )
+        self._freeze_loaded()
+        return dataset
 
     def load_path(
         self,
@@ -68,7 +234,6 @@ class DefaultPackageLoader:
         manifest_path: Optional[PathLike] = None,
         version_path: Optional[PathLike] = None,
     ) -> PublishedDataset:
-        package_data = self._read_json_file(package_path, label="package")
         manifest_data = (
             self._read_json_file(manifest_path, label="manifest")
             if manifest_path is not None
@@ -79,14 +244,136 @@ class DefaultPackageLoader:
             if version_path is not None
             else None
         )
-        return self.load(
-            package_data,
-            manifest_data=manifest_data,
-            version_data=version_data,
-        )
+        if self._stream:
+            dataset = self._load_streamed(
+                Path(package_path),
+                manifest_data=manifest_data,
+                version_data=version_data,
+            )
+        elif self._fused:
+            dataset = self._load_fused(
+                Path(package_path),
+                manifest_data=manifest_data,
+                version_data=version_data,
+            )
+        else:
+            dataset = self._load(
+                self._read_json_file(package_path, label="package"),
+                manifest_data=manifest_data,
+                version_data=version_data,
+            )
+        if self._prepared_cache is not None and dataset.dataset_identity is not None:
+            self._seed_prepared_cache(
+                self._prepared_cache,
+                dataset,
+                Path(package_path).parent / INDEX_SIDECAR_DIRNAME / INDEX_SIDECAR_FILENAME,
+            )
+        self._freeze_loaded()
+        return dataset
 
     # --- internal (read-only helpers) ---
 
+    def _load(
+        self,
+        package_data: Mapping[str, Any],
+        *,
+        manifest_data: Optional[Mapping[str, Any]],
+        version_data: Optional[Mapping[str, Any]],
+    ) -> PublishedDataset:
+        package = self._validate_and_build_package(package_data)
+        self._confirm_manifest(package, manifest_data)
+        self._confirm_version(package, version_data, manifest_data)
+        return self._extract_dataset(package)
+
+    def _load_streamed(
+        self,
+        package_path: Path,
+        *,
+        manifest_data: Optional[Mapping[str, Any]],
+        version_data: Optional[Mapping[str, Any]],
+    ) -> PublishedDataset:
+        sink = _RecordSink(columnar=self._columnar)
+        try:
+            with package_path.open("rb") as handle:
+                report, total = self._progress, os.fstat(handle.fileno()).st_size
+
+                def on_chunk(read: int) -> None:
+                    if report is not None:
+                        report(
+                            LoadProgress(bytes_read=read, total_bytes=total, record_count=sink.count)
+                        )
+
+                package_data = read_package_stream(
+                    handle,
+                    sink.add,
+                    chunk_size=self._stream_chunk_size,
+                    on_chunk=on_chunk,
+                    object_hook=envelope_object_hook if self._fused else None,
+                )
+        except OSError as exc:
+            raise PackageLoadError(
+                f"Failed to read package file: {package_path}", cause=exc
+            ) from exc
+        except ValueError as exc:
+            raise PackageLoadError(
+                f"Invalid JSON in package file: {package_path}: {exc}", cause=exc
+            ) from exc
+
+        if self._fused:
+            package_data = to_plain_json(package_data)
+        return self._finish_sink(
+            package_data, sink, manifest_data=manifest_data, version_data=version_data
+        )
+
+    def _load_fused(
+        self,
+        package_path: Path,
+        *,
+        manifest_data: Optional[Mapping[str, Any]],
+        version_data: Optional[Mapping[str, Any]],
+    ) -> PublishedDataset:
+        try:
+            package_data, items = decode_package_json(package_path.read_text(encoding="utf-8"))
+        except OSError as exc:
+            raise PackageLoadError(
+                f"Failed to read package file: {package_path}", cause=exc
+            ) from exc
+        except json.JSONDecodeError as exc:
+            raise PackageLoadError(
+                f"Invalid JSON in package file: {package_path}", cause=exc
+            ) from exc
+        if not isinstance(package_data, Mapping):
+            raise PackageLoadError(f"package JSON root must be an object: {package_path}")
+        sink = _RecordSink(columnar=self._columnar)
+        for index, item in enumerate(items):
+            sink.add(index, item)
+        return self._finish_sink(
+            package_data, sink, manifest_data=manifest_data, version_data=version_data
+        )
+
+    def _finish_sink(
+        self,
+        package_data: Mapping[str, Any],
+        sink: _RecordSink,
+        *,
+        manifest_data: Optional[Mapping[str, Any]],
+        version_data: Optional[Mapping[str, Any]],
+    ) -> PublishedDataset:
+        # Records were checked one by one; the rest validates with records emptied.
+        package = self._validate_and_build_package(package_data)
+        self._confirm_manifest(package, manifest_data)
+        self._confirm_version(package, version_data, manifest_data)
+        identity = self._dataset_identity(package)
+        if self._columnar:
+            return sink.columnar_dataset(identity)
+        return self._build_dataset(sink.records, identity)
+
+    def _freeze_loaded(self) -> None:
+        if self._gc_freeze:
+            # Collect the parse garbage first so it is not frozen with the dataset.
+            gc.collect()
+            gc.freeze()
+
     def _read_json_file(self, path: PathLike, *, label: str) -> Mapping[str, Any]:
         file_path = Path(path)
         try:
@@ -102,6 +389,34 @@ class DefaultPackageLoader:
             raise PackageLoadError(f"{label} JSON root must be an object: {file_path}")
         return data
 
+    def _seed_prepared_cache(
+        self,
+        cache: PreparedDatasetCache,
+        dataset: PublishedDataset,
+        sidecar_path: Path,
+    ) -> None:
+        try:
+            with sidecar_path.open("rb") as handle:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Absent (or empty) sidecar: build the indexes now.
+            cache.get(dataset)
+            return
+        try:
+            prepared = decode_index_sidecar(
+                buffer, dataset, preparer_options=cache.preparer.options
+            )
+        except StaleIndexSidecar:
+            prepared = None
+        if prepared is not None:
+            # The decoded indexes keep views over the mapping; it stays open.
+            cache.put(prepared)
+            return
+        # Stale sidecar (other dataset or preparer options): unmap it, rebuild.
+        buffer.close()
+        cache.invalidate(dataset.dataset_identity)
+        cache.get(dataset)
+
     def _validate_and_build_package(self, package_data: Mapping[str, Any]) -> Package:
         try:
             validated = validate_package(dict(package_data))
@@ -232,16 +547,54 @@ class DefaultPackageLoader:
         return version
 
     def _extract_dataset(self, package: Package) -> PublishedDataset:
-        dataset = package.dataset
-        if dataset is None:
+        if package.dataset is None:
+            raise DatasetNotFound("Package.dataset is missing")
+        return self._build_dataset(package.dataset.records, self._dataset_identity(package))
+
+    def _dataset_identity(self, package: Package) -> Optional[DatasetIdentity]:
+        if package.dataset is None:
             raise DatasetNotFound("Package.dataset is missing")
         # Prefer package-level dataset_identity when dataset itself has none.
-        if dataset.dataset_identity is None and package.dataset_identity is not None:
-            return PublishedDataset(
-                records=list(dataset.records),
-                dataset_identity=package.dataset_identity,
-            )
+        identity = package.dataset.dataset_identity
+        if identity is None and package.dataset_identity is not None:
+            identity = package.dataset_identity
+        return identity
+
+    def _build_dataset(
+        self,
+        records: List[EnvelopeRecord],
+        identity: Optional[DatasetIdentity],
+    ) -> PublishedDataset:
+        if self._columnar:
+            return ColumnarDataset.from_records(self._checked_records(records), identity)
+        if self._verified:
+            return self._verify_dataset(records, identity)
+        # Every load path builds a fresh record list, so it is not copied.
         return PublishedDataset(
-            records=list(dataset.records),
-            dataset_identity=dataset.dataset_identity,
+            records=records,
+            dataset_identity=identity,
+        )
+
+    def _checked_records(self, records: List[EnvelopeRecord]) -> List[EnvelopeRecord]:
+        for index, record in enumerate(records):
+            if not isinstance(record, EnvelopeRecord):
+                raise PackageLoadError(f"dataset.records[{index}] is not an EnvelopeRecord")
+        return records
+
+    def _verify_dataset(
+        self,
+        records: List[EnvelopeRecord],
+        identity: Optional[DatasetIdentity],
+    ) -> VerifiedDataset:
+        ordinals: DefaultDict[RecordIdentity, List[int]] = defaultdict(list)
+        identities: List[RecordIdentity] = []
+        for index, record in enumerate(self._checked_records(records)):
+            record_id = RecordIdentity(str(record.strategy_ref))
+            ordinals[record_id].append(index)
+            identities.append(record_id)
+        return VerifiedDataset(
+            records=records,
+            dataset_identity=identity,
+            record_ordinals={key: tuple(items) for key, items in ordinals.items()},
+            record_identities=identities,
         )
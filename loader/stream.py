@@ -0,0 +1,169 @@
+"""
+Streaming Package JSON reader.
+
+Decodes a package.json file chunk by chunk. Every member is decoded whole
+except ``dataset.records``, whose items are handed to a callback one at a
+time, so parse memory is one chunk plus one record whatever the corpus
+size. Structure only: validation and model building stay with the Loader.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+# Bytes read per chunk.
+STREAM_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+@dataclass(frozen=True)
+class LoadProgress:
+    """Streaming load progress, reported after every chunk read."""
+
+    bytes_read: int
+    # File size when known.
+    total_bytes: Optional[int]
+    record_count: int
+
+
+class _JsonStream:
+    """One JSON text read in chunks; values are decoded with json.JSONDecoder.raw_decode."""
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        chunk_size: int,
+        on_chunk: Callable[[int], None],
+        object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._on_chunk = on_chunk
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder(object_hook=object_hook)
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._bytes_read = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk (dropping consumed text); False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        self._eof = not chunk
+        self._bytes_read += len(chunk)
+        self._buffer = self._buffer[self._pos:] + self._text.decode(chunk, final=self._eof)
+        self._pos = 0
+        self._on_chunk(self._bytes_read)
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of file)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str) -> None:
+        found = self.peek()
+        if found != expected:
+            raise ValueError(
+                f"expected {expected!r}, found {found or 'end of file'!r} "
+                f"near byte {self._bytes_read}"
+            )
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Possibly cut off by the chunk boundary: read on and retry.
+                if self._fill():
+                    continue
+                raise
+            if end == len(self._buffer) and self._fill():
+                # A number ending the buffer may continue in the next chunk.
+                continue
+            self._pos = end
+            return value
+
+    def members(self, read_member: Callable[[str], Any]) -> Dict[str, Any]:
+        """Decode an object; each member value comes from ``read_member(key)``."""
+        result: Dict[str, Any] = {}
+        self.take("{")
+        if self.peek() == "}":
+            self.take("}")
+            return result
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError(f"object key must be a string near byte {self._bytes_read}")
+            self.take(":")
+            result[key] = read_member(key)
+            if self.peek() != ",":
+                self.take("}")
+                return result
+            self.take(",")
+
+
+def read_package_stream(
+    handle: BinaryIO,
+    on_record: Callable[[int, Any], None],
+    *,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[int], None]] = None,
+    object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Decode the Package JSON object in ``handle`` (binary, UTF-8).
+
+    Each ``dataset.records`` item is passed to ``on_record(index, item)`` in
+    order, and the returned package has ``dataset.records`` emptied. Other
+    members are returned as decoded. ``on_chunk(bytes_read)`` runs after
+    every chunk. ``object_hook`` is passed to the json decoder for every
+    value (records and other members alike). Malformed JSON raises ValueError (json.JSONDecodeError for
+    syntax errors inside a value).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    stream = _JsonStream(handle, chunk_size, on_chunk or (lambda _: None), object_hook)
+
+    def records() -> Any:
+        if stream.peek() != "[":
+            return stream.value()
+        stream.take("[")
+        if stream.peek() == "]":
+            stream.take("]")
+            return []
+        index = 0
+        while True:
+            on_record(index, stream.value())
+            index += 1
+            if stream.peek() != ",":
+                stream.take("]")
+                return []
+            stream.take(",")
+
+    def dataset_member(key: str) -> Any:
+        return records() if key == "records" else stream.value()
+
+    def package_member(key: str) -> Any:
+        if key == "dataset" and stream.peek() == "{":
+            return stream.members(dataset_member)
+        return stream.value()
+
+    package = stream.members(package_member)
+    if stream.peek():
+        raise ValueError("extra data after the package object")
+    return package
@@ -11,9 +11,13 @@ from .interfaces import MembershipEngine, MembershipQuery
 from .matcher import (
     is_member,
     match_cue,
+    match_columnar,
     match_record,
+    match_record_within,
     match_second,
     match_target,
+    nearest_distance,
+    point_distance,
     point_in_set,
     points_equal,
 )
@@ -29,8 +33,12 @@ __all__ = [
     "match_target",
     "match_cue",
     "match_second",
+    "match_columnar",
     "match_record",
+    "match_record_within",
     "is_member",
     "points_equal",
     "point_in_set",
+    "point_distance",
+    "nearest_distance",
 ]
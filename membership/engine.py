@@ -11,20 +11,29 @@ Does not mutate PublishedDataset or EnvelopeRecord.
 
 from __future__ import annotations
 
-from typing import List
+import math
+from typing import List, Sequence
 
 from models import (
+    ColumnarDataset,
     EnvelopeRecord,
     MembershipCandidate,
     PublishedDataset,
     RecordIdentity,
+    VerifiedDataset,
 )
 
 from .exceptions import MembershipFailure, MembershipInputError
 from .interfaces import MembershipQuery
-from .matcher import is_member, match_record
-from search.membership.adapter import DefaultCandidatePrefilterAdapter
-from search.membership.interfaces import CandidatePrefilterAdapter
+from .matcher import is_member, match_columnar, match_record, match_record_within
+from search.membership.adapter import (
+    DefaultCandidatePrefilterAdapter,
+    ToleranceMatchPrefilterAdapter,
+)
+from search.membership.interfaces import CandidatePrefilterAdapter, MembershipNegativeCheck
+from search.membership.models import PrefilterResult
+from search.membership.negative_check import BloomNegativeCheck
+from search.prepared import PreparedDataset
 
 
 def _record_identity(record: EnvelopeRecord, index: int) -> RecordIdentity:
@@ -35,30 +44,64 @@ def _record_identity(record: EnvelopeRecord, index: int) -> RecordIdentity:
     return RecordIdentity(str(record.strategy_ref))
 
 
+def _published(dataset: PublishedDataset | PreparedDataset) -> PublishedDataset:
+    return dataset.dataset if isinstance(dataset, PreparedDataset) else dataset
+
+
 class DefaultMembershipEngine:
-    """Concrete MembershipEngine. Selection only."""
+    """
+    Concrete MembershipEngine. Selection only.
+
+    ``tolerance`` switches to epsilon membership: each axis passes within that
+    Euclidean distance, and MembershipFlags.match_distance reports the worst axis.
+    ``negative_check`` runs before any full-scan fallback (Bloom filters by
+    default in exact mode); a rejection returns no candidates.
+    """
 
     def __init__(
         self,
         *,
         prefilter_adapter: CandidatePrefilterAdapter | None = None,
+        tolerance: float | None = None,
+        negative_check: MembershipNegativeCheck | None = None,
     ) -> None:
-        self._prefilter_adapter = (
-            prefilter_adapter
-            if prefilter_adapter is not None
-            else DefaultCandidatePrefilterAdapter()
-        )
+        if tolerance is not None and not (tolerance > 0.0 and math.isfinite(tolerance)):
+            raise MembershipInputError("tolerance must be a finite value > 0")
+        self._tolerance = tolerance
+        if prefilter_adapter is not None:
+            self._prefilter_adapter = prefilter_adapter
+        elif tolerance is not None:
+            self._prefilter_adapter = ToleranceMatchPrefilterAdapter(tolerance)
+        else:
+            self._prefilter_adapter = DefaultCandidatePrefilterAdapter()
+        # A complete adapter never drops a member: empty means none.
+        self._prefilter_complete = bool(getattr(self._prefilter_adapter, "complete", False))
+        if negative_check is None and tolerance is None:
+            negative_check = BloomNegativeCheck()
+        self._negative_check = negative_check
+
+    @property
+    def membership_tolerance(self) -> float | None:
+        """Epsilon of the tolerance index the adapter reads (see prepared_indexes)."""
+        return getattr(self._prefilter_adapter, "tolerance", None)
+
+    @property
+    def prepared_indexes(self) -> frozenset[str]:
+        """Optional PreparedDataset indexes the adapter and negative check read."""
+        return frozenset(
+            getattr(self._prefilter_adapter, "prepared_indexes", frozenset())
+        ) | frozenset(getattr(self._negative_check, "prepared_indexes", frozenset()))
 
     def evaluate(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
     ) -> List[MembershipCandidate]:
         if dataset is None:
             raise MembershipInputError("PublishedDataset is required")
         if query is None:
             raise MembershipInputError("MembershipQuery is required")
-        if not isinstance(dataset, PublishedDataset):
+        if not isinstance(dataset, (PublishedDataset, PreparedDataset)):
             raise MembershipInputError("dataset must be a PublishedDataset model")
         if not isinstance(query, MembershipQuery):
             raise MembershipInputError("query must be a MembershipQuery")
@@ -70,18 +113,98 @@ class DefaultMembershipEngine:
         except Exception as exc:  # noqa: BLE001 — wrap unexpected matcher failures
             raise MembershipFailure(str(exc), cause=exc) from exc
 
+    def evaluate_with_prefilter(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        query: MembershipQuery,
+        prefilter: PrefilterResult,
+    ) -> List[MembershipCandidate]:
+        """
+        evaluate() reusing an upstream Spatial Index / KDTree shortlist.
+
+        Adapters exposing select_from_prefilter() consume it instead of redoing
+        the prefilter; other adapters select as usual. Same result as evaluate().
+        """
+        if not isinstance(prefilter, PrefilterResult):
+            raise MembershipInputError("prefilter must be a PrefilterResult")
+        return self.evaluate_many(dataset, [query], prefilters=[prefilter])[0]
+
+    def evaluate_many(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        queries: Sequence[MembershipQuery],
+        *,
+        prefilters: Sequence[PrefilterResult] | None = None,
+    ) -> List[List[MembershipCandidate]]:
+        """
+        Evaluate a batch of queries against one dataset.
+
+        Dataset / record checks run once per batch; each entry equals evaluate().
+        ``prefilters`` (one per query) passes upstream shortlists as in
+        evaluate_with_prefilter().
+        """
+        if dataset is None:
+            raise MembershipInputError("PublishedDataset is required")
+        if queries is None:
+            raise MembershipInputError("MembershipQuery list is required")
+        if not isinstance(dataset, (PublishedDataset, PreparedDataset)):
+            raise MembershipInputError("dataset must be a PublishedDataset model")
+        for index, query in enumerate(queries):
+            if not isinstance(query, MembershipQuery):
+                raise MembershipInputError(f"queries[{index}] is not a MembershipQuery")
+        if prefilters is not None and len(prefilters) != len(queries):
+            raise MembershipInputError("prefilters must match queries one-to-one")
+
+        try:
+            published = _published(dataset)
+            records = self._validated_records(published)
+            return [
+                self._evaluate_selected(
+                    dataset,
+                    published,
+                    records,
+                    query,
+                    prefilters[index] if prefilters is not None else None,
+                )
+                for index, query in enumerate(queries)
+            ]
+        except MembershipInputError:
+            raise
+        except Exception as exc:  # noqa: BLE001 — wrap unexpected matcher failures
+            raise MembershipFailure(str(exc), cause=exc) from exc
+
     def _evaluate(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
     ) -> List[MembershipCandidate]:
-        records = self._validated_records(dataset)
-        optimized_records = self._select_candidate_records(dataset, query)
+        published = _published(dataset)
+        records = self._validated_records(published)
+        return self._evaluate_selected(dataset, published, records, query)
+
+    def _evaluate_selected(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        published: PublishedDataset,
+        records: Sequence[EnvelopeRecord],
+        query: MembershipQuery,
+        prefilter: PrefilterResult | None = None,
+    ) -> List[MembershipCandidate]:
+        optimized_records = self._select_candidate_records(dataset, query, prefilter)
         if not optimized_records:
+            if optimized_records is not None and self._prefilter_complete:
+                return []
+            if self._rejected(dataset, query):
+                return []
+            if isinstance(published, ColumnarDataset):
+                return self._evaluate_columnar(published, query)
             optimized_records = tuple(records)
-        return self._evaluate_records(dataset, query, optimized_records)
+        return self._evaluate_records(published, query, optimized_records)
 
-    def _validated_records(self, dataset: PublishedDataset) -> List[EnvelopeRecord]:
+    def _validated_records(self, dataset: PublishedDataset) -> Sequence[EnvelopeRecord]:
+        if isinstance(dataset, VerifiedDataset):
+            # Checked once by the Loader; no per-query record scan.
+            return dataset.records
         records = dataset.records or []
         for index, record in enumerate(records):
             if not isinstance(record, EnvelopeRecord):
@@ -92,24 +215,48 @@ class DefaultMembershipEngine:
 
     def _select_candidate_records(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
+        prefilter: PrefilterResult | None = None,
     ) -> tuple[EnvelopeRecord, ...] | None:
         try:
+            if prefilter is not None:
+                select_from_prefilter = getattr(
+                    self._prefilter_adapter, "select_from_prefilter", None
+                )
+                if callable(select_from_prefilter):
+                    return select_from_prefilter(dataset, prefilter)
             return self._prefilter_adapter.select_records(dataset, query)
         except Exception:
             return None
 
+    def _rejected(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        query: MembershipQuery,
+    ) -> bool:
+        if self._negative_check is None:
+            return False
+        try:
+            return bool(self._negative_check.rejects(dataset, query))
+        except Exception:
+            return False
+
     def _evaluate_records(
         self,
         dataset: PublishedDataset,
         query: MembershipQuery,
-        records: tuple[EnvelopeRecord, ...] | List[EnvelopeRecord],
+        records: Sequence[EnvelopeRecord],
     ) -> List[MembershipCandidate]:
         candidates: List[MembershipCandidate] = []
+        tolerance = self._tolerance
 
         for index, record in enumerate(records):
-            flags = match_record(query, record)
+            flags = (
+                match_record(query, record)
+                if tolerance is None
+                else match_record_within(query, record, tolerance)
+            )
             if not is_member(flags):
                 continue
             candidates.append(
@@ -121,3 +268,20 @@ class DefaultMembershipEngine:
                 )
             )
         return candidates
+
+    def _evaluate_columnar(
+        self,
+        dataset: ColumnarDataset,
+        query: MembershipQuery,
+    ) -> List[MembershipCandidate]:
+        """Full scan over the columns; same result as _evaluate_records on the views."""
+        refs = dataset.strategy_refs
+        return [
+            MembershipCandidate(
+                strategy_ref=refs[ordinal],
+                record_identity=RecordIdentity(str(refs[ordinal])),
+                membership=flags,
+                dataset_identity=dataset.dataset_identity,
+            )
+            for ordinal, flags in match_columnar(query, dataset, self._tolerance)
+        ]
@@ -4,10 +4,24 @@ Membership Engine factory.
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from .engine import DefaultMembershipEngine
 from .interfaces import MembershipEngine
 
+if TYPE_CHECKING:
+    from search.membership.interfaces import CandidatePrefilterAdapter, MembershipNegativeCheck
+
 
-def create_membership_engine() -> MembershipEngine:
-    """Return the repository Membership Selection Engine."""
-    return DefaultMembershipEngine()
+def create_membership_engine(
+    *,
+    prefilter_adapter: "CandidatePrefilterAdapter | None" = None,
+    tolerance: float | None = None,
+    negative_check: "MembershipNegativeCheck | None" = None,
+) -> MembershipEngine:
+    """Return the repository Membership Selection Engine (exact unless ``tolerance``)."""
+    return DefaultMembershipEngine(
+        prefilter_adapter=prefilter_adapter,
+        tolerance=tolerance,
+        negative_check=negative_check,
+    )
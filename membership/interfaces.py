@@ -7,10 +7,13 @@ Read-only Selection Layer. No Resolve / Strategy / Modal / Loader.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, List, Protocol, runtime_checkable
 
 from models import MembershipCandidate, Point, PublishedDataset
 
+if TYPE_CHECKING:
+    from search.prepared import PreparedDataset
+
 
 @dataclass(frozen=True)
 class MembershipQuery:
@@ -28,11 +31,12 @@ class MembershipEngine(Protocol):
 
     PublishedDataset + MembershipQuery → list[MembershipCandidate]
     Does not call Resolve, Loader, Strategy, or Modal.
+    A PreparedDataset may be passed in place of its PublishedDataset.
     """
 
     def evaluate(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
     ) -> List[MembershipCandidate]:
         """Return Candidates that pass Target ∧ Cue ∧ Second membership."""
@@ -3,14 +3,17 @@ Pure Membership matchers.
 
 Side-effect free. No I/O, no Dataset mutation, no Resolve.
 Phase-1 judgment: exact Point equality / exact set membership.
-Threshold / distance / KDTree are Out of Scope.
+Opt-in tolerance mode: Euclidean distance <= tolerance on every axis.
+ColumnarDataset: match_columnar() scans the point columns in place.
+KDTree is Out of Scope.
 """
 
 from __future__ import annotations
 
-from typing import Iterable, List
+import math
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from models import EnvelopeRecord, MembershipFlags, Point
+from models import ColumnarDataset, EnvelopeRecord, MembershipFlags, Point
 
 from .interfaces import MembershipQuery
 
@@ -55,6 +58,36 @@ def match_record(query: MembershipQuery, record: EnvelopeRecord) -> MembershipFl
     )
 
 
+def point_distance(a: Point, b: Point) -> float:
+    """Euclidean distance between two points."""
+    return math.hypot(a.x - b.x, a.y - b.y)
+
+
+def nearest_distance(point: Point, point_set: Iterable[Point]) -> float:
+    """Distance from `point` to the nearest member of `point_set` (inf when empty)."""
+    return min((point_distance(point, candidate) for candidate in point_set), default=math.inf)
+
+
+def match_record_within(
+    query: MembershipQuery,
+    record: EnvelopeRecord,
+    tolerance: float,
+) -> MembershipFlags:
+    """
+    Tolerance-mode match_record: each axis passes when its nearest point lies
+    within `tolerance`. `match_distance` carries the worst axis distance.
+    """
+    target_distance = point_distance(query.target, record.target)
+    cue_distance = nearest_distance(query.cue, record.cue_set)
+    second_distance = nearest_distance(query.second, record.second_set)
+    return MembershipFlags(
+        target_match=target_distance <= tolerance,
+        cue_membership=cue_distance <= tolerance,
+        second_membership=second_distance <= tolerance,
+        match_distance=max(target_distance, cue_distance, second_distance),
+    )
+
+
 def is_member(flags: MembershipFlags) -> bool:
     """AND contract: Target ∧ Cue ∧ Second."""
     return (
@@ -62,3 +95,73 @@ def is_member(flags: MembershipFlags) -> bool:
         and flags.cue_membership
         and flags.second_membership
     )
+
+
+def _in_column(x: float, y: float, xy: Sequence[float], start: int, end: int) -> bool:
+    for i in range(start, end):
+        if xy[2 * i] == x and xy[2 * i + 1] == y:
+            return True
+    return False
+
+
+def _nearest_in_column(x: float, y: float, xy: Sequence[float], start: int, end: int) -> float:
+    return min(
+        (math.hypot(x - xy[2 * i], y - xy[2 * i + 1]) for i in range(start, end)),
+        default=math.inf,
+    )
+
+
+def match_columnar(
+    query: MembershipQuery,
+    dataset: ColumnarDataset,
+    tolerance: Optional[float] = None,
+) -> Iterator[Tuple[int, MembershipFlags]]:
+    """
+    (ordinal, flags) for every member record of a ColumnarDataset, ascending.
+
+    Same flags as match_record / match_record_within on the record views,
+    read straight from the columns; axes are checked target first and a
+    record is dropped at its first failing axis.
+    """
+    target_xy = dataset.target_xy
+    cue_xy, cue_offsets = dataset.cue_xy, dataset.cue_offsets
+    second_xy, second_offsets = dataset.second_xy, dataset.second_offsets
+    target_x, target_y = query.target.x, query.target.y
+    cue_x, cue_y = query.cue.x, query.cue.y
+    second_x, second_y = query.second.x, query.second.y
+    targets = zip(target_xy[0::2], target_xy[1::2])
+    if tolerance is None:
+        for ordinal, (x, y) in enumerate(targets):
+            if not (target_x == x and target_y == y):
+                continue
+            if not _in_column(cue_x, cue_y, cue_xy, cue_offsets[ordinal], cue_offsets[ordinal + 1]):
+                continue
+            if not _in_column(
+                second_x, second_y, second_xy, second_offsets[ordinal], second_offsets[ordinal + 1]
+            ):
+                continue
+            yield ordinal, MembershipFlags(
+                target_match=True, cue_membership=True, second_membership=True
+            )
+        return
+
+    for ordinal, (x, y) in enumerate(targets):
+        target_distance = math.hypot(target_x - x, target_y - y)
+        if not target_distance <= tolerance:
+            continue
+        cue_distance = _nearest_in_column(
+            cue_x, cue_y, cue_xy, cue_offsets[ordinal], cue_offsets[ordinal + 1]
+        )
+        if not cue_distance <= tolerance:
+            continue
+        second_distance = _nearest_in_column(
+            second_x, second_y, second_xy, second_offsets[ordinal], second_offsets[ordinal + 1]
+        )
+        if not second_distance <= tolerance:
+            continue
+        yield ordinal, MembershipFlags(
+            target_match=True,
+            cue_membership=True,
+            second_membership=True,
+            match_distance=max(target_distance, cue_distance, second_distance),
+        )
@@ -5,6 +5,7 @@ Structure-only dataclasses aligned with schemas/*.schema.json.
 No validation, loader, runtime, membership, resolve, or generator logic.
 """
 
+from .columnar_dataset import ColumnarDataset, ColumnarRecords
 from .membership_candidate import MembershipCandidate, MembershipFlags
 from .manifest import Manifest
 from .package import Package
@@ -19,6 +20,7 @@ from .types import (
     StrategyRef,
     VersionIdentity,
 )
+from .verified_dataset import VerifiedDataset
 from .version import Version
 
 __all__ = [
@@ -32,6 +34,9 @@ __all__ = [
     "RecordIdentity",
     "EnvelopeRecord",
     "PublishedDataset",
+    "VerifiedDataset",
+    "ColumnarDataset",
+    "ColumnarRecords",
     "Package",
     "Manifest",
     "Version",
@@ -0,0 +1,225 @@
+"""
+Columnar Published Dataset domain model.
+
+Struct-of-arrays VerifiedDataset: targets and the flattened cue / second
+point sets are held in contiguous float arrays with per-record offset arrays,
+and strategy refs in one interned-string tuple, instead of one EnvelopeRecord
+plus a list of Point objects per record. ``records`` stays available as lazy
+EnvelopeRecord views for legacy callers; search engines read the columns.
+Structure only; verification happens in the Loader.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import chain, repeat
+from typing import DefaultDict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, overload
+
+from .published_dataset import EnvelopeRecord
+from .types import DatasetIdentity, Point, RecordIdentity, StrategyRef
+from .verified_dataset import VerifiedDataset
+
+
+class ColumnarRecords(Sequence[EnvelopeRecord]):
+    """
+    Read-only sequence of EnvelopeRecord views over a ColumnarDataset.
+
+    Each access builds a fresh EnvelopeRecord from the columns; mutating a
+    view does not change the dataset.
+    """
+
+    __slots__ = ("_dataset",)
+
+    def __init__(self, dataset: "ColumnarDataset") -> None:
+        self._dataset = dataset
+
+    def __len__(self) -> int:
+        return len(self._dataset.strategy_refs)
+
+    @overload
+    def __getitem__(self, index: int) -> EnvelopeRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Tuple[EnvelopeRecord, ...]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._dataset.record_view(i) for i in range(*index.indices(len(self))))
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("record index out of range")
+        return self._dataset.record_view(index)
+
+    def __iter__(self) -> Iterator[EnvelopeRecord]:
+        view = self._dataset.record_view
+        return (view(i) for i in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ColumnarRecords):
+            return self._dataset.columns() == other._dataset.columns()
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ColumnarRecords(<{len(self)} records>)"
+
+
+def _points(xy: array, offsets: array, ordinal: int) -> List[Point]:
+    return [
+        Point(x=xy[2 * i], y=xy[2 * i + 1])
+        for i in range(offsets[ordinal], offsets[ordinal + 1])
+    ]
+
+
+@dataclass(init=False)
+class ColumnarDataset(VerifiedDataset):
+    """
+    VerifiedDataset stored as columns (struct-of-arrays).
+
+    Points are interleaved ``x, y`` doubles: record ``i``'s target is
+    ``target_xy[2i:2i + 2]``; its cue points are point indices
+    ``cue_offsets[i]:cue_offsets[i + 1]`` into ``cue_xy`` (likewise
+    ``second_*``). ``strategy_refs`` holds interned strings and doubles as
+    ``record_identities``. ``records`` is a ColumnarRecords view sequence.
+    """
+
+    target_xy: array = field(default_factory=lambda: array("d"))
+    cue_xy: array = field(default_factory=lambda: array("d"))
+    cue_offsets: array = field(default_factory=lambda: array("q", [0]))
+    second_xy: array = field(default_factory=lambda: array("d"))
+    second_offsets: array = field(default_factory=lambda: array("q", [0]))
+    strategy_refs: Tuple[StrategyRef, ...] = ()
+
+    def __init__(
+        self,
+        *,
+        target_xy: array,
+        cue_xy: array,
+        cue_offsets: array,
+        second_xy: array,
+        second_offsets: array,
+        strategy_refs: Iterable[StrategyRef],
+        dataset_identity: Optional[DatasetIdentity] = None,
+        record_ordinals: Optional[Mapping[RecordIdentity, Tuple[int, ...]]] = None,
+    ) -> None:
+        refs = tuple(strategy_refs)
+        if record_ordinals is None:
+            ordinals: DefaultDict[RecordIdentity, List[int]] = defaultdict(list)
+            for ordinal, ref in enumerate(refs):
+                ordinals[RecordIdentity(ref)].append(ordinal)
+            record_ordinals = {key: tuple(items) for key, items in ordinals.items()}
+        VerifiedDataset.__init__(
+            self,
+            (),
+            dataset_identity=dataset_identity,
+            record_ordinals=record_ordinals,
+            record_identities=(),
+        )
+        object.__setattr__(self, "records", ColumnarRecords(self))
+        # Interned refs are already str, so they serve as record identities too.
+        object.__setattr__(self, "record_identities", refs)
+        object.__setattr__(self, "strategy_refs", refs)
+        object.__setattr__(self, "target_xy", target_xy)
+        object.__setattr__(self, "cue_xy", cue_xy)
+        object.__setattr__(self, "cue_offsets", cue_offsets)
+        object.__setattr__(self, "second_xy", second_xy)
+        object.__setattr__(self, "second_offsets", second_offsets)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[EnvelopeRecord],
+        dataset_identity: Optional[DatasetIdentity] = None,
+    ) -> "ColumnarDataset":
+        """Columnar copy of ``records`` (EnvelopeRecords, order kept)."""
+        target_xy, cue_xy, second_xy = array("d"), array("d"), array("d")
+        cue_offsets, second_offsets = array("q", [0]), array("q", [0])
+        refs: List[StrategyRef] = []
+        for record in records:
+            refs.append(StrategyRef(sys.intern(str(record.strategy_ref))))
+            target_xy.append(record.target.x)
+            target_xy.append(record.target.y)
+            for point in record.cue_set:
+                cue_xy.append(point.x)
+                cue_xy.append(point.y)
+            cue_offsets.append(len(cue_xy) >> 1)
+            for point in record.second_set:
+                second_xy.append(point.x)
+                second_xy.append(point.y)
+            second_offsets.append(len(second_xy) >> 1)
+        return cls(
+            target_xy=target_xy,
+            cue_xy=cue_xy,
+            cue_offsets=cue_offsets,
+            second_xy=second_xy,
+            second_offsets=second_offsets,
+            strategy_refs=refs,
+            dataset_identity=dataset_identity,
+        )
+
+    def record_view(self, ordinal: int) -> EnvelopeRecord:
+        """EnvelopeRecord built from the columns at ``ordinal`` (a fresh copy)."""
+        target = self.target_xy
+        return EnvelopeRecord(
+            strategy_ref=self.strategy_refs[ordinal],
+            target=Point(x=target[2 * ordinal], y=target[2 * ordinal + 1]),
+            cue_set=_points(self.cue_xy, self.cue_offsets, ordinal),
+            second_set=_points(self.second_xy, self.second_offsets, ordinal),
+        )
+
+    def points(self, column: str) -> Iterator[Tuple[float, float, int]]:
+        """``(x, y, ordinal)`` for every point of ``column`` ("target", "cue" or "second")."""
+        xy = getattr(self, f"{column}_xy")
+        count = len(self.strategy_refs)
+        if column == "target":
+            owners: Iterable[int] = range(count)
+        else:
+            offsets = getattr(self, f"{column}_offsets")
+            owners = chain.from_iterable(
+                repeat(ordinal, offsets[ordinal + 1] - offsets[ordinal])
+                for ordinal in range(count)
+            )
+        return zip(xy[0::2], xy[1::2], owners)
+
+    def columns(self) -> Tuple[object, ...]:
+        """(target_xy, cue_xy, cue_offsets, second_xy, second_offsets, strategy_refs)."""
+        return (
+            self.target_xy,
+            self.cue_xy,
+            self.cue_offsets,
+            self.second_xy,
+            self.second_offsets,
+            self.strategy_refs,
+        )
+
+    def __reduce__(self):
+        return (
+            _rebuild_columnar,
+            (self.columns(), self.dataset_identity, dict(self.record_ordinals)),
+        )
+
+
+def _rebuild_columnar(
+    columns: Tuple[object, ...],
+    dataset_identity: Optional[DatasetIdentity],
+    record_ordinals: Mapping[RecordIdentity, Tuple[int, ...]],
+) -> ColumnarDataset:
+    target_xy, cue_xy, cue_offsets, second_xy, second_offsets, strategy_refs = columns
+    return ColumnarDataset(
+        target_xy=target_xy,  # type: ignore[arg-type]
+        cue_xy=cue_xy,  # type: ignore[arg-type]
+        cue_offsets=cue_offsets,  # type: ignore[arg-type]
+        second_xy=second_xy,  # type: ignore[arg-type]
+        second_offsets=second_offsets,  # type: ignore[arg-type]
+        strategy_refs=strategy_refs,  # type: ignore[arg-type]
+        dataset_identity=dataset_identity,
+        record_ordinals=record_ordinals,
+    )
@@ -16,16 +16,18 @@ from typing import Optional
 from .types import DatasetIdentity, RecordIdentity, StrategyRef
 
 
-@dataclass
+@dataclass(slots=True)
 class MembershipFlags:
     """Membership Result flags (structure only)."""
 
     target_match: bool
     cue_membership: bool
     second_membership: bool
+    # Side-channel: worst-axis nearest distance in tolerance mode (None when exact).
+    match_distance: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MembershipCandidate:
     """Candidate passed to Resolve. Carries strategy_ref + record identity."""
 
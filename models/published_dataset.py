@@ -16,7 +16,7 @@ from typing import List, Optional
 from .types import DatasetIdentity, Point, StrategyRef
 
 
-@dataclass
+@dataclass(slots=True)
 class EnvelopeRecord:
     """
     Search Representation for one Strategy.
@@ -22,7 +22,7 @@ GeneratorBuildIdentity = NewType("GeneratorBuildIdentity", str)
 RecordIdentity = NewType("RecordIdentity", str)
 
 
-@dataclass
+@dataclass(slots=True)
 class Point:
     """2D coordinate (schema Point)."""
 
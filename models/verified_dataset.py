@@ -0,0 +1,78 @@
+"""
+Verified Published Dataset domain model.
+
+Read-only PublishedDataset produced by the Package Loader once its records
+have been checked. Carries the record-ordinal interning table (ordinal =
+position in ``records``) so search engines can skip per-query record scans
+and key their indexes by int. Structure only; verification happens in the Loader.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import FrozenInstanceError, dataclass, field
+from types import MappingProxyType
+from typing import DefaultDict, Iterable, List, Mapping, Optional, Tuple
+
+from .published_dataset import EnvelopeRecord, PublishedDataset
+from .types import DatasetIdentity, RecordIdentity
+
+
+@dataclass(init=False)
+class VerifiedDataset(PublishedDataset):
+    """
+    Frozen PublishedDataset: every record is an EnvelopeRecord.
+
+    ``records`` is a tuple; ``record_ordinals`` maps record identity
+    (str(strategy_ref)) to its positions in ``records``, ascending;
+    ``record_identities`` is the reverse table (ordinal -> identity).
+    Both tables are derived from ``records`` when omitted.
+    """
+
+    records: Tuple[EnvelopeRecord, ...] = ()  # type: ignore[assignment]
+    dataset_identity: Optional[DatasetIdentity] = None
+    record_ordinals: Mapping[RecordIdentity, Tuple[int, ...]] = field(
+        default_factory=dict
+    )
+    record_identities: Tuple[RecordIdentity, ...] = ()
+
+    def __init__(
+        self,
+        records: Iterable[EnvelopeRecord],
+        dataset_identity: Optional[DatasetIdentity] = None,
+        record_ordinals: Optional[Mapping[RecordIdentity, Tuple[int, ...]]] = None,
+        record_identities: Optional[Iterable[RecordIdentity]] = None,
+    ) -> None:
+        records = tuple(records)
+        if record_identities is None:
+            record_identities = (
+                RecordIdentity(str(record.strategy_ref)) for record in records
+            )
+        identities = tuple(record_identities)
+        if record_ordinals is None:
+            ordinals: DefaultDict[RecordIdentity, List[int]] = defaultdict(list)
+            for ordinal, record_id in enumerate(identities):
+                ordinals[record_id].append(ordinal)
+            record_ordinals = {key: tuple(items) for key, items in ordinals.items()}
+        object.__setattr__(self, "records", records)
+        object.__setattr__(self, "dataset_identity", dataset_identity)
+        object.__setattr__(self, "record_ordinals", MappingProxyType(dict(record_ordinals)))
+        object.__setattr__(self, "record_identities", identities)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __reduce__(self):
+        # MappingProxyType is not copyable/picklable; rebuild from plain values.
+        return (
+            type(self),
+            (
+                self.records,
+                self.dataset_identity,
+                dict(self.record_ordinals),
+                self.record_identities,
+            ),
+        )
@@ -44,6 +44,11 @@ def main(argv: list[str] | None = None) -> int:
     )
     package_p.add_argument("--handoff", required=True, type=Path)
     package_p.add_argument("--out", required=True, type=Path)
+    package_p.add_argument(
+        "--index-sidecar",
+        action="store_true",
+        help="Also write prebuilt search indexes under package/index/",
+    )
 
     deploy_p = sub.add_parser(
         "deploy",
@@ -111,7 +116,9 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.command == "package":
         handoff = json.loads(args.handoff.read_text(encoding="utf-8"))
-        result = emit_published_package_from_handoff_json(handoff, args.out)
+        result = emit_published_package_from_handoff_json(
+            handoff, args.out, index_sidecar=args.index_sidecar
+        )
         print(f"Published Package written: {result.package_dir}")
         return 0
 
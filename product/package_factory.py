@@ -35,11 +35,19 @@ def emit_published_package(
     *,
     identity_suffix: Optional[str] = None,
     package_dirname: str = "package",
+    index_sidecar: bool = False,
 ) -> PublishedPackageEmitResult:
-    """Build + write Published Package to export folder (Mission 03 input)."""
+    """
+    Build + write Published Package to export folder (Mission 03 input).
+
+    ``index_sidecar=True`` adds the prebuilt search index sidecar.
+    """
     bundle = build_published_package(artifact, identity_suffix=identity_suffix)
     return write_published_package(
-        bundle, export_root, package_dirname=package_dirname
+        bundle,
+        export_root,
+        package_dirname=package_dirname,
+        index_sidecar=index_sidecar,
     )
 
 
@@ -49,11 +57,15 @@ def emit_published_package_from_handoff_json(
     *,
     identity_suffix: Optional[str] = None,
     package_dirname: str = "package",
+    index_sidecar: bool = False,
 ) -> PublishedPackageEmitResult:
     """Mission 02 one-shot from Mission 01 handoff JSON file contents."""
     bundle = create_package_builder().build_from_handoff_json(
         handoff_json, identity_suffix=identity_suffix
     )
     return write_published_package(
-        bundle, export_root, package_dirname=package_dirname
+        bundle,
+        export_root,
+        package_dirname=package_dirname,
+        index_sidecar=index_sidecar,
     )
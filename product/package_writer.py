@@ -11,13 +11,25 @@ Layout:
       provenance.json
       identities.json
       build.json
+    index/
+      search-index.bin   (index_sidecar=True: prebuilt search indexes)
 """
 
 from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, Optional, Union
+
+from loader.utils import published_dataset_from_json
+from models import DatasetIdentity, PublishedDataset
+from search.prepared import (
+    INDEX_SIDECAR_DIRNAME,
+    INDEX_SIDECAR_FILENAME,
+    DefaultDatasetPreparer,
+    PreparedDatasetError,
+    encode_index_sidecar,
+)
 
 from .exceptions import PackageWriteFailure
 from .package_builder import assert_mission03_input_contract
@@ -36,16 +48,37 @@ def _write_json(path: Path, payload: object) -> None:
     )
 
 
+def _index_sidecar_bytes(
+    bundle: PublishedPackageBundle,
+    preparer: Optional[DefaultDatasetPreparer],
+) -> bytes:
+    # Index the dataset exactly as the Package Loader returns it (package.json).
+    package_json = bundle.package_json
+    dataset = published_dataset_from_json(package_json["dataset"])
+    if dataset.dataset_identity is None and package_json.get("datasetIdentity"):
+        dataset = PublishedDataset(
+            records=dataset.records,
+            dataset_identity=DatasetIdentity(str(package_json["datasetIdentity"])),
+        )
+    preparer = preparer or DefaultDatasetPreparer()
+    return encode_index_sidecar(preparer.prepare(dataset), preparer_options=preparer.options)
+
+
 def write_published_package(
     bundle: PublishedPackageBundle,
     export_root: PathLike,
     *,
     package_dirname: str = PACKAGE_DIR_NAME,
+    index_sidecar: bool = False,
+    preparer: Optional[DefaultDatasetPreparer] = None,
 ) -> PublishedPackageEmitResult:
     """
     Persist Published Package under export_root/package/.
 
     Mission 03 consumes this folder (Deployment Workflow input).
+    ``index_sidecar=True`` also writes index/search-index.bin: the search
+    indexes ``preparer`` builds for the package dataset, which the Package
+    Loader maps instead of rebuilding them.
     """
     assert_mission03_input_contract(bundle)
     root = Path(export_root)
@@ -85,8 +118,15 @@ def write_published_package(
                 "handoffStatus": bundle.metadata.get("handoffStatus"),
             },
         )
+        if index_sidecar:
+            sidecar_path = package_dir / INDEX_SIDECAR_DIRNAME / INDEX_SIDECAR_FILENAME
+            sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+            sidecar_path.write_bytes(_index_sidecar_bytes(bundle, preparer))
+            files[f"{INDEX_SIDECAR_DIRNAME}/{INDEX_SIDECAR_FILENAME}"] = sidecar_path
     except OSError as exc:
         raise PackageWriteFailure(f"Failed to write package folder: {exc}") from exc
+    except (KeyError, TypeError, ValueError, PreparedDatasetError) as exc:
+        raise PackageWriteFailure(f"Failed to build index sidecar: {exc}") from exc
 
     return PublishedPackageEmitResult(
         bundle=bundle,
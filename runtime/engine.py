@@ -11,12 +11,16 @@ Does not mutate PublishedDataset.
 
 from __future__ import annotations
 
+from typing import Sequence
+
 from membership import MembershipEngine, MembershipQuery
 from membership.exceptions import MembershipError
-from models import PublishedDataset
+from models import MembershipCandidate, PublishedDataset, StrategyRef
 from resolve import ResolveEngine, Strategy
 from resolve.exceptions import ResolveError
+from search.prepared import PreparedDataset, PreparedDatasetCache
 from search.runtime.orchestrator import SearchEnhancementOrchestrator
+from search.runtime.tracing import STAGE_RESOLVE, PipelineTracer, StageTrace
 
 from .exceptions import RuntimeConfigurationError, RuntimeExecutionError
 from .result import SearchResult
@@ -31,6 +35,8 @@ class DefaultSearchRuntime:
         membership: MembershipEngine,
         resolve: ResolveEngine,
         orchestrator: SearchEnhancementOrchestrator | None = None,
+        prepared_cache: PreparedDatasetCache | None = None,
+        tracer: PipelineTracer | None = None,
     ) -> None:
         if membership is None:
             raise RuntimeConfigurationError("MembershipEngine is required")
@@ -41,19 +47,21 @@ class DefaultSearchRuntime:
         self._orchestrator = (
             orchestrator
             if orchestrator is not None
-            else SearchEnhancementOrchestrator(membership=membership)
+            else SearchEnhancementOrchestrator(membership=membership, tracer=tracer)
         )
+        self._prepared_cache = prepared_cache
+        self._tracer = tracer
 
     def execute(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
     ) -> SearchResult:
         if dataset is None:
             raise RuntimeConfigurationError("PublishedDataset is required")
         if query is None:
             raise RuntimeConfigurationError("MembershipQuery is required")
-        if not isinstance(dataset, PublishedDataset):
+        if not isinstance(dataset, (PublishedDataset, PreparedDataset)):
             raise RuntimeConfigurationError(
                 "dataset must be a PublishedDataset (Loader-supplied)"
             )
@@ -61,6 +69,8 @@ class DefaultSearchRuntime:
             raise RuntimeConfigurationError("query must be a MembershipQuery")
 
         try:
+            if self._prepared_cache is not None:
+                dataset = self._prepared_cache.get(dataset)
             artifacts = self._orchestrator.run(dataset, query)
         except MembershipError as exc:
             raise RuntimeExecutionError(
@@ -73,28 +83,92 @@ class DefaultSearchRuntime:
                 cause=exc,
             ) from exc
 
-        candidates = list(artifacts.resolve_candidates)
+        return self._resolve_result(artifacts.resolve_candidates)
+
+    def execute_many(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        queries: Sequence[MembershipQuery],
+    ) -> tuple[SearchResult, ...]:
+        """
+        Batch execute(): one SearchResult per query, in input order.
+
+        Enhancement stages run once over the batch (see run_many) and
+        Resolve looks each strategy_ref up once per batch.
+        Each entry equals execute(dataset, query).
+        """
+        if dataset is None:
+            raise RuntimeConfigurationError("PublishedDataset is required")
+        if queries is None:
+            raise RuntimeConfigurationError("MembershipQuery list is required")
+        if not isinstance(dataset, (PublishedDataset, PreparedDataset)):
+            raise RuntimeConfigurationError(
+                "dataset must be a PublishedDataset (Loader-supplied)"
+            )
+        queries = tuple(queries)
+        for index, query in enumerate(queries):
+            if not isinstance(query, MembershipQuery):
+                raise RuntimeConfigurationError(
+                    f"queries[{index}] must be a MembershipQuery"
+                )
+        if not queries:
+            return ()
+
+        try:
+            if self._prepared_cache is not None:
+                dataset = self._prepared_cache.get(dataset)
+            batch = self._orchestrator.run_many(dataset, queries)
+        except MembershipError as exc:
+            raise RuntimeExecutionError(
+                f"Membership stage failed: {exc}",
+                cause=exc,
+            ) from exc
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeExecutionError(
+                f"Enhancement pipeline failed: {exc}",
+                cause=exc,
+            ) from exc
+
+        resolved: dict[StrategyRef, Strategy] = {}
+        return tuple(
+            self._resolve_result(artifacts.resolve_candidates, resolved)
+            for artifacts in batch
+        )
+
+    def _resolve_result(
+        self,
+        candidates: Sequence[MembershipCandidate],
+        resolved: dict[StrategyRef, Strategy] | None = None,
+    ) -> SearchResult:
         if not candidates:
             return SearchResult()
 
         resolved_candidates = []
         resolved_strategies: list[Strategy] = []
 
-        for index, candidate in enumerate(candidates):
-            try:
-                strategy = self._resolve.resolve(candidate)
-            except ResolveError as exc:
-                raise RuntimeExecutionError(
-                    f"Resolve stage failed at candidate[{index}]: {exc}",
-                    cause=exc,
-                ) from exc
-            except Exception as exc:  # noqa: BLE001
-                raise RuntimeExecutionError(
-                    f"Resolve stage failed unexpectedly at candidate[{index}]: {exc}",
-                    cause=exc,
-                ) from exc
-            resolved_candidates.append(candidate)
-            resolved_strategies.append(strategy)
+        with StageTrace(self._tracer, STAGE_RESOLVE, input_count=len(candidates)) as span:
+            for index, candidate in enumerate(candidates):
+                strategy = (
+                    resolved.get(candidate.strategy_ref) if resolved is not None else None
+                )
+                if strategy is None:
+                    try:
+                        strategy = self._resolve.resolve(candidate)
+                    except ResolveError as exc:
+                        raise RuntimeExecutionError(
+                            f"Resolve stage failed at candidate[{index}]: {exc}",
+                            cause=exc,
+                        ) from exc
+                    except Exception as exc:  # noqa: BLE001
+                        raise RuntimeExecutionError(
+                            f"Resolve stage failed unexpectedly at candidate[{index}]: {exc}",
+                            cause=exc,
+                        ) from exc
+                    if resolved is not None:
+                        resolved[candidate.strategy_ref] = strategy
+                resolved_candidates.append(candidate)
+                resolved_strategies.append(strategy)
+            span.output_count = len(resolved_candidates)
 
         return SearchResult(
             candidate=resolved_candidates[0],
@@ -8,7 +8,8 @@ from typing import Optional
 
 from membership import MembershipEngine, create_membership_engine
 from resolve import ResolveEngine, StrategyRepository, create_resolve_engine
-from search.runtime import SearchEnhancementOrchestrator
+from search.prepared import PreparedDatasetCache
+from search.runtime import PipelineTracer, SearchEnhancementOrchestrator
 
 from .engine import DefaultSearchRuntime
 from .exceptions import RuntimeConfigurationError
@@ -21,6 +22,8 @@ def create_runtime(
     membership: Optional[MembershipEngine] = None,
     resolve: Optional[ResolveEngine] = None,
     orchestrator: Optional[SearchEnhancementOrchestrator] = None,
+    prepared_cache: Optional[PreparedDatasetCache] = None,
+    tracer: Optional[PipelineTracer] = None,
 ) -> SearchRuntime:
     """
     Build a Search Runtime Host.
@@ -28,6 +31,8 @@ def create_runtime(
     Requires either ``resolve`` or ``repository`` (to create ResolveEngine).
     Membership defaults to create_membership_engine().
     Enhancement engines are wired through SearchEnhancementOrchestrator.
+    ``prepared_cache`` reuses Spatial Index / KDTree per dataset_identity.
+    ``tracer`` receives per-stage spans (also wired into a default orchestrator).
     """
     membership_engine = membership if membership is not None else create_membership_engine()
 
@@ -43,11 +48,13 @@ def create_runtime(
     pipeline = (
         orchestrator
         if orchestrator is not None
-        else SearchEnhancementOrchestrator(membership=membership_engine)
+        else SearchEnhancementOrchestrator(membership=membership_engine, tracer=tracer)
     )
 
     return DefaultSearchRuntime(
         membership=membership_engine,
         resolve=resolve_engine,
         orchestrator=pipeline,
+        prepared_cache=prepared_cache,
+        tracer=tracer,
     )
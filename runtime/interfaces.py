@@ -8,10 +8,11 @@ Orchestration only. No Membership / Resolve / Loader algorithm.
 
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable
+from typing import Protocol, Sequence, runtime_checkable
 
 from membership import MembershipQuery
 from models import PublishedDataset
+from search.prepared import PreparedDataset
 
 from .result import SearchResult
 
@@ -28,8 +29,16 @@ class SearchRuntime(Protocol):
 
     def execute(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
     ) -> SearchResult:
         """Host Enhancement pipeline then Resolve; return SearchResult."""
         ...
+
+    def execute_many(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        queries: Sequence[MembershipQuery],
+    ) -> tuple[SearchResult, ...]:
+        """Batch execute(); one SearchResult per query in input order."""
+        ...
@@ -0,0 +1,45 @@
+"""
+Search Runtime benchmark suite.
+
+Deterministic synthetic PublishedDatasets (1k … 1M records) measured through
+create_runtime(...).execute: build time, per-query latency, queries/sec,
+peak RSS and per-stage timings, plus per-instance bytes and construction
+rate of the slotted models vs __dict__-backed twins and package.json load
+throughput (MB/s) per loader decode path, written as JSON for run-to-run
+comparison.
+
+CLI: python -m search.benchmark --out bench.json
+"""
+
+from .corpus import generate_queries, generate_synthetic_dataset
+from .exceptions import BenchmarkError, InvalidBenchmarkConfig
+from .footprint import DEFAULT_FOOTPRINT_COUNT, dict_backed_twin, run_model_footprint
+from .load import DEFAULT_LOAD_SIZES, LOAD_VARIANTS, run_load_size, write_synthetic_package
+from .models import BenchmarkReport, LoadBenchmark, ModelFootprint, SizeBenchmark
+from .serialize import report_to_dict, report_to_json, write_report
+from .suite import DEFAULT_SIZES, peak_rss_bytes, run_benchmark, run_size
+
+__all__ = [
+    "BenchmarkError",
+    "BenchmarkReport",
+    "DEFAULT_FOOTPRINT_COUNT",
+    "DEFAULT_LOAD_SIZES",
+    "DEFAULT_SIZES",
+    "InvalidBenchmarkConfig",
+    "LOAD_VARIANTS",
+    "LoadBenchmark",
+    "ModelFootprint",
+    "SizeBenchmark",
+    "dict_backed_twin",
+    "generate_queries",
+    "generate_synthetic_dataset",
+    "peak_rss_bytes",
+    "report_to_dict",
+    "report_to_json",
+    "run_benchmark",
+    "run_load_size",
+    "run_model_footprint",
+    "run_size",
+    "write_report",
+    "write_synthetic_package",
+]
@@ -0,0 +1,58 @@
+"""CLI: python -m search.benchmark [--sizes N ...] [--queries N] [--out PATH]"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from .serialize import report_to_json, write_report
+from .footprint import DEFAULT_FOOTPRINT_COUNT
+from .load import DEFAULT_LOAD_SIZES
+from .suite import DEFAULT_QUERY_COUNT, DEFAULT_SIZES, DEFAULT_WARMUP, run_benchmark
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="search.benchmark",
+        description="Search Runtime benchmark over synthetic PublishedDatasets",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERY_COUNT)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--footprint-count",
+        type=int,
+        default=DEFAULT_FOOTPRINT_COUNT,
+        help="Instances per model for the footprint section (0 skips it)",
+    )
+    parser.add_argument(
+        "--load-sizes",
+        type=int,
+        nargs="*",
+        default=list(DEFAULT_LOAD_SIZES),
+        help="Package sizes (records) for the load throughput section (none skips it)",
+    )
+    parser.add_argument("--hit-ratio", type=float, default=0.8)
+    parser.add_argument("--out", type=Path, help="Write JSON here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        args.sizes,
+        query_count=args.queries,
+        seed=args.seed,
+        hit_ratio=args.hit_ratio,
+        warmup=args.warmup,
+        footprint_count=args.footprint_count,
+        load_sizes=args.load_sizes,
+    )
+    if args.out is not None:
+        write_report(report, args.out)
+    else:
+        sys.stdout.write(report_to_json(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
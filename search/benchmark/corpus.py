@@ -0,0 +1,111 @@
+"""
+Deterministic synthetic corpus for search benchmarks.
+
+Records spread over the 80x40 table (Spatial Index contract). Each record has
+a target plus cue / second sets clustered around their own anchor point, with
+set sizes drawn per record. Same (size, seed) always yields the same corpus.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import List
+
+from membership import MembershipQuery
+from models import DatasetIdentity, EnvelopeRecord, Point, PublishedDataset, StrategyRef
+from search.spatial_index.contract import GRID_HEIGHT, GRID_WIDTH
+
+from .exceptions import InvalidBenchmarkConfig
+
+# Coordinate resolution of generated points (table units).
+POINT_STEP = 0.5
+CUE_SET_SIZE = (2, 12)
+SECOND_SET_SIZE = (1, 6)
+# Cue / second points stay within this distance (per axis) of their anchor.
+SET_SPREAD = 4.0
+
+
+def _snap(value: float, limit: float) -> float:
+    value = round(value / POINT_STEP) * POINT_STEP
+    return min(max(value, 0.0), limit)
+
+
+def _table_point(rng: random.Random) -> Point:
+    return Point(
+        x=_snap(rng.uniform(0.0, GRID_WIDTH), GRID_WIDTH),
+        y=_snap(rng.uniform(0.0, GRID_HEIGHT), GRID_HEIGHT),
+    )
+
+
+def _point_set(rng: random.Random, size_range: tuple[int, int]) -> List[Point]:
+    anchor = _table_point(rng)
+    return [
+        Point(
+            x=_snap(anchor.x + rng.uniform(-SET_SPREAD, SET_SPREAD), GRID_WIDTH),
+            y=_snap(anchor.y + rng.uniform(-SET_SPREAD, SET_SPREAD), GRID_HEIGHT),
+        )
+        for _ in range(rng.randint(*size_range))
+    ]
+
+
+def generate_synthetic_dataset(size: int, *, seed: int = 0) -> PublishedDataset:
+    """Build a PublishedDataset of ``size`` EnvelopeRecords."""
+    if size <= 0:
+        raise InvalidBenchmarkConfig("size must be >= 1")
+    rng = random.Random(f"dataset:{seed}:{size}")
+    records = [
+        EnvelopeRecord(
+            strategy_ref=StrategyRef(f"bench.s{index}"),
+            target=_table_point(rng),
+            cue_set=_point_set(rng, CUE_SET_SIZE),
+            second_set=_point_set(rng, SECOND_SET_SIZE),
+        )
+        for index in range(size)
+    ]
+    return PublishedDataset(
+        records=records,
+        dataset_identity=DatasetIdentity(f"ds-bench-{size}-{seed}"),
+    )
+
+
+def generate_queries(
+    dataset: PublishedDataset,
+    count: int,
+    *,
+    seed: int = 0,
+    hit_ratio: float = 0.8,
+) -> List[MembershipQuery]:
+    """
+    ``count`` queries over ``dataset``.
+
+    A ``hit_ratio`` share copies target / cue / second from a random record
+    (full Membership match); the rest are random table points (usually misses).
+    """
+    if count <= 0:
+        raise InvalidBenchmarkConfig("query count must be >= 1")
+    if not 0.0 <= hit_ratio <= 1.0:
+        raise InvalidBenchmarkConfig("hit_ratio must be within [0, 1]")
+    records = dataset.records or []
+    if not records:
+        raise InvalidBenchmarkConfig("dataset has no records")
+    rng = random.Random(f"queries:{seed}:{len(records)}:{count}")
+    queries: List[MembershipQuery] = []
+    for _ in range(count):
+        if rng.random() < hit_ratio:
+            record = records[rng.randrange(len(records))]
+            queries.append(
+                MembershipQuery(
+                    cue=rng.choice(record.cue_set),
+                    target=record.target,
+                    second=rng.choice(record.second_set),
+                )
+            )
+        else:
+            queries.append(
+                MembershipQuery(
+                    cue=_table_point(rng),
+                    target=_table_point(rng),
+                    second=_table_point(rng),
+                )
+            )
+    return queries
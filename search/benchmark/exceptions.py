@@ -0,0 +1,11 @@
+"""Search benchmark exceptions."""
+
+from __future__ import annotations
+
+
+class BenchmarkError(Exception):
+    """Base error for the search benchmark suite."""
+
+
+class InvalidBenchmarkConfig(BenchmarkError):
+    """Benchmark sizes / query counts / corpus parameters are invalid."""
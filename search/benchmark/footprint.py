@@ -0,0 +1,137 @@
+"""
+Model footprint benchmark.
+
+Bytes per instance (tracemalloc) and construction rate for the slotted
+per-record / per-candidate models, each against a ``__dict__``-backed
+dataclass twin with the same fields and frozenness. Every instance of one
+model shares the same field values, so only the instance itself is counted.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import field as dataclass_field, fields, make_dataclass
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+from models import (
+    EnvelopeRecord,
+    MembershipCandidate,
+    MembershipFlags,
+    Point,
+    RecordIdentity,
+    StrategyRef,
+)
+from search.geometry.models import GeometryEvaluatedCandidate, MetricDetail
+from search.interpolation.models import RefinedCandidate, RefinementDetail
+from search.ranking.models import RankedCandidate, ScoreDetail
+from search.runtime.tracing import elapsed_ms, start_timer
+
+from .exceptions import InvalidBenchmarkConfig
+from .models import ModelFootprint
+
+DEFAULT_FOOTPRINT_COUNT = 5_000
+
+
+def _sample_kwargs() -> Dict[type, Mapping[str, Any]]:
+    """Constructor arguments per model, nested models built from the previous entries."""
+    ref, identity = StrategyRef("bench.s0"), RecordIdentity("bench.s0")
+    point = Point(x=1.5, y=3.0)
+    flags = MembershipFlags(target_match=True, cue_membership=True, second_membership=True)
+    candidate = MembershipCandidate(strategy_ref=ref, record_identity=identity, membership=flags)
+    ranked = RankedCandidate(
+        candidate_id=identity,
+        strategy_ref=ref,
+        score=1.0,
+        rank=1,
+        score_detail=ScoreDetail(model_id="bench", components={}, total=1.0),
+        candidate=candidate,
+        tie_break_key=identity,
+    )
+    refined = RefinedCandidate(
+        candidate_id=identity,
+        strategy_ref=ref,
+        score=1.0,
+        refined_score=1.0,
+        refinement_detail=RefinementDetail(
+            policy_id="bench", components={}, base_score=1.0, refined_score=1.0
+        ),
+        ranked=ranked,
+    )
+    return {
+        Point: {"x": 1.5, "y": 3.0},
+        EnvelopeRecord: {
+            "strategy_ref": ref,
+            "target": point,
+            "cue_set": [point],
+            "second_set": [point],
+        },
+        MembershipFlags: {"target_match": True, "cue_membership": True, "second_membership": True},
+        MembershipCandidate: {"strategy_ref": ref, "record_identity": identity, "membership": flags},
+        RankedCandidate: {field.name: getattr(ranked, field.name) for field in fields(ranked)},
+        RefinedCandidate: {field.name: getattr(refined, field.name) for field in fields(refined)},
+        GeometryEvaluatedCandidate: {
+            "candidate_id": identity,
+            "strategy_ref": ref,
+            "geometry_score": 1.0,
+            "metric_detail": MetricDetail(engine_id="bench", components={}, total=1.0, metrics=()),
+            "refined": refined,
+        },
+    }
+
+
+def dict_backed_twin(model: type) -> type:
+    """Plain (``__dict__``) dataclass with ``model``'s fields and frozenness."""
+    return make_dataclass(
+        model.__name__,
+        [
+            (
+                field.name,
+                field.type,
+                dataclass_field(default=field.default, default_factory=field.default_factory),
+            )
+            for field in fields(model)
+        ],
+        frozen=model.__dataclass_params__.frozen,  # type: ignore[attr-defined]
+    )
+
+
+def _instance_bytes(factory: Callable[..., object], kwargs: Mapping[str, Any], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = [factory(**kwargs) for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The holding list is not part of the instances.
+    return (after - before - sys.getsizeof(items)) / count
+
+
+def _constructs_per_sec(factory: Callable[..., object], kwargs: Mapping[str, Any], count: int) -> float:
+    started = start_timer()
+    for _ in range(count):
+        factory(**kwargs)
+    total_ms = elapsed_ms(started)
+    return count / (total_ms / 1000.0) if total_ms > 0 else 0.0
+
+
+def run_model_footprint(count: int = DEFAULT_FOOTPRINT_COUNT) -> Tuple[ModelFootprint, ...]:
+    """Measure every footprint model with ``count`` instances per variant."""
+    if count < 1:
+        raise InvalidBenchmarkConfig("footprint count must be >= 1")
+    results = []
+    for model, kwargs in _sample_kwargs().items():
+        twin = dict_backed_twin(model)
+        results.append(
+            ModelFootprint(
+                model=model.__name__,
+                instance_bytes=_instance_bytes(model, kwargs, count),
+                dict_instance_bytes=_instance_bytes(twin, kwargs, count),
+                constructs_per_sec=_constructs_per_sec(model, kwargs, count),
+                dict_constructs_per_sec=_constructs_per_sec(twin, kwargs, count),
+            )
+        )
+    return tuple(results)
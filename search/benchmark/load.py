@@ -0,0 +1,66 @@
+"""
+Package load throughput benchmark.
+
+Writes a synthetic corpus as package.json and times
+``create_package_loader(...).load_path`` once per decode path: the default
+json.loads + schema validation + model mapping, the single-pass fused
+decoder, and their streamed variants. Throughput is package.json MB/s
+(10**6 bytes per second).
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+from generator.published_dataset_builder.serialize import published_dataset_to_json
+from loader import create_package_loader
+from search.runtime.tracing import elapsed_ms, start_timer
+
+from .corpus import generate_synthetic_dataset
+from .models import LoadBenchmark
+
+DEFAULT_LOAD_SIZES = (10_000, 100_000)
+# Loader options per reported variant.
+LOAD_VARIANTS: Mapping[str, Mapping[str, Any]] = {
+    "json": {},
+    "fused": {"fused": True},
+    "stream": {"stream": True},
+    "stream+fused": {"stream": True, "fused": True},
+}
+
+
+def write_synthetic_package(size: int, path: Path, *, seed: int = 0) -> Path:
+    """Write the synthetic corpus of ``size`` records as Package JSON at ``path``."""
+    dataset = generate_synthetic_dataset(size, seed=seed)
+    package = {
+        "packageIdentity": f"bench.pkg.{size}",
+        "datasetIdentity": f"bench.ds.{size}",
+        "dataset": published_dataset_to_json(dataset.records),
+    }
+    path.write_text(json.dumps(package), encoding="utf-8")
+    return path
+
+
+def run_load_size(size: int, *, seed: int = 0) -> LoadBenchmark:
+    """Load one synthetic package of ``size`` records through every variant."""
+    with tempfile.TemporaryDirectory(prefix="search-bench-") as tmp:
+        path = write_synthetic_package(size, Path(tmp) / "package.json", seed=seed)
+        package_bytes = path.stat().st_size
+        load_ms: Dict[str, float] = {}
+        for variant, options in LOAD_VARIANTS.items():
+            loader = create_package_loader(**options)
+            started = start_timer()
+            loader.load_path(path)
+            load_ms[variant] = elapsed_ms(started)
+    return LoadBenchmark(
+        record_count=size,
+        package_bytes=package_bytes,
+        load_ms=load_ms,
+        mb_per_sec={
+            variant: package_bytes / 1e6 / (total_ms / 1000.0) if total_ms > 0 else 0.0
+            for variant, total_ms in load_ms.items()
+        },
+    )
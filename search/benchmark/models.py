@@ -0,0 +1,85 @@
+"""Search benchmark result models."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping, Optional, Tuple
+
+from search.runtime.tracing import StageStats
+
+
+@dataclass(frozen=True)
+class PostingBenchmark:
+    """Spatial Index cost for one grid / posting list representation."""
+
+    postings: str
+    grid: str
+    build_ms: float
+    # Posting container bytes (cell maps + sets / bitmaps; shared ints excluded).
+    memory_bytes: int
+    # Leaf cells over all three axes, and the fullest one (occupancy).
+    cell_count: int
+    max_cell_records: int
+    # Spatial Index query: cell lookup + three-way intersection + ordinals.
+    query: StageStats
+
+
+@dataclass(frozen=True)
+class SizeBenchmark:
+    """Measurements for one synthetic corpus size."""
+
+    record_count: int
+    query_count: int
+    # Queries whose SearchResult has at least one candidate.
+    hit_count: int
+    # Corpus generation (not part of search; reported for context).
+    generate_ms: float
+    # Spatial Index / KDTree / Membership Index build (prepare_dataset).
+    build_ms: float
+    # End-to-end create_runtime(...).execute latency.
+    execute: StageStats
+    queries_per_sec: float
+    # Process peak RSS after this size ran (None when unavailable).
+    peak_rss_bytes: Optional[int]
+    stages: Mapping[str, StageStats]
+    # Spatial Index per "grid/postings" variant (e.g. "adaptive/bitmap").
+    postings: Mapping[str, PostingBenchmark] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ModelFootprint:
+    """Per-instance cost of one slotted model vs its ``__dict__``-backed twin."""
+
+    model: str
+    # tracemalloc bytes per instance (shared field values excluded).
+    instance_bytes: float
+    dict_instance_bytes: float
+    # Construction (allocation) rate.
+    constructs_per_sec: float
+    dict_constructs_per_sec: float
+
+
+@dataclass(frozen=True)
+class LoadBenchmark:
+    """package.json load_path() cost for one synthetic corpus size."""
+
+    record_count: int
+    package_bytes: int
+    # Per loader variant ("json", "fused", "stream", "stream+fused").
+    load_ms: Mapping[str, float]
+    # package.json MB (10**6 bytes) per second.
+    mb_per_sec: Mapping[str, float]
+
+
+@dataclass(frozen=True)
+class BenchmarkReport:
+    """One benchmark run over several corpus sizes."""
+
+    created_at: str
+    seed: int
+    hit_ratio: float
+    python_version: str
+    platform: str
+    sizes: Tuple[SizeBenchmark, ...]
+    models: Tuple[ModelFootprint, ...] = ()
+    loads: Tuple[LoadBenchmark, ...] = ()
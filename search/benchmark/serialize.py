@@ -0,0 +1,108 @@
+"""JSON serialization for benchmark reports (comparable across runs)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from search.runtime.tracing import StageStats
+
+from .models import (
+    BenchmarkReport,
+    LoadBenchmark,
+    ModelFootprint,
+    PostingBenchmark,
+    SizeBenchmark,
+)
+
+REPORT_FORMAT = "search-benchmark/4"
+
+
+def _stage_to_dict(stats: StageStats) -> Dict[str, Any]:
+    return {
+        "count": stats.count,
+        "p50Ms": stats.p50_ms,
+        "p95Ms": stats.p95_ms,
+        "p99Ms": stats.p99_ms,
+        "meanMs": stats.mean_ms,
+        "inputTotal": stats.input_total,
+        "outputTotal": stats.output_total,
+        "selectivity": stats.selectivity,
+        "prefilterHits": stats.prefilter_hits,
+        "prefilterMisses": stats.prefilter_misses,
+    }
+
+
+def _postings_to_dict(item: PostingBenchmark) -> Dict[str, Any]:
+    return {
+        "grid": item.grid,
+        "postings": item.postings,
+        "buildMs": item.build_ms,
+        "memoryBytes": item.memory_bytes,
+        "cellCount": item.cell_count,
+        "maxCellRecords": item.max_cell_records,
+        "query": _stage_to_dict(item.query),
+    }
+
+
+def _size_to_dict(item: SizeBenchmark) -> Dict[str, Any]:
+    return {
+        "recordCount": item.record_count,
+        "queryCount": item.query_count,
+        "hitCount": item.hit_count,
+        "generateMs": item.generate_ms,
+        "buildMs": item.build_ms,
+        "execute": _stage_to_dict(item.execute),
+        "queriesPerSec": item.queries_per_sec,
+        "peakRssBytes": item.peak_rss_bytes,
+        "stages": {name: _stage_to_dict(stats) for name, stats in item.stages.items()},
+        "spatialIndex": {
+            name: _postings_to_dict(postings) for name, postings in item.postings.items()
+        },
+    }
+
+
+def _footprint_to_dict(item: ModelFootprint) -> Dict[str, Any]:
+    return {
+        "model": item.model,
+        "instanceBytes": item.instance_bytes,
+        "dictInstanceBytes": item.dict_instance_bytes,
+        "constructsPerSec": item.constructs_per_sec,
+        "dictConstructsPerSec": item.dict_constructs_per_sec,
+    }
+
+
+def _load_to_dict(item: LoadBenchmark) -> Dict[str, Any]:
+    return {
+        "recordCount": item.record_count,
+        "packageBytes": item.package_bytes,
+        "loadMs": dict(item.load_ms),
+        "mbPerSec": dict(item.mb_per_sec),
+    }
+
+
+def report_to_dict(report: BenchmarkReport) -> Dict[str, Any]:
+    return {
+        "format": REPORT_FORMAT,
+        "createdAt": report.created_at,
+        "seed": report.seed,
+        "hitRatio": report.hit_ratio,
+        "pythonVersion": report.python_version,
+        "platform": report.platform,
+        "sizes": [_size_to_dict(item) for item in report.sizes],
+        "models": [_footprint_to_dict(item) for item in report.models],
+        "loads": [_load_to_dict(item) for item in report.loads],
+    }
+
+
+def report_to_json(report: BenchmarkReport) -> str:
+    return json.dumps(report_to_dict(report), indent=2, ensure_ascii=False) + "\n"
+
+
+def write_report(report: BenchmarkReport, path: Path) -> Path:
+    """Write the report as UTF-8 JSON (parent directories are created)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report_to_json(report), encoding="utf-8")
+    return path
@@ -0,0 +1,218 @@
+"""
+Search benchmark runner.
+
+For each corpus size: generate a synthetic PublishedDataset, prepare its
+indexes once (build time), then run ``create_runtime(...).execute`` per query
+with a StageStatsCollector attached for per-stage timings.
+"""
+
+from __future__ import annotations
+
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence
+
+from membership import MembershipQuery
+from models import PublishedDataset
+from resolve import Strategy, create_memory_repository
+from runtime import create_runtime
+from search.prepared import prepare_dataset
+from search.runtime.tracing import StageSpan, StageStatsCollector, elapsed_ms, start_timer
+from search.spatial_index import (
+    OrdinalBitmap,
+    SpatialIndex,
+    SpatialQuery,
+    create_spatial_index_builder,
+)
+from search.spatial_index.contract import SPATIAL_GRIDS, SPATIAL_POSTINGS
+
+from .corpus import generate_queries, generate_synthetic_dataset
+from .exceptions import InvalidBenchmarkConfig
+from .footprint import DEFAULT_FOOTPRINT_COUNT, run_model_footprint
+from .load import DEFAULT_LOAD_SIZES, run_load_size
+from .models import BenchmarkReport, PostingBenchmark, SizeBenchmark
+
+try:  # POSIX only
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_QUERY_COUNT = 1_000
+DEFAULT_WARMUP = 20
+STAGE_EXECUTE = "execute"
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Process peak resident set size (None when the platform has no getrusage)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def posting_memory_bytes(index: SpatialIndex) -> int:
+    """Approximate bytes held by the Spatial Index cell maps and posting lists."""
+    total = 0
+    for cells in (index.target_cells, index.cue_cells, index.second_cells):
+        total += sys.getsizeof(cells)
+        for postings in cells.values():
+            if isinstance(postings, OrdinalBitmap):
+                total += sys.getsizeof(postings.chunks)
+                total += sum(sys.getsizeof(bits) for bits in postings.chunks.values())
+            else:
+                total += sys.getsizeof(postings)
+    return total
+
+
+def _posting_benchmarks(
+    dataset: PublishedDataset,
+    queries: Sequence[MembershipQuery],
+) -> Dict[str, PostingBenchmark]:
+    results: Dict[str, PostingBenchmark] = {}
+    for grid, postings in ((g, p) for g in SPATIAL_GRIDS for p in SPATIAL_POSTINGS):
+        variant = f"{grid}/{postings}"
+        builder = create_spatial_index_builder(postings=postings, grid=grid)
+        started = start_timer()
+        index = builder.build(dataset)
+        build_time = elapsed_ms(started)
+        occupancy = builder.occupancy(index)
+        axes = (occupancy.target, occupancy.cue, occupancy.second)
+
+        collector = StageStatsCollector(max_samples=len(queries))
+        for query in queries:
+            started = start_timer()
+            result = builder.query(
+                index, SpatialQuery(cue=query.cue, target=query.target, second=query.second)
+            )
+            collector.record(
+                StageSpan(
+                    stage=variant,
+                    elapsed_ms=elapsed_ms(started),
+                    input_count=index.record_count,
+                    output_count=len(result.candidate_ordinals),
+                )
+            )
+        stats = collector.stats(variant)
+        assert stats is not None
+        results[variant] = PostingBenchmark(
+            postings=postings,
+            grid=grid,
+            build_ms=build_time,
+            memory_bytes=posting_memory_bytes(index),
+            cell_count=sum(axis.cell_count for axis in axes),
+            max_cell_records=max(axis.max_records for axis in axes),
+            query=stats,
+        )
+    return results
+
+
+def run_size(
+    size: int,
+    *,
+    query_count: int = DEFAULT_QUERY_COUNT,
+    seed: int = 0,
+    hit_ratio: float = 0.8,
+    warmup: int = DEFAULT_WARMUP,
+) -> SizeBenchmark:
+    """Benchmark one corpus size."""
+    if warmup < 0:
+        raise InvalidBenchmarkConfig("warmup must be >= 0")
+
+    started = start_timer()
+    dataset = generate_synthetic_dataset(size, seed=seed)
+    queries = generate_queries(dataset, query_count, seed=seed, hit_ratio=hit_ratio)
+    generate_time = elapsed_ms(started)
+
+    started = start_timer()
+    prepared = prepare_dataset(dataset)
+    build_time = elapsed_ms(started)
+
+    repository = create_memory_repository(
+        {record.strategy_ref: Strategy(strategy_ref=record.strategy_ref) for record in dataset.records}
+    )
+    stage_collector = StageStatsCollector(max_samples=max(query_count, 1) * 4)
+    runtime = create_runtime(repository=repository, tracer=stage_collector)
+
+    for query in queries[:warmup]:
+        runtime.execute(prepared, query)
+    stage_collector.reset()
+
+    execute_collector = StageStatsCollector(max_samples=query_count)
+    hit_count = 0
+    total_started = start_timer()
+    for query in queries:
+        started = start_timer()
+        result = runtime.execute(prepared, query)
+        execute_collector.record(
+            StageSpan(
+                stage=STAGE_EXECUTE,
+                elapsed_ms=elapsed_ms(started),
+                input_count=len(prepared.records),
+                output_count=len(result.candidates),
+            )
+        )
+        if result.candidates:
+            hit_count += 1
+    total_ms = elapsed_ms(total_started)
+
+    execute_stats = execute_collector.stats(STAGE_EXECUTE)
+    assert execute_stats is not None
+    return SizeBenchmark(
+        record_count=len(dataset.records),
+        query_count=query_count,
+        hit_count=hit_count,
+        generate_ms=generate_time,
+        build_ms=build_time,
+        execute=execute_stats,
+        queries_per_sec=query_count / (total_ms / 1000.0) if total_ms > 0 else 0.0,
+        peak_rss_bytes=peak_rss_bytes(),
+        stages=dict(stage_collector.summary()),
+        postings=_posting_benchmarks(dataset, queries),
+    )
+
+
+def run_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    *,
+    query_count: int = DEFAULT_QUERY_COUNT,
+    seed: int = 0,
+    hit_ratio: float = 0.8,
+    warmup: int = DEFAULT_WARMUP,
+    footprint_count: int = DEFAULT_FOOTPRINT_COUNT,
+    load_sizes: Sequence[int] = DEFAULT_LOAD_SIZES,
+) -> BenchmarkReport:
+    """
+    Benchmark every size in order, then the model footprints, then package
+    load throughput for every ``load_sizes`` entry.
+
+    Sizes run in one process, so ``peak_rss_bytes`` is monotonic; run one
+    size per process to isolate its memory peak. ``footprint_count=0``
+    skips the model footprint section; empty ``load_sizes`` skips the load
+    section.
+    """
+    sizes = tuple(sizes)
+    if not sizes:
+        raise InvalidBenchmarkConfig("at least one size is required")
+    results = tuple(
+        run_size(
+            size,
+            query_count=query_count,
+            seed=seed,
+            hit_ratio=hit_ratio,
+            warmup=warmup,
+        )
+        for size in sizes
+    )
+    return BenchmarkReport(
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        seed=seed,
+        hit_ratio=hit_ratio,
+        python_version=platform.python_version(),
+        platform=platform.platform(),
+        sizes=results,
+        models=run_model_footprint(footprint_count) if footprint_count else (),
+        loads=tuple(run_load_size(size, seed=seed) for size in load_sizes),
+    )
@@ -18,7 +18,7 @@ class GeometrySearchQuery:
     second: Point
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GeometryMetric:
     """One independent geometry quality metric."""
 
@@ -27,7 +27,7 @@ class GeometryMetric:
     detail: Mapping[str, float]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MetricDetail:
     """
     Aggregated geometry metric breakdown.
@@ -42,7 +42,7 @@ class MetricDetail:
     metrics: Tuple[GeometryMetric, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GeometryEvaluatedCandidate:
     """RefinedCandidate after Geometry Metrics evaluation."""
 
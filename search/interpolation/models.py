@@ -9,7 +9,7 @@ from models import RecordIdentity, StrategyRef
 from search.ranking.models import RankedCandidate
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RefinementDetail:
     """
     Deterministic refinement breakdown.
@@ -24,7 +24,7 @@ class RefinementDetail:
     refined_score: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RefinedCandidate:
     """RankedCandidate after Interpolation refinement."""
 
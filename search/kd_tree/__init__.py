@@ -1,16 +1,31 @@
 """
 KDTree layer for envelope candidate retrieval.
 
-Consumes Spatial Index candidate ids and PublishedDataset records,
-then returns deterministic nearest shortlists only.
+Consumes Spatial Index candidate ids (or record ordinals) and PublishedDataset records,
+then returns deterministic nearest shortlists (top-N, batched top-N, or within a radius)
+only; search_approximate trades exactness for bounded work.
 """
 
 from .builder import DefaultKDTreeBuilder
-from .contract import KD_TREE_DIMENSIONS
+from .contract import (
+    KD_TREE_AXIS_WEIGHTS_UNIT,
+    KD_TREE_DIMENSIONS,
+    KD_TREE_ENCODING_CENTROID,
+    KD_TREE_ENCODING_MEMBERS,
+    KD_TREE_ENCODINGS,
+    KD_TREE_LAYOUT_IMPLICIT,
+    KD_TREE_LAYOUT_LINKED,
+    KD_TREE_LEAF_SIZE,
+    KD_TREE_REBALANCE_THRESHOLD,
+    KD_TREE_TABLE_EXTENT,
+)
 from .encoding import (
+    encode_columnar_to_vector_item,
     encode_query_to_vector,
+    encode_record_to_member_vectors,
     encode_record_to_vector,
     encode_record_to_vector_item,
+    table_axis_weights,
 )
 from .exceptions import (
     InvalidKDTreeCandidate,
@@ -21,7 +36,9 @@ from .exceptions import (
 )
 from .factory import create_kd_tree_builder, create_kd_tree_query
 from .models import (
+    ApproximateShortlist,
     EncodedCandidate,
+    ImplicitKDTree,
     KDTreeIndex,
     KDTreeNode,
     KDTreeQueryInput,
@@ -30,9 +47,11 @@ from .models import (
 from .query import DefaultKDTreeQuery
 
 __all__ = [
+    "ApproximateShortlist",
     "DefaultKDTreeBuilder",
     "DefaultKDTreeQuery",
     "EncodedCandidate",
+    "ImplicitKDTree",
     "InvalidKDTreeCandidate",
     "InvalidKDTreeDataset",
     "InvalidKDTreeQuery",
@@ -41,11 +60,23 @@ __all__ = [
     "KDTreeIndex",
     "KDTreeNode",
     "KDTreeQueryInput",
+    "KD_TREE_AXIS_WEIGHTS_UNIT",
     "KD_TREE_DIMENSIONS",
+    "KD_TREE_ENCODINGS",
+    "KD_TREE_ENCODING_CENTROID",
+    "KD_TREE_ENCODING_MEMBERS",
+    "KD_TREE_LAYOUT_IMPLICIT",
+    "KD_TREE_LAYOUT_LINKED",
+    "KD_TREE_LEAF_SIZE",
+    "KD_TREE_REBALANCE_THRESHOLD",
+    "KD_TREE_TABLE_EXTENT",
     "NearestCandidate",
     "create_kd_tree_builder",
     "create_kd_tree_query",
+    "encode_columnar_to_vector_item",
     "encode_query_to_vector",
+    "encode_record_to_member_vectors",
     "encode_record_to_vector",
     "encode_record_to_vector_item",
+    "table_axis_weights",
 ]
@@ -2,42 +2,156 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+import math
+from array import array
+from bisect import insort
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
-from models import EnvelopeRecord, PublishedDataset, RecordIdentity
+from models import (
+    ColumnarDataset,
+    EnvelopeRecord,
+    PublishedDataset,
+    RecordIdentity,
+    VerifiedDataset,
+)
 
-from .contract import KD_TREE_DIMENSIONS
-from .encoding import encode_record_to_vector_item
+from .contract import (
+    KD_TREE_AXIS_WEIGHTS_UNIT,
+    KD_TREE_DIMENSIONS,
+    KD_TREE_ENCODING_CENTROID,
+    KD_TREE_ENCODING_MEMBERS,
+    KD_TREE_ENCODINGS,
+    KD_TREE_LAYOUT_IMPLICIT,
+    KD_TREE_LAYOUTS,
+    KD_TREE_LEAF_SIZE,
+    KD_TREE_REBALANCE_THRESHOLD,
+)
+from .encoding import encode_columnar_to_vector_item, encode_record_to_vector_item
 from .exceptions import InvalidKDTreeCandidate, InvalidKDTreeDataset, KDTreeBuildFailure
-from .models import EncodedCandidate, KDTreeIndex, KDTreeNode
+from .implicit import build_implicit_tree
+from .linked import build_linked_tree, insert_linked, remove_linked
+from .models import EncodedCandidate, ImplicitKDTree, KDTreeIndex, KDTreeNode, Vector6D
+
+_candidate_id = attrgetter("candidate_id")
 
 
 def _record_identity(record: EnvelopeRecord) -> RecordIdentity:
     return RecordIdentity(str(record.strategy_ref))
 
 
-def _build_node(items: Sequence[EncodedCandidate], depth: int) -> KDTreeNode | None:
-    if not items:
-        return None
+def _axis_weights(values: Sequence[float]) -> Vector6D:
+    weights = tuple(float(value) for value in values)
+    if len(weights) != KD_TREE_DIMENSIONS:
+        raise ValueError(f"axis_weights must have {KD_TREE_DIMENSIONS} values")
+    if not all(0.0 <= weight < math.inf for weight in weights) or not any(weights):
+        raise ValueError("axis_weights must be finite, >= 0 and not all 0")
+    return weights  # type: ignore[return-value]
 
-    axis = depth % KD_TREE_DIMENSIONS
-    sorted_items = sorted(
-        items,
-        key=lambda item: (item.vector[axis], str(item.candidate_id)),
-    )
-    mid = len(sorted_items) // 2
-    pivot = sorted_items[mid]
-
-    return KDTreeNode(
-        item=pivot,
-        axis=axis,
-        left=_build_node(sorted_items[:mid], depth + 1),
-        right=_build_node(sorted_items[mid + 1 :], depth + 1),
+
+def _ordinals_by_id(
+    dataset: PublishedDataset,
+    scope: Sequence[RecordIdentity],
+) -> Mapping[RecordIdentity, Tuple[int, ...]]:
+    """Record ordinals per scoped identity (the last record per id is encoded)."""
+    if isinstance(dataset, VerifiedDataset):
+        # Ordinal table: O(scope) lookups, no corpus walk.
+        ordinals = dataset.record_ordinals
+        return {
+            candidate_id: ordinals[candidate_id]
+            for candidate_id in scope
+            if candidate_id in ordinals
+        }
+    wanted = set(scope)
+    ordinals_by_id: dict[RecordIdentity, list[int]] = {}
+    for index, record in enumerate(dataset.records or []):
+        if not isinstance(record, EnvelopeRecord):
+            raise InvalidKDTreeDataset(f"records[{index}] is not an EnvelopeRecord")
+        record_id = _record_identity(record)
+        if record_id in wanted:
+            ordinals_by_id.setdefault(record_id, []).append(index)
+    return {record_id: tuple(items) for record_id, items in ordinals_by_id.items()}
+
+
+def _encode_candidate(
+    dataset: PublishedDataset,
+    candidate_id: RecordIdentity,
+    ordinals: Sequence[int],
+    encoding: str,
+) -> EncodedCandidate:
+    """Encode the last record of ``ordinals`` (columns read in place when columnar)."""
+    if isinstance(dataset, ColumnarDataset):
+        return encode_columnar_to_vector_item(
+            candidate_id, dataset, ordinals[-1], ordinals, encoding=encoding
+        )
+    return encode_record_to_vector_item(
+        candidate_id, dataset.records[ordinals[-1]], ordinals, encoding=encoding
     )
 
 
 class DefaultKDTreeBuilder:
-    """Build KDTree from Spatial Index candidate scope and PublishedDataset."""
+    """
+    Build KDTree from Spatial Index candidate scope and PublishedDataset.
+
+    ``layout`` selects the implicit array-backed tree (default) or the
+    linked KDTreeNode tree; both answer queries identically. Ties at the
+    N-th distance keep the smallest candidate_ids, in both layouts (the
+    original linked walk could keep a larger id there instead).
+    ``rebalance_threshold`` bounds linked-tree skew after update();
+    removed candidates stay as tombstones until a rebuild reclaims them.
+    ``encoding="members"`` indexes one vector per (cue, second) member pair
+    and ranks records by their nearest pair (implicit layout only).
+    ``axis_weights`` scale each squared vector-axis difference (see
+    table_axis_weights()); the index carries them to every query.
+    """
+
+    def __init__(
+        self,
+        *,
+        layout: str = KD_TREE_LAYOUT_IMPLICIT,
+        leaf_size: int = KD_TREE_LEAF_SIZE,
+        rebalance_threshold: float = KD_TREE_REBALANCE_THRESHOLD,
+        encoding: str = KD_TREE_ENCODING_CENTROID,
+        axis_weights: Sequence[float] = KD_TREE_AXIS_WEIGHTS_UNIT,
+    ) -> None:
+        if layout not in KD_TREE_LAYOUTS:
+            raise ValueError(f"unknown KDTree layout: {layout}")
+        if encoding not in KD_TREE_ENCODINGS:
+            raise ValueError(f"unknown KDTree encoding: {encoding}")
+        if encoding == KD_TREE_ENCODING_MEMBERS and layout != KD_TREE_LAYOUT_IMPLICIT:
+            raise ValueError("members encoding requires the implicit layout")
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be >= 1")
+        if not 0.5 <= rebalance_threshold < 1.0:
+            raise ValueError("rebalance_threshold must be in [0.5, 1)")
+        self._layout = layout
+        self._leaf_size = leaf_size
+        self._rebalance_threshold = rebalance_threshold
+        self._encoding = encoding
+        self._axis_weights = _axis_weights(axis_weights)
+
+    @property
+    def layout(self) -> str:
+        return self._layout
+
+    @property
+    def encoding(self) -> str:
+        return self._encoding
+
+    @property
+    def axis_weights(self) -> Vector6D:
+        return self._axis_weights
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Build options as JSON values (recorded in index sidecars)."""
+        return {
+            "layout": self._layout,
+            "leafSize": self._leaf_size,
+            "rebalanceThreshold": self._rebalance_threshold,
+            "encoding": self._encoding,
+            "axisWeights": list(self._axis_weights),
+        }
 
     def build(
         self,
@@ -53,29 +167,177 @@ class DefaultKDTreeBuilder:
 
         try:
             scope = tuple(sorted({RecordIdentity(str(candidate_id)) for candidate_id in candidate_ids}))
+            ordinals_by_id = _ordinals_by_id(dataset, scope)
             records = dataset.records or []
-            records_by_id: dict[RecordIdentity, EnvelopeRecord] = {}
-            for index, record in enumerate(records):
-                if not isinstance(record, EnvelopeRecord):
-                    raise InvalidKDTreeDataset(
-                        f"records[{index}] is not an EnvelopeRecord"
-                    )
-                records_by_id[_record_identity(record)] = record
 
             encoded: list[EncodedCandidate] = []
-            for candidate_id in scope:
-                record = records_by_id.get(candidate_id)
-                if record is None:
+            ordinal_positions = array("q", [-1]) * len(records)
+            for position, candidate_id in enumerate(scope):
+                ordinals = ordinals_by_id.get(candidate_id)
+                if not ordinals:
                     raise InvalidKDTreeCandidate(
                         f"candidate id not found in dataset: {candidate_id}"
                     )
-                encoded.append(encode_record_to_vector_item(candidate_id, record))
+                encoded.append(
+                    _encode_candidate(dataset, candidate_id, ordinals, self._encoding)
+                )
+                for ordinal in ordinals:
+                    ordinal_positions[ordinal] = position
 
             candidates = tuple(encoded)
+            root: KDTreeNode | ImplicitKDTree | None
+            if not candidates:
+                root = None
+            elif self._layout == KD_TREE_LAYOUT_IMPLICIT:
+                root = build_implicit_tree(
+                    candidates,
+                    leaf_size=self._leaf_size,
+                    multi_point=self._encoding == KD_TREE_ENCODING_MEMBERS,
+                )
+            else:
+                root = build_linked_tree(candidates)
             return KDTreeIndex(
-                root=_build_node(candidates, 0),
+                root=root,
                 candidates=candidates,
                 dimensions=KD_TREE_DIMENSIONS,
+                positions={
+                    item.candidate_id: position
+                    for position, item in enumerate(candidates)
+                },
+                ordinal_positions=ordinal_positions,
+                encoding=self._encoding,
+                axis_weights=self._axis_weights,
+            )
+        except (InvalidKDTreeCandidate, InvalidKDTreeDataset):
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise KDTreeBuildFailure(str(exc), cause=exc) from exc
+
+    def update(
+        self,
+        index: KDTreeIndex,
+        dataset: PublishedDataset,
+        previous: Mapping[int, Optional[EnvelopeRecord]],
+        *,
+        record_positions: Mapping[RecordIdentity, Sequence[int]] | None = None,
+    ) -> KDTreeIndex:
+        """
+        Apply record edits to ``index`` without re-encoding the corpus.
+
+        ``dataset`` / ``previous`` follow DefaultSpatialIndexBuilder.update.
+        Every identity at a changed ordinal is re-encoded from its last
+        record and joins the scope; identities left without records are
+        dropped. The linked layout copies one root path per changed
+        candidate and rebuilds a subtree only once it is out of balance; the
+        implicit layout re-lays its arrays from the encoded candidates.
+        Queries equal a build over the updated scope. ``record_positions``
+        (identity -> ordinals in the edited dataset) spares plain
+        PublishedDatasets a records scan.
+        """
+        if index is None or not isinstance(index, KDTreeIndex):
+            raise InvalidKDTreeDataset("KDTreeIndex is required")
+        if dataset is None or not isinstance(dataset, PublishedDataset):
+            raise InvalidKDTreeDataset("dataset must be a PublishedDataset model")
+
+        records = dataset.records or []
+        count = len(records)
+        affected: Set[RecordIdentity] = set()
+        for ordinal, old in previous.items():
+            if old is not None:
+                affected.add(_record_identity(old))
+            if ordinal < count:
+                record = records[ordinal]
+                if not isinstance(record, EnvelopeRecord):
+                    raise InvalidKDTreeDataset(f"records[{ordinal}] is not an EnvelopeRecord")
+                affected.add(_record_identity(record))
+
+        try:
+            scope = tuple(sorted(affected))
+            if record_positions is not None:
+                ordinals_by_id: Mapping[RecordIdentity, Sequence[int]] = {
+                    candidate_id: record_positions[candidate_id]
+                    for candidate_id in scope
+                    if record_positions.get(candidate_id)
+                }
+            else:
+                ordinals_by_id = _ordinals_by_id(dataset, scope)
+
+            positions = index.positions or {
+                item.candidate_id: position for position, item in enumerate(index.candidates)
+            }
+            candidates = list(index.candidates)
+            removed: List[EncodedCandidate] = []
+            added: List[EncodedCandidate] = []
+            gone: List[int] = []
+            joined: List[EncodedCandidate] = []
+            for candidate_id in scope:
+                position = positions.get(candidate_id)
+                ordinals = ordinals_by_id.get(candidate_id)
+                if position is not None:
+                    removed.append(candidates[position])
+                if ordinals:
+                    item = _encode_candidate(dataset, candidate_id, ordinals, index.encoding)
+                    added.append(item)
+                    if position is None:
+                        joined.append(item)
+                    else:
+                        candidates[position] = item
+                elif position is not None:
+                    gone.append(position)
+
+            if gone or joined:
+                # Candidate ids left or joined: keep id order, renumber positions.
+                for position in sorted(gone, reverse=True):
+                    del candidates[position]
+                for item in joined:
+                    insort(candidates, item, key=_candidate_id)
+                positions = dict(zip(map(_candidate_id, candidates), range(len(candidates))))
+                remap = list(map(positions.get, map(_candidate_id, index.candidates)))
+                for position in gone:
+                    remap[position] = -1
+                remap.append(-1)  # remap[-1]: "not indexed" stays -1
+                ordinal_positions = array(
+                    "q", map(remap.__getitem__, index.ordinal_positions[:count])
+                )
+            else:
+                ordinal_positions = array("q", index.ordinal_positions[:count])
+            ordinal_positions.extend([-1] * (count - len(ordinal_positions)))
+            for ordinal in previous:
+                if ordinal < count:
+                    ordinal_positions[ordinal] = positions.get(
+                        _record_identity(records[ordinal]), -1
+                    )
+
+            root: KDTreeNode | ImplicitKDTree | None = index.root
+            frozen = tuple(candidates)
+            if not frozen:
+                root = None
+            elif (
+                isinstance(root, ImplicitKDTree)
+                or index.encoding == KD_TREE_ENCODING_MEMBERS
+                or (root is None and self._layout == KD_TREE_LAYOUT_IMPLICIT)
+            ):
+                leaf_size = root.leaf_size if root is not None else self._leaf_size
+                root = build_implicit_tree(
+                    frozen,
+                    leaf_size=leaf_size,
+                    multi_point=index.encoding == KD_TREE_ENCODING_MEMBERS,
+                )
+            else:
+                threshold = self._rebalance_threshold
+                for item in removed:
+                    root = remove_linked(root, item, threshold=threshold)
+                for item in added:
+                    root = insert_linked(root, item, threshold=threshold)
+
+            return KDTreeIndex(
+                root=root,
+                candidates=frozen,
+                dimensions=KD_TREE_DIMENSIONS,
+                positions=positions,
+                ordinal_positions=ordinal_positions,
+                encoding=index.encoding,
+                axis_weights=index.axis_weights,
             )
         except (InvalidKDTreeCandidate, InvalidKDTreeDataset):
             raise
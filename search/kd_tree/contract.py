@@ -3,3 +3,30 @@
 from __future__ import annotations
 
 KD_TREE_DIMENSIONS = 6
+
+# Tree layouts behind create_kd_tree_builder().
+KD_TREE_LAYOUT_IMPLICIT = "implicit"
+KD_TREE_LAYOUT_LINKED = "linked"
+KD_TREE_LAYOUTS = (KD_TREE_LAYOUT_IMPLICIT, KD_TREE_LAYOUT_LINKED)
+
+# Implicit layout: ranges at or below this size are scanned as one leaf bucket.
+KD_TREE_LEAF_SIZE = 8
+
+# Linked layout updates: a subtree is rebuilt once one child holds more than
+# this fraction of its nodes (scapegoat-style lazy rebalancing).
+KD_TREE_REBALANCE_THRESHOLD = 0.75
+
+# Record encodings behind create_kd_tree_builder(): one centroid vector per
+# record, or one vector per (cue member, second member) pair ranked by the
+# nearest pair (set-aware distance).
+KD_TREE_ENCODING_CENTROID = "centroid"
+KD_TREE_ENCODING_MEMBERS = "members"
+KD_TREE_ENCODINGS = (KD_TREE_ENCODING_CENTROID, KD_TREE_ENCODING_MEMBERS)
+
+# Per-axis weights on squared coordinate differences over (cue.x, cue.y,
+# target.x, target.y, second.x, second.y): distance_sq = sum(w * (q - v) ** 2).
+# Unit weights are plain Euclidean distance (the default).
+KD_TREE_AXIS_WEIGHTS_UNIT = (1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+# (x, y) table extent (80x40 grid) used by table_axis_weights() to normalise
+# differences so the long x axis does not dominate.
+KD_TREE_TABLE_EXTENT = (80.0, 40.0)
@@ -4,13 +4,22 @@ Point encoding for KDTree candidate retrieval.
 Contract:
 - Query is encoded as (cue.x, cue.y, target.x, target.y, second.x, second.y)
 - EnvelopeRecord is encoded with target plus cue/second set centroids
+  ("centroid"), or additionally with one vector per (cue, second) member
+  pair ("members") so distance is taken to the nearest actual members
+- ColumnarDataset records are encoded straight from the point columns,
+  with the same arithmetic as their EnvelopeRecord views
 - Encoding is deterministic and independent from tree build/query mechanics
+- Axis weights scale squared differences per vector axis; table_axis_weights()
+  normalises by the table extent and weights cue/target/second points
 """
 
 from __future__ import annotations
 
-from models import EnvelopeRecord, Point, RecordIdentity
+from typing import Sequence, Tuple
 
+from models import ColumnarDataset, EnvelopeRecord, Point, RecordIdentity
+
+from .contract import KD_TREE_ENCODING_CENTROID, KD_TREE_ENCODING_MEMBERS, KD_TREE_TABLE_EXTENT
 from .models import EncodedCandidate, KDTreeQueryInput, Vector6D
 
 
@@ -34,6 +43,33 @@ def encode_query_to_vector(query: KDTreeQueryInput) -> Vector6D:
     )
 
 
+def table_axis_weights(
+    *,
+    cue: float = 1.0,
+    target: float = 1.0,
+    second: float = 1.0,
+) -> Vector6D:
+    """
+    Axis weights normalised by the table extent, scaled per point.
+
+    Each point's x / y difference is divided by the table width / height, so
+    distance is in table units; ``cue`` / ``target`` / ``second`` then weight
+    that point's squared distance (e.g. ``target=4.0`` counts target error
+    twice as far).
+    """
+    width, height = KD_TREE_TABLE_EXTENT
+    x_unit = 1.0 / (width * width)
+    y_unit = 1.0 / (height * height)
+    return (
+        cue * x_unit,
+        cue * y_unit,
+        target * x_unit,
+        target * y_unit,
+        second * x_unit,
+        second * y_unit,
+    )
+
+
 def encode_record_to_vector(record: EnvelopeRecord) -> Vector6D:
     """
     Encode EnvelopeRecord to fixed 6D vector.
@@ -53,13 +89,85 @@ def encode_record_to_vector(record: EnvelopeRecord) -> Vector6D:
     )
 
 
+def encode_record_to_member_vectors(record: EnvelopeRecord) -> Tuple[Vector6D, ...]:
+    """
+    Encode EnvelopeRecord to one 6D vector per distinct (cue, second) member pair.
+
+    The nearest pair to a query is the record's set-aware distance: the
+    query cue / second are compared with actual members, not set centroids.
+    """
+    cues = dict.fromkeys((point.x, point.y) for point in record.cue_set)
+    seconds = dict.fromkeys((point.x, point.y) for point in record.second_set)
+    target_x, target_y = record.target.x, record.target.y
+    return tuple(
+        (cue_x, cue_y, target_x, target_y, second_x, second_y)
+        for cue_x, cue_y in cues
+        for second_x, second_y in seconds
+    )
+
+
 def encode_record_to_vector_item(
     candidate_id: RecordIdentity,
     record: EnvelopeRecord,
+    record_ordinals: Sequence[int] = (),
+    *,
+    encoding: str = KD_TREE_ENCODING_CENTROID,
 ) -> EncodedCandidate:
-    """Encode one EnvelopeRecord into KDTree candidate item."""
+    """Encode one EnvelopeRecord into KDTree candidate item (``encoding`` adds members)."""
     return EncodedCandidate(
         candidate_id=candidate_id,
         strategy_ref=record.strategy_ref,
         vector=encode_record_to_vector(record),
+        record_ordinals=tuple(record_ordinals),
+        members=(
+            encode_record_to_member_vectors(record)
+            if encoding == KD_TREE_ENCODING_MEMBERS
+            else ()
+        ),
+    )
+
+
+def _column_centroid(xy: Sequence[float], start: int, end: int) -> Tuple[float, float]:
+    count = end - start
+    return (
+        sum(xy[2 * i] for i in range(start, end)) / count,
+        sum(xy[2 * i + 1] for i in range(start, end)) / count,
+    )
+
+
+def _column_members(xy: Sequence[float], start: int, end: int) -> Sequence[Tuple[float, float]]:
+    return tuple(dict.fromkeys((xy[2 * i], xy[2 * i + 1]) for i in range(start, end)))
+
+
+def encode_columnar_to_vector_item(
+    candidate_id: RecordIdentity,
+    dataset: ColumnarDataset,
+    ordinal: int,
+    record_ordinals: Sequence[int] = (),
+    *,
+    encoding: str = KD_TREE_ENCODING_CENTROID,
+) -> EncodedCandidate:
+    """encode_record_to_vector_item for record ``ordinal`` of a ColumnarDataset, read in place."""
+    cue_start, cue_end = dataset.cue_offsets[ordinal], dataset.cue_offsets[ordinal + 1]
+    second_start, second_end = (
+        dataset.second_offsets[ordinal],
+        dataset.second_offsets[ordinal + 1],
+    )
+    cue_x, cue_y = _column_centroid(dataset.cue_xy, cue_start, cue_end)
+    second_x, second_y = _column_centroid(dataset.second_xy, second_start, second_end)
+    target_x, target_y = dataset.target_xy[2 * ordinal], dataset.target_xy[2 * ordinal + 1]
+    members: Tuple[Vector6D, ...] = ()
+    if encoding == KD_TREE_ENCODING_MEMBERS:
+        seconds = _column_members(dataset.second_xy, second_start, second_end)
+        members = tuple(
+            (member_cue_x, member_cue_y, target_x, target_y, member_second_x, member_second_y)
+            for member_cue_x, member_cue_y in _column_members(dataset.cue_xy, cue_start, cue_end)
+            for member_second_x, member_second_y in seconds
+        )
+    return EncodedCandidate(
+        candidate_id=candidate_id,
+        strategy_ref=dataset.strategy_refs[ordinal],
+        vector=(cue_x, cue_y, target_x, target_y, second_x, second_y),
+        record_ordinals=tuple(record_ordinals),
+        members=members,
     )
@@ -2,13 +2,40 @@
 
 from __future__ import annotations
 
+from typing import Sequence
+
 from .builder import DefaultKDTreeBuilder
+from .contract import (
+    KD_TREE_AXIS_WEIGHTS_UNIT,
+    KD_TREE_ENCODING_CENTROID,
+    KD_TREE_LAYOUT_IMPLICIT,
+    KD_TREE_LEAF_SIZE,
+    KD_TREE_REBALANCE_THRESHOLD,
+)
 from .query import DefaultKDTreeQuery
 
 
-def create_kd_tree_builder() -> DefaultKDTreeBuilder:
-    """Create KDTree builder."""
-    return DefaultKDTreeBuilder()
+def create_kd_tree_builder(
+    *,
+    layout: str = KD_TREE_LAYOUT_IMPLICIT,
+    leaf_size: int = KD_TREE_LEAF_SIZE,
+    rebalance_threshold: float = KD_TREE_REBALANCE_THRESHOLD,
+    encoding: str = KD_TREE_ENCODING_CENTROID,
+    axis_weights: Sequence[float] = KD_TREE_AXIS_WEIGHTS_UNIT,
+) -> DefaultKDTreeBuilder:
+    """
+    Create KDTree builder (implicit array layout unless ``layout`` says otherwise).
+
+    ``encoding="members"`` ranks records by their nearest (cue, second) member pair.
+    ``axis_weights`` weights squared axis differences (e.g. table_axis_weights()).
+    """
+    return DefaultKDTreeBuilder(
+        layout=layout,
+        leaf_size=leaf_size,
+        rebalance_threshold=rebalance_threshold,
+        encoding=encoding,
+        axis_weights=axis_weights,
+    )
 
 
 def create_kd_tree_query() -> DefaultKDTreeQuery:
@@ -0,0 +1,328 @@
+"""
+Implicit (array-backed) KDTree build and search.
+
+Build: per-axis ranks once (O(n log n)), then median selection per range.
+Search: explicit stack over slot ranges with leaf-bucket scans.
+Ordering matches the linked tree: (distance, candidate_id).
+Multi-point trees (member encoding) index every member vector and keep
+each candidate's nearest slot, so top-N counts distinct candidates.
+Radius search prunes every far side beyond the bound from the root down.
+Bounded search adds a (1 + epsilon) pruning factor and a slot-visit budget
+for approximate answers.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .contract import KD_TREE_AXIS_WEIGHTS_UNIT, KD_TREE_DIMENSIONS
+from .models import EncodedCandidate, ImplicitKDTree, Vector6D
+
+# Ranges at or below this size are ordered by a plain sort during selection.
+_SELECT_SORT_THRESHOLD = 16
+
+
+def _axis_ranks(vectors: Sequence[Vector6D], axis: int) -> List[int]:
+    # Vectors follow candidate_id order, so position breaks value ties by id.
+    order = sorted(
+        range(len(vectors)),
+        key=lambda position: (vectors[position][axis], position),
+    )
+    ranks = [0] * len(order)
+    for rank, position in enumerate(order):
+        ranks[position] = rank
+    return ranks
+
+
+def _select(items: List[int], k: int, ranks: List[int]) -> List[int]:
+    """Reorder ``items`` so items[k] is the k-th smallest rank, lower ranks before it."""
+    rank_of = ranks.__getitem__
+    lower: List[int] = []
+    upper: List[int] = []
+    while len(items) > _SELECT_SORT_THRESHOLD:
+        first, middle, last = items[0], items[len(items) // 2], items[-1]
+        pivot = sorted((first, middle, last), key=rank_of)[1]
+        pivot_rank = ranks[pivot]
+        lows = [item for item in items if ranks[item] < pivot_rank]
+        if k < len(lows):
+            upper = [item for item in items if ranks[item] > pivot_rank] + [pivot] + upper
+            items = lows
+        elif k == len(lows):
+            highs = [item for item in items if ranks[item] > pivot_rank]
+            return lower + lows + [pivot] + highs + upper
+        else:
+            lower += lows
+            lower.append(pivot)
+            k -= len(lows) + 1
+            items = [item for item in items if ranks[item] > pivot_rank]
+    items.sort(key=rank_of)
+    return lower + items + upper
+
+
+def build_implicit_tree(
+    candidates: Sequence[EncodedCandidate],
+    *,
+    leaf_size: int,
+    multi_point: bool = False,
+) -> ImplicitKDTree:
+    """
+    Build an implicit KDTree over id-sorted encoded candidates.
+
+    ``multi_point`` indexes each candidate's member vectors instead of its
+    centroid vector.
+    """
+    if multi_point:
+        vectors: List[Vector6D] = []
+        owners: List[int] = []
+        for position, item in enumerate(candidates):
+            vectors.extend(item.members)
+            owners.extend([position] * len(item.members))
+    else:
+        vectors = [item.vector for item in candidates]
+        owners = list(range(len(candidates)))
+
+    size = len(vectors)
+    dimensions = KD_TREE_DIMENSIONS
+    slots = list(range(size))
+    if size > leaf_size:
+        ranks = [_axis_ranks(vectors, axis) for axis in range(dimensions)]
+        stack = [(0, size, 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= leaf_size:
+                continue
+            mid = (lo + hi) // 2
+            slots[lo:hi] = _select(slots[lo:hi], mid - lo, ranks[depth % dimensions])
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid + 1, hi, depth + 1))
+
+    coords = array("d")
+    for position in slots:
+        coords.extend(vectors[position])
+    return ImplicitKDTree(
+        coords=coords,
+        slots=array("q", [owners[position] for position in slots]),
+        size=size,
+        dimensions=dimensions,
+        leaf_size=leaf_size,
+        multi_point=multi_point,
+    )
+
+
+def search_implicit_tree(
+    tree: ImplicitKDTree,
+    query_vector: Vector6D,
+    top_n: int,
+    weights: Vector6D = KD_TREE_AXIS_WEIGHTS_UNIT,
+) -> List[tuple[float, int]]:
+    """
+    Return up to ``top_n`` (distance_sq, candidate position) pairs.
+
+    Positions are distinct; a multi-point tree reports each candidate at its
+    nearest member vector. Positions follow candidate_id order, so (distance_sq, position) is the
+    same total order as (distance, candidate_id). ``weights`` scale each
+    squared axis difference; a far side is bounded by its weighted plane
+    distance, which no vector beyond the plane can undercut.
+    """
+    return search_implicit_tree_bounded(tree, query_vector, top_n, weights)[0]
+
+
+def search_implicit_tree_bounded(
+    tree: ImplicitKDTree,
+    query_vector: Vector6D,
+    top_n: int,
+    weights: Vector6D = KD_TREE_AXIS_WEIGHTS_UNIT,
+    *,
+    epsilon: float = 0.0,
+    max_visits: Optional[int] = None,
+) -> Tuple[List[tuple[float, int]], bool, int]:
+    """
+    search_implicit_tree() with approximation knobs: (entries, exact, visited).
+
+    A range is also pruned once (1 + epsilon) times its bound passes the
+    current worst distance, so every reported distance is within (1 +
+    epsilon) of the true one at its rank. The walk stops after scoring
+    ``max_visits`` slots. ``exact`` is True when neither cut skipped a range
+    the exact walk would have entered, i.e. the entries equal search_implicit_tree().
+    """
+    coords = tree.coords
+    slots = tree.slots
+    leaf_size = tree.leaf_size
+    dimensions = tree.dimensions
+    q0, q1, q2, q3, q4, q5 = query_vector
+    w0, w1, w2, w3, w4, w5 = weights
+    # Max-heap of (-distance_sq, -position): heap[0] is the current worst entry.
+    heap: List[tuple[float, int]] = []
+    push = heapq.heappush
+    replace = heapq.heapreplace
+    # Multi-point trees: candidate position -> its heap entry.
+    held: Dict[int, tuple[float, int]] = {}
+
+    def visit_nearest(slot: int) -> None:
+        base = slot * 6
+        d0 = q0 - coords[base]
+        d1 = q1 - coords[base + 1]
+        d2 = q2 - coords[base + 2]
+        d3 = q3 - coords[base + 3]
+        d4 = q4 - coords[base + 4]
+        d5 = q5 - coords[base + 5]
+        entry = (
+            -(
+                w0 * (d0 * d0)
+                + w1 * (d1 * d1)
+                + w2 * (d2 * d2)
+                + w3 * (d3 * d3)
+                + w4 * (d4 * d4)
+                + w5 * (d5 * d5)
+            ),
+            -slots[slot],
+        )
+        if len(heap) < top_n:
+            push(heap, entry)
+        elif entry > heap[0]:
+            replace(heap, entry)
+
+    def visit_distinct(slot: int) -> None:
+        base = slot * 6
+        d0 = q0 - coords[base]
+        d1 = q1 - coords[base + 1]
+        d2 = q2 - coords[base + 2]
+        d3 = q3 - coords[base + 3]
+        d4 = q4 - coords[base + 4]
+        d5 = q5 - coords[base + 5]
+        position = slots[slot]
+        entry = (
+            -(
+                w0 * (d0 * d0)
+                + w1 * (d1 * d1)
+                + w2 * (d2 * d2)
+                + w3 * (d3 * d3)
+                + w4 * (d4 * d4)
+                + w5 * (d5 * d5)
+            ),
+            -position,
+        )
+        current = held.get(position)
+        if current is not None:
+            # Same candidate, nearer member: move its entry down the max-heap.
+            if entry > current:
+                heap[heap.index(current)] = entry
+                heapq.heapify(heap)
+                held[position] = entry
+        elif len(heap) < top_n:
+            push(heap, entry)
+            held[position] = entry
+        elif entry > heap[0]:
+            del held[-replace(heap, entry)[1]]
+            held[position] = entry
+
+    visit = visit_distinct if tree.multi_point else visit_nearest
+    # Squared distances, so the (1 + epsilon) distance factor is squared too.
+    slack = (1.0 + epsilon) * (1.0 + epsilon)
+    # A walk scores each slot at most once, so tree.size never binds.
+    budget = tree.size if max_visits is None else max_visits
+    visited = 0
+    exact = True
+
+    stack = [(0, tree.size, 0, 0.0)]
+    while stack:
+        lo, hi, depth, bound = stack.pop()
+        if len(heap) == top_n:
+            worst = -heap[0][0]
+            # Equal bounds may still win on candidate_id, so only strictly worse prunes.
+            if bound > worst:
+                continue
+            if bound * slack > worst:
+                exact = False
+                continue
+        if visited >= budget:
+            exact = False
+            break
+        if hi - lo <= leaf_size:
+            end = min(hi, lo + budget - visited)
+            for slot in range(lo, end):
+                visit(slot)
+            visited += end - lo
+            if end < hi:
+                exact = False
+                break
+            continue
+
+        mid = (lo + hi) // 2
+        visit(mid)
+        visited += 1
+        axis = depth % dimensions
+        diff = query_vector[axis] - coords[mid * dimensions + axis]
+        plane = weights[axis] * (diff * diff)
+        far_bound = plane if plane > bound else bound
+        if diff <= 0:
+            near, far = (lo, mid), (mid + 1, hi)
+        else:
+            near, far = (mid + 1, hi), (lo, mid)
+        # LIFO: the near side is explored before the far side is bounded.
+        if far[0] < far[1]:
+            stack.append((far[0], far[1], depth + 1, far_bound))
+        if near[0] < near[1]:
+            stack.append((near[0], near[1], depth + 1, bound))
+
+    entries = [(-distance_sq, -negative_position) for distance_sq, negative_position in heap]
+    return entries, exact, visited
+
+
+def radius_search_implicit_tree(
+    tree: ImplicitKDTree,
+    query_vector: Vector6D,
+    limits: Sequence[float],
+    within: Callable[[Sequence[float], int], Optional[float]],
+    *,
+    first_only: bool = False,
+) -> Dict[int, float]:
+    """
+    Candidate position -> distance_sq for every slot ``within`` accepts.
+
+    ``limits[axis]`` bounds |query - plane| on that axis for any accepted
+    vector, so far sides beyond it are pruned from the root down; no heap
+    has to fill first. Multi-point trees keep each candidate's nearest
+    accepted slot. ``first_only`` stops at the first accepted slot.
+    """
+    coords = tree.coords
+    slots = tree.slots
+    leaf_size = tree.leaf_size
+    dimensions = tree.dimensions
+    found: Dict[int, float] = {}
+
+    def visit(slot: int) -> bool:
+        distance_sq = within(coords, slot * dimensions)
+        if distance_sq is None:
+            return False
+        position = slots[slot]
+        current = found.get(position)
+        if current is None or distance_sq < current:
+            found[position] = distance_sq
+        return first_only
+
+    stack = [(0, tree.size, 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= leaf_size:
+            for slot in range(lo, hi):
+                if visit(slot):
+                    return found
+            continue
+
+        mid = (lo + hi) // 2
+        if visit(mid):
+            return found
+        axis = depth % dimensions
+        diff = query_vector[axis] - coords[mid * dimensions + axis]
+        if diff <= 0:
+            near, far = (lo, mid), (mid + 1, hi)
+        else:
+            near, far = (mid + 1, hi), (lo, mid)
+        if far[0] < far[1] and abs(diff) <= limits[axis]:
+            stack.append((far[0], far[1], depth + 1))
+        if near[0] < near[1]:
+            stack.append((near[0], near[1], depth + 1))
+    return found
@@ -0,0 +1,138 @@
+"""
+Linked KDTreeNode tree: build plus persistent insert / remove.
+
+Nodes are ordered by (vector[axis], candidate_id), so every live candidate
+has exactly one root path. Updates copy that path and share every other node
+with the input tree: an insert adds a leaf, a remove marks the node as a
+tombstone (it keeps splitting the space, queries skip it). A subtree is
+rebuilt at its medians from its live items once one child holds more than
+``threshold`` of its nodes or tombstones make up over half of them
+(scapegoat-style), which also reclaims the tombstones.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import List, Optional, Sequence, Tuple
+
+from .contract import KD_TREE_DIMENSIONS
+from .exceptions import InvalidKDTreeCandidate
+from .models import EncodedCandidate, KDTreeNode
+
+
+def _size(node: Optional[KDTreeNode]) -> int:
+    return node.size if node is not None else 0
+
+
+def _key(item: EncodedCandidate, axis: int) -> Tuple[float, str]:
+    return (item.vector[axis], str(item.candidate_id))
+
+
+def _with_children(
+    node: KDTreeNode,
+    left: Optional[KDTreeNode],
+    right: Optional[KDTreeNode],
+) -> KDTreeNode:
+    return KDTreeNode(
+        item=node.item,
+        axis=node.axis,
+        left=left,
+        right=right,
+        size=1 + _size(left) + _size(right),
+        deleted=node.deleted,
+        dead=int(node.deleted) + _dead(left) + _dead(right),
+    )
+
+
+def _dead(node: Optional[KDTreeNode]) -> int:
+    return node.dead if node is not None else 0
+
+
+def _live_items(node: Optional[KDTreeNode]) -> List[EncodedCandidate]:
+    items: List[EncodedCandidate] = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current is None:
+            continue
+        if not current.deleted:
+            items.append(current.item)
+        stack.append(current.left)
+        stack.append(current.right)
+    return items
+
+
+def _balanced(node: KDTreeNode, threshold: float) -> Optional[KDTreeNode]:
+    if (
+        max(_size(node.left), _size(node.right)) > threshold * node.size
+        or node.dead * 2 > node.size
+    ):
+        # node.axis == depth % dimensions, which is all the build reads from depth.
+        return build_linked_tree(_live_items(node), node.axis)
+    return node
+
+
+def build_linked_tree(items: Sequence[EncodedCandidate], depth: int = 0) -> KDTreeNode | None:
+    """Balanced tree: median of (vector[axis], candidate_id) at every level."""
+    if not items:
+        return None
+
+    axis = depth % KD_TREE_DIMENSIONS
+    sorted_items = sorted(items, key=lambda item: _key(item, axis))
+    mid = len(sorted_items) // 2
+    left = build_linked_tree(sorted_items[:mid], depth + 1)
+    right = build_linked_tree(sorted_items[mid + 1 :], depth + 1)
+    return KDTreeNode(
+        item=sorted_items[mid],
+        axis=axis,
+        left=left,
+        right=right,
+        size=1 + _size(left) + _size(right),
+    )
+
+
+def insert_linked(
+    node: Optional[KDTreeNode],
+    item: EncodedCandidate,
+    *,
+    threshold: float,
+    depth: int = 0,
+) -> KDTreeNode:
+    """Tree with ``item`` added as a leaf (its candidate_id must not be live)."""
+    if node is None:
+        return KDTreeNode(item=item, axis=depth % KD_TREE_DIMENSIONS)
+    if _key(item, node.axis) < _key(node.item, node.axis):
+        left = insert_linked(node.left, item, threshold=threshold, depth=node.axis + 1)
+        updated = _with_children(node, left, node.right)
+    else:
+        right = insert_linked(node.right, item, threshold=threshold, depth=node.axis + 1)
+        updated = _with_children(node, node.left, right)
+    balanced = _balanced(updated, threshold)
+    assert balanced is not None  # ``item`` itself is live
+    return balanced
+
+
+def remove_linked(
+    node: Optional[KDTreeNode],
+    item: EncodedCandidate,
+    *,
+    threshold: float,
+) -> Optional[KDTreeNode]:
+    """
+    Tree with ``item``'s live node (matched by candidate_id, located by its
+    stored vector) turned into a tombstone.
+    """
+    if node is None:
+        raise InvalidKDTreeCandidate(f"candidate id not found in tree: {item.candidate_id}")
+    if node.item.candidate_id == item.candidate_id and not node.deleted:
+        # The node keeps its split plane; the next rebuild drops it.
+        return _balanced(replace(node, deleted=True, dead=node.dead + 1), threshold)
+    if _key(item, node.axis) < _key(node.item, node.axis):
+        updated = _with_children(
+            node, remove_linked(node.left, item, threshold=threshold), node.right
+        )
+    else:
+        updated = _with_children(
+            node, node.left, remove_linked(node.right, item, threshold=threshold)
+        )
+    return _balanced(updated, threshold)
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from array import array
+from dataclasses import dataclass, field
+from typing import Mapping, Optional, Tuple, Union
 
 from models import Point, RecordIdentity, StrategyRef
 
+from .contract import KD_TREE_AXIS_WEIGHTS_UNIT, KD_TREE_ENCODING_CENTROID
+
 Vector6D = Tuple[float, float, float, float, float, float]
 
 
@@ -26,6 +29,10 @@ class EncodedCandidate:
     candidate_id: RecordIdentity
     strategy_ref: StrategyRef
     vector: Vector6D
+    # Ordinals (positions in dataset.records) of the records with this identity.
+    record_ordinals: Tuple[int, ...] = ()
+    # Member-pair vectors ("members" encoding); distance is to the nearest one.
+    members: Tuple[Vector6D, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -36,15 +43,54 @@ class KDTreeNode:
     axis: int
     left: Optional["KDTreeNode"] = None
     right: Optional["KDTreeNode"] = None
+    # Nodes in this subtree, tombstones included (drives lazy rebalancing on update).
+    size: int = 1
+    # Removed by update(): still splits the space, never returned by queries.
+    deleted: bool = False
+    # Tombstones in this subtree (reclaimed by the next rebuild).
+    dead: int = 0
+
+
+@dataclass(frozen=True)
+class ImplicitKDTree:
+    """
+    Array-backed KDTree with an implicit layout.
+
+    Slot range [lo, hi) at depth d splits on axis d % dimensions at its median
+    slot (lo + hi) // 2; children are [lo, mid) and [mid + 1, hi). Ranges of at
+    most ``leaf_size`` slots are leaf buckets.
+
+    ``multi_point`` trees hold one slot per member vector, so several slots
+    map to one candidate and searches keep each candidate's nearest slot.
+    """
+
+    # Flat slot-ordered vectors: coords[slot * dimensions + axis].
+    coords: array
+    # slot -> position in KDTreeIndex.candidates.
+    slots: array
+    size: int
+    dimensions: int
+    leaf_size: int
+    multi_point: bool = False
 
 
 @dataclass(frozen=True)
 class KDTreeIndex:
     """Runtime-only KDTree candidate index."""
 
-    root: Optional[KDTreeNode]
+    root: Optional[Union[KDTreeNode, ImplicitKDTree]]
     candidates: Tuple[EncodedCandidate, ...]
     dimensions: int
+    # candidate_id -> position in `candidates` (used by scoped search).
+    positions: Mapping[RecordIdentity, int] = field(default_factory=dict)
+    # record ordinal -> position in `candidates`, -1 when not indexed
+    # (used by ordinal-scoped search).
+    ordinal_positions: array = field(default_factory=lambda: array("q"))
+    # Record encoding the candidates were built with (KD_TREE_ENCODINGS).
+    encoding: str = KD_TREE_ENCODING_CENTROID
+    # Weights on squared per-axis differences; every query on this index
+    # ranks, prunes and reports distance under them.
+    axis_weights: Vector6D = KD_TREE_AXIS_WEIGHTS_UNIT
 
 
 @dataclass(frozen=True)
@@ -55,3 +101,16 @@ class NearestCandidate:
     strategy_ref: StrategyRef
     distance: float
     tie_break_key: RecordIdentity
+    record_ordinals: Tuple[int, ...] = ()
+
+
+@dataclass(frozen=True)
+class ApproximateShortlist:
+    """Approximate top-N shortlist (DefaultKDTreeQuery.search_approximate)."""
+
+    candidates: Tuple[NearestCandidate, ...]
+    # True when no epsilon prune or visit budget skipped part of the tree the
+    # exact walk would have entered: candidates then equal search().
+    exact: bool
+    # Tree vectors scored by the walk.
+    visited: int
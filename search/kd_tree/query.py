@@ -4,19 +4,115 @@ from __future__ import annotations
 
 import heapq
 import math
-from typing import List
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from .exceptions import InvalidKDTreeQuery
-from .models import EncodedCandidate, KDTreeIndex, KDTreeNode, KDTreeQueryInput, NearestCandidate, Vector6D
+from models import RecordIdentity
+
+from .exceptions import InvalidKDTreeCandidate, InvalidKDTreeQuery
+from .implicit import radius_search_implicit_tree, search_implicit_tree_bounded
+from .models import (
+    ApproximateShortlist,
+    EncodedCandidate,
+    ImplicitKDTree,
+    KDTreeIndex,
+    KDTreeNode,
+    KDTreeQueryInput,
+    NearestCandidate,
+    Vector6D,
+)
 from .encoding import encode_query_to_vector
 
 
-def _distance_squared(a: Vector6D, b: Vector6D) -> float:
-    return sum((lhs - rhs) ** 2 for lhs, rhs in zip(a, b))
+def _distance_squared(a: Vector6D, b: Vector6D, weights: Vector6D) -> float:
+    # Same arithmetic as the implicit tree scan (w * (x * x), summed left to right).
+    return sum(
+        weight * ((lhs - rhs) * (lhs - rhs)) for lhs, rhs, weight in zip(a, b, weights)
+    )
+
+
+# within(values, base) -> distance_sq of values[base:base + 6], or None when out of bounds.
+_RadiusTest = Callable[[Sequence[float], int], Optional[float]]
+
+
+def _radius_test(
+    query_vector: Vector6D,
+    radius: float | None,
+    axis_radii: Tuple[float, float, float] | None,
+    weights: Vector6D,
+) -> _RadiusTest:
+    q0, q1, q2, q3, q4, q5 = query_vector
+    w0, w1, w2, w3, w4, w5 = weights
+    hypot = math.hypot
+    sqrt = math.sqrt
+    cue_radius, target_radius, second_radius = axis_radii or (math.inf,) * 3
+    ball = math.inf if radius is None else radius
+
+    def within(values: Sequence[float], base: int) -> Optional[float]:
+        d0 = q0 - values[base]
+        d1 = q1 - values[base + 1]
+        d2 = q2 - values[base + 2]
+        d3 = q3 - values[base + 3]
+        d4 = q4 - values[base + 4]
+        d5 = q5 - values[base + 5]
+        # Per-axis distances as Membership tolerance mode measures them.
+        if axis_radii is not None and not (
+            hypot(d0, d1) <= cue_radius
+            and hypot(d2, d3) <= target_radius
+            and hypot(d4, d5) <= second_radius
+        ):
+            return None
+        distance_sq = (
+            w0 * (d0 * d0)
+            + w1 * (d1 * d1)
+            + w2 * (d2 * d2)
+            + w3 * (d3 * d3)
+            + w4 * (d4 * d4)
+            + w5 * (d5 * d5)
+        )
+        if sqrt(distance_sq) > ball:
+            return None
+        return distance_sq
+
+    return within
+
 
+def _radius_limits(
+    radius: float | None,
+    axis_radii: Tuple[float, float, float] | None,
+    weights: Vector6D,
+) -> Tuple[float, ...]:
+    # Largest |query - plane| per vector axis that an accepted vector can have.
+    # The weighted ball reaches radius / sqrt(w) along an axis; the slack keeps
+    # rounding in that division from pruning a vector on the boundary.
+    per_axis = axis_radii or (math.inf,) * 3
+    limits = []
+    for axis, weight in enumerate(weights):
+        ball = math.inf if radius is None or weight == 0.0 else radius / math.sqrt(weight)
+        if ball != math.inf and weight != 1.0:
+            ball *= 1.0 + 1e-9
+        limits.append(min(ball, per_axis[axis // 2]))
+    return tuple(limits)
 
-def _candidate_sort_key(distance: float, candidate_id: str) -> tuple[float, str]:
-    return (distance, candidate_id)
+
+def _to_nearest(
+    candidates: Sequence[EncodedCandidate],
+    entries: Iterable[tuple[float, int]],
+) -> tuple[NearestCandidate, ...]:
+    # Candidates are stored in candidate_id order, so position breaks ties by id.
+    ordered = sorted((math.sqrt(distance_sq), position) for distance_sq, position in entries)
+    result = []
+    for distance, position in ordered:
+        item = candidates[position]
+        result.append(
+            NearestCandidate(
+                candidate_id=item.candidate_id,
+                strategy_ref=item.strategy_ref,
+                distance=distance,
+                tie_break_key=item.candidate_id,
+                record_ordinals=item.record_ordinals,
+            )
+        )
+    return tuple(result)
 
 
 class DefaultKDTreeQuery:
@@ -28,7 +124,21 @@ class DefaultKDTreeQuery:
         query: KDTreeQueryInput,
         *,
         top_n: int,
+        scope: Iterable[RecordIdentity] | None = None,
+        scope_ordinals: Iterable[int] | None = None,
     ) -> tuple[NearestCandidate, ...]:
+        """
+        Return the top-N nearest candidates.
+
+        Distance is to each candidate's vector, or to its nearest member
+        pair under the "members" encoding (one entry per candidate), under
+        the index's axis_weights.
+        When ``scope`` is given, only those candidate ids are eligible; the
+        result equals searching a KDTree built over ``scope`` alone, so one
+        dataset-wide index can serve per-query Spatial Index shortlists.
+        ``scope_ordinals`` does the same for record ordinals (Spatial Index
+        candidate_ordinals) without touching identity strings.
+        """
         if index is None or not isinstance(index, KDTreeIndex):
             raise InvalidKDTreeQuery("KDTreeIndex is required")
         if query is None or not isinstance(query, KDTreeQueryInput):
@@ -41,29 +151,101 @@ class DefaultKDTreeQuery:
             return ()
 
         query_vector = encode_query_to_vector(query)
-        heap: List[tuple[float, str, EncodedCandidate]] = []
+        if scope_ordinals is not None:
+            return self._search_positions(
+                index, query_vector, top_n, _ordinal_positions(index, scope_ordinals)
+            )
+        if scope is not None:
+            return self._search_positions(
+                index, query_vector, top_n, _identity_positions(index, scope)
+            )
+        entries, _, _ = self._walk_nearest(index, query_vector, top_n, 0.0, None)
+        return _to_nearest(index.candidates, entries)
+
+    def search_approximate(
+        self,
+        index: KDTreeIndex,
+        query: KDTreeQueryInput,
+        *,
+        top_n: int,
+        epsilon: float = 0.0,
+        max_visits: int | None = None,
+    ) -> ApproximateShortlist:
+        """
+        Top-N nearest with bounded work, for latency over exactness.
+
+        A far side is skipped once (1 + epsilon) times its plane distance
+        passes the current N-th distance, so each returned distance is
+        within (1 + epsilon) of the exact one at its rank; ``max_visits``
+        caps the tree vectors scored (best effort once it runs out). With
+        the defaults the result equals search(). ``exact`` reports whether
+        either cut skipped part of the exact walk.
+        """
+        self._check_query(index, query)
+        if top_n <= 0:
+            raise InvalidKDTreeQuery("top_n must be >= 1")
+        if not 0.0 <= epsilon < math.inf:
+            raise InvalidKDTreeQuery("epsilon must be finite and >= 0")
+        if max_visits is not None and max_visits < 1:
+            raise InvalidKDTreeQuery("max_visits must be >= 1")
+        if index.root is None:
+            return ApproximateShortlist(candidates=(), exact=True, visited=0)
+        entries, exact, visited = self._walk_nearest(
+            index, encode_query_to_vector(query), top_n, epsilon, max_visits
+        )
+        return ApproximateShortlist(
+            candidates=_to_nearest(index.candidates, entries), exact=exact, visited=visited
+        )
+
+    @staticmethod
+    def _walk_nearest(
+        index: KDTreeIndex,
+        query_vector: Vector6D,
+        top_n: int,
+        epsilon: float,
+        max_visits: int | None,
+    ) -> Tuple[List[tuple[float, int]], bool, int]:
+        """(distance_sq, position) entries, exact, visited for an unscoped tree walk."""
+        weights = index.axis_weights
+        if isinstance(index.root, ImplicitKDTree):
+            return search_implicit_tree_bounded(
+                index.root,
+                query_vector,
+                top_n,
+                weights,
+                epsilon=epsilon,
+                max_visits=max_visits,
+            )
+
+        slack = (1.0 + epsilon) * (1.0 + epsilon)
+        budget = math.inf if max_visits is None else max_visits
+        visited = 0
+        exact = True
+        positions = _positions_by_id(index)
+        # Max-heap of (-distance_sq, -position), as in the implicit layout:
+        # positions follow candidate_id order, so heap[0] is the worst entry
+        # under (distance, candidate_id) ties included.
+        heap: List[tuple[float, int]] = []
 
         def push(item: EncodedCandidate, distance_sq: float) -> None:
-            candidate_id = str(item.candidate_id)
-            entry = (-distance_sq, candidate_id, item)
+            entry = (-distance_sq, -positions[item.candidate_id])
             if len(heap) < top_n:
                 heapq.heappush(heap, entry)
-                return
-
-            worst_distance_sq = -heap[0][0]
-            worst_candidate_id = heap[0][1]
-            if _candidate_sort_key(distance_sq, candidate_id) < _candidate_sort_key(
-                worst_distance_sq, worst_candidate_id
-            ):
+            elif entry > heap[0]:
                 heapq.heapreplace(heap, entry)
 
         def walk(node: KDTreeNode | None) -> None:
+            nonlocal visited, exact
             if node is None:
                 return
+            if visited >= budget:
+                exact = False
+                return
 
             axis = node.axis
-            distance_sq = _distance_squared(query_vector, node.item.vector)
-            push(node.item, distance_sq)
+            if not node.deleted:
+                push(node.item, _distance_squared(query_vector, node.item.vector, weights))
+                visited += 1
 
             diff = query_vector[axis] - node.item.vector[axis]
             near, far = (
@@ -76,23 +258,272 @@ class DefaultKDTreeQuery:
                 walk(far)
                 return
 
-            plane_distance_sq = diff * diff
+            plane_distance_sq = weights[axis] * (diff * diff)
             worst_distance_sq = -heap[0][0]
-            if plane_distance_sq <= worst_distance_sq:
+            if plane_distance_sq * slack <= worst_distance_sq:
                 walk(far)
+            elif far is not None and plane_distance_sq <= worst_distance_sq:
+                exact = False
 
         walk(index.root)
+        entries = [(-distance_sq, -negative_position) for distance_sq, negative_position in heap]
+        return entries, exact, visited
 
-        ordered = sorted(
-            (
-                NearestCandidate(
-                    candidate_id=item.candidate_id,
-                    strategy_ref=item.strategy_ref,
-                    distance=math.sqrt(-distance_sq),
-                    tie_break_key=item.candidate_id,
-                )
-                for distance_sq, _, item in heap
-            ),
-            key=lambda candidate: (candidate.distance, str(candidate.tie_break_key)),
+    def search_radius(
+        self,
+        index: KDTreeIndex,
+        query: KDTreeQueryInput,
+        radius: float | None = None,
+        *,
+        axis_radii: Tuple[float, float, float] | None = None,
+        scope: Iterable[RecordIdentity] | None = None,
+        scope_ordinals: Iterable[int] | None = None,
+    ) -> tuple[NearestCandidate, ...]:
+        """
+        Every candidate within the bounds, ordered by (distance, candidate_id).
+
+        ``radius`` bounds the (axis-weighted) 6D distance; ``axis_radii``
+        bounds the raw (cue, target, second) point distances separately, as
+        Membership tolerance mode does. Either or both may be given. Under the "members" encoding
+        a candidate qualifies when one member pair meets every bound and
+        reports its nearest such pair. The tree walk prunes each far side
+        whose splitting plane lies beyond the bound. ``scope`` /
+        ``scope_ordinals`` restrict eligibility as in search().
+        """
+        self._check_query(index, query)
+        axis_radii = self._check_bounds(radius, axis_radii)
+        found = self._within(
+            index, encode_query_to_vector(query), radius, axis_radii, scope, scope_ordinals
         )
-        return tuple(ordered)
+        return _to_nearest(index.candidates, ((d, p) for p, d in found.items()))
+
+    def any_within(
+        self,
+        index: KDTreeIndex,
+        query: KDTreeQueryInput,
+        radius: float | None = None,
+        *,
+        axis_radii: Tuple[float, float, float] | None = None,
+    ) -> bool:
+        """True when search_radius() would return anything; stops at the first hit."""
+        self._check_query(index, query)
+        axis_radii = self._check_bounds(radius, axis_radii)
+        found = self._within(
+            index, encode_query_to_vector(query), radius, axis_radii, None, None, first_only=True
+        )
+        return bool(found)
+
+    @staticmethod
+    def _check_query(index: KDTreeIndex, query: KDTreeQueryInput) -> None:
+        if index is None or not isinstance(index, KDTreeIndex):
+            raise InvalidKDTreeQuery("KDTreeIndex is required")
+        if query is None or not isinstance(query, KDTreeQueryInput):
+            raise InvalidKDTreeQuery("KDTreeQueryInput is required")
+        if index.dimensions != 6:
+            raise InvalidKDTreeQuery("KDTreeIndex dimensions must be 6")
+
+    @staticmethod
+    def _check_bounds(
+        radius: float | None,
+        axis_radii: Tuple[float, float, float] | None,
+    ) -> Tuple[float, float, float] | None:
+        if radius is None and axis_radii is None:
+            raise InvalidKDTreeQuery("radius or axis_radii is required")
+        if radius is not None and not radius >= 0.0:
+            raise InvalidKDTreeQuery("radius must be >= 0")
+        if axis_radii is None:
+            return None
+        if len(axis_radii) != 3:
+            raise InvalidKDTreeQuery("axis_radii must be (cue, target, second)")
+        if not all(value >= 0.0 for value in axis_radii):
+            raise InvalidKDTreeQuery("axis_radii must be >= 0")
+        return (axis_radii[0], axis_radii[1], axis_radii[2])
+
+    @staticmethod
+    def _within(
+        index: KDTreeIndex,
+        query_vector: Vector6D,
+        radius: float | None,
+        axis_radii: Tuple[float, float, float] | None,
+        scope: Iterable[RecordIdentity] | None,
+        scope_ordinals: Iterable[int] | None,
+        *,
+        first_only: bool = False,
+    ) -> Dict[int, float]:
+        """Candidate position -> distance_sq of its nearest in-bounds vector."""
+        if index.root is None:
+            return {}
+        within = _radius_test(query_vector, radius, axis_radii, index.axis_weights)
+        limits = _radius_limits(radius, axis_radii, index.axis_weights)
+        found: Dict[int, float] = {}
+
+        if scope_ordinals is not None or scope is not None:
+            positions = (
+                _ordinal_positions(index, scope_ordinals)
+                if scope_ordinals is not None
+                else _identity_positions(index, scope or ())
+            )
+            for position in positions:
+                item = index.candidates[position]
+                for vector in item.members or (item.vector,):
+                    distance_sq = within(vector, 0)
+                    if distance_sq is not None and distance_sq < found.get(position, math.inf):
+                        found[position] = distance_sq
+            return found
+
+        if isinstance(index.root, ImplicitKDTree):
+            return radius_search_implicit_tree(
+                index.root, query_vector, limits, within, first_only=first_only
+            )
+
+        positions_by_id = _positions_by_id(index)
+        stack: List[KDTreeNode] = [index.root]
+        while stack:
+            node = stack.pop()
+            distance_sq = None if node.deleted else within(node.item.vector, 0)
+            if distance_sq is not None:
+                found[positions_by_id[node.item.candidate_id]] = distance_sq
+                if first_only:
+                    return found
+            diff = query_vector[node.axis] - node.item.vector[node.axis]
+            near, far = (node.left, node.right) if diff <= 0 else (node.right, node.left)
+            if far is not None and abs(diff) <= limits[node.axis]:
+                stack.append(far)
+            if near is not None:
+                stack.append(near)
+        return found
+
+    @staticmethod
+    def _search_positions(
+        index: KDTreeIndex,
+        query_vector: Vector6D,
+        top_n: int,
+        positions: Sequence[int],
+    ) -> tuple[NearestCandidate, ...]:
+        # A tree walk cannot prune until every in-scope item has been seen, so
+        # scoped queries rank the in-scope vectors directly (same exact order).
+        return _rank_scope_many(index, [query_vector], top_n, positions)[0]
+
+    def search_many(
+        self,
+        index: KDTreeIndex,
+        queries: Sequence[KDTreeQueryInput],
+        *,
+        top_n: int,
+        scope: Iterable[RecordIdentity] | None = None,
+        scope_ordinals: Iterable[int] | None = None,
+    ) -> tuple[tuple[NearestCandidate, ...], ...]:
+        """
+        Batch search(): one shortlist per query, in input order.
+
+        Queries are validated and encoded up front, identical query vectors
+        share one tree walk, and a shared scope is resolved and flattened
+        once, then ranked for every query in a single pass over its rows.
+        Each entry equals search(index, query, top_n=top_n, scope=...,
+        scope_ordinals=...).
+        """
+        if index is None or not isinstance(index, KDTreeIndex):
+            raise InvalidKDTreeQuery("KDTreeIndex is required")
+        if top_n <= 0:
+            raise InvalidKDTreeQuery("top_n must be >= 1")
+        for query in queries:
+            self._check_query(index, query)
+        if index.root is None:
+            return tuple(() for _ in queries)
+
+        unique: Dict[Vector6D, List[int]] = {}
+        for position, query in enumerate(queries):
+            unique.setdefault(encode_query_to_vector(query), []).append(position)
+        vectors = list(unique)
+
+        if scope_ordinals is not None or scope is not None:
+            positions = (
+                _ordinal_positions(index, scope_ordinals)
+                if scope_ordinals is not None
+                else _identity_positions(index, scope or ())
+            )
+            shortlists = _rank_scope_many(index, vectors, top_n, positions)
+        else:
+            shortlists = [
+                self.search(index, queries[unique[vector][0]], top_n=top_n)
+                for vector in vectors
+            ]
+
+        results: List[tuple[NearestCandidate, ...]] = [()] * len(queries)
+        for vector, shortlist in zip(vectors, shortlists):
+            for position in unique[vector]:
+                results[position] = shortlist
+        return tuple(results)
+
+
+def _positions_by_id(index: KDTreeIndex) -> Mapping[RecordIdentity, int]:
+    return index.positions or {
+        item.candidate_id: position for position, item in enumerate(index.candidates)
+    }
+
+
+def _identity_positions(index: KDTreeIndex, scope: Iterable[RecordIdentity]) -> List[int]:
+    positions = _positions_by_id(index)
+    result = set()
+    for value in scope:
+        candidate_id = RecordIdentity(str(value))
+        position = positions.get(candidate_id)
+        if position is None:
+            raise InvalidKDTreeCandidate(f"candidate id not found in index: {candidate_id}")
+        result.add(position)
+    return sorted(result)
+
+
+def _ordinal_positions(index: KDTreeIndex, ordinals: Iterable[int]) -> List[int]:
+    table = index.ordinal_positions
+    result = set()
+    for ordinal in ordinals:
+        position = table[ordinal] if 0 <= ordinal < len(table) else -1
+        if position < 0:
+            raise InvalidKDTreeCandidate(f"record ordinal not found in index: {ordinal}")
+        result.add(position)
+    return sorted(result)
+
+
+def _rank_scope_many(
+    index: KDTreeIndex,
+    query_vectors: Sequence[Vector6D],
+    top_n: int,
+    positions: Sequence[int],
+) -> List[tuple[NearestCandidate, ...]]:
+    # One (vector, position) row per in-scope vector, flattened once per batch.
+    # Member encoding: distance to the nearest member pair; else the centroid vector.
+    candidates = index.candidates
+    w0, w1, w2, w3, w4, w5 = index.axis_weights
+    rows: List[Vector6D] = []
+    # (position, start, end) of each candidate's rows; one row unless members.
+    spans: List[tuple[int, int, int]] = []
+    multi_point = False
+    for position in positions:
+        item = candidates[position]
+        start = len(rows)
+        if item.members:
+            multi_point = True
+            rows.extend(item.members)
+        else:
+            rows.append(item.vector)
+        spans.append((position, start, len(rows)))
+
+    results = []
+    for q0, q1, q2, q3, q4, q5 in query_vectors:
+        # Same arithmetic as _distance_squared (w * (x * x), summed left to right).
+        distances = [
+            w0 * ((q0 - v0) * (q0 - v0))
+            + w1 * ((q1 - v1) * (q1 - v1))
+            + w2 * ((q2 - v2) * (q2 - v2))
+            + w3 * ((q3 - v3) * (q3 - v3))
+            + w4 * ((q4 - v4) * (q4 - v4))
+            + w5 * ((q5 - v5) * (q5 - v5))
+            for v0, v1, v2, v3, v4, v5 in rows
+        ]
+        if multi_point:
+            entries = [(min(distances[start:end]), position) for position, start, end in spans]
+        else:
+            entries = [(distance_sq, span[0]) for distance_sq, span in zip(distances, spans)]
+        results.append(_to_nearest(candidates, heapq.nsmallest(top_n, entries)))
+    return results
@@ -2,22 +2,66 @@
 
 from __future__ import annotations
 
+from typing import Iterable, Mapping, Sequence, Tuple
+
 from membership.interfaces import MembershipQuery
-from models import EnvelopeRecord, PublishedDataset, RecordIdentity
-from search.kd_tree import KDTreeQueryInput, create_kd_tree_builder, create_kd_tree_query
+from models import EnvelopeRecord, PublishedDataset, RecordIdentity, VerifiedDataset
+from search.kd_tree import (
+    KDTreeQueryInput,
+    NearestCandidate,
+    create_kd_tree_builder,
+    create_kd_tree_query,
+)
+from search.membership_index import (
+    MembershipIndex,
+    MembershipIndexQuery,
+    create_membership_index_builder,
+)
+from search.prepared import PreparedDataset
 from search.spatial_index import SpatialQuery, create_spatial_index_builder
 
+from .models import PrefilterResult
+
 
 def _record_identity(record: EnvelopeRecord) -> RecordIdentity:
     return RecordIdentity(str(record.strategy_ref))
 
 
+def _records_in_order(
+    records: Sequence[EnvelopeRecord],
+    positions_by_id: Mapping[RecordIdentity, Tuple[int, ...]],
+    shortlist: Iterable[NearestCandidate],
+) -> tuple[EnvelopeRecord, ...]:
+    positions = sorted(
+        position
+        for item in shortlist
+        for position in positions_by_id.get(RecordIdentity(str(item.candidate_id)), ())
+    )
+    return tuple(records[position] for position in positions)
+
+
+def _records_by_ordinals(
+    records: Sequence[EnvelopeRecord],
+    shortlist: Sequence[NearestCandidate],
+) -> tuple[EnvelopeRecord, ...] | None:
+    """Dataset order as a sort of record ordinals; None when an entry carries none."""
+    ordinals: list[int] = []
+    for item in shortlist:
+        if not item.record_ordinals:
+            return None
+        ordinals.extend(item.record_ordinals)
+    ordinals.sort()
+    return tuple(records[ordinal] for ordinal in ordinals)
+
+
 class DefaultCandidatePrefilterAdapter:
     """
     Spatial Index -> KDTree adapter for Membership.
 
     Returns candidate records in original dataset order so Membership output order
     remains identical to the legacy full-scan path.
+    A PreparedDataset reuses its prebuilt indexes instead of building per query.
+    A PrefilterResult from the orchestrator skips both steps (select_from_prefilter).
     """
 
     def __init__(self) -> None:
@@ -25,11 +69,24 @@ class DefaultCandidatePrefilterAdapter:
         self._kd_builder = create_kd_tree_builder()
         self._kd_query = create_kd_tree_query()
 
+    def select_from_prefilter(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        prefilter: PrefilterResult,
+    ) -> tuple[EnvelopeRecord, ...] | None:
+        """Same selection as select_records(), from an upstream Spatial/KDTree shortlist."""
+        if not (prefilter.candidate_ordinals or prefilter.candidate_ids) or not prefilter.shortlist:
+            return None
+        return self._ordered_records(dataset, prefilter.shortlist)
+
     def select_records(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
     ) -> tuple[EnvelopeRecord, ...] | None:
+        if isinstance(dataset, PreparedDataset):
+            return self._select_prepared(dataset, query)
+
         spatial_index = self._spatial_builder.build(dataset)
         spatial_result = self._spatial_builder.query(
             spatial_index,
@@ -48,9 +105,138 @@ class DefaultCandidatePrefilterAdapter:
         if not shortlist:
             return None
 
+        return self._ordered_records(dataset, shortlist)
+
+    def _select_prepared(
+        self,
+        prepared: PreparedDataset,
+        query: MembershipQuery,
+    ) -> tuple[EnvelopeRecord, ...] | None:
+        spatial_result = self._spatial_builder.query(
+            prepared.spatial_index,
+            SpatialQuery(cue=query.cue, target=query.target, second=query.second),
+        )
+        candidate_ordinals = spatial_result.candidate_ordinals
+        if not candidate_ordinals:
+            return None
+
+        shortlist = self._kd_query.search(
+            prepared.kd_index,
+            KDTreeQueryInput(cue=query.cue, target=query.target, second=query.second),
+            top_n=len(candidate_ordinals),
+            scope_ordinals=candidate_ordinals,
+        )
+        if not shortlist:
+            return None
+
+        return self._ordered_records(prepared, shortlist)
+
+    @staticmethod
+    def _ordered_records(
+        dataset: PublishedDataset | PreparedDataset,
+        shortlist: Sequence[NearestCandidate],
+    ) -> tuple[EnvelopeRecord, ...]:
+        # Dataset order from the shortlist's record ordinals (an int sort), else
+        # via a position table when one exists (no corpus rescan).
+        ordered = _records_by_ordinals(dataset.records or [], shortlist)
+        if ordered is not None:
+            return ordered
+        if isinstance(dataset, PreparedDataset):
+            return _records_in_order(dataset.records, dataset.record_positions, shortlist)
+        if isinstance(dataset, VerifiedDataset):
+            return _records_in_order(dataset.records, dataset.record_ordinals, shortlist)
         shortlist_ids = {RecordIdentity(str(item.candidate_id)) for item in shortlist}
         return tuple(
             record
             for record in (dataset.records or [])
             if _record_identity(record) in shortlist_ids
         )
+
+
+class ExactMatchPrefilterAdapter:
+    """
+    Membership Index adapter: exact (x, y) postings per axis.
+
+    A query is three hash lookups plus a posting-list intersection, so the
+    selection is exactly the member set in dataset order (``complete``: an
+    empty selection means no members, no full-scan fallback needed).
+    A PreparedDataset reuses its Membership Index (prepare with
+    ``membership_index=True``); otherwise one is built per call.
+    """
+
+    complete = True
+    prepared_indexes = frozenset({"membership_index"})
+
+    def __init__(self) -> None:
+        self._index_builder = create_membership_index_builder()
+
+    def select_records(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        query: MembershipQuery,
+    ) -> tuple[EnvelopeRecord, ...] | None:
+        if isinstance(dataset, PreparedDataset):
+            index = dataset.membership_index
+            if index is None:
+                index = self._index_builder.build(dataset.dataset)
+        else:
+            index = self._index_builder.build(dataset)
+
+        result = self._index_builder.query(
+            index,
+            MembershipIndexQuery(cue=query.cue, target=query.target, second=query.second),
+        )
+        records = dataset.records or []
+        return tuple(records[ordinal] for ordinal in result.ordinals)
+
+
+class ToleranceMatchPrefilterAdapter:
+    """
+    Membership Index adapter for tolerance mode (epsilon-sized buckets).
+
+    Each axis probes its bucket and the eight neighbours, so the selection is
+    a dataset-ordered superset of records within ``tolerance`` (``complete``).
+    A PreparedDataset reuses its tolerance index when the epsilon matches
+    (prepare with ``membership_tolerance=tolerance``); otherwise the index is
+    built once and reused while queries pass the same dataset.
+    """
+
+    complete = True
+    prepared_indexes = frozenset({"membership_tolerance"})
+
+    def __init__(self, tolerance: float) -> None:
+        self._tolerance = tolerance
+        self._index_builder = create_membership_index_builder()
+        self._last_built: tuple[PublishedDataset, MembershipIndex] | None = None
+
+    @property
+    def tolerance(self) -> float:
+        return self._tolerance
+
+    def select_records(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        query: MembershipQuery,
+    ) -> tuple[EnvelopeRecord, ...] | None:
+        index = None
+        if isinstance(dataset, PreparedDataset):
+            prepared_index = dataset.tolerance_index
+            if prepared_index is not None and prepared_index.epsilon == self._tolerance:
+                index = prepared_index
+            published = dataset.dataset
+        else:
+            published = dataset
+        if index is None:
+            last = self._last_built
+            if last is not None and last[0] is published:
+                index = last[1]
+            else:
+                index = self._index_builder.build(published, epsilon=self._tolerance)
+                self._last_built = (published, index)
+
+        result = self._index_builder.query(
+            index,
+            MembershipIndexQuery(cue=query.cue, target=query.target, second=query.second),
+        )
+        records = dataset.records or []
+        return tuple(records[ordinal] for ordinal in result.ordinals)
@@ -6,15 +6,35 @@ from typing import Protocol, runtime_checkable
 
 from membership.interfaces import MembershipQuery
 from models import EnvelopeRecord, PublishedDataset
+from search.prepared import PreparedDataset
 
 
 @runtime_checkable
 class CandidatePrefilterAdapter(Protocol):
-    """Return candidate records for optimized Membership, or None for fallback."""
+    """
+    Return candidate records for optimized Membership, or None for fallback.
+
+    An empty selection also falls back to the full scan unless the adapter
+    sets ``complete = True`` (its selection never drops a member). Adapters
+    that read optional PreparedDataset indexes name those fields in
+    ``prepared_indexes`` so preparers build them (see MembershipEngine).
+    """
 
     def select_records(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
     ) -> tuple[EnvelopeRecord, ...] | None:
         ...
+
+
+@runtime_checkable
+class MembershipNegativeCheck(Protocol):
+    """Pre-check ahead of the full-scan fallback: True proves no record can match."""
+
+    def rejects(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        query: MembershipQuery,
+    ) -> bool:
+        ...
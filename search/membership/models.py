@@ -0,0 +1,26 @@
+"""Models for optimized Membership candidate prefilter."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+from models import RecordIdentity
+from search.kd_tree.models import NearestCandidate
+
+
+@dataclass(frozen=True)
+class PrefilterResult:
+    """
+    Spatial Index → KDTree shortlist already computed for one query.
+
+    Passed from the orchestrator so Membership does not repeat the prefilter.
+    """
+
+    # Spatial Index candidate ids (empty on a prefilter miss).
+    candidate_ids: Tuple[RecordIdentity, ...] = ()
+    # KDTree shortlist over the Spatial Index candidates.
+    shortlist: Tuple[NearestCandidate, ...] = ()
+    # Spatial Index candidate record ordinals (the orchestrator passes these
+    # instead of materialising ``candidate_ids``).
+    candidate_ordinals: Tuple[int, ...] = ()
@@ -0,0 +1,35 @@
+"""Negative-result pre-checks for Membership misses."""
+
+from __future__ import annotations
+
+from membership.interfaces import MembershipQuery
+from models import PublishedDataset
+from search.membership_filter import MembershipFilterQuery, create_membership_filter_builder
+from search.prepared import PreparedDataset
+
+
+class BloomNegativeCheck:
+    """
+    Reject exact-mode queries whose target, cue or second appears in no record.
+
+    Uses the PreparedDataset's per-axis Bloom filters (built once per dataset
+    by preparers with ``membership_filter=True``); a dataset without them is
+    never rejected.
+    """
+
+    prepared_indexes = frozenset({"membership_filter"})
+
+    def __init__(self) -> None:
+        self._filter_builder = create_membership_filter_builder()
+
+    def rejects(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        query: MembershipQuery,
+    ) -> bool:
+        if not isinstance(dataset, PreparedDataset) or dataset.membership_filter is None:
+            return False
+        return not self._filter_builder.may_match(
+            dataset.membership_filter,
+            MembershipFilterQuery(cue=query.cue, target=query.target, second=query.second),
+        )
@@ -0,0 +1,30 @@
+"""
+Membership Filter — per-axis Bloom filters over exact record points.
+
+A negative answer proves no record can match a query exactly, so misses
+skip the full scan. Runtime-derived and in-memory only.
+"""
+
+from .builder import DefaultMembershipFilterBuilder
+from .contract import DEFAULT_FALSE_POSITIVE_RATE
+from .exceptions import (
+    InvalidMembershipFilterDataset,
+    InvalidMembershipFilterQuery,
+    MembershipFilterBuildFailure,
+    MembershipFilterError,
+)
+from .factory import create_membership_filter_builder
+from .models import BloomFilter, MembershipFilter, MembershipFilterQuery
+
+__all__ = [
+    "BloomFilter",
+    "DEFAULT_FALSE_POSITIVE_RATE",
+    "DefaultMembershipFilterBuilder",
+    "InvalidMembershipFilterDataset",
+    "InvalidMembershipFilterQuery",
+    "MembershipFilter",
+    "MembershipFilterBuildFailure",
+    "MembershipFilterError",
+    "MembershipFilterQuery",
+    "create_membership_filter_builder",
+]
@@ -0,0 +1,213 @@
+"""Membership Filter builder and query API."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Set, Tuple
+
+from models import ColumnarDataset, EnvelopeRecord, Point, PublishedDataset
+
+from .contract import DEFAULT_FALSE_POSITIVE_RATE
+from .exceptions import (
+    InvalidMembershipFilterDataset,
+    InvalidMembershipFilterQuery,
+    MembershipFilterBuildFailure,
+)
+from .models import BloomFilter, MembershipFilter, MembershipFilterQuery
+
+_MASK64 = (1 << 64) - 1
+
+PointKey = Tuple[float, float]
+
+
+def _point_key(point: Point) -> PointKey | None:
+    x, y = point.x, point.y
+    if x != x or y != y:
+        return None
+    return (x, y)
+
+
+def _mix64(value: int) -> int:
+    # splitmix64 finalizer: spreads Python's tuple hash over 64 bits.
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def _bit_positions(key: PointKey, bit_count: int, hash_count: int) -> Iterator[int]:
+    # Double hashing (Kirsch–Mitzenmacher). hash() of float tuples is not salted.
+    first = _mix64(hash(key) & _MASK64)
+    second = _mix64(first) | 1
+    for i in range(hash_count):
+        yield ((first + i * second) & _MASK64) % bit_count
+
+
+def build_bloom_filter(keys: Set[PointKey], false_positive_rate: float) -> BloomFilter:
+    """Size a Bloom filter for ``keys`` at ``false_positive_rate`` and fill it."""
+    item_count = len(keys)
+    if item_count == 0:
+        return BloomFilter(bits=b"", bit_count=0, hash_count=0, item_count=0)
+    bit_count = max(8, math.ceil(-item_count * math.log(false_positive_rate) / (math.log(2) ** 2)))
+    hash_count = max(1, round(bit_count / item_count * math.log(2)))
+    bits = bytearray((bit_count + 7) // 8)
+    for key in keys:
+        for position in _bit_positions(key, bit_count, hash_count):
+            bits[position >> 3] |= 1 << (position & 7)
+    return BloomFilter(
+        bits=bytes(bits),
+        bit_count=bit_count,
+        hash_count=hash_count,
+        item_count=item_count,
+    )
+
+
+def add_to_bloom_filter(
+    bloom: BloomFilter,
+    keys: Set[PointKey],
+    false_positive_rate: float,
+) -> BloomFilter:
+    """``bloom`` with ``keys`` set too (same size; an empty filter is sized afresh)."""
+    if not keys:
+        return bloom
+    if bloom.bit_count == 0:
+        return build_bloom_filter(keys, false_positive_rate)
+    bits = bytearray(bloom.bits)
+    for key in keys:
+        for position in _bit_positions(key, bloom.bit_count, bloom.hash_count):
+            bits[position >> 3] |= 1 << (position & 7)
+    return BloomFilter(
+        bits=bytes(bits),
+        bit_count=bloom.bit_count,
+        hash_count=bloom.hash_count,
+        item_count=bloom.item_count + len(keys),
+    )
+
+
+def might_contain(bloom: BloomFilter, point: Point) -> bool:
+    """False proves no indexed point equals ``point``; True may be a false positive."""
+    key = _point_key(point)
+    if key is None or bloom.bit_count == 0:
+        return False
+    bits = bloom.bits
+    for position in _bit_positions(key, bloom.bit_count, bloom.hash_count):
+        if not bits[position >> 3] & (1 << (position & 7)):
+            return False
+    return True
+
+
+def _add_keys(keys: Set[PointKey], points: Iterable[Point]) -> None:
+    for point in points:
+        key = _point_key(point)
+        if key is not None:
+            keys.add(key)
+
+
+def _add_column(keys: Set[PointKey], dataset: ColumnarDataset, column: str) -> None:
+    for x, y, _ in dataset.points(column):
+        if x == x and y == y:
+            keys.add((x, y))
+
+
+class DefaultMembershipFilterBuilder:
+    """Build per-axis Bloom filters and reject queries that cannot match."""
+
+    def __init__(self, *, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE) -> None:
+        if not 0.0 < false_positive_rate < 1.0:
+            raise ValueError("false_positive_rate must be in (0, 1)")
+        self._false_positive_rate = false_positive_rate
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Build options as JSON values (recorded in index sidecars)."""
+        return {"falsePositiveRate": self._false_positive_rate}
+
+    def build(self, dataset: PublishedDataset) -> MembershipFilter:
+        if dataset is None:
+            raise InvalidMembershipFilterDataset("PublishedDataset is required")
+        if not isinstance(dataset, PublishedDataset):
+            raise InvalidMembershipFilterDataset("dataset must be a PublishedDataset model")
+
+        try:
+            target: Set[PointKey] = set()
+            cue: Set[PointKey] = set()
+            second: Set[PointKey] = set()
+            records = dataset.records or []
+            columnar = isinstance(dataset, ColumnarDataset)
+            if columnar:
+                _add_column(target, dataset, "target")
+                _add_column(cue, dataset, "cue")
+                _add_column(second, dataset, "second")
+            for index, record in enumerate(() if columnar else records):
+                if not isinstance(record, EnvelopeRecord):
+                    raise InvalidMembershipFilterDataset(
+                        f"records[{index}] is not an EnvelopeRecord"
+                    )
+                _add_keys(target, (record.target,))
+                _add_keys(cue, record.cue_set)
+                _add_keys(second, record.second_set)
+
+            rate = self._false_positive_rate
+            return MembershipFilter(
+                target=build_bloom_filter(target, rate),
+                cue=build_bloom_filter(cue, rate),
+                second=build_bloom_filter(second, rate),
+                record_count=len(records),
+            )
+        except InvalidMembershipFilterDataset:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise MembershipFilterBuildFailure(str(exc), cause=exc) from exc
+
+    def update(
+        self,
+        membership_filter: MembershipFilter,
+        dataset: PublishedDataset,
+        previous: Mapping[int, Optional[EnvelopeRecord]],
+    ) -> MembershipFilter:
+        """
+        Add the points of records written at ``previous`` ordinals (see
+        DefaultMembershipIndexBuilder.update). Bloom filters cannot drop
+        members: points of removed records stay set, which only costs false
+        positives until the next build(); ``item_count`` is an upper bound.
+        """
+        if membership_filter is None or not isinstance(membership_filter, MembershipFilter):
+            raise InvalidMembershipFilterDataset("MembershipFilter is required")
+        if dataset is None or not isinstance(dataset, PublishedDataset):
+            raise InvalidMembershipFilterDataset("dataset must be a PublishedDataset model")
+
+        records = dataset.records or []
+        target: Set[PointKey] = set()
+        cue: Set[PointKey] = set()
+        second: Set[PointKey] = set()
+        for ordinal in previous:
+            if ordinal >= len(records):
+                continue
+            record = records[ordinal]
+            if not isinstance(record, EnvelopeRecord):
+                raise InvalidMembershipFilterDataset(f"records[{ordinal}] is not an EnvelopeRecord")
+            _add_keys(target, (record.target,))
+            _add_keys(cue, record.cue_set)
+            _add_keys(second, record.second_set)
+        rate = self._false_positive_rate
+        try:
+            return MembershipFilter(
+                target=add_to_bloom_filter(membership_filter.target, target, rate),
+                cue=add_to_bloom_filter(membership_filter.cue, cue, rate),
+                second=add_to_bloom_filter(membership_filter.second, second, rate),
+                record_count=len(records),
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise MembershipFilterBuildFailure(str(exc), cause=exc) from exc
+
+    def may_match(self, membership_filter: MembershipFilter, query: MembershipFilterQuery) -> bool:
+        """False proves no record matches Target ∧ Cue ∧ Second exactly."""
+        if membership_filter is None or not isinstance(membership_filter, MembershipFilter):
+            raise InvalidMembershipFilterQuery("MembershipFilter is required")
+        if query is None or not isinstance(query, MembershipFilterQuery):
+            raise InvalidMembershipFilterQuery("MembershipFilterQuery is required")
+        return (
+            might_contain(membership_filter.target, query.target)
+            and might_contain(membership_filter.cue, query.cue)
+            and might_contain(membership_filter.second, query.second)
+        )
@@ -0,0 +1,6 @@
+"""Membership Filter contract constants."""
+
+from __future__ import annotations
+
+# Target false-positive rate per axis filter.
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
@@ -0,0 +1,23 @@
+"""Membership Filter exceptions."""
+
+from __future__ import annotations
+
+
+class MembershipFilterError(Exception):
+    """Base error for Membership Filter."""
+
+
+class InvalidMembershipFilterDataset(MembershipFilterError):
+    """PublishedDataset input is missing or invalid."""
+
+
+class InvalidMembershipFilterQuery(MembershipFilterError):
+    """Membership Filter query input is missing or invalid."""
+
+
+class MembershipFilterBuildFailure(MembershipFilterError):
+    """Membership Filter build failed unexpectedly."""
+
+    def __init__(self, message: str, *, cause: BaseException | None = None) -> None:
+        super().__init__(message)
+        self.cause = cause
@@ -0,0 +1,14 @@
+"""Factory helpers for Membership Filter."""
+
+from __future__ import annotations
+
+from .builder import DefaultMembershipFilterBuilder
+from .contract import DEFAULT_FALSE_POSITIVE_RATE
+
+
+def create_membership_filter_builder(
+    *,
+    false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+) -> DefaultMembershipFilterBuilder:
+    """Create Membership Filter builder."""
+    return DefaultMembershipFilterBuilder(false_positive_rate=false_positive_rate)
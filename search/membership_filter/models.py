@@ -0,0 +1,36 @@
+"""Membership Filter models."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from models import Point
+
+
+@dataclass(frozen=True)
+class MembershipFilterQuery:
+    """Exact query coordinates."""
+
+    cue: Point
+    target: Point
+    second: Point
+
+
+@dataclass(frozen=True)
+class BloomFilter:
+    """Immutable Bloom filter over exact (x, y) keys."""
+
+    bits: bytes
+    bit_count: int
+    hash_count: int
+    item_count: int
+
+
+@dataclass(frozen=True)
+class MembershipFilter:
+    """One Bloom filter per Membership axis."""
+
+    target: BloomFilter
+    cue: BloomFilter
+    second: BloomFilter
+    record_count: int = 0
@@ -0,0 +1,37 @@
+"""
+Membership Index — exact-match point postings for Membership prefiltering.
+
+Maps each exact (x, y) — or, in tolerance mode, each epsilon-sized bucket —
+to the ordinals of records holding it, per axis (target / cue / second).
+Runtime-derived and in-memory only.
+"""
+
+from .builder import DefaultMembershipIndexBuilder
+from .exceptions import (
+    InvalidMembershipIndexDataset,
+    InvalidMembershipIndexQuery,
+    MembershipIndexBuildFailure,
+    MembershipIndexError,
+)
+from .factory import create_membership_index_builder
+from .models import (
+    BucketKey,
+    MembershipIndex,
+    MembershipIndexQuery,
+    MembershipIndexResult,
+    PointKey,
+)
+
+__all__ = [
+    "BucketKey",
+    "DefaultMembershipIndexBuilder",
+    "InvalidMembershipIndexDataset",
+    "InvalidMembershipIndexQuery",
+    "MembershipIndex",
+    "MembershipIndexBuildFailure",
+    "MembershipIndexError",
+    "MembershipIndexQuery",
+    "MembershipIndexResult",
+    "PointKey",
+    "create_membership_index_builder",
+]
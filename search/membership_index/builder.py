@@ -0,0 +1,292 @@
+"""Membership Index builder and query API."""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from types import MappingProxyType
+from typing import (
+    Callable,
+    DefaultDict,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from models import ColumnarDataset, EnvelopeRecord, Point, PublishedDataset
+
+from .exceptions import (
+    InvalidMembershipIndexDataset,
+    InvalidMembershipIndexQuery,
+    MembershipIndexBuildFailure,
+)
+from .models import (
+    BucketKey,
+    MembershipIndex,
+    MembershipIndexQuery,
+    MembershipIndexResult,
+    PointKey,
+)
+
+# Buckets are a hair wider than epsilon so float rounding in x / width can
+# never push a point within epsilon more than one bucket away.
+_BUCKET_WIDTH_FACTOR = 1.0 + 1e-9
+
+
+def xy_key(x: float, y: float) -> PointKey | None:
+    """point_key() from raw coordinates."""
+    if x != x or y != y:
+        return None
+    return (x, y)
+
+
+def xy_bucket_key(x: float, y: float, width: float) -> BucketKey | None:
+    """bucket_key() from raw coordinates."""
+    if not (math.isfinite(x) and math.isfinite(y)):
+        return None
+    return (math.floor(x / width), math.floor(y / width))
+
+
+def point_key(point: Point) -> PointKey | None:
+    """Hash key for exact equality; None for NaN (never equal to anything)."""
+    return xy_key(point.x, point.y)
+
+
+def bucket_key(point: Point, width: float) -> BucketKey | None:
+    """Quantized bucket for tolerance mode; None for non-finite coordinates."""
+    return xy_bucket_key(point.x, point.y, width)
+
+
+def _add_points(
+    table: DefaultDict[Hashable, List[int]],
+    points: Iterable[Point],
+    ordinal: int,
+    key_of: Callable[[Point], Optional[Hashable]],
+) -> None:
+    for point in points:
+        key = key_of(point)
+        if key is None:
+            continue
+        posting = table[key]
+        # Ordinals arrive ascending; skip repeats of the same record.
+        if not posting or posting[-1] != ordinal:
+            posting.append(ordinal)
+
+
+def _add_columnar(
+    table: DefaultDict[Hashable, List[int]],
+    dataset: ColumnarDataset,
+    column: str,
+    epsilon: float,
+) -> None:
+    # Same postings as _add_points over the record views, read from the columns.
+    width = epsilon * _BUCKET_WIDTH_FACTOR
+    for x, y, ordinal in dataset.points(column):
+        key = xy_bucket_key(x, y, width) if epsilon > 0.0 else xy_key(x, y)
+        if key is None:
+            continue
+        posting = table[key]
+        if not posting or posting[-1] != ordinal:
+            posting.append(ordinal)
+
+
+def _freeze(table: Mapping[Hashable, List[int]]) -> Mapping[Hashable, Tuple[int, ...]]:
+    return MappingProxyType({key: tuple(items) for key, items in table.items()})
+
+
+def _key_function(epsilon: float) -> Callable[[Point], Optional[Hashable]]:
+    if epsilon > 0.0:
+        width = epsilon * _BUCKET_WIDTH_FACTOR
+        return lambda point: bucket_key(point, width)
+    return point_key
+
+
+def _record_axes(record: EnvelopeRecord) -> Tuple[Sequence[Point], ...]:
+    return ((record.target,), record.cue_set, record.second_set)
+
+
+def _update_postings(
+    table: Mapping[Hashable, Tuple[int, ...]],
+    axis: int,
+    records: Sequence[EnvelopeRecord],
+    previous: Mapping[int, Optional[EnvelopeRecord]],
+    key_of: Callable[[Point], Optional[Hashable]],
+) -> Mapping[Hashable, Tuple[int, ...]]:
+    count = len(records)
+    added: DefaultDict[Hashable, Set[int]] = defaultdict(set)
+    touched: Set[Hashable] = set()
+    for ordinal, old in previous.items():
+        if old is not None:
+            touched.update(key_of(point) for point in _record_axes(old)[axis])
+        if ordinal < count:
+            for point in _record_axes(records[ordinal])[axis]:
+                key = key_of(point)
+                touched.add(key)
+                added[key].add(ordinal)
+    touched.discard(None)
+    if not touched:
+        return table
+
+    # MappingProxyType.copy() copies the wrapped dict in C; dict(proxy) does not.
+    updated: Dict[Hashable, Tuple[int, ...]] = (
+        table.copy() if isinstance(table, MappingProxyType) else dict(table)
+    )
+    for key in touched:
+        kept = {ordinal for ordinal in updated.pop(key, ()) if ordinal not in previous}
+        posting = tuple(sorted(kept | added.get(key, set())))
+        if posting:
+            updated[key] = posting
+    return MappingProxyType(updated)
+
+
+def _neighbourhood_posting(
+    table: Mapping[Hashable, Tuple[int, ...]],
+    key: BucketKey,
+) -> Tuple[int, ...]:
+    col, row = key
+    merged: set[int] = set()
+    for d_col in (-1, 0, 1):
+        for d_row in (-1, 0, 1):
+            merged.update(table.get((col + d_col, row + d_row), ()))
+    return tuple(sorted(merged))
+
+
+def _contains(posting: Tuple[int, ...], ordinal: int) -> bool:
+    position = bisect_left(posting, ordinal)
+    return position < len(posting) and posting[position] == ordinal
+
+
+def intersect_postings(*postings: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Ascending ordinals present in every posting list (shortest list drives)."""
+    if not postings:
+        return ()
+    ordered = sorted(postings, key=len)
+    shortest, others = ordered[0], ordered[1:]
+    return tuple(
+        ordinal
+        for ordinal in shortest
+        if all(_contains(posting, ordinal) for posting in others)
+    )
+
+
+class DefaultMembershipIndexBuilder:
+    """Build per-axis postings and answer Target ∧ Cue ∧ Second queries."""
+
+    def build(self, dataset: PublishedDataset, *, epsilon: float = 0.0) -> MembershipIndex:
+        """Exact-match index, or a tolerance index when ``epsilon`` > 0."""
+        if dataset is None:
+            raise InvalidMembershipIndexDataset("PublishedDataset is required")
+        if not isinstance(dataset, PublishedDataset):
+            raise InvalidMembershipIndexDataset("dataset must be a PublishedDataset model")
+        if not (epsilon >= 0.0 and math.isfinite(epsilon)):
+            raise InvalidMembershipIndexDataset("epsilon must be a finite value >= 0")
+
+        key_of = _key_function(epsilon)
+
+        try:
+            target: DefaultDict[Hashable, List[int]] = defaultdict(list)
+            cue: DefaultDict[Hashable, List[int]] = defaultdict(list)
+            second: DefaultDict[Hashable, List[int]] = defaultdict(list)
+
+            records = dataset.records or []
+            columnar = isinstance(dataset, ColumnarDataset)
+            if columnar:
+                _add_columnar(target, dataset, "target", epsilon)
+                _add_columnar(cue, dataset, "cue", epsilon)
+                _add_columnar(second, dataset, "second", epsilon)
+            for ordinal, record in enumerate(() if columnar else records):
+                if not isinstance(record, EnvelopeRecord):
+                    raise InvalidMembershipIndexDataset(
+                        f"records[{ordinal}] is not an EnvelopeRecord"
+                    )
+                _add_points(target, (record.target,), ordinal, key_of)
+                _add_points(cue, record.cue_set, ordinal, key_of)
+                _add_points(second, record.second_set, ordinal, key_of)
+
+            return MembershipIndex(
+                target_postings=_freeze(target),
+                cue_postings=_freeze(cue),
+                second_postings=_freeze(second),
+                record_count=len(records),
+                epsilon=epsilon,
+            )
+        except InvalidMembershipIndexDataset:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise MembershipIndexBuildFailure(str(exc), cause=exc) from exc
+
+    def update(
+        self,
+        index: MembershipIndex,
+        dataset: PublishedDataset,
+        previous: Mapping[int, Optional[EnvelopeRecord]],
+    ) -> MembershipIndex:
+        """
+        Apply record edits without a rebuild; equals build(dataset, epsilon=index.epsilon).
+
+        ``previous`` maps every changed ordinal to the record it held before
+        (None when appended); ordinals past the end of ``dataset.records``
+        were removed. Only postings keyed by an old or new point are rewritten.
+        """
+        if index is None or not isinstance(index, MembershipIndex):
+            raise InvalidMembershipIndexDataset("MembershipIndex is required")
+        if dataset is None or not isinstance(dataset, PublishedDataset):
+            raise InvalidMembershipIndexDataset("dataset must be a PublishedDataset model")
+
+        records = dataset.records or []
+        for ordinal in previous:
+            if ordinal < len(records) and not isinstance(records[ordinal], EnvelopeRecord):
+                raise InvalidMembershipIndexDataset(
+                    f"records[{ordinal}] is not an EnvelopeRecord"
+                )
+        try:
+            key_of = _key_function(index.epsilon)
+            return MembershipIndex(
+                target_postings=_update_postings(
+                    index.target_postings, 0, records, previous, key_of
+                ),
+                cue_postings=_update_postings(index.cue_postings, 1, records, previous, key_of),
+                second_postings=_update_postings(
+                    index.second_postings, 2, records, previous, key_of
+                ),
+                record_count=len(records),
+                epsilon=index.epsilon,
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise MembershipIndexBuildFailure(str(exc), cause=exc) from exc
+
+    def query(
+        self,
+        index: MembershipIndex,
+        query: MembershipIndexQuery,
+    ) -> MembershipIndexResult:
+        if index is None or not isinstance(index, MembershipIndex):
+            raise InvalidMembershipIndexQuery("MembershipIndex is required")
+        if query is None or not isinstance(query, MembershipIndexQuery):
+            raise InvalidMembershipIndexQuery("MembershipIndexQuery is required")
+
+        width = index.epsilon * _BUCKET_WIDTH_FACTOR
+        postings = []
+        for table, point in (
+            (index.target_postings, query.target),
+            (index.cue_postings, query.cue),
+            (index.second_postings, query.second),
+        ):
+            if index.epsilon > 0.0:
+                bucket = bucket_key(point, width)
+                posting = _neighbourhood_posting(table, bucket) if bucket is not None else ()
+            else:
+                key = point_key(point)
+                posting = table.get(key, ()) if key is not None else ()
+            if not posting:
+                return MembershipIndexResult(ordinals=())
+            postings.append(posting)
+        # Tolerance mode: a superset; callers confirm distances per record.
+        return MembershipIndexResult(ordinals=intersect_postings(*postings))
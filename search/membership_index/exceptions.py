@@ -0,0 +1,23 @@
+"""Membership Index exceptions."""
+
+from __future__ import annotations
+
+
+class MembershipIndexError(Exception):
+    """Base error for Membership Index."""
+
+
+class InvalidMembershipIndexDataset(MembershipIndexError):
+    """PublishedDataset input is missing or invalid."""
+
+
+class InvalidMembershipIndexQuery(MembershipIndexError):
+    """Membership Index query input is missing or invalid."""
+
+
+class MembershipIndexBuildFailure(MembershipIndexError):
+    """Membership Index build/query failed unexpectedly."""
+
+    def __init__(self, message: str, *, cause: BaseException | None = None) -> None:
+        super().__init__(message)
+        self.cause = cause
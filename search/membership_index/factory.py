@@ -0,0 +1,10 @@
+"""Factory helpers for Membership Index."""
+
+from __future__ import annotations
+
+from .builder import DefaultMembershipIndexBuilder
+
+
+def create_membership_index_builder() -> DefaultMembershipIndexBuilder:
+    """Create Membership Index builder."""
+    return DefaultMembershipIndexBuilder()
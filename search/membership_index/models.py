@@ -0,0 +1,53 @@
+"""Membership Index models."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping, Tuple, Union
+
+from models import Point
+
+# Exact point coordinates used as a hash key.
+PointKey = Tuple[float, float]
+# Quantized (col, row) bucket used as a hash key in tolerance mode.
+BucketKey = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class MembershipIndexQuery:
+    """Exact query coordinates."""
+
+    cue: Point
+    target: Point
+    second: Point
+
+
+@dataclass(frozen=True)
+class MembershipIndexResult:
+    """
+    Ordinals of records matching all three axes, ascending (dataset order).
+
+    In tolerance mode this is a superset (bucket neighbourhoods).
+    """
+
+    ordinals: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class MembershipIndex:
+    """
+    Postings per axis: key -> ascending record ordinals.
+
+    epsilon == 0: keys are exact points (exact-match mode).
+    epsilon > 0: keys are epsilon-sized buckets; queries probe the 3x3
+    neighbourhood and return a superset of records within epsilon.
+
+    Ordinals index PublishedDataset.records; each record appears at most once
+    per posting list even when a set repeats a point.
+    """
+
+    target_postings: Mapping[Union[PointKey, BucketKey], Tuple[int, ...]] = field(default_factory=dict)
+    cue_postings: Mapping[Union[PointKey, BucketKey], Tuple[int, ...]] = field(default_factory=dict)
+    second_postings: Mapping[Union[PointKey, BucketKey], Tuple[int, ...]] = field(default_factory=dict)
+    record_count: int = 0
+    epsilon: float = 0.0
@@ -0,0 +1,50 @@
+"""
+Prepared Dataset — PublishedDataset with prebuilt runtime indexes.
+
+Spatial Index and KDTree are built once per dataset and reused by
+Search Runtime, the Enhancement orchestrator and the Membership prefilter.
+PublishedDataset remains the only search input; indexes live in memory and
+may be persisted as an index sidecar next to a Published Package.
+"""
+
+from .builder import DefaultDatasetPreparer
+from .cache import PreparedDatasetCache
+from .contract import (
+    INDEX_SIDECAR_DIRNAME,
+    INDEX_SIDECAR_FILENAME,
+    INDEX_SIDECAR_FORMAT,
+)
+from .edit import edit_dataset
+from .exceptions import (
+    InvalidPreparedDataset,
+    PreparedDatasetBuildFailure,
+    PreparedDatasetError,
+    StaleIndexSidecar,
+)
+from .factory import (
+    create_dataset_preparer,
+    create_prepared_dataset_cache,
+    prepare_dataset,
+)
+from .models import DatasetEdit, PreparedDataset
+from .sidecar import decode_index_sidecar, encode_index_sidecar
+
+__all__ = [
+    "INDEX_SIDECAR_DIRNAME",
+    "INDEX_SIDECAR_FILENAME",
+    "INDEX_SIDECAR_FORMAT",
+    "DatasetEdit",
+    "DefaultDatasetPreparer",
+    "InvalidPreparedDataset",
+    "PreparedDataset",
+    "PreparedDatasetBuildFailure",
+    "PreparedDatasetCache",
+    "PreparedDatasetError",
+    "StaleIndexSidecar",
+    "create_dataset_preparer",
+    "create_prepared_dataset_cache",
+    "decode_index_sidecar",
+    "edit_dataset",
+    "encode_index_sidecar",
+    "prepare_dataset",
+]
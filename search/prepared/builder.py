@@ -0,0 +1,202 @@
+"""Prepared Dataset builder."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Any, DefaultDict, Dict, Iterable, Mapping, Sequence
+
+from models import EnvelopeRecord, PublishedDataset, RecordIdentity, StrategyRef, VerifiedDataset
+from search.kd_tree import create_kd_tree_builder
+from search.kd_tree.builder import DefaultKDTreeBuilder
+from search.membership_filter import create_membership_filter_builder
+from search.membership_filter.builder import DefaultMembershipFilterBuilder
+from search.membership_index import create_membership_index_builder
+from search.membership_index.builder import DefaultMembershipIndexBuilder
+from search.spatial_index import create_spatial_index_builder
+from search.spatial_index.builder import DefaultSpatialIndexBuilder
+
+from .edit import edit_dataset
+from .exceptions import InvalidPreparedDataset, PreparedDatasetBuildFailure
+from .models import PreparedDataset
+
+
+def _record_identity(record: EnvelopeRecord) -> RecordIdentity:
+    return RecordIdentity(str(record.strategy_ref))
+
+
+def _record_positions(dataset: PublishedDataset) -> Mapping[RecordIdentity, Sequence[int]]:
+    positions: DefaultDict[RecordIdentity, list[int]] = defaultdict(list)
+    for index, record in enumerate(dataset.records or []):
+        if not isinstance(record, EnvelopeRecord):
+            raise InvalidPreparedDataset(f"records[{index}] is not an EnvelopeRecord")
+        positions[_record_identity(record)].append(index)
+    return positions
+
+
+class DefaultDatasetPreparer:
+    """
+    Build the dataset-wide Spatial Index, KDTree and Membership Index / Filter once for reuse.
+
+    The exact Membership Index is only read by ExactMatchPrefilterAdapter and
+    the Membership Filter only by BloomNegativeCheck, so each is built when
+    ``membership_index`` / ``membership_filter`` is set (see MembershipEngine
+    .prepared_indexes); otherwise that PreparedDataset field is None.
+    """
+
+    def __init__(
+        self,
+        *,
+        spatial_builder: DefaultSpatialIndexBuilder | None = None,
+        kd_builder: DefaultKDTreeBuilder | None = None,
+        membership_index_builder: DefaultMembershipIndexBuilder | None = None,
+        membership_index: bool = False,
+        membership_tolerance: float | None = None,
+        membership_filter_builder: DefaultMembershipFilterBuilder | None = None,
+        membership_filter: bool = True,
+    ) -> None:
+        self._spatial_builder = spatial_builder or create_spatial_index_builder()
+        self._kd_builder = kd_builder or create_kd_tree_builder()
+        self._membership_index_builder = (
+            membership_index_builder or create_membership_index_builder()
+        )
+        self._membership_index = membership_index
+        self._membership_tolerance = membership_tolerance
+        self._membership_filter_builder = (
+            membership_filter_builder or create_membership_filter_builder()
+        )
+        self._membership_filter = membership_filter
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Index build options as JSON values; index sidecars record and check them."""
+        return {
+            "spatialIndex": self._spatial_builder.options,
+            "kdTree": self._kd_builder.options,
+            "membershipIndex": self._membership_index,
+            "membershipTolerance": self._membership_tolerance,
+            "membershipFilter": (
+                self._membership_filter_builder.options if self._membership_filter else None
+            ),
+        }
+
+    def prepare(self, dataset: PublishedDataset) -> PreparedDataset:
+        if dataset is None:
+            raise InvalidPreparedDataset("PublishedDataset is required")
+        if isinstance(dataset, PreparedDataset):
+            return dataset
+        if not isinstance(dataset, PublishedDataset):
+            raise InvalidPreparedDataset("dataset must be a PublishedDataset model")
+
+        if isinstance(dataset, VerifiedDataset):
+            # Loader already checked records and built the ordinal table.
+            positions: Mapping[RecordIdentity, Sequence[int]] = dataset.record_ordinals
+        else:
+            positions = _record_positions(dataset)
+
+        try:
+            spatial_index = self._spatial_builder.build(dataset)
+            kd_index = self._kd_builder.build(dataset, positions.keys())
+            membership_index = (
+                self._membership_index_builder.build(dataset)
+                if self._membership_index
+                else None
+            )
+            tolerance_index = (
+                self._membership_index_builder.build(
+                    dataset, epsilon=self._membership_tolerance
+                )
+                if self._membership_tolerance is not None
+                else None
+            )
+            membership_filter = (
+                self._membership_filter_builder.build(dataset)
+                if self._membership_filter
+                else None
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise PreparedDatasetBuildFailure(str(exc), cause=exc) from exc
+
+        return PreparedDataset(
+            dataset=dataset,
+            spatial_index=spatial_index,
+            kd_index=kd_index,
+            record_positions=MappingProxyType(
+                {record_id: tuple(items) for record_id, items in positions.items()}
+            ),
+            membership_index=membership_index,
+            tolerance_index=tolerance_index,
+            membership_filter=membership_filter,
+        )
+
+    def update(
+        self,
+        prepared: PreparedDataset,
+        *,
+        add: Iterable[EnvelopeRecord] = (),
+        remove: Iterable[StrategyRef] = (),
+        replace: Iterable[EnvelopeRecord] = (),
+    ) -> PreparedDataset:
+        """
+        PreparedDataset for ``prepared`` with records edited (see edit_dataset).
+
+        Every index is patched from the changed ordinals instead of rebuilt;
+        queries answer as on prepare(edited dataset). Record order follows
+        edit_dataset (removals swap the last record in), so re-publish
+        ``records`` of the result to reload the same answer order.
+        ``prepared`` itself is left untouched.
+        """
+        if prepared is None or not isinstance(prepared, PreparedDataset):
+            raise InvalidPreparedDataset("PreparedDataset is required")
+        edit = edit_dataset(
+            prepared.dataset,
+            add=add,
+            remove=remove,
+            replace=replace,
+            record_positions=prepared.record_positions,
+        )
+        dataset = edit.dataset
+
+        try:
+            spatial_index = self._spatial_builder.update(
+                prepared.spatial_index, dataset, edit.previous
+            )
+            kd_index = self._kd_builder.update(
+                prepared.kd_index,
+                dataset,
+                edit.previous,
+                record_positions=edit.record_positions,
+            )
+            membership_index = (
+                self._membership_index_builder.update(
+                    prepared.membership_index, dataset, edit.previous
+                )
+                if prepared.membership_index is not None
+                else None
+            )
+            tolerance_index = (
+                self._membership_index_builder.update(
+                    prepared.tolerance_index, dataset, edit.previous
+                )
+                if prepared.tolerance_index is not None
+                else None
+            )
+            membership_filter = (
+                self._membership_filter_builder.update(
+                    prepared.membership_filter, dataset, edit.previous
+                )
+                if prepared.membership_filter is not None
+                else None
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise PreparedDatasetBuildFailure(str(exc), cause=exc) from exc
+
+        return PreparedDataset(
+            dataset=dataset,
+            spatial_index=spatial_index,
+            kd_index=kd_index,
+            record_positions=edit.record_positions,
+            membership_index=membership_index,
+            tolerance_index=tolerance_index,
+            membership_filter=membership_filter,
+        )
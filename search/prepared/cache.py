@@ -0,0 +1,134 @@
+"""Prepared Dataset cache keyed by dataset identity."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import replace as replace_dataset
+from typing import Dict, Iterable, Optional
+
+from models import DatasetIdentity, EnvelopeRecord, PublishedDataset, StrategyRef
+
+from .builder import DefaultDatasetPreparer
+from .digest import same_records
+from .exceptions import InvalidPreparedDataset
+from .models import PreparedDataset
+
+
+class PreparedDatasetCache:
+    """
+    Process-local PreparedDataset cache.
+
+    A dataset_identity names one immutable published build, so indexes are
+    built on first use and reused for every later query on the same identity.
+    An entry is served only to the dataset object it was built for (or seeded
+    / hot-patched from); another object under the same identity reuses the
+    indexes when its records match and is prepared afresh otherwise.
+    Datasets without dataset_identity keep one entry for the last such
+    object, like the orchestrator does.
+    """
+
+    def __init__(self, *, preparer: DefaultDatasetPreparer | None = None) -> None:
+        self._preparer = preparer or DefaultDatasetPreparer()
+        self._entries: Dict[DatasetIdentity, PreparedDataset] = {}
+        # identity -> the caller's dataset object the entry answers for
+        # (differs from entry.dataset after a hot-patch update()).
+        self._sources: Dict[DatasetIdentity, PublishedDataset] = {}
+        self._anonymous: Optional[PreparedDataset] = None
+        self._lock = threading.Lock()
+
+    @property
+    def preparer(self) -> DefaultDatasetPreparer:
+        return self._preparer
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, dataset: PublishedDataset | PreparedDataset) -> PreparedDataset:
+        if isinstance(dataset, PreparedDataset):
+            return dataset
+        identity = getattr(dataset, "dataset_identity", None)
+        if identity is None:
+            return self._get_anonymous(dataset)
+
+        cached = self._entries.get(identity)
+        if cached is not None and self._serves(identity, cached, dataset):
+            return cached
+        with self._lock:
+            cached = self._entries.get(identity)
+            if cached is not None and self._serves(identity, cached, dataset):
+                return cached
+            if cached is not None and same_records(cached.dataset, dataset):
+                # Equal records under another object: keep the indexes.
+                cached = replace_dataset(cached, dataset=dataset)
+            else:
+                cached = self._preparer.prepare(dataset)
+            self._entries[identity] = cached
+            self._sources[identity] = dataset
+            return cached
+
+    def _serves(
+        self, identity: DatasetIdentity, cached: PreparedDataset, dataset: PublishedDataset
+    ) -> bool:
+        return cached.dataset is dataset or self._sources.get(identity) is dataset
+
+    def _get_anonymous(self, dataset: PublishedDataset) -> PreparedDataset:
+        last = self._anonymous
+        if last is not None and last.dataset is dataset:
+            return last
+        prepared = self._preparer.prepare(dataset)
+        self._anonymous = prepared
+        return prepared
+
+    def peek(self, dataset_identity: DatasetIdentity) -> Optional[PreparedDataset]:
+        return self._entries.get(dataset_identity)
+
+    def put(self, prepared: PreparedDataset) -> PreparedDataset:
+        """
+        Seed the cache with indexes built elsewhere (e.g. an index sidecar).
+
+        Replaces any entry for the same dataset_identity; datasets without
+        one become the identity-less entry.
+        """
+        if prepared is None or not isinstance(prepared, PreparedDataset):
+            raise InvalidPreparedDataset("PreparedDataset is required")
+        identity = prepared.dataset_identity
+        with self._lock:
+            if identity is None:
+                self._anonymous = prepared
+            else:
+                self._entries[identity] = prepared
+                self._sources[identity] = prepared.dataset
+        return prepared
+
+    def update(
+        self,
+        dataset_identity: DatasetIdentity,
+        *,
+        add: Iterable[EnvelopeRecord] = (),
+        remove: Iterable[StrategyRef] = (),
+        replace: Iterable[EnvelopeRecord] = (),
+    ) -> PreparedDataset:
+        """
+        Hot-patch the cached entry's records and indexes (see DefaultDatasetPreparer.update).
+
+        Queries already running keep the entry they started with; later
+        get() calls with the originally cached dataset object see the patch.
+        """
+        with self._lock:
+            cached = self._entries.get(dataset_identity)
+            if cached is None:
+                raise InvalidPreparedDataset(f"dataset is not cached: {dataset_identity}")
+            updated = self._preparer.update(cached, add=add, remove=remove, replace=replace)
+            self._entries[dataset_identity] = updated
+            return updated
+
+    def invalidate(self, dataset_identity: DatasetIdentity) -> None:
+        with self._lock:
+            self._entries.pop(dataset_identity, None)
+            self._sources.pop(dataset_identity, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sources.clear()
+            self._anonymous = None
@@ -0,0 +1,11 @@
+"""Prepared Dataset contract constants."""
+
+from __future__ import annotations
+
+# Index sidecar persisted next to a Published Package (package/index/).
+INDEX_SIDECAR_DIRNAME = "index"
+INDEX_SIDECAR_FILENAME = "search-index.bin"
+INDEX_SIDECAR_MAGIC = b"SRCHIDX\x00"
+# Bumped whenever the binary layout or any encoded index model changes;
+# other versions are treated as stale and rebuilt.
+INDEX_SIDECAR_FORMAT = 3
@@ -0,0 +1,60 @@
+"""
+Record fingerprints — decide whether two datasets carry the same records.
+
+Shared by the index sidecar (staleness check) and PreparedDatasetCache
+(a cached entry is only served to a dataset whose records it was built on).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from array import array
+from typing import Any, Sequence
+
+from models import ColumnarDataset, PublishedDataset, VerifiedDataset
+
+
+def record_digest(dataset: PublishedDataset) -> str:
+    # sha256 over the record coordinates in ColumnarDataset column order, so
+    # columnar and record-list datasets with equal contents hash alike.
+    if isinstance(dataset, ColumnarDataset):
+        columns: Sequence[Any] = (
+            dataset.target_xy,
+            dataset.cue_offsets,
+            dataset.cue_xy,
+            dataset.second_offsets,
+            dataset.second_xy,
+        )
+    else:
+        target_xy, cue_xy, second_xy = array("d"), array("d"), array("d")
+        cue_offsets, second_offsets = array("q", [0]), array("q", [0])
+        for record in dataset.records or []:
+            target_xy.extend((record.target.x, record.target.y))
+            for point in record.cue_set:
+                cue_xy.extend((point.x, point.y))
+            cue_offsets.append(len(cue_xy) // 2)
+            for point in record.second_set:
+                second_xy.extend((point.x, point.y))
+            second_offsets.append(len(second_xy) // 2)
+        columns = (target_xy, cue_offsets, cue_xy, second_offsets, second_xy)
+    digest = hashlib.sha256()
+    for column in columns:
+        digest.update(column)
+    return digest.hexdigest()
+
+
+def dataset_identities(dataset: PublishedDataset) -> Sequence[str]:
+    if isinstance(dataset, VerifiedDataset):
+        return dataset.record_identities
+    return [str(record.strategy_ref) for record in dataset.records or []]
+
+
+def same_records(left: PublishedDataset, right: PublishedDataset) -> bool:
+    """True when both datasets hold the same records in the same order."""
+    if left is right:
+        return True
+    if len(left.records or []) != len(right.records or []):
+        return False
+    if list(dataset_identities(left)) != list(dataset_identities(right)):
+        return False
+    return record_digest(left) == record_digest(right)
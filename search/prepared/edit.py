@@ -0,0 +1,184 @@
+"""
+Record-level edits of a PublishedDataset (add / remove / replace by strategy_ref).
+
+Removal swaps the last record into the freed ordinal, so one edit touches a
+constant number of ordinals and every index can be patched instead of rebuilt.
+The price is record order: an edited dataset is not the source order minus
+the removed records (see edit_dataset).
+"""
+
+from __future__ import annotations
+
+from bisect import insort
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from models import (
+    ColumnarDataset,
+    EnvelopeRecord,
+    PublishedDataset,
+    RecordIdentity,
+    StrategyRef,
+    VerifiedDataset,
+)
+
+from .exceptions import InvalidPreparedDataset
+from .models import DatasetEdit
+
+
+def _record_identity(record: EnvelopeRecord) -> RecordIdentity:
+    return RecordIdentity(str(record.strategy_ref))
+
+
+class _Editor:
+    def __init__(
+        self,
+        records: Sequence[EnvelopeRecord],
+        positions: Mapping[RecordIdentity, Sequence[int]],
+    ) -> None:
+        self.source = records
+        self.records: List[EnvelopeRecord] = list(records)
+        # Shallow copy (dict / MappingProxyType copy() stays in C); only
+        # edited identities get new tuples.
+        copy = getattr(positions, "copy", None)
+        self.positions: Dict[RecordIdentity, Tuple[int, ...]] = (
+            copy() if copy is not None else dict(positions)
+        )
+        self.previous: Dict[int, Optional[EnvelopeRecord]] = {}
+
+    def _remember(self, ordinal: int) -> None:
+        if ordinal not in self.previous:
+            self.previous[ordinal] = (
+                self.source[ordinal] if ordinal < len(self.source) else None
+            )
+
+    def _unlink(self, identity: RecordIdentity, ordinal: int) -> None:
+        remaining = tuple(item for item in self.positions[identity] if item != ordinal)
+        if remaining:
+            self.positions[identity] = remaining
+        else:
+            del self.positions[identity]
+
+    def _link(self, identity: RecordIdentity, ordinal: int) -> None:
+        items = list(self.positions.get(identity, ()))
+        insort(items, ordinal)
+        self.positions[identity] = tuple(items)
+
+    def ordinals(self, strategy_ref: StrategyRef) -> Tuple[int, ...]:
+        ordinals = self.positions.get(RecordIdentity(str(strategy_ref)))
+        if not ordinals:
+            raise InvalidPreparedDataset(f"strategy_ref not found in dataset: {strategy_ref}")
+        return tuple(ordinals)
+
+    def swap_remove(self, ordinal: int) -> None:
+        last = len(self.records) - 1
+        self._remember(ordinal)
+        self._remember(last)
+        self._unlink(_record_identity(self.records[ordinal]), ordinal)
+        if ordinal != last:
+            moved = self.records[last]
+            identity = _record_identity(moved)
+            self._unlink(identity, last)
+            self._link(identity, ordinal)
+            self.records[ordinal] = moved
+        self.records.pop()
+
+    def put(self, ordinal: int, record: EnvelopeRecord) -> None:
+        self._remember(ordinal)
+        self.records[ordinal] = record
+
+    def append(self, record: EnvelopeRecord) -> None:
+        ordinal = len(self.records)
+        self._remember(ordinal)
+        self.records.append(record)
+        self._link(_record_identity(record), ordinal)
+
+
+def _checked(records: Iterable[EnvelopeRecord], label: str) -> List[EnvelopeRecord]:
+    items = list(records)
+    for index, record in enumerate(items):
+        if not isinstance(record, EnvelopeRecord):
+            raise InvalidPreparedDataset(f"{label}[{index}] is not an EnvelopeRecord")
+    return items
+
+
+def edit_dataset(
+    dataset: PublishedDataset,
+    *,
+    add: Iterable[EnvelopeRecord] = (),
+    remove: Iterable[StrategyRef] = (),
+    replace: Iterable[EnvelopeRecord] = (),
+    record_positions: Mapping[RecordIdentity, Sequence[int]] | None = None,
+) -> DatasetEdit:
+    """
+    Apply removals, then replacements, then additions to a copy of ``dataset``.
+
+    ``remove`` drops every record of each strategy_ref (the last record moves
+    into each freed ordinal). A ``replace`` record takes the first ordinal of
+    its strategy_ref and drops the others. ``add`` appends. Unknown refs in
+    ``remove`` / ``replace`` raise InvalidPreparedDataset. VerifiedDataset
+    input yields a VerifiedDataset with updated ordinal tables (re-packed
+    into columns for a ColumnarDataset).
+    ``record_positions`` (identity -> ordinals) skips the identity scan.
+
+    Record order is not preserved across removals: each one moves the then
+    last record into the freed ordinal. Anything ordered by ordinal (e.g.
+    Membership candidates) follows ``edit.dataset.records``; a package
+    re-published from the source order minus the removed records holds the
+    same records but may answer in another order. Re-publish
+    ``edit.dataset.records`` as they are to reload the same answers.
+    """
+    if dataset is None or not isinstance(dataset, PublishedDataset):
+        raise InvalidPreparedDataset("dataset must be a PublishedDataset model")
+    added = _checked(add, "add")
+    replaced = _checked(replace, "replace")
+
+    records = dataset.records or []
+    if record_positions is None:
+        if isinstance(dataset, VerifiedDataset):
+            record_positions = dataset.record_ordinals
+        else:
+            scanned: Dict[RecordIdentity, List[int]] = {}
+            for index, record in enumerate(_checked(records, "records")):
+                scanned.setdefault(_record_identity(record), []).append(index)
+            record_positions = {key: tuple(items) for key, items in scanned.items()}
+
+    editor = _Editor(records, record_positions)
+    for strategy_ref in remove:
+        for ordinal in sorted(editor.ordinals(strategy_ref), reverse=True):
+            editor.swap_remove(ordinal)
+    for record in replaced:
+        first, *extra = editor.ordinals(record.strategy_ref)
+        # Extras sit above ``first``, so swapping them out never moves it.
+        for ordinal in sorted(extra, reverse=True):
+            editor.swap_remove(ordinal)
+        editor.put(first, record)
+    for record in added:
+        editor.append(record)
+
+    edited: PublishedDataset
+    if isinstance(dataset, ColumnarDataset):
+        edited = ColumnarDataset.from_records(editor.records, dataset.dataset_identity)
+    elif isinstance(dataset, VerifiedDataset):
+        count = len(editor.records)
+        identities = list(dataset.record_identities[:count])
+        identities.extend([RecordIdentity("")] * (count - len(identities)))
+        for ordinal in editor.previous:
+            if ordinal < count:
+                identities[ordinal] = _record_identity(editor.records[ordinal])
+        edited = VerifiedDataset(
+            records=editor.records,
+            dataset_identity=dataset.dataset_identity,
+            record_ordinals=editor.positions,
+            record_identities=identities,
+        )
+    else:
+        edited = PublishedDataset(
+            records=editor.records,
+            dataset_identity=dataset.dataset_identity,
+        )
+    return DatasetEdit(
+        dataset=edited,
+        previous=editor.previous,
+        record_positions=MappingProxyType(editor.positions),
+    )
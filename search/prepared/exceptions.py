@@ -0,0 +1,23 @@
+"""Prepared Dataset exceptions."""
+
+from __future__ import annotations
+
+
+class PreparedDatasetError(Exception):
+    """Base error for Prepared Dataset."""
+
+
+class InvalidPreparedDataset(PreparedDatasetError):
+    """PublishedDataset input is missing or invalid."""
+
+
+class PreparedDatasetBuildFailure(PreparedDatasetError):
+    """Prepared Dataset index build failed unexpectedly."""
+
+    def __init__(self, message: str, *, cause: BaseException | None = None) -> None:
+        super().__init__(message)
+        self.cause = cause
+
+
+class StaleIndexSidecar(PreparedDatasetError):
+    """Index sidecar is corrupt, from another format, or does not match the dataset."""
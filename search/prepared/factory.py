@@ -0,0 +1,82 @@
+"""Factory helpers for Prepared Dataset."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from models import PublishedDataset
+from search.kd_tree import (
+    KD_TREE_AXIS_WEIGHTS_UNIT,
+    KD_TREE_ENCODING_CENTROID,
+    create_kd_tree_builder,
+)
+from search.spatial_index import (
+    SPATIAL_GRID_FIXED,
+    SPATIAL_POSTINGS_SET,
+    create_spatial_index_builder,
+)
+
+from .builder import DefaultDatasetPreparer
+from .cache import PreparedDatasetCache
+from .models import PreparedDataset
+
+
+def create_dataset_preparer(
+    *,
+    membership_index: bool = False,
+    membership_tolerance: float | None = None,
+    membership_filter: bool = True,
+    spatial_postings: str = SPATIAL_POSTINGS_SET,
+    spatial_grid: str = SPATIAL_GRID_FIXED,
+    kd_encoding: str = KD_TREE_ENCODING_CENTROID,
+    kd_axis_weights: Sequence[float] = KD_TREE_AXIS_WEIGHTS_UNIT,
+) -> DefaultDatasetPreparer:
+    """
+    Create DefaultDatasetPreparer.
+
+    ``membership_index`` adds the exact Membership Index (read by
+    ExactMatchPrefilterAdapter); ``membership_tolerance`` adds a tolerance
+    index; ``membership_filter=False`` skips the Bloom filters (read by
+    BloomNegativeCheck, the exact-mode default); ``spatial_postings`` /
+    ``spatial_grid`` select the Spatial Index cell representation and grid;
+    ``kd_encoding`` / ``kd_axis_weights`` select the KDTree record encoding
+    and distance weights.
+    """
+    return DefaultDatasetPreparer(
+        spatial_builder=create_spatial_index_builder(
+            postings=spatial_postings, grid=spatial_grid
+        ),
+        kd_builder=create_kd_tree_builder(encoding=kd_encoding, axis_weights=kd_axis_weights),
+        membership_index=membership_index,
+        membership_tolerance=membership_tolerance,
+        membership_filter=membership_filter,
+    )
+
+
+def create_prepared_dataset_cache(
+    *,
+    membership_index: bool = False,
+    membership_tolerance: float | None = None,
+    membership_filter: bool = True,
+    spatial_postings: str = SPATIAL_POSTINGS_SET,
+    spatial_grid: str = SPATIAL_GRID_FIXED,
+    kd_encoding: str = KD_TREE_ENCODING_CENTROID,
+    kd_axis_weights: Sequence[float] = KD_TREE_AXIS_WEIGHTS_UNIT,
+) -> PreparedDatasetCache:
+    """Create an empty PreparedDatasetCache."""
+    return PreparedDatasetCache(
+        preparer=create_dataset_preparer(
+            membership_index=membership_index,
+            membership_tolerance=membership_tolerance,
+            membership_filter=membership_filter,
+            spatial_postings=spatial_postings,
+            spatial_grid=spatial_grid,
+            kd_encoding=kd_encoding,
+            kd_axis_weights=kd_axis_weights,
+        )
+    )
+
+
+def prepare_dataset(dataset: PublishedDataset) -> PreparedDataset:
+    """Build a PreparedDataset with the default preparer."""
+    return create_dataset_preparer().prepare(dataset)
@@ -0,0 +1,58 @@
+"""Prepared Dataset models."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Tuple
+
+from models import DatasetIdentity, EnvelopeRecord, PublishedDataset, RecordIdentity
+from search.kd_tree.models import KDTreeIndex
+from search.membership_filter.models import MembershipFilter
+from search.membership_index.models import MembershipIndex
+from search.spatial_index.models import SpatialIndex
+
+
+@dataclass(frozen=True)
+class PreparedDataset:
+    """
+    PublishedDataset plus its runtime-derived search indexes.
+
+    Built once per dataset and reused across queries.
+    The wrapped PublishedDataset is not copied or modified.
+    """
+
+    dataset: PublishedDataset
+    spatial_index: SpatialIndex
+    kd_index: KDTreeIndex
+    # record identity -> positions in dataset.records (dataset order).
+    record_positions: Mapping[RecordIdentity, Tuple[int, ...]]
+    # Exact-match point postings (record ordinals per axis).
+    membership_index: Optional[MembershipIndex] = None
+    # Tolerance-mode postings (epsilon buckets), when a tolerance was configured.
+    tolerance_index: Optional[MembershipIndex] = None
+    # Per-axis Bloom filters: proves exact-mode misses without a scan.
+    membership_filter: Optional[MembershipFilter] = None
+
+    @property
+    def dataset_identity(self) -> Optional[DatasetIdentity]:
+        return self.dataset.dataset_identity
+
+    @property
+    def records(self) -> List[EnvelopeRecord]:
+        return self.dataset.records
+
+
+@dataclass(frozen=True)
+class DatasetEdit:
+    """
+    Result of edit_dataset(): the edited corpus plus what changed.
+
+    ``previous`` maps every changed ordinal to the record it held before
+    (None when appended); ordinals past the end of ``dataset.records`` were
+    removed. Index update() methods consume exactly this.
+    """
+
+    dataset: PublishedDataset
+    previous: Mapping[int, Optional[EnvelopeRecord]]
+    # record identity -> positions in the edited dataset.records (ascending).
+    record_positions: Mapping[RecordIdentity, Tuple[int, ...]]
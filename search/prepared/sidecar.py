@@ -0,0 +1,492 @@
+"""
+Index sidecar — binary persistence of a PreparedDataset's indexes.
+
+Layout (little-endian hosts write and read it; others rebuild):
+  header   magic · format · meta length · sha256(meta + payload)
+  meta     UTF-8 JSON: datasetIdentity, recordCount, recordDigest (sha256
+           of the record contents), preparerOptions, index options and the
+           section table {name: [offset, length, typecode]}
+  payload  8-byte aligned flat arrays (ordinals, cells, vectors, bits)
+
+Decoding works on any buffer (bytes or an mmap). KDTree coordinates, slots
+and the ordinal table stay views over that buffer; posting maps are
+rebuilt from flat arrays without touching records. Any mismatch with the
+dataset (identity, record count, record ordinal table, record contents,
+checksum, format) or with the expected preparer options raises
+StaleIndexSidecar so callers fall back to prepare().
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Any, Callable, DefaultDict, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from models import PublishedDataset, RecordIdentity, StrategyRef, VerifiedDataset
+from search.kd_tree.contract import (
+    KD_TREE_AXIS_WEIGHTS_UNIT,
+    KD_TREE_ENCODING_CENTROID,
+    KD_TREE_ENCODING_MEMBERS,
+    KD_TREE_LAYOUT_IMPLICIT,
+    KD_TREE_LAYOUT_LINKED,
+)
+from search.kd_tree.linked import build_linked_tree
+from search.kd_tree.models import EncodedCandidate, ImplicitKDTree, KDTreeIndex
+from search.membership_filter.models import BloomFilter, MembershipFilter
+from search.membership_index.models import MembershipIndex
+from search.spatial_index.bitmap import OrdinalBitmap, bitmap_from_ordinals
+from search.spatial_index.contract import SPATIAL_POSTINGS_BITMAP
+from search.spatial_index.models import SpatialCell, SpatialIndex
+
+from .contract import INDEX_SIDECAR_FORMAT, INDEX_SIDECAR_MAGIC
+from .digest import dataset_identities, record_digest
+from .exceptions import InvalidPreparedDataset, StaleIndexSidecar
+from .models import PreparedDataset
+
+_HEADER = struct.Struct("<8sII32s")
+_ALIGN = 8
+_AXES = ("target", "cue", "second")
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGN
+
+
+class _SectionWriter:
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self.sections: Dict[str, List[Any]] = {}
+
+    def add(self, name: str, values: array | bytes) -> None:
+        if isinstance(values, array):
+            data, length, typecode = values.tobytes(), len(values), values.typecode
+        else:
+            data, length, typecode = bytes(values), len(values), "B"
+        self.sections[name] = [self._size, length, typecode]
+        self._chunks.append(data)
+        self._chunks.append(b"\x00" * _padding(len(data)))
+        self._size += len(data) + _padding(len(data))
+
+    def add_postings(
+        self,
+        name: str,
+        keys: Optional[array],
+        postings: Sequence[Sequence[int]],
+    ) -> None:
+        offsets = array("q", [0])
+        ordinals = array("q")
+        for posting in postings:
+            ordinals.extend(posting)
+            offsets.append(len(ordinals))
+        if keys is not None:
+            self.add(f"{name}.keys", keys)
+        self.add(f"{name}.offsets", offsets)
+        self.add(f"{name}.ordinals", ordinals)
+
+    def payload(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+def _cell_array(cells: Sequence[SpatialCell]) -> array:
+    flat = array("q")
+    for cell in cells:
+        flat.extend((cell.col, cell.row, cell.level))
+    return flat
+
+
+def _encode_spatial(writer: _SectionWriter, index: SpatialIndex) -> Dict[str, Any]:
+    for axis in _AXES:
+        cells: Mapping[SpatialCell, Any] = getattr(index, f"{axis}_cells")
+        writer.add_postings(
+            f"spatial.{axis}",
+            _cell_array(list(cells)),
+            [
+                posting.ordinals() if isinstance(posting, OrdinalBitmap) else sorted(posting)
+                for posting in cells.values()
+            ],
+        )
+        splits = sorted(
+            getattr(index, f"{axis}_splits"),
+            key=lambda cell: (cell.level, cell.col, cell.row),
+        )
+        writer.add(f"spatial.{axis}.splits", _cell_array(splits))
+    return {"postings": index.postings, "grid": index.grid}
+
+
+def _encode_kd(writer: _SectionWriter, index: KDTreeIndex) -> Dict[str, Any]:
+    vectors = array("d")
+    for item in index.candidates:
+        vectors.extend(item.vector)
+    writer.add("kd.vectors", vectors)
+    writer.add_postings(
+        "kd.candidates",
+        None,
+        [item.record_ordinals for item in index.candidates],
+    )
+    writer.add("kd.ordinalPositions", array("q", index.ordinal_positions))
+    meta: Dict[str, Any] = {
+        "dimensions": index.dimensions,
+        "encoding": index.encoding,
+        "axisWeights": list(index.axis_weights),
+        "layout": None,
+    }
+    if index.encoding == KD_TREE_ENCODING_MEMBERS:
+        members = array("d")
+        offsets = array("q", [0])
+        for item in index.candidates:
+            for member in item.members:
+                members.extend(member)
+            offsets.append(offsets[-1] + len(item.members))
+        writer.add("kd.members", members)
+        writer.add("kd.memberOffsets", offsets)
+    root = index.root
+    if isinstance(root, ImplicitKDTree):
+        writer.add("kd.coords", array("d", root.coords))
+        writer.add("kd.slots", array("q", root.slots))
+        meta.update(
+            layout=KD_TREE_LAYOUT_IMPLICIT,
+            leafSize=root.leaf_size,
+            multiPoint=root.multi_point,
+        )
+    elif root is not None:
+        meta["layout"] = KD_TREE_LAYOUT_LINKED
+    return meta
+
+
+def _encode_membership(
+    writer: _SectionWriter,
+    name: str,
+    index: MembershipIndex,
+) -> Dict[str, Any]:
+    typecode = "q" if index.epsilon > 0 else "d"
+    for axis in _AXES:
+        postings: Mapping[Tuple[Any, Any], Tuple[int, ...]] = getattr(index, f"{axis}_postings")
+        keys = array(typecode)
+        for key in postings:
+            keys.extend(key)
+        writer.add_postings(f"{name}.{axis}", keys, list(postings.values()))
+    return {"epsilon": index.epsilon, "recordCount": index.record_count}
+
+
+def _encode_filter(writer: _SectionWriter, membership_filter: MembershipFilter) -> Dict[str, Any]:
+    meta: Dict[str, Any] = {"recordCount": membership_filter.record_count}
+    for axis in _AXES:
+        bloom: BloomFilter = getattr(membership_filter, axis)
+        writer.add(f"filter.{axis}.bits", bloom.bits)
+        meta[axis] = {
+            "bitCount": bloom.bit_count,
+            "hashCount": bloom.hash_count,
+            "itemCount": bloom.item_count,
+        }
+    return meta
+
+
+def _plain_options(options: Optional[Mapping[str, Any]]) -> Any:
+    # Compare options as they read back from the JSON meta (tuples -> lists).
+    return json.loads(json.dumps(options, sort_keys=True)) if options is not None else None
+
+
+def encode_index_sidecar(
+    prepared: PreparedDataset,
+    *,
+    preparer_options: Optional[Mapping[str, Any]] = None,
+) -> bytes:
+    """
+    Serialize ``prepared``'s indexes (not its records) into sidecar bytes.
+
+    The sidecar is tied to the dataset by identity, by its record ordinal
+    table and by a digest of its record contents; it is only usable next
+    to that exact dataset. ``preparer_options`` (DefaultDatasetPreparer
+    .options of the preparer that built ``prepared``) are recorded so
+    readers can reject indexes built with other options.
+    """
+    if prepared is None or not isinstance(prepared, PreparedDataset):
+        raise InvalidPreparedDataset("PreparedDataset is required")
+    if sys.byteorder != "little":
+        raise InvalidPreparedDataset("index sidecars are written on little-endian hosts only")
+
+    records = prepared.records or []
+    identities = [str(record.strategy_ref) for record in records]
+    writer = _SectionWriter()
+    writer.add("records.identities", json.dumps(identities, ensure_ascii=False).encode("utf-8"))
+    meta: Dict[str, Any] = {
+        "datasetIdentity": (
+            str(prepared.dataset_identity) if prepared.dataset_identity is not None else None
+        ),
+        "recordCount": len(records),
+        "recordDigest": record_digest(prepared.dataset),
+        "preparerOptions": _plain_options(preparer_options),
+        "spatialIndex": _encode_spatial(writer, prepared.spatial_index),
+        "kdTree": _encode_kd(writer, prepared.kd_index),
+        "membershipIndex": None,
+        "toleranceIndex": None,
+        "membershipFilter": None,
+    }
+    if prepared.membership_index is not None:
+        meta["membershipIndex"] = _encode_membership(
+            writer, "membership", prepared.membership_index
+        )
+    if prepared.tolerance_index is not None:
+        meta["toleranceIndex"] = _encode_membership(
+            writer, "tolerance", prepared.tolerance_index
+        )
+    if prepared.membership_filter is not None:
+        meta["membershipFilter"] = _encode_filter(writer, prepared.membership_filter)
+    meta["sections"] = writer.sections
+
+    meta_bytes = json.dumps(meta, sort_keys=True).encode("utf-8")
+    meta_bytes += b" " * _padding(_HEADER.size + len(meta_bytes))
+    payload = writer.payload()
+    digest = hashlib.sha256(meta_bytes)
+    digest.update(payload)
+    header = _HEADER.pack(INDEX_SIDECAR_MAGIC, INDEX_SIDECAR_FORMAT, len(meta_bytes), digest.digest())
+    return header + meta_bytes + payload
+
+
+class _SectionReader:
+    def __init__(self, payload: memoryview, sections: Mapping[str, Sequence[Any]]) -> None:
+        self._payload = payload
+        self._sections = sections
+
+    def get(self, name: str) -> memoryview:
+        try:
+            offset, length, typecode = self._sections[name]
+            view = self._payload[offset : offset + length * array(typecode).itemsize]
+            return view.cast(typecode)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise StaleIndexSidecar(f"index sidecar section is unreadable: {name}") from exc
+
+    def postings(
+        self,
+        name: str,
+        freeze: Callable[[memoryview], Any],
+    ) -> List[Any]:
+        offsets = self.get(f"{name}.offsets")
+        ordinals = self.get(f"{name}.ordinals")
+        return [freeze(ordinals[offsets[i] : offsets[i + 1]]) for i in range(len(offsets) - 1)]
+
+
+def _cells(flat: memoryview) -> List[SpatialCell]:
+    return [SpatialCell(flat[i], flat[i + 1], flat[i + 2]) for i in range(0, len(flat), 3)]
+
+
+def _decode_spatial(
+    reader: _SectionReader,
+    meta: Mapping[str, Any],
+    record_identities: Tuple[RecordIdentity, ...],
+) -> SpatialIndex:
+    freeze = bitmap_from_ordinals if meta["postings"] == SPATIAL_POSTINGS_BITMAP else frozenset
+    fields: Dict[str, Any] = {}
+    for axis in _AXES:
+        postings = reader.postings(f"spatial.{axis}", freeze)
+        fields[f"{axis}_cells"] = dict(zip(_cells(reader.get(f"spatial.{axis}.keys")), postings))
+        fields[f"{axis}_splits"] = frozenset(_cells(reader.get(f"spatial.{axis}.splits")))
+    return SpatialIndex(
+        record_count=len(record_identities),
+        record_identities=record_identities,
+        postings=meta["postings"],
+        grid=meta["grid"],
+        **fields,
+    )
+
+
+def _decode_kd(
+    reader: _SectionReader,
+    meta: Mapping[str, Any],
+    record_identities: Tuple[RecordIdentity, ...],
+) -> KDTreeIndex:
+    dimensions = meta["dimensions"]
+    encoding = meta.get("encoding", KD_TREE_ENCODING_CENTROID)
+    vectors = reader.get("kd.vectors")
+    ordinals = reader.postings("kd.candidates", tuple)
+    if encoding == KD_TREE_ENCODING_MEMBERS:
+        flat = reader.get("kd.members")
+        member_offsets = reader.get("kd.memberOffsets")
+    candidates = []
+    for position, record_ordinals in enumerate(ordinals):
+        candidate_id = record_identities[record_ordinals[0]]
+        base = position * dimensions
+        members: Tuple[Any, ...] = ()
+        if encoding == KD_TREE_ENCODING_MEMBERS:
+            members = tuple(
+                tuple(flat[start : start + dimensions])
+                for start in range(
+                    member_offsets[position] * dimensions,
+                    member_offsets[position + 1] * dimensions,
+                    dimensions,
+                )
+            )
+        candidates.append(
+            EncodedCandidate(
+                candidate_id=candidate_id,
+                strategy_ref=StrategyRef(candidate_id),
+                vector=tuple(vectors[base : base + dimensions]),
+                record_ordinals=record_ordinals,
+                members=members,
+            )
+        )
+    frozen = tuple(candidates)
+
+    root: ImplicitKDTree | Any = None
+    if meta["layout"] == KD_TREE_LAYOUT_IMPLICIT:
+        slots = reader.get("kd.slots")
+        root = ImplicitKDTree(
+            coords=reader.get("kd.coords"),
+            slots=slots,
+            size=len(slots),
+            dimensions=dimensions,
+            leaf_size=meta["leafSize"],
+            multi_point=meta.get("multiPoint", False),
+        )
+    elif meta["layout"] == KD_TREE_LAYOUT_LINKED:
+        root = build_linked_tree(frozen)
+    return KDTreeIndex(
+        root=root,
+        candidates=frozen,
+        dimensions=dimensions,
+        positions={item.candidate_id: position for position, item in enumerate(frozen)},
+        ordinal_positions=reader.get("kd.ordinalPositions"),
+        encoding=encoding,
+        axis_weights=tuple(meta.get("axisWeights", KD_TREE_AXIS_WEIGHTS_UNIT)),
+    )
+
+
+def _decode_membership(
+    reader: _SectionReader,
+    name: str,
+    meta: Mapping[str, Any],
+) -> MembershipIndex:
+    fields: Dict[str, Any] = {}
+    for axis in _AXES:
+        postings = reader.postings(f"{name}.{axis}", tuple)
+        keys = reader.get(f"{name}.{axis}.keys")
+        pairs = zip(keys[0::2], keys[1::2])
+        fields[f"{axis}_postings"] = MappingProxyType(dict(zip(pairs, postings)))
+    return MembershipIndex(
+        record_count=meta["recordCount"],
+        epsilon=meta["epsilon"],
+        **fields,
+    )
+
+
+def _decode_filter(reader: _SectionReader, meta: Mapping[str, Any]) -> MembershipFilter:
+    blooms = {
+        axis: BloomFilter(
+            bits=bytes(reader.get(f"filter.{axis}.bits")),
+            bit_count=meta[axis]["bitCount"],
+            hash_count=meta[axis]["hashCount"],
+            item_count=meta[axis]["itemCount"],
+        )
+        for axis in _AXES
+    }
+    return MembershipFilter(record_count=meta["recordCount"], **blooms)
+
+
+def _read_meta(view: memoryview) -> Tuple[Dict[str, Any], memoryview]:
+    if sys.byteorder != "little":
+        raise StaleIndexSidecar("index sidecar requires a little-endian host")
+    if len(view) < _HEADER.size:
+        raise StaleIndexSidecar("index sidecar is truncated")
+    magic, version, meta_length, digest = _HEADER.unpack_from(view)
+    if magic != INDEX_SIDECAR_MAGIC:
+        raise StaleIndexSidecar("not an index sidecar")
+    if version != INDEX_SIDECAR_FORMAT:
+        raise StaleIndexSidecar(f"index sidecar format {version} != {INDEX_SIDECAR_FORMAT}")
+    if hashlib.sha256(view[_HEADER.size :]).digest() != digest:
+        raise StaleIndexSidecar("index sidecar checksum mismatch")
+    start = _HEADER.size
+    try:
+        meta = json.loads(bytes(view[start : start + meta_length]))
+    except ValueError as exc:
+        raise StaleIndexSidecar("index sidecar metadata is unreadable") from exc
+    return meta, view[start + meta_length :]
+
+
+def decode_index_sidecar(
+    buffer: bytes | memoryview | Any,
+    dataset: PublishedDataset,
+    *,
+    preparer_options: Optional[Mapping[str, Any]] = None,
+) -> PreparedDataset:
+    """
+    PreparedDataset for ``dataset`` from sidecar bytes (any buffer, e.g. an mmap).
+
+    Queries answer as on prepare(dataset) with the options the sidecar was
+    written with. Raises StaleIndexSidecar when the sidecar does not belong
+    to ``dataset`` or is corrupt, and, when ``preparer_options`` is given,
+    when the sidecar was not written with exactly those options.
+    """
+    if dataset is None or not isinstance(dataset, PublishedDataset):
+        raise InvalidPreparedDataset("dataset must be a PublishedDataset model")
+    view = memoryview(buffer).cast("B")
+    meta, payload = _read_meta(view)
+
+    if preparer_options is not None and meta.get("preparerOptions") != _plain_options(
+        preparer_options
+    ):
+        raise StaleIndexSidecar("index sidecar was built with other preparer options")
+    identity = str(dataset.dataset_identity) if dataset.dataset_identity is not None else None
+    if meta.get("datasetIdentity") != identity:
+        raise StaleIndexSidecar(
+            f"index sidecar datasetIdentity {meta.get('datasetIdentity')!r} != {identity!r}"
+        )
+    records = dataset.records or []
+    if meta.get("recordCount") != len(records):
+        raise StaleIndexSidecar(
+            f"index sidecar recordCount {meta.get('recordCount')!r} != {len(records)}"
+        )
+
+    reader = _SectionReader(payload, meta.get("sections") or {})
+    try:
+        identities = json.loads(bytes(reader.get("records.identities")))
+    except ValueError as exc:
+        raise StaleIndexSidecar("index sidecar record table is unreadable") from exc
+    if identities != list(dataset_identities(dataset)):
+        raise StaleIndexSidecar("index sidecar record ordinal table does not match dataset")
+    if meta.get("recordDigest") != record_digest(dataset):
+        raise StaleIndexSidecar("index sidecar record contents do not match dataset")
+    record_identities: Tuple[RecordIdentity, ...] = tuple(identities)
+
+    if isinstance(dataset, VerifiedDataset):
+        ordinals_by_id: Mapping[RecordIdentity, Sequence[int]] = dataset.record_ordinals
+    else:
+        grouped: DefaultDict[RecordIdentity, List[int]] = defaultdict(list)
+        for ordinal, record_id in enumerate(record_identities):
+            grouped[record_id].append(ordinal)
+        ordinals_by_id = grouped
+
+    try:
+        membership_meta: Optional[Mapping[str, Any]] = meta["membershipIndex"]
+        tolerance_meta: Optional[Mapping[str, Any]] = meta["toleranceIndex"]
+        filter_meta: Optional[Mapping[str, Any]] = meta["membershipFilter"]
+        return PreparedDataset(
+            dataset=dataset,
+            spatial_index=_decode_spatial(reader, meta["spatialIndex"], record_identities),
+            kd_index=_decode_kd(reader, meta["kdTree"], record_identities),
+            record_positions=MappingProxyType(
+                {record_id: tuple(items) for record_id, items in ordinals_by_id.items()}
+            ),
+            membership_index=(
+                _decode_membership(reader, "membership", membership_meta)
+                if membership_meta is not None
+                else None
+            ),
+            tolerance_index=(
+                _decode_membership(reader, "tolerance", tolerance_meta)
+                if tolerance_meta is not None
+                else None
+            ),
+            membership_filter=(
+                _decode_filter(reader, filter_meta) if filter_meta is not None else None
+            ),
+        )
+    except StaleIndexSidecar:
+        raise
+    except (IndexError, KeyError, TypeError, ValueError) as exc:
+        raise StaleIndexSidecar(f"index sidecar is unreadable: {exc}") from exc
@@ -1 +1,36 @@
-"""Search quality validation artifacts for Phase 3."""
+"""
+Search quality validation artifacts for Phase 3.
+
+Approximate KDTree search evaluation: recall / exactness / latency of
+search_approximate per (epsilon, max_visits) against exact search().
+
+CLI: python -m search.quality --size 20000 --out approximate.json
+"""
+
+from .approximate import (
+    DEFAULT_EPSILONS,
+    DEFAULT_MAX_VISITS,
+    evaluate_approximate_recall,
+    run_approximate_recall,
+)
+from .exceptions import InvalidQualityConfig, QualityEvaluationError
+from .models import ApproximateRecallPoint, ApproximateRecallReport
+from .serialize import (
+    approximate_report_to_dict,
+    approximate_report_to_json,
+    write_approximate_report,
+)
+
+__all__ = [
+    "ApproximateRecallPoint",
+    "ApproximateRecallReport",
+    "DEFAULT_EPSILONS",
+    "DEFAULT_MAX_VISITS",
+    "InvalidQualityConfig",
+    "QualityEvaluationError",
+    "approximate_report_to_dict",
+    "approximate_report_to_json",
+    "evaluate_approximate_recall",
+    "run_approximate_recall",
+    "write_approximate_report",
+]
@@ -0,0 +1,59 @@
+"""CLI: python -m search.quality [--size N] [--queries N] [--top-n N] [--epsilons E ...] [--out PATH]"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from search.kd_tree import KD_TREE_ENCODING_CENTROID, KD_TREE_ENCODINGS
+
+from .approximate import DEFAULT_EPSILONS, DEFAULT_MAX_VISITS, DEFAULT_TOP_N, run_approximate_recall
+from .serialize import approximate_report_to_json, write_approximate_report
+
+
+def _max_visits(value: str) -> int | None:
+    return None if value == "none" else int(value)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="search.quality",
+        description="Approximate KDTree search recall / latency over a synthetic corpus",
+    )
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hit-ratio", type=float, default=0.8)
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument("--epsilons", type=float, nargs="+", default=list(DEFAULT_EPSILONS))
+    parser.add_argument(
+        "--max-visits",
+        type=_max_visits,
+        nargs="+",
+        default=list(DEFAULT_MAX_VISITS),
+        help='Visit budgets ("none" = unbounded)',
+    )
+    parser.add_argument("--encoding", choices=KD_TREE_ENCODINGS, default=KD_TREE_ENCODING_CENTROID)
+    parser.add_argument("--out", type=Path, help="Write JSON here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_approximate_recall(
+        args.size,
+        query_count=args.queries,
+        seed=args.seed,
+        hit_ratio=args.hit_ratio,
+        top_n=args.top_n,
+        epsilons=args.epsilons,
+        max_visits=args.max_visits,
+        encoding=args.encoding,
+    )
+    if args.out is not None:
+        write_approximate_report(report, args.out)
+    else:
+        sys.stdout.write(approximate_report_to_json(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
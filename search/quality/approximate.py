@@ -0,0 +1,194 @@
+"""
+Recall / latency evaluation for approximate KDTree search.
+
+Every query is answered once by the exact search() and once per
+(epsilon, max_visits) setting by search_approximate(); each setting reports
+recall against the exact shortlist, exactness, distance loss, tree visits and
+latency percentiles, so epsilon / budget can be picked from data. Recall is
+scored by distance: a returned candidate counts when it is no farther than
+the exact k-th neighbour, so candidates tied with the exact ones at that
+distance are not misses.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Sequence
+
+from models import RecordIdentity
+from search.benchmark.corpus import generate_queries, generate_synthetic_dataset
+from search.kd_tree import (
+    KD_TREE_ENCODING_CENTROID,
+    KDTreeIndex,
+    KDTreeQueryInput,
+    NearestCandidate,
+    create_kd_tree_builder,
+    create_kd_tree_query,
+)
+from search.runtime.tracing import (
+    StageSpan,
+    StageStats,
+    StageStatsCollector,
+    elapsed_ms,
+    start_timer,
+)
+
+from .exceptions import InvalidQualityConfig, QualityEvaluationError
+from .models import ApproximateRecallPoint, ApproximateRecallReport
+
+DEFAULT_EPSILONS = (0.0, 0.1, 0.25, 0.5, 1.0)
+DEFAULT_MAX_VISITS: tuple[Optional[int], ...] = (None, 1024, 256, 64)
+DEFAULT_TOP_N = 10
+STAGE_EXACT = "exact"
+
+
+def _distance_ratio(found: NearestCandidate, best: NearestCandidate) -> float:
+    if best.distance == 0.0:
+        return 1.0 if found.distance == 0.0 else float("inf")
+    return found.distance / best.distance
+
+
+def _recall_hits(
+    found: Sequence[NearestCandidate],
+    exact: Sequence[NearestCandidate],
+) -> int:
+    """Returned candidates (at most ``len(exact)``) within the exact k-th distance."""
+    if not exact:
+        return 0
+    kth = exact[-1].distance
+    return sum(
+        item.distance <= kth or math.isclose(item.distance, kth)
+        for item in found[: len(exact)]
+    )
+
+
+def _latency(collector: StageStatsCollector, stage: str) -> StageStats:
+    stats = collector.stats(stage)
+    if stats is None:
+        raise QualityEvaluationError(f"no latency samples recorded for {stage}")
+    return stats
+
+
+def evaluate_approximate_recall(
+    index: KDTreeIndex,
+    queries: Sequence[KDTreeQueryInput],
+    *,
+    top_n: int = DEFAULT_TOP_N,
+    epsilons: Iterable[float] = DEFAULT_EPSILONS,
+    max_visits: Iterable[Optional[int]] = DEFAULT_MAX_VISITS,
+    record_count: Optional[int] = None,
+) -> ApproximateRecallReport:
+    """Score every epsilon x max_visits setting against exact search() on ``index``."""
+    if not queries:
+        raise InvalidQualityConfig("at least one query is required")
+    if top_n <= 0:
+        raise InvalidQualityConfig("top_n must be >= 1")
+    # Settings are crossed below; one-shot iterables must not run dry.
+    epsilons = tuple(epsilons)
+    max_visits = tuple(max_visits)
+    settings = [(epsilon, budget) for epsilon in epsilons for budget in max_visits]
+    if not settings:
+        raise InvalidQualityConfig("at least one epsilon and max_visits setting is required")
+
+    query_api = create_kd_tree_query()
+    collector = StageStatsCollector(max_samples=len(queries))
+    candidate_count = len(index.candidates)
+
+    exact_results: List[tuple[NearestCandidate, ...]] = []
+    exact_visited = 0
+    for query in queries:
+        started = start_timer()
+        result = query_api.search(index, query, top_n=top_n)
+        collector.record(
+            StageSpan(
+                stage=STAGE_EXACT,
+                elapsed_ms=elapsed_ms(started),
+                input_count=candidate_count,
+                output_count=len(result),
+            )
+        )
+        exact_results.append(result)
+        exact_visited += query_api.search_approximate(index, query, top_n=top_n).visited
+
+    points = []
+    for epsilon, budget in settings:
+        stage = f"epsilon={epsilon:g}/max_visits={budget}"
+        found = expected = exact_count = visited = 0
+        max_ratio = 1.0
+        for query, exact in zip(queries, exact_results):
+            started = start_timer()
+            result = query_api.search_approximate(
+                index, query, top_n=top_n, epsilon=epsilon, max_visits=budget
+            )
+            collector.record(
+                StageSpan(
+                    stage=stage,
+                    elapsed_ms=elapsed_ms(started),
+                    input_count=candidate_count,
+                    output_count=len(result.candidates),
+                )
+            )
+            found += _recall_hits(result.candidates, exact)
+            expected += len(exact)
+            exact_count += result.exact
+            visited += result.visited
+            for item, best in zip(result.candidates, exact):
+                max_ratio = max(max_ratio, _distance_ratio(item, best))
+            if len(result.candidates) < len(exact):
+                max_ratio = float("inf")
+        latency = _latency(collector, stage)
+        points.append(
+            ApproximateRecallPoint(
+                epsilon=epsilon,
+                max_visits=budget,
+                recall=found / expected if expected else 1.0,
+                exact_ratio=exact_count / len(queries),
+                max_distance_ratio=max_ratio,
+                mean_visited=visited / len(queries),
+                latency=latency,
+            )
+        )
+
+    exact_latency = _latency(collector, STAGE_EXACT)
+    return ApproximateRecallReport(
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        record_count=candidate_count if record_count is None else record_count,
+        query_count=len(queries),
+        top_n=top_n,
+        encoding=index.encoding,
+        exact_latency=exact_latency,
+        exact_mean_visited=exact_visited / len(queries),
+        points=tuple(points),
+    )
+
+
+def run_approximate_recall(
+    size: int,
+    *,
+    query_count: int = 200,
+    seed: int = 0,
+    hit_ratio: float = 0.8,
+    top_n: int = DEFAULT_TOP_N,
+    epsilons: Iterable[float] = DEFAULT_EPSILONS,
+    max_visits: Iterable[Optional[int]] = DEFAULT_MAX_VISITS,
+    encoding: str = KD_TREE_ENCODING_CENTROID,
+) -> ApproximateRecallReport:
+    """evaluate_approximate_recall() over a synthetic benchmark corpus of ``size`` records."""
+    if size <= 0:
+        raise InvalidQualityConfig("size must be >= 1")
+    dataset = generate_synthetic_dataset(size, seed=seed)
+    ids = [RecordIdentity(str(record.strategy_ref)) for record in dataset.records]
+    index = create_kd_tree_builder(encoding=encoding).build(dataset, ids)
+    queries = [
+        KDTreeQueryInput(cue=query.cue, target=query.target, second=query.second)
+        for query in generate_queries(dataset, query_count, seed=seed, hit_ratio=hit_ratio)
+    ]
+    return evaluate_approximate_recall(
+        index,
+        queries,
+        top_n=top_n,
+        epsilons=epsilons,
+        max_visits=max_visits,
+        record_count=len(dataset.records),
+    )
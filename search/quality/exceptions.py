@@ -0,0 +1,11 @@
+"""Search quality evaluation exceptions."""
+
+from __future__ import annotations
+
+
+class QualityEvaluationError(Exception):
+    """Base error for search quality evaluations."""
+
+
+class InvalidQualityConfig(QualityEvaluationError):
+    """Evaluation sizes / query counts / approximation settings are invalid."""
@@ -0,0 +1,39 @@
+"""Search quality evaluation models."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from search.runtime.tracing import StageStats
+
+
+@dataclass(frozen=True)
+class ApproximateRecallPoint:
+    """Recall / latency of search_approximate for one (epsilon, max_visits) setting."""
+
+    epsilon: float
+    max_visits: Optional[int]
+    # Exact top-N candidates found, over all queries (1.0 = every one).
+    recall: float
+    # Queries whose result reported exact=True.
+    exact_ratio: float
+    # Worst returned / exact distance at the same rank (1.0 = no loss).
+    max_distance_ratio: float
+    mean_visited: float
+    latency: StageStats
+
+
+@dataclass(frozen=True)
+class ApproximateRecallReport:
+    """Approximate KDTree search against exact search() over one query set."""
+
+    created_at: str
+    record_count: int
+    query_count: int
+    top_n: int
+    encoding: str
+    # search() latency and visits, the reference every point is scored against.
+    exact_latency: StageStats
+    exact_mean_visited: float
+    points: Tuple[ApproximateRecallPoint, ...]
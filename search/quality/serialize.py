@@ -0,0 +1,67 @@
+"""JSON serialization for search quality reports."""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict
+
+from search.runtime.tracing import StageStats
+
+from .models import ApproximateRecallPoint, ApproximateRecallReport
+
+APPROXIMATE_REPORT_FORMAT = "search-quality-approximate/1"
+
+
+def _latency_to_dict(stats: StageStats) -> Dict[str, Any]:
+    return {
+        "count": stats.count,
+        "p50Ms": stats.p50_ms,
+        "p95Ms": stats.p95_ms,
+        "p99Ms": stats.p99_ms,
+        "meanMs": stats.mean_ms,
+    }
+
+
+def _point_to_dict(point: ApproximateRecallPoint) -> Dict[str, Any]:
+    return {
+        "epsilon": point.epsilon,
+        "maxVisits": point.max_visits,
+        "recall": point.recall,
+        "exactRatio": point.exact_ratio,
+        # JSON has no Infinity: a short result (budget ran out) is null.
+        "maxDistanceRatio": point.max_distance_ratio
+        if math.isfinite(point.max_distance_ratio)
+        else None,
+        "meanVisited": point.mean_visited,
+        "latency": _latency_to_dict(point.latency),
+    }
+
+
+def approximate_report_to_dict(report: ApproximateRecallReport) -> Dict[str, Any]:
+    return {
+        "format": APPROXIMATE_REPORT_FORMAT,
+        "createdAt": report.created_at,
+        "recordCount": report.record_count,
+        "queryCount": report.query_count,
+        "topN": report.top_n,
+        "encoding": report.encoding,
+        "exact": {
+            "meanVisited": report.exact_mean_visited,
+            "latency": _latency_to_dict(report.exact_latency),
+        },
+        "points": [_point_to_dict(point) for point in report.points],
+    }
+
+
+def approximate_report_to_json(report: ApproximateRecallReport) -> str:
+    return json.dumps(approximate_report_to_dict(report), indent=2, ensure_ascii=False) + "\n"
+
+
+def write_approximate_report(report: ApproximateRecallReport, path: Path) -> Path:
+    """Write the report as UTF-8 JSON (parent directories are created)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(approximate_report_to_json(report), encoding="utf-8")
+    return path
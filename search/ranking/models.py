@@ -8,7 +8,7 @@ from typing import Mapping, Tuple
 from models import MembershipCandidate, RecordIdentity, StrategyRef
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScoreDetail:
     """
     Deterministic score breakdown.
@@ -22,7 +22,7 @@ class ScoreDetail:
     total: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RankedCandidate:
     """Ordered MembershipCandidate with ranking metadata."""
 
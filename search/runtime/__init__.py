@@ -7,9 +7,23 @@ Does not implement search algorithms.
 
 from .factory import create_search_enhancement_orchestrator
 from .orchestrator import PipelineArtifacts, SearchEnhancementOrchestrator
+from .tracing import (
+    PIPELINE_STAGES,
+    PipelineTracer,
+    StageSpan,
+    StageStats,
+    StageStatsCollector,
+    StageTrace,
+)
 
 __all__ = [
+    "PIPELINE_STAGES",
     "PipelineArtifacts",
+    "PipelineTracer",
     "SearchEnhancementOrchestrator",
+    "StageSpan",
+    "StageStats",
+    "StageStatsCollector",
+    "StageTrace",
     "create_search_enhancement_orchestrator",
 ]
@@ -5,13 +5,16 @@ from __future__ import annotations
 from membership import MembershipEngine, create_membership_engine
 
 from .orchestrator import SearchEnhancementOrchestrator
+from .tracing import PipelineTracer
 
 
 def create_search_enhancement_orchestrator(
     *,
     membership: MembershipEngine | None = None,
+    tracer: PipelineTracer | None = None,
 ) -> SearchEnhancementOrchestrator:
-    """Create orchestrator with default Phase-3 engines."""
+    """Create orchestrator with default Phase-3 engines and optional tracer."""
     return SearchEnhancementOrchestrator(
         membership=membership if membership is not None else create_membership_engine(),
+        tracer=tracer,
     )
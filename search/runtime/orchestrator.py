@@ -8,6 +8,7 @@ Does not implement Membership, Ranking, Interpolation, Geometry, or Resolve logi
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Sequence
 
 from membership.interfaces import MembershipEngine, MembershipQuery
 from models import MembershipCandidate, PublishedDataset
@@ -26,13 +27,57 @@ from search.kd_tree import (
     create_kd_tree_query,
 )
 from search.kd_tree.builder import DefaultKDTreeBuilder
+from search.kd_tree.models import NearestCandidate
 from search.kd_tree.query import DefaultKDTreeQuery
+from search.membership.models import PrefilterResult
+from search.prepared import DefaultDatasetPreparer, PreparedDataset
 from search.ranking import create_ranking_engine
 from search.ranking.engine import DefaultRankingEngine
 from search.ranking.models import RankedCandidate
-from search.spatial_index import SpatialQuery, create_spatial_index_builder
+from search.spatial_index import (
+    SpatialCell,
+    SpatialIndex,
+    SpatialQuery,
+    create_spatial_index_builder,
+    query_cells,
+)
 from search.spatial_index.builder import DefaultSpatialIndexBuilder
 
+from .tracing import (
+    STAGE_GEOMETRY,
+    STAGE_INTERPOLATION,
+    STAGE_KD_TREE,
+    STAGE_MEMBERSHIP,
+    STAGE_RANKING,
+    STAGE_SPATIAL_INDEX,
+    PipelineTracer,
+    StageTrace,
+)
+
+# Exact query coordinates (cue, target, second) for in-batch deduplication.
+_QueryKey = tuple[float, float, float, float, float, float]
+
+
+def _cell_key(
+    index: SpatialIndex,
+    query: MembershipQuery,
+) -> tuple[SpatialCell, SpatialCell, SpatialCell]:
+    # Leaf cells of this index (adaptive grids split below the 8x4 cells).
+    return query_cells(
+        index, SpatialQuery(cue=query.cue, target=query.target, second=query.second)
+    )
+
+
+def _query_key(query: MembershipQuery) -> _QueryKey:
+    return (
+        query.cue.x,
+        query.cue.y,
+        query.target.x,
+        query.target.y,
+        query.second.x,
+        query.second.y,
+    )
+
 
 @dataclass(frozen=True)
 class PipelineArtifacts:
@@ -52,6 +97,9 @@ class SearchEnhancementOrchestrator:
     Call order:
       Spatial Index → KDTree → Membership → Ranking → Interpolation
       → Geometry Metrics → (Resolve is performed by Runtime Host)
+
+    A PreparedDataset skips Spatial Index / KDTree builds and queries its
+    prebuilt indexes; the PublishedDataset path builds them per run.
     """
 
     def __init__(
@@ -64,6 +112,7 @@ class SearchEnhancementOrchestrator:
         ranking: DefaultRankingEngine | None = None,
         interpolation: DefaultInterpolationEngine | None = None,
         geometry: DefaultGeometryMetricsEngine | None = None,
+        tracer: PipelineTracer | None = None,
     ) -> None:
         self._membership = membership
         self._spatial_builder = spatial_builder or create_spatial_index_builder()
@@ -72,31 +121,254 @@ class SearchEnhancementOrchestrator:
         self._ranking = ranking or create_ranking_engine()
         self._interpolation = interpolation or create_interpolation_engine()
         self._geometry = geometry or create_geometry_metrics_engine()
+        self._tracer = tracer
+        # Build only the optional indexes the Membership engine reads.
+        prepared_indexes = getattr(membership, "prepared_indexes", frozenset())
+        self._preparer = DefaultDatasetPreparer(
+            spatial_builder=self._spatial_builder,
+            kd_builder=self._kd_builder,
+            membership_index="membership_index" in prepared_indexes,
+            membership_filter="membership_filter" in prepared_indexes,
+            membership_tolerance=(
+                getattr(membership, "membership_tolerance", None)
+                if "membership_tolerance" in prepared_indexes
+                else None
+            ),
+        )
+        self._last_prepared: PreparedDataset | None = None
 
     def run(
         self,
-        dataset: PublishedDataset,
+        dataset: PublishedDataset | PreparedDataset,
         query: MembershipQuery,
     ) -> PipelineArtifacts:
+        prepared = dataset if isinstance(dataset, PreparedDataset) else None
+        tracer = self._tracer
+        record_count = len(dataset.records or []) if tracer is not None else 0
+
         # 1. Spatial Index
-        spatial_index = self._spatial_builder.build(dataset)
-        spatial_result = self._spatial_builder.query(
-            spatial_index,
-            SpatialQuery(cue=query.cue, target=query.target, second=query.second),
-        )
+        with StageTrace(tracer, STAGE_SPATIAL_INDEX, input_count=record_count) as span:
+            spatial_index = (
+                prepared.spatial_index
+                if prepared is not None
+                else self._spatial_builder.build(dataset)
+            )
+            spatial_result = self._spatial_builder.query(
+                spatial_index,
+                SpatialQuery(cue=query.cue, target=query.target, second=query.second),
+            )
+            candidate_ordinals = spatial_result.candidate_ordinals
+            prefilter_hit = bool(candidate_ordinals)
+            span.output_count = len(candidate_ordinals)
+            span.prefilter_hit = prefilter_hit
 
         # 2. KDTree
-        candidate_ids = spatial_result.candidate_ids
-        kd_index = self._kd_builder.build(dataset, candidate_ids)
-        top_n = len(candidate_ids) if candidate_ids else 1
-        self._kd_query.search(
-            kd_index,
+        with StageTrace(
+            tracer,
+            STAGE_KD_TREE,
+            input_count=len(candidate_ordinals),
+            prefilter_hit=prefilter_hit,
+        ) as span:
+            if prepared is not None:
+                shortlist = self._search_prepared(prepared, query, candidate_ordinals)
+            else:
+                candidate_ids = spatial_result.candidate_ids
+                kd_index = self._kd_builder.build(dataset, candidate_ids)
+                shortlist = self._kd_query.search(
+                    kd_index,
+                    KDTreeQueryInput(cue=query.cue, target=query.target, second=query.second),
+                    top_n=len(candidate_ids) if candidate_ids else 1,
+                )
+            span.output_count = len(shortlist or ())
+
+        # 3. Membership (final contract gate; reuses the Spatial/KDTree shortlist)
+        with StageTrace(
+            tracer,
+            STAGE_MEMBERSHIP,
+            # A prefilter miss means Membership may scan the whole corpus.
+            input_count=len(candidate_ordinals) if prefilter_hit else record_count,
+            prefilter_hit=prefilter_hit,
+        ) as span:
+            membership_candidates = tuple(
+                self._evaluate(
+                    dataset,
+                    query,
+                    PrefilterResult(
+                        candidate_ordinals=candidate_ordinals,
+                        shortlist=tuple(shortlist or ()),
+                    ),
+                )
+                or ()
+            )
+            span.output_count = len(membership_candidates)
+        return self._run_downstream(query, membership_candidates)
+
+    def run_many(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        queries: Sequence[MembershipQuery],
+    ) -> tuple[PipelineArtifacts, ...]:
+        """
+        Batch run(): one PipelineArtifacts per query, in input order.
+
+        A PublishedDataset is prepared once and reused while later batches
+        pass the same dataset object; queries are grouped by Spatial cell so
+        each cell is queried once, and identical queries share one pipeline
+        pass. Each entry equals run(dataset, query).
+        """
+        tracer = self._tracer
+        prepared = self._prepare(dataset)
+        record_count = len(prepared.records or []) if tracer is not None else 0
+
+        groups: dict[tuple[SpatialCell, SpatialCell, SpatialCell], list[int]] = {}
+        for position, query in enumerate(queries):
+            groups.setdefault(_cell_key(prepared.spatial_index, query), []).append(position)
+
+        results: list[PipelineArtifacts | None] = [None] * len(queries)
+        for positions in groups.values():
+            first = queries[positions[0]]
+            unique: dict[_QueryKey, list[int]] = {}
+            for position in positions:
+                unique.setdefault(_query_key(queries[position]), []).append(position)
+            group_queries = [queries[items[0]] for items in unique.values()]
+
+            # 1. Spatial Index (one lookup per cell group)
+            query_count = len(group_queries)
+            with StageTrace(
+                tracer,
+                STAGE_SPATIAL_INDEX,
+                input_count=record_count,
+                query_count=query_count,
+            ) as span:
+                spatial_result = self._spatial_builder.query(
+                    prepared.spatial_index,
+                    SpatialQuery(cue=first.cue, target=first.target, second=first.second),
+                )
+                candidate_ordinals = spatial_result.candidate_ordinals
+                prefilter_hit = bool(candidate_ordinals)
+                span.output_count = len(candidate_ordinals)
+                span.prefilter_hit = prefilter_hit
+
+            # 2. KDTree
+            with StageTrace(
+                tracer,
+                STAGE_KD_TREE,
+                input_count=len(candidate_ordinals) * query_count,
+                prefilter_hit=prefilter_hit,
+                query_count=query_count,
+            ) as span:
+                prefilters = [
+                    PrefilterResult(candidate_ordinals=candidate_ordinals, shortlist=shortlist)
+                    for shortlist in self._search_prepared_many(
+                        prepared, group_queries, candidate_ordinals
+                    )
+                ]
+                span.output_count = sum(len(item.shortlist) for item in prefilters)
+
+            # 3. Membership over the whole group (reusing each KDTree shortlist)
+            with StageTrace(
+                tracer,
+                STAGE_MEMBERSHIP,
+                input_count=(len(candidate_ordinals) if prefilter_hit else record_count)
+                * query_count,
+                prefilter_hit=prefilter_hit,
+                query_count=query_count,
+            ) as span:
+                membership_batches = self._evaluate_many(prepared, group_queries, prefilters)
+                span.output_count = sum(len(items or ()) for items in membership_batches)
+
+            # 4-6. Ranking → Interpolation → Geometry Metrics per unique query
+            for query, items, candidates in zip(
+                group_queries, unique.values(), membership_batches
+            ):
+                artifacts = self._run_downstream(query, tuple(candidates or ()))
+                for position in items:
+                    results[position] = artifacts
+
+        return tuple(item for item in results if item is not None)
+
+    def _prepare(self, dataset: PublishedDataset | PreparedDataset) -> PreparedDataset:
+        if isinstance(dataset, PreparedDataset):
+            return dataset
+        last = self._last_prepared
+        if last is not None and last.dataset is dataset:
+            return last
+        prepared = self._preparer.prepare(dataset)
+        self._last_prepared = prepared
+        return prepared
+
+    def _search_prepared(
+        self,
+        prepared: PreparedDataset,
+        query: MembershipQuery,
+        candidate_ordinals: tuple[int, ...],
+    ) -> tuple[NearestCandidate, ...]:
+        return self._kd_query.search(
+            prepared.kd_index,
             KDTreeQueryInput(cue=query.cue, target=query.target, second=query.second),
-            top_n=top_n,
+            top_n=len(candidate_ordinals) if candidate_ordinals else 1,
+            scope_ordinals=candidate_ordinals,
         )
 
-        # 3. Membership (final contract gate; may reuse Spatial/KDTree internally)
-        membership_candidates = tuple(self._membership.evaluate(dataset, query) or ())
+    def _search_prepared_many(
+        self,
+        prepared: PreparedDataset,
+        queries: Sequence[MembershipQuery],
+        candidate_ordinals: tuple[int, ...],
+    ) -> Sequence[tuple[NearestCandidate, ...]]:
+        # A cell group shares one scope, so its queries are searched as a batch
+        # when the KDTree query offers one; else one search() per query.
+        search_many = getattr(self._kd_query, "search_many", None)
+        if not callable(search_many):
+            return [
+                self._search_prepared(prepared, query, candidate_ordinals) for query in queries
+            ]
+        return search_many(
+            prepared.kd_index,
+            [
+                KDTreeQueryInput(cue=query.cue, target=query.target, second=query.second)
+                for query in queries
+            ],
+            top_n=len(candidate_ordinals) if candidate_ordinals else 1,
+            scope_ordinals=candidate_ordinals,
+        )
+
+    def _evaluate(
+        self,
+        dataset: PublishedDataset | PreparedDataset,
+        query: MembershipQuery,
+        prefilter: PrefilterResult,
+    ) -> list[MembershipCandidate]:
+        # Explicit prefilter channel when the engine offers one; else plain evaluate().
+        evaluate_with_prefilter = getattr(self._membership, "evaluate_with_prefilter", None)
+        if callable(evaluate_with_prefilter):
+            return evaluate_with_prefilter(dataset, query, prefilter)
+        return self._membership.evaluate(dataset, query)
+
+    def _evaluate_many(
+        self,
+        prepared: PreparedDataset,
+        queries: Sequence[MembershipQuery],
+        prefilters: Sequence[PrefilterResult],
+    ) -> list[list[MembershipCandidate]]:
+        evaluate_many = getattr(self._membership, "evaluate_many", None)
+        # Engines with the prefilter channel also take prefilters= in evaluate_many().
+        if callable(evaluate_many) and callable(
+            getattr(self._membership, "evaluate_with_prefilter", None)
+        ):
+            return list(evaluate_many(prepared, queries, prefilters=prefilters))
+        if callable(evaluate_many):
+            return list(evaluate_many(prepared, queries))
+        return [
+            self._evaluate(prepared, query, prefilter)
+            for query, prefilter in zip(queries, prefilters)
+        ]
+
+    def _run_downstream(
+        self,
+        query: MembershipQuery,
+        membership_candidates: tuple[MembershipCandidate, ...],
+    ) -> PipelineArtifacts:
         if not membership_candidates:
             empty: tuple = ()
             return PipelineArtifacts(
@@ -106,24 +378,31 @@ class SearchEnhancementOrchestrator:
                 geometry_candidates=empty,
                 resolve_candidates=empty,
             )
+        tracer = self._tracer
 
         # 4. Ranking
-        ranked = tuple(self._ranking.rank(membership_candidates))
+        with StageTrace(tracer, STAGE_RANKING, input_count=len(membership_candidates)) as span:
+            ranked = tuple(self._ranking.rank(membership_candidates))
+            span.output_count = len(ranked)
 
         # 5. Interpolation
-        refined = tuple(self._interpolation.refine(ranked))
+        with StageTrace(tracer, STAGE_INTERPOLATION, input_count=len(ranked)) as span:
+            refined = tuple(self._interpolation.refine(ranked))
+            span.output_count = len(refined)
 
         # 6. Geometry Metrics
-        geometry = tuple(
-            self._geometry.evaluate(
-                refined,
-                GeometrySearchQuery(
-                    cue=query.cue,
-                    target=query.target,
-                    second=query.second,
-                ),
+        with StageTrace(tracer, STAGE_GEOMETRY, input_count=len(refined)) as span:
+            geometry = tuple(
+                self._geometry.evaluate(
+                    refined,
+                    GeometrySearchQuery(
+                        cue=query.cue,
+                        target=query.target,
+                        second=query.second,
+                    ),
+                )
             )
-        )
+            span.output_count = len(geometry)
 
         # Resolve input preserves Geometry / Ranking order via MembershipCandidate.
         resolve_candidates = tuple(
@@ -0,0 +1,231 @@
+"""
+Pipeline stage tracing.
+
+Optional hook for the Enhancement orchestrator and Runtime Host.
+One StageSpan per stage: wall time, candidate counts in/out, prefilter hit.
+Tracing is off unless a PipelineTracer is supplied.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Mapping, Optional, Protocol, runtime_checkable
+
+STAGE_SPATIAL_INDEX = "spatial_index"
+STAGE_KD_TREE = "kd_tree"
+STAGE_MEMBERSHIP = "membership"
+STAGE_RANKING = "ranking"
+STAGE_INTERPOLATION = "interpolation"
+STAGE_GEOMETRY = "geometry"
+STAGE_RESOLVE = "resolve"
+
+PIPELINE_STAGES = (
+    STAGE_SPATIAL_INDEX,
+    STAGE_KD_TREE,
+    STAGE_MEMBERSHIP,
+    STAGE_RANKING,
+    STAGE_INTERPOLATION,
+    STAGE_GEOMETRY,
+    STAGE_RESOLVE,
+)
+
+
+@dataclass(frozen=True)
+class StageSpan:
+    """One stage execution for one query (or one query group in a batch)."""
+
+    stage: str
+    elapsed_ms: float
+    input_count: int
+    output_count: int
+    # Spatial prefilter produced candidates (None when not applicable).
+    prefilter_hit: Optional[bool] = None
+    query_count: int = 1
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Aggregated timing / selectivity for one stage."""
+
+    stage: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    input_total: int
+    output_total: int
+    prefilter_hits: int
+    prefilter_misses: int
+
+    @property
+    def selectivity(self) -> float:
+        """output / input over all spans (1.0 when nothing entered the stage)."""
+        if self.input_total == 0:
+            return 1.0
+        return self.output_total / self.input_total
+
+
+@runtime_checkable
+class PipelineTracer(Protocol):
+    """Receives one StageSpan per executed stage."""
+
+    def record(self, span: StageSpan) -> None:
+        ...
+
+
+def start_timer() -> float:
+    return time.perf_counter()
+
+
+def elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000.0
+
+
+class StageTrace:
+    """
+    Context manager timing one stage and recording its StageSpan on exit.
+
+    Set ``output_count`` (and ``input_count`` when it is only known inside
+    the block) before leaving. Without a tracer nothing is timed or
+    recorded; a block that raises records nothing.
+    """
+
+    __slots__ = (
+        "_tracer",
+        "_stage",
+        "_started",
+        "input_count",
+        "output_count",
+        "prefilter_hit",
+        "query_count",
+    )
+
+    def __init__(
+        self,
+        tracer: Optional[PipelineTracer],
+        stage: str,
+        *,
+        input_count: int = 0,
+        prefilter_hit: Optional[bool] = None,
+        query_count: int = 1,
+    ) -> None:
+        self._tracer = tracer
+        self._stage = stage
+        self._started = 0.0
+        self.input_count = input_count
+        self.output_count = 0
+        self.prefilter_hit = prefilter_hit
+        self.query_count = query_count
+
+    def __enter__(self) -> "StageTrace":
+        if self._tracer is not None:
+            self._started = start_timer()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, traceback: object) -> None:
+        if self._tracer is not None and exc_type is None:
+            self._tracer.record(
+                StageSpan(
+                    stage=self._stage,
+                    elapsed_ms=elapsed_ms(self._started),
+                    input_count=self.input_count,
+                    output_count=self.output_count,
+                    prefilter_hit=self.prefilter_hit,
+                    query_count=self.query_count,
+                )
+            )
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile over an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class _StageAccumulator:
+    def __init__(self, max_samples: int) -> None:
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+        self.total_ms = 0.0
+        self.input_total = 0
+        self.output_total = 0
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, span: StageSpan) -> None:
+        self.samples.append(span.elapsed_ms)
+        self.count += 1
+        self.total_ms += span.elapsed_ms
+        self.input_total += span.input_count
+        self.output_total += span.output_count
+        if span.prefilter_hit is True:
+            self.hits += 1
+        elif span.prefilter_hit is False:
+            self.misses += 1
+
+
+class StageStatsCollector:
+    """
+    Built-in PipelineTracer aggregating p50 / p95 / p99 per stage.
+
+    Percentiles use the most recent ``max_samples`` spans per stage;
+    counts and totals cover every span recorded.
+    """
+
+    def __init__(self, *, max_samples: int = 10_000) -> None:
+        if max_samples <= 0:
+            raise ValueError("max_samples must be >= 1")
+        self._max_samples = max_samples
+        self._stages: Dict[str, _StageAccumulator] = {}
+        self._lock = threading.Lock()
+
+    def record(self, span: StageSpan) -> None:
+        with self._lock:
+            accumulator = self._stages.get(span.stage)
+            if accumulator is None:
+                accumulator = _StageAccumulator(self._max_samples)
+                self._stages[span.stage] = accumulator
+            accumulator.add(span)
+
+    def stats(self, stage: str) -> Optional[StageStats]:
+        with self._lock:
+            accumulator = self._stages.get(stage)
+            if accumulator is None:
+                return None
+            ordered = sorted(accumulator.samples)
+            return StageStats(
+                stage=stage,
+                count=accumulator.count,
+                p50_ms=_percentile(ordered, 0.50),
+                p95_ms=_percentile(ordered, 0.95),
+                p99_ms=_percentile(ordered, 0.99),
+                mean_ms=accumulator.total_ms / accumulator.count,
+                input_total=accumulator.input_total,
+                output_total=accumulator.output_total,
+                prefilter_hits=accumulator.hits,
+                prefilter_misses=accumulator.misses,
+            )
+
+    def summary(self) -> Mapping[str, StageStats]:
+        """Stats per recorded stage, pipeline stages first."""
+        with self._lock:
+            names = list(self._stages)
+        ordered = [name for name in PIPELINE_STAGES if name in names]
+        ordered += sorted(name for name in names if name not in PIPELINE_STAGES)
+        result: Dict[str, StageStats] = {}
+        for name in ordered:
+            stats = self.stats(name)
+            if stats is not None:
+                result[name] = stats
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
@@ -5,7 +5,16 @@ PublishedDataset remains the only search input.
 Spatial Index exists only as an in-memory derived cache.
 """
 
-from .builder import DefaultSpatialIndexBuilder
+from .bitmap import OrdinalBitmap, bitmap_from_ordinals, intersect_bitmaps
+from .builder import DefaultSpatialIndexBuilder, query_cells
+from .contract import (
+    SPATIAL_GRID_ADAPTIVE,
+    SPATIAL_GRID_FIXED,
+    SPATIAL_LEAF_CAPACITY,
+    SPATIAL_MAX_DEPTH,
+    SPATIAL_POSTINGS_BITMAP,
+    SPATIAL_POSTINGS_SET,
+)
 from .exceptions import (
     InvalidSpatialDataset,
     InvalidSpatialQuery,
@@ -13,17 +22,36 @@ from .exceptions import (
     SpatialIndexError,
 )
 from .factory import create_spatial_index_builder
-from .models import SpatialCell, SpatialIndex, SpatialQuery, SpatialQueryResult
+from .models import (
+    AxisOccupancy,
+    SpatialCell,
+    SpatialIndex,
+    SpatialOccupancy,
+    SpatialQuery,
+    SpatialQueryResult,
+)
 
 __all__ = [
+    "AxisOccupancy",
     "DefaultSpatialIndexBuilder",
     "InvalidSpatialDataset",
     "InvalidSpatialQuery",
+    "OrdinalBitmap",
+    "SPATIAL_GRID_ADAPTIVE",
+    "SPATIAL_GRID_FIXED",
+    "SPATIAL_LEAF_CAPACITY",
+    "SPATIAL_MAX_DEPTH",
+    "SPATIAL_POSTINGS_BITMAP",
+    "SPATIAL_POSTINGS_SET",
     "SpatialCell",
     "SpatialIndex",
     "SpatialIndexBuildFailure",
     "SpatialIndexError",
+    "SpatialOccupancy",
     "SpatialQuery",
     "SpatialQueryResult",
+    "bitmap_from_ordinals",
     "create_spatial_index_builder",
+    "intersect_bitmaps",
+    "query_cells",
 ]
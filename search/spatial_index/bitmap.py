@@ -0,0 +1,100 @@
+"""
+Chunked int-bitset posting lists over record ordinals.
+
+Roaring-style split: ordinal >> 16 selects a container, the low 16 bits are
+one bit in that container's Python int. AND / popcount run on whole ints, and
+containers absent from either side are skipped.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from .contract import BITMAP_CHUNK_BITS
+
+_CHUNK_MASK = (1 << BITMAP_CHUNK_BITS) - 1
+_CHUNK_BYTES = (1 << BITMAP_CHUNK_BITS) // 8
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+# Containers with at most this many members decode bit by bit, not bytewise.
+_SPARSE_DECODE_LIMIT = 16
+# Set bit offsets per byte value.
+_BYTE_BITS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)
+)
+
+
+@dataclass(frozen=True)
+class OrdinalBitmap:
+    """Immutable set of record ordinals: chunk key -> non-zero int bitset."""
+
+    chunks: Mapping[int, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return sum(bits.bit_count() for bits in self.chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks)
+
+    def __and__(self, other: "OrdinalBitmap") -> "OrdinalBitmap":
+        return intersect_bitmaps(self, other)
+
+    def ordinals(self) -> Tuple[int, ...]:
+        """Member ordinals, ascending."""
+        result: List[int] = []
+        for key in sorted(self.chunks):
+            base = key << BITMAP_CHUNK_BITS
+            bits = self.chunks[key]
+            if bits.bit_count() <= _SPARSE_DECODE_LIMIT:
+                while bits:
+                    low = bits & -bits
+                    result.append(base + low.bit_length() - 1)
+                    bits ^= low
+                continue
+            data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+            for match in _NONZERO_BYTE.finditer(data):
+                offset = base + match.start() * 8
+                result.extend(offset + bit for bit in _BYTE_BITS[data[match.start()]])
+        return tuple(result)
+
+
+EMPTY_BITMAP = OrdinalBitmap()
+
+
+def bitmap_from_ordinals(ordinals: Iterable[int]) -> OrdinalBitmap:
+    """Build a bitmap from non-negative ordinals (any order, repeats allowed)."""
+    buffers: Dict[int, bytearray] = {}
+    for ordinal in ordinals:
+        if ordinal < 0:
+            raise ValueError("record ordinals must be >= 0")
+        key = ordinal >> BITMAP_CHUNK_BITS
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = buffers[key] = bytearray(_CHUNK_BYTES)
+        low = ordinal & _CHUNK_MASK
+        buffer[low >> 3] |= 1 << (low & 7)
+    return OrdinalBitmap(
+        chunks={key: int.from_bytes(buffer, "little") for key, buffer in buffers.items()}
+    )
+
+
+def intersect_bitmaps(*bitmaps: OrdinalBitmap) -> OrdinalBitmap:
+    """AND of every bitmap (smallest container map drives)."""
+    if not bitmaps:
+        return EMPTY_BITMAP
+    ordered = sorted(bitmaps, key=lambda bitmap: len(bitmap.chunks))
+    first, others = ordered[0], ordered[1:]
+    chunks: Dict[int, int] = {}
+    for key, bits in first.chunks.items():
+        for other in others:
+            other_bits = other.chunks.get(key)
+            if other_bits is None:
+                bits = 0
+                break
+            bits &= other_bits
+            if not bits:
+                break
+        if bits:
+            chunks[key] = bits
+    return OrdinalBitmap(chunks=chunks)
@@ -2,15 +2,61 @@
 
 from __future__ import annotations
 
+import math
 from collections import defaultdict
 from types import MappingProxyType
-from typing import DefaultDict, FrozenSet, Iterable, Mapping, Sequence
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from models import EnvelopeRecord, Point, PublishedDataset, RecordIdentity
+from models import (
+    ColumnarDataset,
+    EnvelopeRecord,
+    Point,
+    PublishedDataset,
+    RecordIdentity,
+    VerifiedDataset,
+)
 
-from .cell import point_to_cell
+from .bitmap import EMPTY_BITMAP, OrdinalBitmap, bitmap_from_ordinals, intersect_bitmaps
+from .cell import base_cell, clamp_point, clamp_xy, locate_cell, point_to_cell, xy_to_cell
+from .contract import (
+    CELL_HEIGHT,
+    CELL_WIDTH,
+    SPATIAL_GRID_ADAPTIVE,
+    SPATIAL_GRID_FIXED,
+    SPATIAL_GRIDS,
+    SPATIAL_LEAF_CAPACITY,
+    SPATIAL_MAX_DEPTH,
+    SPATIAL_POSTINGS,
+    SPATIAL_POSTINGS_BITMAP,
+    SPATIAL_POSTINGS_SET,
+)
 from .exceptions import InvalidSpatialDataset, InvalidSpatialQuery, SpatialIndexBuildFailure
-from .models import SpatialCell, SpatialIndex, SpatialQuery, SpatialQueryResult
+from .models import (
+    AxisOccupancy,
+    CellPostings,
+    SpatialCell,
+    SpatialIndex,
+    SpatialOccupancy,
+    SpatialQuery,
+    SpatialQueryResult,
+)
+
+# Adaptive build input: base cell -> (x, y, record ordinal), coordinates clamped.
+_Entries = DefaultDict[SpatialCell, List[Tuple[float, float, int]]]
 
 
 def _record_identity(record: EnvelopeRecord) -> RecordIdentity:
@@ -18,22 +64,160 @@ def _record_identity(record: EnvelopeRecord) -> RecordIdentity:
 
 
 def _freeze_map(
-    source: Mapping[SpatialCell, Iterable[RecordIdentity]]
-) -> dict[SpatialCell, FrozenSet[RecordIdentity]]:
-    return {cell: frozenset(ids) for cell, ids in source.items()}
+    source: Mapping[SpatialCell, Iterable[int]],
+    freeze: Callable[[Iterable[int]], CellPostings],
+) -> dict[SpatialCell, CellPostings]:
+    return {cell: freeze(ordinals) for cell, ordinals in source.items()}
 
 
 def _add_points(
-    table: DefaultDict[SpatialCell, set[RecordIdentity]],
+    table: DefaultDict[SpatialCell, set[int]],
     points: Sequence[Point],
-    record_id: RecordIdentity,
+    ordinal: int,
 ) -> None:
     for point in points:
-        table[point_to_cell(point)].add(record_id)
+        table[point_to_cell(point)].add(ordinal)
+
+
+def _add_entries(table: _Entries, points: Sequence[Point], ordinal: int) -> None:
+    for point in points:
+        x, y = clamp_point(point)
+        table[point_to_cell(point)].append((x, y, ordinal))
+
+
+def _add_columnar(
+    cells: DefaultDict[SpatialCell, set[int]],
+    entries: _Entries,
+    dataset: ColumnarDataset,
+    column: str,
+    adaptive: bool,
+) -> None:
+    # Reads the point columns in place; no EnvelopeRecord views are built.
+    if adaptive:
+        for x, y, ordinal in dataset.points(column):
+            x, y = clamp_xy(x, y)
+            entries[xy_to_cell(x, y)].append((x, y, ordinal))
+        return
+    for x, y, ordinal in dataset.points(column):
+        cells[xy_to_cell(x, y)].add(ordinal)
+
+
+def _split_cells(
+    table: _Entries,
+    leaf_capacity: int,
+    max_depth: int,
+) -> Tuple[Dict[SpatialCell, Set[int]], Set[SpatialCell]]:
+    """Split cells over ``leaf_capacity`` records into 2x2 children, up to ``max_depth``."""
+    leaves: Dict[SpatialCell, Set[int]] = {}
+    splits: Set[SpatialCell] = set()
+    stack = list(table.items())
+    while stack:
+        cell, entries = stack.pop()
+        ordinals = {entry[2] for entry in entries}
+        if len(ordinals) <= leaf_capacity or cell.level >= max_depth:
+            leaves[cell] = ordinals
+            continue
+        splits.add(cell)
+        # Same midpoint rule as child_cell, on plain (col, row) keys.
+        level = cell.level + 1
+        col, row = cell.col * 2, cell.row * 2
+        mid_x = (col + 1) * (CELL_WIDTH / (1 << level))
+        mid_y = (row + 1) * (CELL_HEIGHT / (1 << level))
+        children: DefaultDict[Tuple[int, int], List[Tuple[float, float, int]]]
+        children = defaultdict(list)
+        for entry in entries:
+            children[(col + (entry[0] >= mid_x), row + (entry[1] >= mid_y))].append(entry)
+        stack.extend(
+            (SpatialCell(col=key[0], row=key[1], level=level), child)
+            for key, child in children.items()
+        )
+    return leaves, splits
+
+
+def _target_points(record: EnvelopeRecord) -> Sequence[Point]:
+    return (record.target,)
+
+
+def _cue_points(record: EnvelopeRecord) -> Sequence[Point]:
+    return record.cue_set
+
+
+def _second_points(record: EnvelopeRecord) -> Sequence[Point]:
+    return record.second_set
+
+
+def _posting_ordinals(postings: CellPostings) -> Iterable[int]:
+    return postings.ordinals() if isinstance(postings, OrdinalBitmap) else postings
+
+
+def _axis_occupancy(
+    axis: str,
+    cells: Mapping[SpatialCell, CellPostings],
+    splits: AbstractSet[SpatialCell],
+) -> AxisOccupancy:
+    counts = {cell: len(postings) for cell, postings in cells.items()}
+    ordered = sorted(counts.values())
+    p95 = ordered[min(len(ordered), max(1, math.ceil(0.95 * len(ordered)))) - 1] if ordered else 0
+    return AxisOccupancy(
+        axis=axis,
+        cell_count=len(counts),
+        split_count=len(splits),
+        max_level=max((cell.level for cell in counts), default=0),
+        max_records=ordered[-1] if ordered else 0,
+        mean_records=sum(ordered) / len(ordered) if ordered else 0.0,
+        p95_records=p95,
+        cells=MappingProxyType(counts),
+    )
 
 
 class DefaultSpatialIndexBuilder:
-    """Build runtime-derived spatial index and query candidate ids."""
+    """
+    Build runtime-derived spatial index and query candidate ids.
+
+    ``postings`` selects frozenset cells (default) or chunked int-bitset
+    cells (OrdinalBitmap); both answer queries identically.
+    ``grid="adaptive"`` splits any 8x4 cell holding more than ``leaf_capacity``
+    records into 2x2 children, recursively down to ``max_depth`` levels.
+    """
+
+    def __init__(
+        self,
+        *,
+        postings: str = SPATIAL_POSTINGS_SET,
+        grid: str = SPATIAL_GRID_FIXED,
+        leaf_capacity: int = SPATIAL_LEAF_CAPACITY,
+        max_depth: int = SPATIAL_MAX_DEPTH,
+    ) -> None:
+        if postings not in SPATIAL_POSTINGS:
+            raise ValueError(f"unknown Spatial Index postings: {postings}")
+        if grid not in SPATIAL_GRIDS:
+            raise ValueError(f"unknown Spatial Index grid: {grid}")
+        if leaf_capacity < 1:
+            raise ValueError("leaf_capacity must be >= 1")
+        if max_depth < 0:
+            raise ValueError("max_depth must be >= 0")
+        self._postings = postings
+        self._grid = grid
+        self._leaf_capacity = leaf_capacity
+        self._max_depth = max_depth
+
+    @property
+    def postings(self) -> str:
+        return self._postings
+
+    @property
+    def grid(self) -> str:
+        return self._grid
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Build options as JSON values (recorded in index sidecars)."""
+        return {
+            "postings": self._postings,
+            "grid": self._grid,
+            "leafCapacity": self._leaf_capacity,
+            "maxDepth": self._max_depth,
+        }
 
     def build(self, dataset: PublishedDataset) -> SpatialIndex:
         if dataset is None:
@@ -42,26 +226,68 @@ class DefaultSpatialIndexBuilder:
             raise InvalidSpatialDataset("dataset must be a PublishedDataset model")
 
         try:
-            target_cells: DefaultDict[SpatialCell, set[RecordIdentity]] = defaultdict(set)
-            cue_cells: DefaultDict[SpatialCell, set[RecordIdentity]] = defaultdict(set)
-            second_cells: DefaultDict[SpatialCell, set[RecordIdentity]] = defaultdict(set)
+            adaptive = self._grid == SPATIAL_GRID_ADAPTIVE
+            target_cells: DefaultDict[SpatialCell, set[int]] = defaultdict(set)
+            cue_cells: DefaultDict[SpatialCell, set[int]] = defaultdict(set)
+            second_cells: DefaultDict[SpatialCell, set[int]] = defaultdict(set)
+            target_entries: _Entries = defaultdict(list)
+            cue_entries: _Entries = defaultdict(list)
+            second_entries: _Entries = defaultdict(list)
 
             records = dataset.records or []
-            for index, record in enumerate(records):
-                if not isinstance(record, EnvelopeRecord):
+            # VerifiedDataset records were checked once by the Loader.
+            verified = isinstance(dataset, VerifiedDataset)
+            identities: List[RecordIdentity] = []
+            columnar = isinstance(dataset, ColumnarDataset)
+            if columnar:
+                _add_columnar(target_cells, target_entries, dataset, "target", adaptive)
+                _add_columnar(cue_cells, cue_entries, dataset, "cue", adaptive)
+                _add_columnar(second_cells, second_entries, dataset, "second", adaptive)
+            for ordinal, record in enumerate(() if columnar else records):
+                if not verified and not isinstance(record, EnvelopeRecord):
                     raise InvalidSpatialDataset(
-                        f"records[{index}] is not an EnvelopeRecord"
+                        f"records[{ordinal}] is not an EnvelopeRecord"
                     )
-                record_id = _record_identity(record)
-                target_cells[point_to_cell(record.target)].add(record_id)
-                _add_points(cue_cells, record.cue_set, record_id)
-                _add_points(second_cells, record.second_set, record_id)
+                if not verified:
+                    identities.append(_record_identity(record))
+                if adaptive:
+                    _add_entries(target_entries, (record.target,), ordinal)
+                    _add_entries(cue_entries, record.cue_set, ordinal)
+                    _add_entries(second_entries, record.second_set, ordinal)
+                    continue
+                target_cells[point_to_cell(record.target)].add(ordinal)
+                _add_points(cue_cells, record.cue_set, ordinal)
+                _add_points(second_cells, record.second_set, ordinal)
+
+            target_splits: Set[SpatialCell] = set()
+            cue_splits: Set[SpatialCell] = set()
+            second_splits: Set[SpatialCell] = set()
+            if adaptive:
+                capacity, depth = self._leaf_capacity, self._max_depth
+                target_leaves, target_splits = _split_cells(target_entries, capacity, depth)
+                cue_leaves, cue_splits = _split_cells(cue_entries, capacity, depth)
+                second_leaves, second_splits = _split_cells(second_entries, capacity, depth)
+            else:
+                target_leaves, cue_leaves, second_leaves = target_cells, cue_cells, second_cells
 
+            freeze: Callable[[Iterable[int]], CellPostings] = (
+                bitmap_from_ordinals
+                if self._postings == SPATIAL_POSTINGS_BITMAP
+                else frozenset
+            )
             return SpatialIndex(
-                target_cells=_freeze_map(target_cells),
-                cue_cells=_freeze_map(cue_cells),
-                second_cells=_freeze_map(second_cells),
+                target_cells=_freeze_map(target_leaves, freeze),
+                cue_cells=_freeze_map(cue_leaves, freeze),
+                second_cells=_freeze_map(second_leaves, freeze),
                 record_count=len(records),
+                record_identities=(
+                    dataset.record_identities if verified else tuple(identities)
+                ),
+                postings=self._postings,
+                grid=self._grid,
+                target_splits=frozenset(target_splits),
+                cue_splits=frozenset(cue_splits),
+                second_splits=frozenset(second_splits),
             )
         except InvalidSpatialDataset:
             raise
@@ -74,18 +300,184 @@ class DefaultSpatialIndexBuilder:
         if query is None or not isinstance(query, SpatialQuery):
             raise InvalidSpatialQuery("SpatialQuery is required")
 
-        target_cell = point_to_cell(query.target)
-        cue_cell = point_to_cell(query.cue)
-        second_cell = point_to_cell(query.second)
+        target_cell, cue_cell, second_cell = query_cells(index, query)
 
-        target_ids = index.target_cells.get(target_cell, frozenset())
-        cue_ids = index.cue_cells.get(cue_cell, frozenset())
-        second_ids = index.second_cells.get(second_cell, frozenset())
-        candidate_ids = tuple(sorted(target_ids & cue_ids & second_ids))
+        if index.postings == SPATIAL_POSTINGS_BITMAP:
+            candidate_ordinals = intersect_bitmaps(
+                index.target_cells.get(target_cell, EMPTY_BITMAP),
+                index.cue_cells.get(cue_cell, EMPTY_BITMAP),
+                index.second_cells.get(second_cell, EMPTY_BITMAP),
+            ).ordinals()
+        else:
+            target_ordinals = index.target_cells.get(target_cell, frozenset())
+            cue_ordinals = index.cue_cells.get(cue_cell, frozenset())
+            second_ordinals = index.second_cells.get(second_cell, frozenset())
+            candidate_ordinals = tuple(sorted(target_ordinals & cue_ordinals & second_ordinals))
 
         return SpatialQueryResult(
             target_cell=target_cell,
             cue_cell=cue_cell,
             second_cell=second_cell,
-            candidate_ids=candidate_ids,
+            candidate_ordinals=candidate_ordinals,
+            record_identities=index.record_identities,
         )
+
+    def update(
+        self,
+        index: SpatialIndex,
+        dataset: PublishedDataset,
+        previous: Mapping[int, Optional[EnvelopeRecord]],
+    ) -> SpatialIndex:
+        """
+        Apply record edits to ``index`` without a full rebuild.
+
+        ``dataset`` is the edited corpus; ``previous`` maps every changed
+        ordinal to the record it held before (None when appended), and
+        ordinals past the end of ``dataset.records`` were removed. Only the
+        8x4 cells holding an old or new point of a changed record are
+        rewritten (re-split on adaptive grids), so the result equals
+        ``build(dataset)`` from the builder that built ``index``.
+        """
+        if index is None or not isinstance(index, SpatialIndex):
+            raise InvalidSpatialDataset("SpatialIndex is required")
+        if dataset is None or not isinstance(dataset, PublishedDataset):
+            raise InvalidSpatialDataset("dataset must be a PublishedDataset model")
+
+        records = dataset.records or []
+        count = len(records)
+        verified = isinstance(dataset, VerifiedDataset)
+        resized = range(min(index.record_count, count), max(index.record_count, count))
+        if any(ordinal not in previous for ordinal in resized):
+            raise InvalidSpatialDataset("previous must cover every added or removed ordinal")
+        for ordinal in previous:
+            if ordinal < count and not verified and not isinstance(records[ordinal], EnvelopeRecord):
+                raise InvalidSpatialDataset(f"records[{ordinal}] is not an EnvelopeRecord")
+
+        try:
+            cells = []
+            splits = []
+            for axis_cells, axis_splits, points_of in (
+                (index.target_cells, index.target_splits, _target_points),
+                (index.cue_cells, index.cue_splits, _cue_points),
+                (index.second_cells, index.second_splits, _second_points),
+            ):
+                updated_cells, updated_splits = self._update_axis(
+                    axis_cells,
+                    axis_splits,
+                    points_of,
+                    records,
+                    previous,
+                    index.grid,
+                    index.postings,
+                )
+                cells.append(updated_cells)
+                splits.append(updated_splits)
+
+            if verified:
+                identities: Tuple[RecordIdentity, ...] = dataset.record_identities
+            else:
+                table = list(index.record_identities[:count])
+                table.extend([RecordIdentity("")] * (count - len(table)))
+                for ordinal in previous:
+                    if ordinal < count:
+                        table[ordinal] = _record_identity(records[ordinal])
+                identities = tuple(table)
+
+            return SpatialIndex(
+                target_cells=cells[0],
+                cue_cells=cells[1],
+                second_cells=cells[2],
+                record_count=count,
+                record_identities=identities,
+                postings=index.postings,
+                grid=index.grid,
+                target_splits=splits[0],
+                cue_splits=splits[1],
+                second_splits=splits[2],
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise SpatialIndexBuildFailure(str(exc), cause=exc) from exc
+
+    def _update_axis(
+        self,
+        cells: Mapping[SpatialCell, CellPostings],
+        splits: AbstractSet[SpatialCell],
+        points_of: Callable[[EnvelopeRecord], Sequence[Point]],
+        records: Sequence[EnvelopeRecord],
+        previous: Mapping[int, Optional[EnvelopeRecord]],
+        grid: str,
+        postings: str,
+    ) -> Tuple[Dict[SpatialCell, CellPostings], FrozenSet[SpatialCell]]:
+        count = len(records)
+        touched: Set[SpatialCell] = set()
+        for ordinal, old in previous.items():
+            if old is not None:
+                touched.update(point_to_cell(point) for point in points_of(old))
+            if ordinal < count:
+                touched.update(point_to_cell(point) for point in points_of(records[ordinal]))
+        if not touched:
+            return dict(cells), frozenset(splits)
+
+        adaptive = grid == SPATIAL_GRID_ADAPTIVE
+        freeze: Callable[[Iterable[int]], CellPostings] = (
+            bitmap_from_ordinals if postings == SPATIAL_POSTINGS_BITMAP else frozenset
+        )
+        updated = dict(cells)
+        updated_splits = {cell for cell in splits if base_cell(cell) not in touched}
+        leaves: DefaultDict[SpatialCell, List[SpatialCell]] = defaultdict(list)
+        for cell in cells:
+            base = base_cell(cell)
+            if base in touched:
+                leaves[base].append(cell)
+
+        for base in touched:
+            ordinals: Set[int] = set()
+            for leaf in leaves.get(base, ()):
+                ordinals.update(_posting_ordinals(updated.pop(leaf)))
+            for ordinal in previous:
+                ordinals.discard(ordinal)
+                if ordinal < count and any(
+                    point_to_cell(point) == base for point in points_of(records[ordinal])
+                ):
+                    ordinals.add(ordinal)
+            if not ordinals:
+                continue
+            if not adaptive:
+                updated[base] = freeze(ordinals)
+                continue
+            entries: _Entries = defaultdict(list)
+            for ordinal in ordinals:
+                for point in points_of(records[ordinal]):
+                    if point_to_cell(point) == base:
+                        x, y = clamp_point(point)
+                        entries[base].append((x, y, ordinal))
+            base_leaves, base_splits = _split_cells(
+                entries, self._leaf_capacity, self._max_depth
+            )
+            updated.update(_freeze_map(base_leaves, freeze))
+            updated_splits.update(base_splits)
+        return updated, frozenset(updated_splits)
+
+    def occupancy(self, index: SpatialIndex) -> SpatialOccupancy:
+        """Per-axis leaf occupancy (records per cell, split depth) for grid tuning."""
+        if index is None or not isinstance(index, SpatialIndex):
+            raise InvalidSpatialQuery("SpatialIndex is required")
+        return SpatialOccupancy(
+            record_count=index.record_count,
+            grid=index.grid,
+            target=_axis_occupancy("target", index.target_cells, index.target_splits),
+            cue=_axis_occupancy("cue", index.cue_cells, index.cue_splits),
+            second=_axis_occupancy("second", index.second_cells, index.second_splits),
+        )
+
+
+def query_cells(
+    index: SpatialIndex,
+    query: SpatialQuery,
+) -> Tuple[SpatialCell, SpatialCell, SpatialCell]:
+    """(target, cue, second) leaf cells a query reads; equal cells mean equal candidates."""
+    return (
+        locate_cell(query.target, index.target_splits),
+        locate_cell(query.cue, index.cue_splits),
+        locate_cell(query.second, index.second_splits),
+    )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import AbstractSet, Tuple
+
 from models import Point
 
 from .contract import CELL_HEIGHT, CELL_WIDTH, GRID_COLS, GRID_HEIGHT, GRID_ROWS, GRID_WIDTH
@@ -12,10 +14,57 @@ def _clamp(value: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, value))
 
 
+def clamp_xy(x: float, y: float) -> Tuple[float, float]:
+    """Coordinates clamped onto the table."""
+    return _clamp(x, 0.0, GRID_WIDTH), _clamp(y, 0.0, GRID_HEIGHT)
+
+
+def clamp_point(point: Point) -> Tuple[float, float]:
+    """Point coordinates clamped onto the table."""
+    return _clamp(point.x, 0.0, GRID_WIDTH), _clamp(point.y, 0.0, GRID_HEIGHT)
+
+
+def xy_to_cell(x: float, y: float) -> SpatialCell:
+    """Map table coordinates to an 8x4 grid cell (columnar datasets)."""
+    x, y = clamp_xy(x, y)
+    col = min(int(x // CELL_WIDTH), GRID_COLS - 1)
+    row = min(int(y // CELL_HEIGHT), GRID_ROWS - 1)
+    return SpatialCell(col=col, row=row)
+
+
 def point_to_cell(point: Point) -> SpatialCell:
     """Map a table point to an 8x4 grid cell."""
-    x = _clamp(point.x, 0.0, GRID_WIDTH)
-    y = _clamp(point.y, 0.0, GRID_HEIGHT)
+    x, y = clamp_point(point)
     col = min(int(x // CELL_WIDTH), GRID_COLS - 1)
     row = min(int(y // CELL_HEIGHT), GRID_ROWS - 1)
     return SpatialCell(col=col, row=row)
+
+
+def child_cell(cell: SpatialCell, point: Point) -> SpatialCell:
+    """The 2x2 child of ``cell`` (one level down) that holds ``point``."""
+    level = cell.level + 1
+    x, y = clamp_point(point)
+    col = cell.col * 2
+    row = cell.row * 2
+    # Children split at the parent's midpoint; (2c + 1) * width is exact for
+    # the power-of-two cell fractions used here.
+    if x >= (col + 1) * (CELL_WIDTH / (1 << level)):
+        col += 1
+    if y >= (row + 1) * (CELL_HEIGHT / (1 << level)):
+        row += 1
+    return SpatialCell(col=col, row=row, level=level)
+
+
+def base_cell(cell: SpatialCell) -> SpatialCell:
+    """The 8x4 grid cell an adaptive leaf (or split cell) descends from."""
+    if not cell.level:
+        return cell
+    return SpatialCell(col=cell.col >> cell.level, row=cell.row >> cell.level)
+
+
+def locate_cell(point: Point, splits: AbstractSet[SpatialCell]) -> SpatialCell:
+    """Leaf cell holding ``point``: the 8x4 cell, descended through split cells."""
+    cell = point_to_cell(point)
+    while cell in splits:
+        cell = child_cell(cell, point)
+    return cell
@@ -8,3 +8,21 @@ GRID_COLS = 8
 GRID_ROWS = 4
 CELL_WIDTH = GRID_WIDTH / GRID_COLS
 CELL_HEIGHT = GRID_HEIGHT / GRID_ROWS
+
+# Posting list representations behind create_spatial_index_builder().
+SPATIAL_POSTINGS_SET = "set"
+SPATIAL_POSTINGS_BITMAP = "bitmap"
+SPATIAL_POSTINGS = (SPATIAL_POSTINGS_SET, SPATIAL_POSTINGS_BITMAP)
+
+# Bitmap postings: one int bitset container per 2**16 record ordinals.
+BITMAP_CHUNK_BITS = 16
+
+# Grid modes behind create_spatial_index_builder().
+SPATIAL_GRID_FIXED = "fixed"
+SPATIAL_GRID_ADAPTIVE = "adaptive"
+SPATIAL_GRIDS = (SPATIAL_GRID_FIXED, SPATIAL_GRID_ADAPTIVE)
+
+# Adaptive grid: a cell holding more records than this splits into 2x2 children.
+SPATIAL_LEAF_CAPACITY = 256
+# Adaptive grid: deepest split level below the 8x4 base grid (level 0).
+SPATIAL_MAX_DEPTH = 6
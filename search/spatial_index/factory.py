@@ -3,8 +3,29 @@
 from __future__ import annotations
 
 from .builder import DefaultSpatialIndexBuilder
+from .contract import (
+    SPATIAL_GRID_FIXED,
+    SPATIAL_LEAF_CAPACITY,
+    SPATIAL_MAX_DEPTH,
+    SPATIAL_POSTINGS_SET,
+)
 
 
-def create_spatial_index_builder() -> DefaultSpatialIndexBuilder:
-    """Create DefaultSpatialIndexBuilder."""
-    return DefaultSpatialIndexBuilder()
+def create_spatial_index_builder(
+    *,
+    postings: str = SPATIAL_POSTINGS_SET,
+    grid: str = SPATIAL_GRID_FIXED,
+    leaf_capacity: int = SPATIAL_LEAF_CAPACITY,
+    max_depth: int = SPATIAL_MAX_DEPTH,
+) -> DefaultSpatialIndexBuilder:
+    """
+    Create DefaultSpatialIndexBuilder.
+
+    Fixed 8x4 grid with frozenset cells unless ``grid`` / ``postings`` say otherwise.
+    """
+    return DefaultSpatialIndexBuilder(
+        postings=postings,
+        grid=grid,
+        leaf_capacity=leaf_capacity,
+        max_depth=max_depth,
+    )
@@ -3,17 +3,29 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, FrozenSet, Tuple
+from typing import Dict, FrozenSet, Mapping, Tuple, Union
 
 from models import Point, RecordIdentity
 
+from .bitmap import OrdinalBitmap
+from .contract import SPATIAL_GRID_FIXED, SPATIAL_POSTINGS_SET
+
+# One cell's posting list: frozenset of ordinals or an OrdinalBitmap.
+CellPostings = Union[FrozenSet[int], OrdinalBitmap]
+
 
 @dataclass(frozen=True)
 class SpatialCell:
-    """One runtime-derived cell address in the 8x4 spatial grid."""
+    """
+    One runtime-derived cell address.
+
+    Level 0 is the 8x4 base grid; level L cells come from adaptive splits
+    and address a (8 * 2**L) x (4 * 2**L) grid.
+    """
 
     col: int
     row: int
+    level: int = 0
 
 
 @dataclass(frozen=True)
@@ -27,12 +39,27 @@ class SpatialQuery:
 
 @dataclass(frozen=True)
 class SpatialQueryResult:
-    """Coarse prefilter output."""
+    """
+    Coarse prefilter output.
+
+    ``candidate_ordinals`` are record ordinals (positions in dataset.records),
+    ascending. ``candidate_ids`` materialises their identities on access.
+    """
 
     target_cell: SpatialCell
     cue_cell: SpatialCell
     second_cell: SpatialCell
-    candidate_ids: Tuple[RecordIdentity, ...]
+    candidate_ordinals: Tuple[int, ...] = ()
+    # Ordinal -> identity table shared with the index (not part of equality).
+    record_identities: Tuple[RecordIdentity, ...] = field(
+        default=(), compare=False, repr=False
+    )
+
+    @property
+    def candidate_ids(self) -> Tuple[RecordIdentity, ...]:
+        """Distinct candidate identities, sorted."""
+        identities = self.record_identities
+        return tuple(sorted({identities[ordinal] for ordinal in self.candidate_ordinals}))
 
 
 @dataclass(frozen=True)
@@ -40,10 +67,47 @@ class SpatialIndex:
     """
     Runtime-derived Spatial Index.
 
-    Dataset is not persisted or modified; only record identities are cached.
+    Dataset is not persisted or modified; cells hold record ordinals and
+    ``record_identities`` maps each ordinal back to its record identity.
+    ``postings`` names the cell representation (frozenset or bitmap).
+
+    Adaptive grids keep leaf cells only; ``*_splits`` lists the cells that
+    were split, so a point is located by descending from its 8x4 cell.
     """
 
-    target_cells: Dict[SpatialCell, FrozenSet[RecordIdentity]] = field(default_factory=dict)
-    cue_cells: Dict[SpatialCell, FrozenSet[RecordIdentity]] = field(default_factory=dict)
-    second_cells: Dict[SpatialCell, FrozenSet[RecordIdentity]] = field(default_factory=dict)
+    target_cells: Dict[SpatialCell, CellPostings] = field(default_factory=dict)
+    cue_cells: Dict[SpatialCell, CellPostings] = field(default_factory=dict)
+    second_cells: Dict[SpatialCell, CellPostings] = field(default_factory=dict)
     record_count: int = 0
+    record_identities: Tuple[RecordIdentity, ...] = ()
+    postings: str = SPATIAL_POSTINGS_SET
+    grid: str = SPATIAL_GRID_FIXED
+    target_splits: FrozenSet[SpatialCell] = frozenset()
+    cue_splits: FrozenSet[SpatialCell] = frozenset()
+    second_splits: FrozenSet[SpatialCell] = frozenset()
+
+
+@dataclass(frozen=True)
+class AxisOccupancy:
+    """Leaf-cell occupancy for one Membership axis (target, cue or second)."""
+
+    axis: str
+    cell_count: int
+    split_count: int
+    max_level: int
+    max_records: int
+    mean_records: float
+    p95_records: int
+    # leaf cell -> distinct records in it.
+    cells: Mapping[SpatialCell, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SpatialOccupancy:
+    """Per-axis occupancy statistics of one SpatialIndex (grid tuning input)."""
+
+    record_count: int
+    grid: str
+    target: AxisOccupancy
+    cue: AxisOccupancy
+    second: AxisOccupancy
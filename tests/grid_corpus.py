@@ -0,0 +1,44 @@
+"""
+Shared test corpus — random records on the 1.5-unit grid of the 80x40 table.
+
+Points snap to multiples of 1.5 so independently drawn records share
+coordinates (exact-match hits). Same arguments always yield the same corpus.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Optional
+
+from models import DatasetIdentity, EnvelopeRecord, Point, PublishedDataset, StrategyRef
+
+
+def grid_point(rng: random.Random) -> Point:
+    return Point(x=rng.randrange(0, 54) * 1.5, y=rng.randrange(0, 27) * 1.5)
+
+
+def grid_dataset(
+    n: int,
+    seed: int,
+    *,
+    prefix: str,
+    dataset_identity: str,
+    max_set_size: int = 3,
+    ref_count: Optional[int] = None,
+) -> PublishedDataset:
+    """
+    ``n`` records ``{prefix}.s{i % ref_count}`` with 1..``max_set_size`` cue / second points.
+
+    ``ref_count`` below ``n`` repeats strategy refs (duplicate record identities).
+    """
+    rng = random.Random(seed)
+    records = [
+        EnvelopeRecord(
+            strategy_ref=StrategyRef(f"{prefix}.s{i % (ref_count or n)}"),
+            target=grid_point(rng),
+            cue_set=[grid_point(rng) for _ in range(rng.randint(1, max_set_size))],
+            second_set=[grid_point(rng) for _ in range(rng.randint(1, max_set_size))],
+        )
+        for i in range(n)
+    ]
+    return PublishedDataset(records=records, dataset_identity=DatasetIdentity(dataset_identity))
@@ -0,0 +1,214 @@
+"""
+Unit tests — ColumnarDataset (struct-of-arrays records with lazy views).
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import math
+import pickle
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from loader import create_package_loader  # noqa: E402
+from membership import (  # noqa: E402
+    MembershipQuery,
+    create_membership_engine,
+    is_member,
+    match_columnar,
+    match_record,
+    match_record_within,
+)
+from models import (  # noqa: E402
+    ColumnarDataset,
+    EnvelopeRecord,
+    Point,
+    RecordIdentity,
+    StrategyRef,
+    VerifiedDataset,
+)
+from search.kd_tree import (  # noqa: E402
+    KDTreeQueryInput,
+    create_kd_tree_builder,
+    create_kd_tree_query,
+)
+from search.membership_filter import create_membership_filter_builder  # noqa: E402
+from search.membership_index import create_membership_index_builder  # noqa: E402
+from search.prepared import create_dataset_preparer, edit_dataset  # noqa: E402
+from search.runtime import create_search_enhancement_orchestrator  # noqa: E402
+from search.spatial_index import create_spatial_index_builder  # noqa: E402
+
+
+def _point(rng: random.Random) -> dict:
+    return {"x": rng.randrange(0, 54) * 1.5, "y": rng.randrange(0, 27) * 1.5}
+
+
+def _package_json(n: int = 80, seed: int = 9) -> dict:
+    rng = random.Random(seed)
+    records = [
+        {
+            "strategyRef": f"col.s{i % 70}",
+            "target": _point(rng),
+            "cueSet": [_point(rng) for _ in range(rng.randint(1, 3))],
+            "secondSet": [_point(rng) for _ in range(rng.randint(1, 3))],
+        }
+        for i in range(n)
+    ]
+    return {
+        "packageIdentity": "pkg-col",
+        "datasetIdentity": "ds-col",
+        "dataset": {"records": records},
+    }
+
+
+def _datasets() -> tuple[ColumnarDataset, VerifiedDataset]:
+    columnar = create_package_loader(columnar=True).load(_package_json())
+    verified = create_package_loader(verified=True).load(_package_json())
+    assert isinstance(columnar, ColumnarDataset)
+    return columnar, verified
+
+
+def _queries(dataset: VerifiedDataset) -> list[MembershipQuery]:
+    records = list(dataset.records)
+    queries = [
+        MembershipQuery(cue=r.cue_set[-1], target=r.target, second=r.second_set[0])
+        for r in records[::4]
+    ]
+    rng = random.Random(3)
+    return queries + [
+        MembershipQuery(cue=a.cue_set[0], target=b.target, second=a.second_set[-1])
+        for a, b in zip(rng.sample(records, 6), rng.sample(records, 6))
+    ]
+
+
+def test_loader_returns_columnar_dataset_with_record_views() -> None:
+    columnar, verified = _datasets()
+    assert isinstance(columnar, VerifiedDataset)
+    assert columnar.dataset_identity == "ds-col"
+    assert len(columnar.records) == 80
+    assert list(columnar.records) == list(verified.records)
+    assert columnar.records == verified.records
+    assert columnar.records[-1] == verified.records[-1]
+    assert columnar.records[2:9:3] == verified.records[2:9:3]
+    with pytest.raises(IndexError):
+        columnar.records[80]
+    assert dict(columnar.record_ordinals) == dict(verified.record_ordinals)
+    assert columnar.record_identities == verified.record_identities
+    # Repeated strategy refs share one interned string.
+    assert columnar.strategy_refs[3] is columnar.strategy_refs[73]
+    assert len(columnar.cue_offsets) == len(columnar.second_offsets) == 81
+
+
+def test_columnar_dataset_is_frozen_copyable_and_views_are_copies() -> None:
+    columnar, _ = _datasets()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        columnar.target_xy = None  # type: ignore[misc]
+    view = columnar.records[0]
+    view.target = Point(x=-1.0, y=-1.0)
+    view.cue_set.append(Point(x=-1.0, y=-1.0))
+    assert columnar.records[0] != view
+    assert copy.deepcopy(columnar) == columnar
+    assert pickle.loads(pickle.dumps(columnar)) == columnar
+    assert ColumnarDataset.from_records(columnar.records, "ds-col") == columnar
+
+
+def test_match_columnar_equals_record_matchers() -> None:
+    columnar, verified = _datasets()
+    for query in _queries(verified):
+        for tolerance in (None, 2.0):
+            expected = []
+            for ordinal, record in enumerate(verified.records):
+                flags = (
+                    match_record(query, record)
+                    if tolerance is None
+                    else match_record_within(query, record, tolerance)
+                )
+                if is_member(flags):
+                    expected.append((ordinal, flags))
+            assert list(match_columnar(query, columnar, tolerance)) == expected
+    nan_query = MembershipQuery(
+        cue=Point(x=math.nan, y=0.0), target=Point(x=math.nan, y=0.0), second=Point(x=0.0, y=0.0)
+    )
+    assert list(match_columnar(nan_query, columnar, 2.0)) == []
+
+
+def test_engines_match_verified_dataset() -> None:
+    columnar, verified = _datasets()
+    queries = _queries(verified)
+    for engine in (
+        create_membership_engine(),
+        create_membership_engine(tolerance=2.0),
+        create_membership_engine(prefilter_adapter=_NoShortlist()),
+    ):
+        for query in queries:
+            assert engine.evaluate(columnar, query) == engine.evaluate(verified, query)
+    orchestrator = create_search_enhancement_orchestrator()
+    for query in queries:
+        assert orchestrator.run(columnar, query) == orchestrator.run(verified, query)
+    assert orchestrator.run_many(columnar, queries) == orchestrator.run_many(verified, queries)
+
+    for grid in ("fixed", "adaptive"):
+        for postings in ("set", "bitmap"):
+            spatial = create_spatial_index_builder(grid=grid, postings=postings, leaf_capacity=4)
+            assert spatial.build(columnar) == spatial.build(verified)
+
+    index_builder = create_membership_index_builder()
+    for epsilon in (0.0, 2.0):
+        assert index_builder.build(columnar, epsilon=epsilon) == index_builder.build(
+            verified, epsilon=epsilon
+        )
+    filter_builder = create_membership_filter_builder()
+    assert filter_builder.build(columnar) == filter_builder.build(verified)
+
+    ids = sorted(verified.record_ordinals)
+    record = verified.records[5]
+    kd_query = KDTreeQueryInput(cue=record.cue_set[0], target=record.target, second=record.second_set[0])
+    for encoding in ("centroid", "members"):
+        builder = create_kd_tree_builder(encoding=encoding)
+        columnar_index = builder.build(columnar, ids)
+        assert columnar_index == builder.build(verified, ids)
+        assert create_kd_tree_query().search(columnar_index, kd_query, top_n=5)
+
+
+def test_prepare_and_edit_keep_columnar_dataset() -> None:
+    columnar, verified = _datasets()
+    preparer = create_dataset_preparer(membership_index=True, membership_tolerance=2.0)
+    prepared = preparer.prepare(columnar)
+    expected = preparer.prepare(verified)
+    for name in (
+        "spatial_index",
+        "kd_index",
+        "record_positions",
+        "membership_index",
+        "tolerance_index",
+        "membership_filter",
+    ):
+        assert getattr(prepared, name) == getattr(expected, name)
+
+    replacement = EnvelopeRecord(
+        strategy_ref=StrategyRef("col.s3"),
+        target=Point(x=1.5, y=3.0),
+        cue_set=[Point(x=4.5, y=6.0)],
+        second_set=[Point(x=7.5, y=9.0)],
+    )
+    edit = edit_dataset(columnar, remove=[StrategyRef("col.s8")], replace=[replacement])
+    plain = edit_dataset(verified, remove=[StrategyRef("col.s8")], replace=[replacement])
+    assert isinstance(edit.dataset, ColumnarDataset)
+    assert list(edit.dataset.records) == list(plain.dataset.records)
+    assert dict(edit.dataset.record_ordinals) == dict(plain.dataset.record_ordinals)
+    assert edit.dataset.record_ordinals[RecordIdentity("col.s3")] == (3,)
+
+
+class _NoShortlist:
+    """Prefilter adapter that never shortlists (forces the full scan)."""
+
+    def select_records(self, dataset, query):  # noqa: ANN001, ANN201
+        return None
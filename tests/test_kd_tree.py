@@ -8,6 +8,7 @@ import copy
 import importlib
 import inspect
 import math
+import random
 import sys
 from pathlib import Path
 
@@ -17,24 +18,33 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from membership import MembershipQuery  # noqa: E402
+from membership.matcher import is_member, match_record_within  # noqa: E402
 from models import EnvelopeRecord, Point, PublishedDataset, RecordIdentity, StrategyRef  # noqa: E402
 from search.kd_tree import (  # noqa: E402
     InvalidKDTreeCandidate,
     InvalidKDTreeDataset,
     InvalidKDTreeQuery,
     KD_TREE_DIMENSIONS,
+    KD_TREE_ENCODING_MEMBERS,
+    KD_TREE_LAYOUT_LINKED,
+    KD_TREE_LEAF_SIZE,
+    ImplicitKDTree,
     KDTreeIndex,
+    KDTreeNode,
     KDTreeQueryInput,
     create_kd_tree_builder,
     create_kd_tree_query,
     encode_query_to_vector,
     encode_record_to_vector,
+    table_axis_weights,
 )
 from search.kd_tree.fixtures import (  # noqa: E402
     make_fixture_candidate_ids,
     make_fixture_dataset,
     make_fixture_query,
 )
+from search.prepared import edit_dataset  # noqa: E402
 
 
 def test_encode_query_to_fixed_6d() -> None:
@@ -160,3 +170,600 @@ def test_no_legacy_position_record_dependency() -> None:
             "Resolve",
         ):
             assert banned not in src, f"{banned} found in {name}"
+
+
+def _random_dataset(n: int, seed: int) -> PublishedDataset:
+    rng = random.Random(seed)
+
+    def point() -> Point:
+        # Coarse grid so distance ties are common.
+        return Point(x=rng.randrange(0, 12) * 5.0, y=rng.randrange(0, 6) * 5.0)
+
+    return PublishedDataset(
+        records=[
+            EnvelopeRecord(
+                strategy_ref=StrategyRef(f"kd.random.{i:04d}"),
+                target=point(),
+                cue_set=[point() for _ in range(rng.randint(1, 3))],
+                second_set=[point() for _ in range(rng.randint(1, 3))],
+            )
+            for i in range(n)
+        ]
+    )
+
+
+def _brute_force(index: KDTreeIndex, query: KDTreeQueryInput, top_n: int) -> list[str]:
+    vector = encode_query_to_vector(query)
+    ranked = sorted(
+        index.candidates,
+        key=lambda item: (
+            math.sqrt(sum((a - b) * (a - b) for a, b in zip(vector, item.vector))),
+            str(item.candidate_id),
+        ),
+    )
+    return [str(item.candidate_id) for item in ranked[:top_n]]
+
+
+@pytest.mark.parametrize("leaf_size", [1, 4, KD_TREE_LEAF_SIZE])
+def test_implicit_layout_matches_brute_force_order(leaf_size: int) -> None:
+    dataset = _random_dataset(300, seed=leaf_size)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    index = create_kd_tree_builder(leaf_size=leaf_size).build(dataset, ids)
+    assert isinstance(index.root, ImplicitKDTree)
+    query_api = create_kd_tree_query()
+    rng = random.Random(99)
+    for _ in range(40):
+        record = rng.choice(dataset.records)
+        query = KDTreeQueryInput(cue=record.cue_set[0], target=record.target, second=record.second_set[-1])
+        top_n = rng.choice([1, 3, 17, 300, 500])
+        shortlist = query_api.search(index, query, top_n=top_n)
+        assert [str(item.candidate_id) for item in shortlist] == _brute_force(index, query, top_n)
+
+
+def test_implicit_and_linked_layouts_agree() -> None:
+    dataset = _random_dataset(120, seed=5)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    implicit = create_kd_tree_builder().build(dataset, ids)
+    linked = create_kd_tree_builder(layout=KD_TREE_LAYOUT_LINKED).build(dataset, ids)
+    assert isinstance(linked.root, KDTreeNode)
+    assert implicit.candidates == linked.candidates
+    query_api = create_kd_tree_query()
+    for record in dataset.records[::7]:
+        query = KDTreeQueryInput(cue=record.cue_set[-1], target=record.target, second=record.second_set[0])
+        for top_n in (1, 5, 120):
+            assert query_api.search(implicit, query, top_n=top_n) == query_api.search(
+                linked, query, top_n=top_n
+            )
+
+
+def test_implicit_build_is_deterministic_and_rejects_bad_options() -> None:
+    dataset = _random_dataset(64, seed=2)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    first = create_kd_tree_builder().build(dataset, ids)
+    second = create_kd_tree_builder().build(dataset, list(reversed(ids)))
+    assert first == second
+    assert sorted(first.root.slots) == list(range(64))
+    with pytest.raises(ValueError):
+        create_kd_tree_builder(layout="bogus")
+    with pytest.raises(ValueError):
+        create_kd_tree_builder(leaf_size=0)
+
+
+def _brute_force_members(
+    index: KDTreeIndex,
+    query: KDTreeQueryInput,
+    top_n: int,
+) -> list[tuple[str, float]]:
+    vector = encode_query_to_vector(query)
+    ranked = sorted(
+        (
+            min(math.sqrt(sum((a - b) * (a - b) for a, b in zip(vector, member))) for member in item.members),
+            str(item.candidate_id),
+        )
+        for item in index.candidates
+    )
+    return [(candidate_id, distance) for distance, candidate_id in ranked[:top_n]]
+
+
+@pytest.mark.parametrize("leaf_size", [1, 4, KD_TREE_LEAF_SIZE])
+def test_members_encoding_ranks_by_nearest_member_pair(leaf_size: int) -> None:
+    dataset = _random_dataset(200, seed=20 + leaf_size)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    index = create_kd_tree_builder(leaf_size=leaf_size, encoding=KD_TREE_ENCODING_MEMBERS).build(dataset, ids)
+    assert isinstance(index.root, ImplicitKDTree) and index.root.multi_point
+    assert index.root.size == sum(len(item.members) for item in index.candidates)
+    query_api = create_kd_tree_query()
+    rng = random.Random(leaf_size)
+    for _ in range(30):
+        record = rng.choice(dataset.records)
+        query = KDTreeQueryInput(
+            cue=rng.choice(record.cue_set), target=record.target, second=rng.choice(record.second_set)
+        )
+        for top_n in (1, 4, 25, 300):
+            expected = _brute_force_members(index, query, top_n)
+            shortlist = query_api.search(index, query, top_n=top_n)
+            assert [(str(item.candidate_id), item.distance) for item in shortlist] == expected
+            scope = ids[::3]
+            scoped = query_api.search(index, query, top_n=top_n, scope=scope)
+            assert len({item.candidate_id for item in scoped}) == len(scoped)
+            assert scoped == query_api.search(
+                create_kd_tree_builder(encoding=KD_TREE_ENCODING_MEMBERS).build(dataset, scope),
+                query,
+                top_n=top_n,
+            )
+
+
+def test_members_encoding_reaches_members_far_from_centroid() -> None:
+    spread = EnvelopeRecord(
+        strategy_ref=StrategyRef("kd.spread"),
+        target=Point(x=40.0, y=20.0),
+        cue_set=[Point(x=0.0, y=0.0), Point(x=80.0, y=40.0)],
+        second_set=[Point(x=0.0, y=40.0), Point(x=80.0, y=0.0)],
+    )
+    near_centroid = EnvelopeRecord(
+        strategy_ref=StrategyRef("kd.central"),
+        target=Point(x=40.0, y=20.0),
+        cue_set=[Point(x=10.0, y=10.0)],
+        second_set=[Point(x=10.0, y=30.0)],
+    )
+    dataset = PublishedDataset(records=[spread, near_centroid])
+    ids = [RecordIdentity("kd.spread"), RecordIdentity("kd.central")]
+    query = KDTreeQueryInput(cue=Point(x=0.0, y=0.0), target=Point(x=40.0, y=20.0), second=Point(x=0.0, y=40.0))
+    query_api = create_kd_tree_query()
+
+    centroid = query_api.search(create_kd_tree_builder().build(dataset, ids), query, top_n=1)
+    assert [str(item.candidate_id) for item in centroid] == ["kd.central"]
+    members = query_api.search(
+        create_kd_tree_builder(encoding=KD_TREE_ENCODING_MEMBERS).build(dataset, ids), query, top_n=1
+    )
+    assert [(str(item.candidate_id), item.distance) for item in members] == [("kd.spread", 0.0)]
+    with pytest.raises(ValueError):
+        create_kd_tree_builder(layout=KD_TREE_LAYOUT_LINKED, encoding=KD_TREE_ENCODING_MEMBERS)
+    with pytest.raises(ValueError):
+        create_kd_tree_builder(encoding="bogus")
+
+
+def _tree_sizes_consistent(node: KDTreeNode | None) -> int:
+    """Live nodes under ``node``, checking every size / tombstone count on the way."""
+
+    def walk(current: KDTreeNode | None) -> tuple[int, int]:
+        if current is None:
+            return 0, 0
+        left_size, left_dead = walk(current.left)
+        right_size, right_dead = walk(current.right)
+        size = 1 + left_size + right_size
+        dead = int(current.deleted) + left_dead + right_dead
+        assert (current.size, current.dead) == (size, dead)
+        return size, dead
+
+    size, dead = walk(node)
+    return size - dead
+
+
+@pytest.mark.parametrize(
+    ("layout", "encoding", "weighted"),
+    [
+        ("implicit", "centroid", False),
+        (KD_TREE_LAYOUT_LINKED, "centroid", False),
+        ("implicit", KD_TREE_ENCODING_MEMBERS, False),
+        (KD_TREE_LAYOUT_LINKED, "centroid", True),
+        ("implicit", KD_TREE_ENCODING_MEMBERS, True),
+    ],
+)
+def test_update_matches_rebuilt_index(layout: str, encoding: str, weighted: bool) -> None:
+    rng = random.Random(8)
+    dataset = _random_dataset(150, seed=8)
+    donors = _random_dataset(40, seed=9).records
+    weights = table_axis_weights(target=3.0) if weighted else (1.0,) * KD_TREE_DIMENSIONS
+    builder = create_kd_tree_builder(layout=layout, encoding=encoding, axis_weights=weights)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    index = builder.build(dataset, ids)
+    query_api = create_kd_tree_query()
+
+    for step in range(8):
+        refs = sorted({str(r.strategy_ref) for r in dataset.records})
+        removed, replaced = rng.sample(refs, 2)
+        donor = donors[step]
+        edit = edit_dataset(
+            dataset,
+            remove=[StrategyRef(removed)],
+            replace=[
+                EnvelopeRecord(
+                    strategy_ref=StrategyRef(replaced),
+                    target=donor.target,
+                    cue_set=donor.cue_set,
+                    second_set=donor.second_set,
+                )
+            ],
+            add=[donors[20 + step], donors[step + 1]],  # one new id, one duplicate ref
+        )
+        dataset = edit.dataset
+        index = builder.update(index, dataset, edit.previous)
+
+    ids = sorted({RecordIdentity(str(r.strategy_ref)) for r in dataset.records})
+    rebuilt = builder.build(dataset, ids)
+    assert index.candidates == rebuilt.candidates
+    assert index.positions == rebuilt.positions
+    assert index.ordinal_positions == rebuilt.ordinal_positions
+    assert index.axis_weights == rebuilt.axis_weights == weights
+    if layout == KD_TREE_LAYOUT_LINKED:
+        assert _tree_sizes_consistent(index.root) == len(index.candidates)
+    else:
+        assert index.root == rebuilt.root
+    for record in dataset.records[::9]:
+        query = KDTreeQueryInput(cue=record.cue_set[0], target=record.target, second=record.second_set[-1])
+        for top_n in (1, 6, 400):
+            assert query_api.search(index, query, top_n=top_n) == query_api.search(
+                rebuilt, query, top_n=top_n
+            )
+
+
+def test_linked_updates_rebalance_lazily() -> None:
+    dataset = _random_dataset(40, seed=4)
+    builder = create_kd_tree_builder(layout=KD_TREE_LAYOUT_LINKED)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    index = builder.build(dataset, ids)
+    records = list(dataset.records)
+    # Monotone inserts would degrade an unbalanced tree into a list.
+    for i in range(400):
+        records.append(
+            EnvelopeRecord(
+                strategy_ref=StrategyRef(f"kd.skew.{i:04d}"),
+                target=Point(x=i * 0.1, y=1.0),
+                cue_set=[Point(x=i * 0.1, y=2.0)],
+                second_set=[Point(x=i * 0.1, y=3.0)],
+            )
+        )
+        index = builder.update(index, PublishedDataset(records=records), {len(records) - 1: None})
+
+    def depth(node: KDTreeNode | None) -> int:
+        return 0 if node is None else 1 + max(depth(node.left), depth(node.right))
+
+    assert _tree_sizes_consistent(index.root) == 440
+    # log base 1 / 0.75 of 440 is ~21; a list would be 440 deep.
+    assert depth(index.root) <= 22
+    with pytest.raises(ValueError):
+        create_kd_tree_builder(rebalance_threshold=1.0)
+
+
+def _brute_force_radius(
+    index: KDTreeIndex,
+    query: KDTreeQueryInput,
+    radius: float | None,
+    axis_radii: tuple[float, float, float] | None,
+) -> list[str]:
+    vector = encode_query_to_vector(query)
+    hits = []
+    for item in index.candidates:
+        best = math.inf
+        for member in item.members or (item.vector,):
+            d = [a - b for a, b in zip(vector, member)]
+            if axis_radii is not None and any(
+                math.hypot(d[2 * axis], d[2 * axis + 1]) > axis_radii[axis] for axis in range(3)
+            ):
+                continue
+            distance = math.sqrt(sum(value * value for value in d))
+            if radius is None or distance <= radius:
+                best = min(best, distance)
+        if best < math.inf:
+            hits.append((best, str(item.candidate_id)))
+    return [candidate_id for _, candidate_id in sorted(hits)]
+
+
+@pytest.mark.parametrize(
+    ("layout", "encoding"),
+    [("implicit", "centroid"), (KD_TREE_LAYOUT_LINKED, "centroid"), ("implicit", KD_TREE_ENCODING_MEMBERS)],
+)
+def test_radius_search_matches_brute_force(layout: str, encoding: str) -> None:
+    dataset = _random_dataset(250, seed=31)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    index = create_kd_tree_builder(layout=layout, encoding=encoding).build(dataset, ids)
+    query_api = create_kd_tree_query()
+    rng = random.Random(32)
+    bounds = [(0.0, None), (7.5, None), (20.0, None), (None, (0.0, 0.0, 0.0)), (None, (5.0, 10.0, 5.0)), (15.0, (5.0, 5.0, 10.0))]
+    for _ in range(20):
+        record = rng.choice(dataset.records)
+        query = KDTreeQueryInput(
+            cue=rng.choice(record.cue_set), target=record.target, second=rng.choice(record.second_set)
+        )
+        for radius, axis_radii in bounds:
+            result = query_api.search_radius(index, query, radius, axis_radii=axis_radii)
+            assert [str(item.candidate_id) for item in result] == _brute_force_radius(
+                index, query, radius, axis_radii
+            )
+            assert query_api.any_within(index, query, radius, axis_radii=axis_radii) == bool(result)
+            scope = ids[::4]
+            assert query_api.search_radius(
+                index, query, radius, axis_radii=axis_radii, scope=scope
+            ) == tuple(item for item in result if item.candidate_id in set(scope))
+
+
+def test_members_radius_matches_tolerance_membership() -> None:
+    dataset = _random_dataset(200, seed=41)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    index = create_kd_tree_builder(encoding=KD_TREE_ENCODING_MEMBERS).build(dataset, ids)
+    query_api = create_kd_tree_query()
+    rng = random.Random(42)
+    for tolerance in (0.0, 5.0, 7.5):
+        for record in rng.sample(dataset.records, 15):
+            query = MembershipQuery(
+                cue=rng.choice(record.cue_set), target=record.target, second=rng.choice(record.second_set)
+            )
+            expected = sorted(
+                str(item.strategy_ref)
+                for item in dataset.records
+                if is_member(match_record_within(query, item, tolerance))
+            )
+            hits = query_api.search_radius(
+                index,
+                KDTreeQueryInput(cue=query.cue, target=query.target, second=query.second),
+                axis_radii=(tolerance, tolerance, tolerance),
+            )
+            assert sorted(str(item.candidate_id) for item in hits) == expected
+
+
+def test_radius_search_rejects_bad_bounds() -> None:
+    dataset = make_fixture_dataset()
+    index = create_kd_tree_builder().build(dataset, make_fixture_candidate_ids())
+    query_api = create_kd_tree_query()
+    query = make_fixture_query()
+    with pytest.raises(InvalidKDTreeQuery):
+        query_api.search_radius(index, query)
+    with pytest.raises(InvalidKDTreeQuery):
+        query_api.search_radius(index, query, -1.0)
+    with pytest.raises(InvalidKDTreeQuery):
+        query_api.search_radius(index, query, axis_radii=(1.0, 1.0))
+    with pytest.raises(InvalidKDTreeQuery):
+        query_api.any_within(index, query, float("nan"))
+
+
+@pytest.mark.parametrize(
+    ("layout", "encoding"),
+    [("implicit", "centroid"), (KD_TREE_LAYOUT_LINKED, "centroid"), ("implicit", KD_TREE_ENCODING_MEMBERS)],
+)
+def test_search_many_equals_looped_search(layout: str, encoding: str) -> None:
+    dataset = _random_dataset(200, seed=51)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    index = create_kd_tree_builder(layout=layout, encoding=encoding).build(dataset, ids)
+    query_api = create_kd_tree_query()
+    rng = random.Random(52)
+    queries = []
+    for record in rng.sample(dataset.records, 25):
+        queries.append(
+            KDTreeQueryInput(
+                cue=rng.choice(record.cue_set), target=record.target, second=rng.choice(record.second_set)
+            )
+        )
+    queries += queries[:5]  # repeated queries share one walk
+    for top_n in (1, 7, 200):
+        for scope_kwargs in ({}, {"scope": ids[::3]}, {"scope_ordinals": list(range(0, 200, 2))}):
+            expected = tuple(query_api.search(index, query, top_n=top_n, **scope_kwargs) for query in queries)
+            assert query_api.search_many(index, queries, top_n=top_n, **scope_kwargs) == expected
+
+
+def test_search_many_edge_cases() -> None:
+    dataset = make_fixture_dataset()
+    index = create_kd_tree_builder().build(dataset, make_fixture_candidate_ids())
+    query_api = create_kd_tree_query()
+    query = make_fixture_query()
+    assert query_api.search_many(index, [], top_n=3) == ()
+    assert query_api.search_many(index, [query], top_n=3, scope_ordinals=()) == ((),)
+    empty = create_kd_tree_builder().build(dataset, [])
+    assert query_api.search_many(empty, [query, query], top_n=3) == ((), ())
+    with pytest.raises(InvalidKDTreeQuery):
+        query_api.search_many(index, [query], top_n=0)
+    with pytest.raises(InvalidKDTreeQuery):
+        query_api.search_many(index, [query, None], top_n=1)  # type: ignore[list-item]
+
+
+def _brute_force_weighted(
+    index: KDTreeIndex,
+    query: KDTreeQueryInput,
+    top_n: int,
+    weights: tuple[float, ...],
+) -> list[tuple[str, float]]:
+    vector = encode_query_to_vector(query)
+    ranked = sorted(
+        (
+            min(
+                math.sqrt(sum(w * ((a - b) * (a - b)) for a, b, w in zip(vector, member, weights)))
+                for member in item.members or (item.vector,)
+            ),
+            str(item.candidate_id),
+        )
+        for item in index.candidates
+    )
+    return [(candidate_id, distance) for distance, candidate_id in ranked[:top_n]]
+
+
+@pytest.mark.parametrize(
+    ("layout", "encoding"),
+    [("implicit", "centroid"), (KD_TREE_LAYOUT_LINKED, "centroid"), ("implicit", KD_TREE_ENCODING_MEMBERS)],
+)
+def test_axis_weighted_search_matches_brute_force(layout: str, encoding: str) -> None:
+    dataset = _random_dataset(220, seed=61)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    weights = table_axis_weights(cue=0.5, target=4.0, second=0.25)
+    index = create_kd_tree_builder(layout=layout, encoding=encoding, axis_weights=weights).build(dataset, ids)
+    assert index.axis_weights == weights
+    query_api = create_kd_tree_query()
+    rng = random.Random(62)
+    queries = []
+    for _ in range(20):
+        record = rng.choice(dataset.records)
+        queries.append(
+            KDTreeQueryInput(
+                cue=rng.choice(record.cue_set), target=record.target, second=rng.choice(record.second_set)
+            )
+        )
+    scope = ids[::3]
+    for top_n in (1, 5, 220):
+        for query in queries:
+            shortlist = query_api.search(index, query, top_n=top_n)
+            assert [(str(item.candidate_id), item.distance) for item in shortlist] == _brute_force_weighted(
+                index, query, top_n, weights
+            )
+            assert query_api.search(index, query, top_n=top_n, scope=scope) == tuple(
+                item for item in query_api.search(index, query, top_n=220) if item.candidate_id in set(scope)
+            )[:top_n]
+        assert query_api.search_many(index, queries, top_n=top_n) == tuple(
+            query_api.search(index, query, top_n=top_n) for query in queries
+        )
+    # Radius is on the weighted distance; axis_radii stay in raw table units.
+    for query in queries:
+        ranked = query_api.search(index, query, top_n=220)
+        for radius in (0.0, 0.05, 0.2):
+            assert query_api.search_radius(index, query, radius) == tuple(
+                item for item in ranked if item.distance <= radius
+            )
+        assert {item.candidate_id for item in query_api.search_radius(index, query, axis_radii=(5.0, 5.0, 5.0))} == {
+            item.candidate_id
+            for item in create_kd_tree_query().search_radius(
+                create_kd_tree_builder(layout=layout, encoding=encoding).build(dataset, ids),
+                query,
+                axis_radii=(5.0, 5.0, 5.0),
+            )
+        }
+
+
+def test_axis_weights_shape_the_ranking_and_validate() -> None:
+    assert table_axis_weights() == (1 / 6400, 1 / 1600, 1 / 6400, 1 / 1600, 1 / 6400, 1 / 1600)
+    near_target = EnvelopeRecord(
+        strategy_ref=StrategyRef("kd.near.target"),
+        target=Point(x=41.0, y=20.0),
+        cue_set=[Point(x=20.0, y=10.0)],
+        second_set=[Point(x=60.0, y=30.0)],
+    )
+    near_second = EnvelopeRecord(
+        strategy_ref=StrategyRef("kd.near.second"),
+        target=Point(x=46.0, y=20.0),
+        cue_set=[Point(x=10.0, y=10.0)],
+        second_set=[Point(x=70.0, y=30.0)],
+    )
+    dataset = PublishedDataset(records=[near_target, near_second])
+    ids = [RecordIdentity("kd.near.target"), RecordIdentity("kd.near.second")]
+    query = KDTreeQueryInput(cue=Point(x=10.0, y=10.0), target=Point(x=40.0, y=20.0), second=Point(x=70.0, y=30.0))
+    query_api = create_kd_tree_query()
+    raw = create_kd_tree_builder().build(dataset, ids)
+    assert str(query_api.search(raw, query, top_n=1)[0].candidate_id) == "kd.near.second"
+    weighted = create_kd_tree_builder(axis_weights=table_axis_weights(target=16.0)).build(dataset, ids)
+    assert str(query_api.search(weighted, query, top_n=1)[0].candidate_id) == "kd.near.target"
+
+    for bad in ((1.0,) * 5, (1.0, 1.0, 1.0, 1.0, 1.0, -1.0), (0.0,) * 6, (1.0, 1.0, 1.0, 1.0, 1.0, math.inf)):
+        with pytest.raises(ValueError):
+            create_kd_tree_builder(axis_weights=bad)
+
+
+@pytest.mark.parametrize(
+    ("layout", "encoding"),
+    [("implicit", "centroid"), (KD_TREE_LAYOUT_LINKED, "centroid"), ("implicit", KD_TREE_ENCODING_MEMBERS)],
+)
+def test_approximate_search_bounds_work_and_reports_exactness(layout: str, encoding: str) -> None:
+    dataset = _random_dataset(300, seed=71)
+    ids = [RecordIdentity(str(r.strategy_ref)) for r in dataset.records]
+    index = create_kd_tree_builder(layout=layout, encoding=encoding).build(dataset, ids)
+    query_api = create_kd_tree_query()
+    rng = random.Random(72)
+    inexact = 0
+    for _ in range(25):
+        record = rng.choice(dataset.records)
+        query = KDTreeQueryInput(
+            cue=rng.choice(record.cue_set), target=record.target, second=rng.choice(record.second_set)
+        )
+        for top_n in (1, 10):
+            exact = query_api.search(index, query, top_n=top_n)
+            default = query_api.search_approximate(index, query, top_n=top_n)
+            assert default.candidates == exact and default.exact
+            for epsilon in (0.25, 1.0):
+                result = query_api.search_approximate(index, query, top_n=top_n, epsilon=epsilon)
+                assert len(result.candidates) == len(exact)
+                assert len({item.candidate_id for item in result.candidates}) == len(result.candidates)
+                for found, best in zip(result.candidates, exact):
+                    assert found.distance <= best.distance * (1.0 + epsilon) + 1e-9
+                if result.exact:
+                    assert result.candidates == exact
+                inexact += not result.exact
+            budgeted = query_api.search_approximate(index, query, top_n=top_n, max_visits=5)
+            assert budgeted.visited <= 5 and not budgeted.exact
+            assert len(budgeted.candidates) <= top_n
+    assert inexact
+
+
+def test_approximate_search_rejects_bad_knobs() -> None:
+    dataset = make_fixture_dataset()
+    index = create_kd_tree_builder().build(dataset, make_fixture_candidate_ids())
+    query_api = create_kd_tree_query()
+    query = make_fixture_query()
+    for kwargs in ({"epsilon": -0.1}, {"epsilon": math.inf}, {"max_visits": 0}, {"top_n": 0}):
+        with pytest.raises(InvalidKDTreeQuery):
+            query_api.search_approximate(index, query, **{"top_n": 3, **kwargs})
+    empty = create_kd_tree_builder().build(dataset, [])
+    assert query_api.search_approximate(empty, query, top_n=3).exact
+
+
+def test_both_layouts_keep_smallest_ids_on_distance_ties() -> None:
+    def record(ref: str, x: float) -> EnvelopeRecord:
+        return EnvelopeRecord(
+            strategy_ref=StrategyRef(ref),
+            target=Point(x=x, y=0.0),
+            cue_set=[Point(x=0.0, y=0.0)],
+            second_set=[Point(x=0.0, y=0.0)],
+        )
+
+    # a, b, c and e tie at distance 1 behind d; the linked walk meets the
+    # tied ones first, so the kept one must still be the smallest id.
+    xs = {"a": 1.0, "b": -1.0, "c": 1.0, "d": 0.0, "e": -1.0}
+    dataset = PublishedDataset(records=[record(ref, x) for ref, x in xs.items()])
+    ids = [RecordIdentity(ref) for ref in xs]
+    query = KDTreeQueryInput(cue=Point(x=0.0, y=0.0), target=Point(x=0.0, y=0.0), second=Point(x=0.0, y=0.0))
+    for layout in ("implicit", KD_TREE_LAYOUT_LINKED):
+        index = create_kd_tree_builder(layout=layout).build(dataset, ids)
+        shortlist = create_kd_tree_query().search(index, query, top_n=2)
+        assert [str(item.candidate_id) for item in shortlist] == ["d", "a"]
+
+
+@pytest.mark.parametrize("layout", ["implicit", KD_TREE_LAYOUT_LINKED])
+def test_update_equals_build_with_duplicate_positions(layout: str) -> None:
+    rng = random.Random(21)
+    # Three distinct shapes only: most distances tie.
+    shapes = [
+        (Point(x=5.0 * i, y=5.0), [Point(x=5.0, y=5.0 * i)], [Point(x=10.0, y=5.0)])
+        for i in range(3)
+    ]
+
+    def record(ref: str) -> EnvelopeRecord:
+        target, cue, second = rng.choice(shapes)
+        return EnvelopeRecord(
+            strategy_ref=StrategyRef(ref), target=target, cue_set=list(cue), second_set=list(second)
+        )
+
+    dataset = PublishedDataset(records=[record(f"kd.dup.{i:03d}") for i in range(60)])
+    builder = create_kd_tree_builder(layout=layout)
+    index = builder.build(dataset, [RecordIdentity(str(r.strategy_ref)) for r in dataset.records])
+    query_api = create_kd_tree_query()
+    queries = [
+        KDTreeQueryInput(cue=cue[0], target=target, second=second[0]) for target, cue, second in shapes
+    ]
+    for step in range(30):
+        refs = sorted({str(r.strategy_ref) for r in dataset.records})
+        removed, replaced = rng.sample(refs, 2)
+        edit = edit_dataset(
+            dataset,
+            remove=[StrategyRef(removed)],
+            replace=[record(replaced)],
+            add=[record(f"kd.dup.new.{step:03d}")],
+        )
+        dataset = edit.dataset
+        index = builder.update(index, dataset, edit.previous)
+        rebuilt = builder.build(
+            dataset, sorted({RecordIdentity(str(r.strategy_ref)) for r in dataset.records})
+        )
+        for query in queries:
+            for top_n in (1, 4, 25):
+                expected = query_api.search(rebuilt, query, top_n=top_n)
+                assert query_api.search(index, query, top_n=top_n) == expected
+                assert [str(item.candidate_id) for item in expected] == _brute_force(
+                    rebuilt, query, top_n
+                )
+    if layout == KD_TREE_LAYOUT_LINKED:
+        assert _tree_sizes_consistent(index.root) == len(index.candidates)
@@ -0,0 +1,197 @@
+"""
+Unit tests — Membership Filter (per-axis Bloom filters) and negative pre-check.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import membership.engine as membership_engine  # noqa: E402
+from grid_corpus import grid_dataset, grid_point  # noqa: E402
+from membership import DefaultMembershipEngine, MembershipQuery, create_membership_engine  # noqa: E402
+from models import Point, PublishedDataset, StrategyRef  # noqa: E402
+from search.membership.negative_check import BloomNegativeCheck  # noqa: E402
+from search.membership_filter import (  # noqa: E402
+    InvalidMembershipFilterDataset,
+    InvalidMembershipFilterQuery,
+    MembershipFilterQuery,
+    create_membership_filter_builder,
+)
+from search.prepared import (  # noqa: E402
+    DefaultDatasetPreparer,
+    create_dataset_preparer,
+    edit_dataset,
+    prepare_dataset,
+)
+from search.runtime import create_search_enhancement_orchestrator  # noqa: E402
+
+
+class _FullScan:
+    def select_records(self, dataset, query):
+        return None
+
+
+def _dataset(n: int = 300, seed: int = 4) -> PublishedDataset:
+    return grid_dataset(n, seed, prefix="mf", dataset_identity="ds-mf", max_set_size=4)
+
+
+def test_filter_has_no_false_negatives() -> None:
+    dataset = _dataset()
+    builder = create_membership_filter_builder()
+    membership_filter = builder.build(dataset)
+    assert membership_filter.record_count == len(dataset.records)
+    for record in dataset.records:
+        for cue in record.cue_set:
+            for second in record.second_set:
+                assert builder.may_match(
+                    membership_filter,
+                    MembershipFilterQuery(cue=cue, target=record.target, second=second),
+                )
+
+
+def test_update_adds_written_records() -> None:
+    dataset = _dataset()
+    builder = create_membership_filter_builder()
+    membership_filter = builder.build(dataset)
+    added = _dataset(30, seed=11).records
+    edit = edit_dataset(dataset, remove=[StrategyRef("mf.s0")], add=added)
+    updated = builder.update(membership_filter, edit.dataset, edit.previous)
+    assert updated.record_count == len(edit.dataset.records)
+    assert updated.target.bit_count == membership_filter.target.bit_count
+    for record in edit.dataset.records:
+        assert builder.may_match(
+            updated,
+            MembershipFilterQuery(
+                cue=record.cue_set[0], target=record.target, second=record.second_set[-1]
+            ),
+        )
+
+
+def test_filter_rejects_most_off_grid_queries() -> None:
+    dataset = _dataset()
+    builder = create_membership_filter_builder()
+    membership_filter = builder.build(dataset)
+    rng = random.Random(1)
+    off_grid = [
+        MembershipFilterQuery(
+            cue=Point(rng.uniform(0, 80), rng.uniform(0, 40)),
+            target=Point(rng.uniform(0, 80), rng.uniform(0, 40)),
+            second=Point(rng.uniform(0, 80), rng.uniform(0, 40)),
+        )
+        for _ in range(500)
+    ]
+    passed = sum(builder.may_match(membership_filter, query) for query in off_grid)
+    assert passed <= 5
+
+
+def test_prepared_miss_skips_full_scan(monkeypatch: pytest.MonkeyPatch) -> None:
+    dataset = _dataset()
+    prepared = prepare_dataset(dataset)
+    assert prepared.membership_filter is not None
+    calls = []
+    original = membership_engine.match_record
+
+    def counting(query, record):
+        calls.append(record)
+        return original(query, record)
+
+    monkeypatch.setattr(membership_engine, "match_record", counting)
+    engine = DefaultMembershipEngine(prefilter_adapter=_FullScan())
+    miss = MembershipQuery(cue=Point(0.1, 0.2), target=Point(0.3, 0.4), second=Point(0.5, 0.6))
+    assert engine.evaluate(prepared, miss) == []
+    assert calls == []
+
+    # Plain datasets carry no filter and keep the full-scan fallback.
+    assert engine.evaluate(dataset, miss) == []
+    assert len(calls) == len(dataset.records)
+
+
+def test_results_unchanged_with_filter() -> None:
+    dataset = _dataset()
+    prepared = prepare_dataset(dataset)
+    rng = random.Random(2)
+    with_check = DefaultMembershipEngine(prefilter_adapter=_FullScan())
+    without_check = DefaultMembershipEngine(
+        prefilter_adapter=_FullScan(), negative_check=_NeverRejects()
+    )
+    for record in dataset.records[::10]:
+        query = MembershipQuery(cue=record.cue_set[-1], target=record.target, second=record.second_set[0])
+        assert with_check.evaluate(prepared, query) == without_check.evaluate(dataset, query)
+        assert with_check.evaluate(prepared, query)
+    query = MembershipQuery(cue=grid_point(rng), target=grid_point(rng), second=grid_point(rng))
+    assert with_check.evaluate(prepared, query) == without_check.evaluate(dataset, query)
+
+
+class _NeverRejects:
+    def rejects(self, dataset, query):
+        return False
+
+
+class _AlwaysRejects:
+    def rejects(self, dataset, query):
+        return True
+
+
+def test_negative_check_is_pluggable() -> None:
+    dataset = _dataset()
+    record = dataset.records[0]
+    query = MembershipQuery(cue=record.cue_set[0], target=record.target, second=record.second_set[0])
+    # Only consulted on the fallback path, never when the prefilter has candidates.
+    assert create_membership_engine(negative_check=_AlwaysRejects()).evaluate(dataset, query)
+    engine = DefaultMembershipEngine(prefilter_adapter=_FullScan(), negative_check=_AlwaysRejects())
+    assert engine.evaluate(dataset, query) == []
+    assert isinstance(BloomNegativeCheck().rejects(dataset, query), bool)
+
+
+def test_filter_is_built_only_for_a_bloom_negative_check(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dataset = _dataset()
+    assert create_dataset_preparer(membership_filter=False).prepare(dataset).membership_filter is None
+    assert create_membership_engine().prepared_indexes == {"membership_filter"}
+    assert create_membership_engine(tolerance=1.0).prepared_indexes == {"membership_tolerance"}
+    assert (
+        create_membership_engine(negative_check=_NeverRejects()).prepared_indexes == frozenset()
+    )
+
+    built = []
+    prepare = DefaultDatasetPreparer.prepare
+
+    def recording_prepare(self, target):
+        result = prepare(self, target)
+        built.append(result.membership_filter is not None)
+        return result
+
+    monkeypatch.setattr(DefaultDatasetPreparer, "prepare", recording_prepare)
+    record = dataset.records[0]
+    queries = [
+        MembershipQuery(cue=record.cue_set[0], target=record.target, second=record.second_set[0])
+    ]
+    for engine in (
+        create_membership_engine(),
+        create_membership_engine(tolerance=1.0),
+        create_membership_engine(negative_check=_NeverRejects()),
+    ):
+        assert create_search_enhancement_orchestrator(membership=engine).run_many(dataset, queries)
+    assert built == [True, False, False]
+
+
+def test_empty_dataset_and_invalid_inputs() -> None:
+    builder = create_membership_filter_builder()
+    empty = builder.build(PublishedDataset(records=[]))
+    query = MembershipFilterQuery(cue=Point(1.0, 1.0), target=Point(1.0, 1.0), second=Point(1.0, 1.0))
+    assert builder.may_match(empty, query) is False
+    with pytest.raises(InvalidMembershipFilterDataset):
+        builder.build(None)  # type: ignore[arg-type]
+    with pytest.raises(InvalidMembershipFilterQuery):
+        builder.may_match(empty, None)  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        create_membership_filter_builder(false_positive_rate=1.0)
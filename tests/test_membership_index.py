@@ -0,0 +1,221 @@
+"""
+Unit tests — Membership Index (exact and tolerance modes) and prefilter adapters.
+"""
+
+from __future__ import annotations
+
+import copy
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from membership import (  # noqa: E402
+    DefaultMembershipEngine,
+    MembershipInputError,
+    MembershipQuery,
+    create_membership_engine,
+)
+from models import (  # noqa: E402
+    DatasetIdentity,
+    EnvelopeRecord,
+    Point,
+    PublishedDataset,
+    StrategyRef,
+)
+from search.membership.adapter import ExactMatchPrefilterAdapter  # noqa: E402
+from search.membership_index import (  # noqa: E402
+    InvalidMembershipIndexDataset,
+    InvalidMembershipIndexQuery,
+    MembershipIndexQuery,
+    create_membership_index_builder,
+)
+from search.prepared import create_dataset_preparer, edit_dataset, prepare_dataset  # noqa: E402
+
+
+class _FullScan:
+    def select_records(self, dataset, query):
+        return None
+
+
+def _grid_point(rng: random.Random) -> Point:
+    return Point(x=rng.randrange(0, 10) * 8.0, y=rng.randrange(0, 5) * 8.0)
+
+
+def _dataset(n: int = 200, seed: int = 3) -> PublishedDataset:
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        cue_set = [_grid_point(rng) for _ in range(rng.randint(1, 3))]
+        records.append(
+            EnvelopeRecord(
+                strategy_ref=StrategyRef(f"mi.s{i % 150}"),
+                target=_grid_point(rng),
+                cue_set=cue_set + cue_set[:1],  # repeated point in one set
+                second_set=[_grid_point(rng) for _ in range(rng.randint(1, 3))],
+            )
+        )
+    return PublishedDataset(records=records, dataset_identity=DatasetIdentity("ds-mi"))
+
+
+def _queries(dataset: PublishedDataset) -> list[MembershipQuery]:
+    rng = random.Random(8)
+    queries = [
+        MembershipQuery(cue=r.cue_set[0], target=r.target, second=r.second_set[-1])
+        for r in dataset.records[::5]
+    ]
+    queries += [
+        MembershipQuery(cue=_grid_point(rng), target=_grid_point(rng), second=_grid_point(rng))
+        for _ in range(40)
+    ]
+    return queries
+
+
+def test_postings_are_deduplicated_and_ascending() -> None:
+    p = Point(8.0, 8.0)
+    dataset = PublishedDataset(
+        records=[
+            EnvelopeRecord(strategy_ref=StrategyRef("a"), target=p, cue_set=[p, p], second_set=[p]),
+            EnvelopeRecord(strategy_ref=StrategyRef("b"), target=Point(0.0, 0.0), cue_set=[p], second_set=[p]),
+        ]
+    )
+    index = create_membership_index_builder().build(dataset)
+    assert index.record_count == 2
+    assert index.cue_postings[(8.0, 8.0)] == (0, 1)
+    assert index.target_postings[(8.0, 8.0)] == (0,)
+    result = create_membership_index_builder().query(
+        index, MembershipIndexQuery(cue=p, target=p, second=p)
+    )
+    assert result.ordinals == (0,)
+
+
+def test_exact_adapter_matches_full_scan_order() -> None:
+    dataset = _dataset()
+    before = copy.deepcopy(dataset)
+    full_scan = DefaultMembershipEngine(prefilter_adapter=_FullScan())
+    exact = create_membership_engine(prefilter_adapter=ExactMatchPrefilterAdapter())
+    prepared = create_dataset_preparer(membership_index=True).prepare(dataset)
+    assert prepared.membership_index is not None
+    assert prepare_dataset(dataset).membership_index is None
+    hits = 0
+    for query in _queries(dataset):
+        expected = full_scan.evaluate(dataset, query)
+        hits += bool(expected)
+        assert exact.evaluate(dataset, query) == expected
+        assert exact.evaluate(prepared, query) == expected
+    assert hits > 10
+    assert dataset == before
+
+
+def test_exact_adapter_miss_skips_full_scan() -> None:
+    dataset = _dataset()
+    adapter = ExactMatchPrefilterAdapter()
+    query = MembershipQuery(cue=Point(1.0, 1.0), target=Point(2.0, 2.0), second=Point(3.0, 3.0))
+    assert adapter.select_records(dataset, query) == ()
+    assert DefaultMembershipEngine(prefilter_adapter=adapter).evaluate(dataset, query) == []
+
+
+def test_nan_points_never_match() -> None:
+    nan = Point(float("nan"), 0.0)
+    dataset = PublishedDataset(
+        records=[EnvelopeRecord(strategy_ref=StrategyRef("n"), target=nan, cue_set=[nan], second_set=[nan])]
+    )
+    query = MembershipQuery(cue=nan, target=nan, second=nan)
+    assert create_membership_engine(prefilter_adapter=ExactMatchPrefilterAdapter()).evaluate(
+        dataset, query
+    ) == DefaultMembershipEngine(prefilter_adapter=_FullScan()).evaluate(dataset, query) == []
+
+
+@pytest.mark.parametrize("epsilon", [0.0, 3.0])
+def test_update_equals_rebuild(epsilon: float) -> None:
+    dataset = _dataset()
+    builder = create_membership_index_builder()
+    index = builder.build(dataset, epsilon=epsilon)
+    donors = _dataset(20, seed=9).records
+    edit = edit_dataset(
+        dataset,
+        remove=[StrategyRef("mi.s3"), StrategyRef("mi.s140")],
+        replace=[
+            EnvelopeRecord(
+                strategy_ref=StrategyRef("mi.s7"),
+                target=donors[0].target,
+                cue_set=donors[0].cue_set,
+                second_set=donors[0].second_set,
+            )
+        ],
+        add=donors[1:4],
+    )
+    updated = builder.update(index, edit.dataset, edit.previous)
+    assert updated == builder.build(edit.dataset, epsilon=epsilon)
+
+
+def test_invalid_inputs() -> None:
+    builder = create_membership_index_builder()
+    with pytest.raises(InvalidMembershipIndexDataset):
+        builder.build(None)  # type: ignore[arg-type]
+    with pytest.raises(InvalidMembershipIndexDataset):
+        builder.build(PublishedDataset(records=["bad"]))  # type: ignore[list-item]
+    with pytest.raises(InvalidMembershipIndexQuery):
+        builder.query(None, None)  # type: ignore[arg-type]
+
+
+def _jitter(point: Point, rng: random.Random, radius: float) -> Point:
+    return Point(x=point.x + rng.uniform(-radius, radius), y=point.y + rng.uniform(-radius, radius))
+
+
+def test_tolerance_mode_matches_full_scan_with_distance() -> None:
+    dataset = _dataset()
+    rng = random.Random(21)
+    tolerance = 0.75
+    indexed = create_membership_engine(tolerance=tolerance)
+    full_scan = DefaultMembershipEngine(prefilter_adapter=_FullScan(), tolerance=tolerance)
+    prepared = create_dataset_preparer(membership_tolerance=tolerance).prepare(dataset)
+    assert prepared.tolerance_index is not None
+    hits = 0
+    for record in dataset.records[::4]:
+        query = MembershipQuery(
+            cue=_jitter(record.cue_set[0], rng, 0.6),
+            target=_jitter(record.target, rng, 0.6),
+            second=_jitter(record.second_set[0], rng, 0.6),
+        )
+        expected = full_scan.evaluate(dataset, query)
+        hits += bool(expected)
+        assert indexed.evaluate(dataset, query) == expected
+        assert indexed.evaluate(prepared, query) == expected
+        for candidate in expected:
+            assert candidate.membership.match_distance is not None
+            assert candidate.membership.match_distance <= tolerance
+    assert hits > 10
+    # Exact mode never matches jittered positions and keeps match_distance unset.
+    exact = create_membership_engine().evaluate(dataset, _queries(dataset)[0])
+    assert exact and all(c.membership.match_distance is None for c in exact)
+
+
+def test_tolerance_boundary_is_inclusive_across_buckets() -> None:
+    tolerance = 0.1
+    record = EnvelopeRecord(
+        strategy_ref=StrategyRef("edge"),
+        target=Point(0.3, 0.0),
+        cue_set=[Point(1.0, 1.0)],
+        second_set=[Point(2.0, 2.0)],
+    )
+    dataset = PublishedDataset(records=[record])
+    engine = create_membership_engine(tolerance=tolerance)
+    near = MembershipQuery(cue=Point(1.0, 1.0), target=Point(0.2, 0.0), second=Point(2.0, 2.0))
+    far = MembershipQuery(cue=Point(1.0, 1.0), target=Point(0.15, 0.0), second=Point(2.0, 2.0))
+    matched = engine.evaluate(dataset, near)
+    assert [c.strategy_ref for c in matched] == ["edge"]
+    assert matched[0].membership.match_distance == pytest.approx(0.1)
+    assert engine.evaluate(dataset, far) == []
+
+
+def test_tolerance_must_be_positive() -> None:
+    with pytest.raises(MembershipInputError):
+        create_membership_engine(tolerance=0.0)
+    with pytest.raises(InvalidMembershipIndexDataset):
+        create_membership_index_builder().build(_dataset(), epsilon=-1.0)
@@ -28,6 +28,12 @@ from product import (  # noqa: E402
     serialize_handoff,
 )
 from product.package_builder import PackageBuilder  # noqa: E402
+from search.prepared import (  # noqa: E402
+    INDEX_SIDECAR_DIRNAME,
+    INDEX_SIDECAR_FILENAME,
+    create_prepared_dataset_cache,
+    prepare_dataset,
+)
 from product.package_factory import (  # noqa: E402
     build_published_package,
     emit_published_package_from_handoff_json,
@@ -118,6 +124,27 @@ def test_write_package_folder(handoff_artifact, tmp_path: Path) -> None:
     assert len(loaded.records) == len(handoff_artifact.dataset.records)
 
 
+def test_write_package_folder_with_index_sidecar(handoff_artifact, tmp_path: Path) -> None:
+    plain = emit_published_package(handoff_artifact, tmp_path / "plain")
+    assert not (plain.package_dir / INDEX_SIDECAR_DIRNAME).exists()
+
+    result = emit_published_package(handoff_artifact, tmp_path / "indexed", index_sidecar=True)
+    sidecar = result.package_dir / INDEX_SIDECAR_DIRNAME / INDEX_SIDECAR_FILENAME
+    assert sidecar.exists()
+    assert result.files[f"{INDEX_SIDECAR_DIRNAME}/{INDEX_SIDECAR_FILENAME}"] == sidecar
+
+    cache = create_prepared_dataset_cache()
+    loaded = create_package_loader(prepared_cache=cache).load_path(
+        result.package_dir / "package.json",
+        manifest_path=result.package_dir / "manifest.json",
+        version_path=result.package_dir / "version.json",
+    )
+    prepared = cache.peek(loaded.dataset_identity)
+    assert prepared is not None and prepared.dataset is loaded
+    assert isinstance(prepared.kd_index.ordinal_positions, memoryview)
+    assert prepared == prepare_dataset(loaded)
+
+
 def test_emit_from_handoff_json_roundtrip(handoff_artifact, tmp_path: Path) -> None:
     handoff_path = tmp_path / "export_handoff.json"
     handoff_path.write_text(
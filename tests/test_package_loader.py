@@ -4,8 +4,13 @@ Package Loader tests (SEARCH_LOADER_SSOT contract).
 
 from __future__ import annotations
 
+import gc
+import io
 import json
+import mmap
+import random
 import sys
+import tracemalloc
 from pathlib import Path
 
 import pytest
@@ -16,11 +21,30 @@ if str(ROOT) not in sys.path:
 
 from loader import (  # noqa: E402
     LoaderValidationError,
+    LoadProgress,
     ManifestNotFound,
+    PackageLoadError,
     VersionNotFound,
     create_package_loader,
+    decode_package_json,
+    read_package_stream,
+)
+from models import (  # noqa: E402
+    ColumnarDataset,
+    DatasetIdentity,
+    EnvelopeRecord,
+    Point,
+    PublishedDataset,
+    VerifiedDataset,
+)
+from search.prepared import (  # noqa: E402
+    INDEX_SIDECAR_DIRNAME,
+    INDEX_SIDECAR_FILENAME,
+    create_dataset_preparer,
+    create_prepared_dataset_cache,
+    encode_index_sidecar,
+    prepare_dataset,
 )
-from models import PublishedDataset  # noqa: E402
 
 
 def _dataset_json() -> dict:
@@ -170,3 +194,308 @@ def test_optional_manifest_version_when_not_referenced() -> None:
     pkg.pop("versionReference")
     dataset = loader.load(pkg)
     assert len(dataset.records) == 1
+
+
+def _write_package_dir(tmp_path: Path) -> Path:
+    (tmp_path / "package.json").write_text(json.dumps(_package_json()), encoding="utf-8")
+    (tmp_path / "manifest.json").write_text(json.dumps(_manifest_json()), encoding="utf-8")
+    (tmp_path / "version.json").write_text(json.dumps(_version_json()), encoding="utf-8")
+    return tmp_path
+
+
+def _load_dir(loader, package_dir: Path) -> PublishedDataset:
+    return loader.load_path(
+        package_dir / "package.json",
+        manifest_path=package_dir / "manifest.json",
+        version_path=package_dir / "version.json",
+    )
+
+
+def _write_sidecar(tmp_path: Path, dataset: PublishedDataset, **options) -> Path:
+    path = tmp_path / INDEX_SIDECAR_DIRNAME / INDEX_SIDECAR_FILENAME
+    path.parent.mkdir(exist_ok=True)
+    preparer = create_dataset_preparer(**options)
+    path.write_bytes(
+        encode_index_sidecar(preparer.prepare(dataset), preparer_options=preparer.options)
+    )
+    return path
+
+
+def test_load_path_maps_index_sidecar_into_cache(tmp_path: Path) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    plain = _load_dir(create_package_loader(), package_dir)
+    _write_sidecar(tmp_path, plain)
+
+    cache = create_prepared_dataset_cache()
+    loader = create_package_loader(verified=True, prepared_cache=cache)
+    dataset = _load_dir(loader, package_dir)
+    prepared = cache.peek(DatasetIdentity("ds-1"))
+    assert prepared is not None
+    assert prepared.dataset is dataset
+    # Served from the mapped sidecar, not rebuilt.
+    assert isinstance(prepared.kd_index.ordinal_positions, memoryview)
+    assert prepared == prepare_dataset(dataset)
+
+
+def test_load_path_rebuilds_absent_or_stale_sidecar(tmp_path: Path) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    cache = create_prepared_dataset_cache()
+    loader = create_package_loader(prepared_cache=cache)
+
+    dataset = _load_dir(loader, package_dir)
+    assert cache.peek(DatasetIdentity("ds-1")) == prepare_dataset(dataset)
+
+    # Sidecar written for another dataset identity.
+    stale = PublishedDataset(records=dataset.records, dataset_identity=DatasetIdentity("ds-0"))
+    sidecar = _write_sidecar(tmp_path, stale)
+    cache.clear()
+    dataset = _load_dir(loader, package_dir)
+    prepared = cache.peek(DatasetIdentity("ds-1"))
+    assert prepared == prepare_dataset(dataset)
+    assert not isinstance(prepared.kd_index.ordinal_positions, memoryview)
+
+    # Corrupt sidecar.
+    sidecar.write_bytes(b"\x00" * 64)
+    cache.clear()
+    dataset = _load_dir(loader, package_dir)
+    assert cache.peek(DatasetIdentity("ds-1")) == prepare_dataset(dataset)
+
+
+def test_load_path_rebuilds_sidecar_written_with_other_options(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    plain = _load_dir(create_package_loader(), package_dir)
+    _write_sidecar(tmp_path, plain)
+
+    mapped = []
+
+    class _TrackedMap(mmap.mmap):
+        def __init__(self, *args, **kwargs) -> None:
+            mapped.append(self)
+
+    monkeypatch.setattr(mmap, "mmap", _TrackedMap)
+    # The cache prepares with a tolerance index; the sidecar has none.
+    cache = create_prepared_dataset_cache(membership_tolerance=0.5)
+    dataset = _load_dir(create_package_loader(prepared_cache=cache), package_dir)
+    prepared = cache.peek(DatasetIdentity("ds-1"))
+    assert prepared is not None and prepared.tolerance_index is not None
+    assert prepared == create_dataset_preparer(membership_tolerance=0.5).prepare(dataset)
+    assert len(mapped) == 1 and mapped[0].closed
+
+
+def test_gc_freeze_moves_loaded_dataset_to_permanent_generation() -> None:
+    gc.unfreeze()
+    try:
+        dataset = create_package_loader(gc_freeze=True).load(
+            _package_json(), manifest_data=_manifest_json(), version_data=_version_json()
+        )
+        assert gc.get_freeze_count() > 0
+        assert dataset.records[0].strategy_ref == "strategy-1"
+    finally:
+        gc.unfreeze()
+    create_package_loader().load(
+        _package_json(), manifest_data=_manifest_json(), version_data=_version_json()
+    )
+    assert gc.get_freeze_count() == 0
+
+
+def _large_package_json(n: int, seed: int = 4) -> dict:
+    rng = random.Random(seed)
+
+    def point() -> dict:
+        return {"x": rng.randrange(0, 800) / 10, "y": rng.randrange(0, 400) / 10}
+
+    data = _package_json()
+    data["dataset"] = {
+        "datasetIdentity": "ds-1",
+        "records": [
+            {
+                "strategyRef": f"strategy-{i % (n - 3)}",
+                "target": point(),
+                "cueSet": [point() for _ in range(rng.randint(1, 10))],
+                "secondSet": [point() for _ in range(rng.randint(1, 10))],
+            }
+            for i in range(n)
+        ],
+    }
+    return data
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+def test_read_package_stream_matches_json_loads(chunk_size: int) -> None:
+    data = _large_package_json(40)
+    data["dataset"]["records"][3]["strategyRef"] = "strat\u00e9gie \"q\" \u2603"
+    data["dataset"]["records"][5]["target"] = {"x": 12345678.125, "y": -0.0}
+    text = json.dumps({"manifestReference": "man-1", **data}, indent=1, ensure_ascii=False)
+    streamed: list = []
+    package = read_package_stream(
+        io.BytesIO(text.encode("utf-8")),
+        lambda index, record: streamed.append((index, record)),
+        chunk_size=chunk_size,
+    )
+    expected = json.loads(text)
+    assert [record for _, record in streamed] == expected["dataset"]["records"]
+    assert [index for index, _ in streamed] == list(range(40))
+    expected["dataset"]["records"] = []
+    assert package == expected
+
+    empty = read_package_stream(io.BytesIO(b'{"dataset": {"records": []}}'), streamed.append)
+    assert empty == {"dataset": {"records": []}}
+    for malformed in (b'{"dataset": {"records": [{"x": 1}', b'{"a": 1} 2', b"[1]", b'{"a" 1}'):
+        with pytest.raises(ValueError):
+            read_package_stream(io.BytesIO(malformed), lambda index, record: None, chunk_size=4)
+
+
+@pytest.mark.parametrize("options", [{}, {"verified": True}, {"columnar": True}])
+def test_streamed_load_path_matches_full_load(tmp_path: Path, options: dict) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    (package_dir / "package.json").write_text(
+        json.dumps(_large_package_json(300)), encoding="utf-8"
+    )
+    expected = _load_dir(create_package_loader(**options), package_dir)
+    reports: list[LoadProgress] = []
+    streamed = _load_dir(
+        create_package_loader(stream=True, progress=reports.append, **options), package_dir
+    )
+    assert type(streamed) is type(expected)
+    assert streamed == expected
+    if isinstance(expected, VerifiedDataset):
+        assert dict(streamed.record_ordinals) == dict(expected.record_ordinals)
+
+    size = (package_dir / "package.json").stat().st_size
+    assert reports and reports[-1] == LoadProgress(
+        bytes_read=size, total_bytes=size, record_count=300
+    )
+    assert [r.bytes_read for r in reports] == sorted(r.bytes_read for r in reports)
+
+
+def test_streamed_load_validates_each_record(tmp_path: Path) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    data = _large_package_json(5)
+    data["dataset"]["records"][2]["cueSet"] = []
+    (package_dir / "package.json").write_text(json.dumps(data), encoding="utf-8")
+    loader = create_package_loader(stream=True)
+    with pytest.raises(LoaderValidationError, match=r"records\[2\]"):
+        _load_dir(loader, package_dir)
+
+    data = _large_package_json(5)
+    data["unexpected"] = True
+    (package_dir / "package.json").write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(LoaderValidationError):
+        _load_dir(loader, package_dir)
+
+    (package_dir / "package.json").write_text('{"packageIdentity": "pkg-1", "dataset": {', encoding="utf-8")
+    with pytest.raises(PackageLoadError):
+        _load_dir(loader, package_dir)
+
+
+def test_streamed_columnar_load_bounds_parse_memory(tmp_path: Path) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    (package_dir / "package.json").write_text(
+        json.dumps(_large_package_json(300)), encoding="utf-8"
+    )
+
+    def peak(loader) -> int:
+        tracemalloc.start()
+        try:
+            dataset = _load_dir(loader, package_dir)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            assert isinstance(dataset, ColumnarDataset)
+
+    full = peak(create_package_loader(columnar=True))
+    streamed = peak(
+        create_package_loader(columnar=True, stream=True, stream_chunk_size=16 * 1024)
+    )
+    assert streamed * 4 < full
+
+
+def test_decode_package_json_builds_records_in_one_pass() -> None:
+    data = _large_package_json(20)
+    data["dataset"]["records"][4]["target"] = {"x": 3, "y": -0.5}
+    data["dataset"]["records"][6]["cueSet"].append({"x": 1.0, "y": True})
+    data["generatorBuildIdentity"] = {"x": 1.0, "y": 2.0}
+    package, records = decode_package_json(json.dumps(data))
+
+    assert all(type(r) is EnvelopeRecord for i, r in enumerate(records) if i != 6)
+    assert records[4].target == Point(x=3.0, y=-0.5) and type(records[4].target.x) is float
+    assert records[0].cue_set[0] == Point(**data["dataset"]["records"][0]["cueSet"][0])
+    # A record breaking the EnvelopeRecord rules stays plain JSON (inner Points aside).
+    assert isinstance(records[6], dict)
+    # Everything outside dataset.records comes back as plain JSON.
+    data["dataset"]["records"] = []
+    assert package == data
+
+    assert decode_package_json("[1]") == ([1], [])
+    assert decode_package_json('{"dataset": {"records": {"x": 1, "y": 2}}}') == (
+        {"dataset": {"records": {"x": 1, "y": 2}}},
+        [],
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"verified": True}, {"columnar": True}, {"stream": True}, {"stream": True, "columnar": True}],
+)
+def test_fused_load_path_matches_full_load(tmp_path: Path, options: dict) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    (package_dir / "package.json").write_text(
+        json.dumps(_large_package_json(300)), encoding="utf-8"
+    )
+    expected = _load_dir(create_package_loader(**options), package_dir)
+    fused = _load_dir(create_package_loader(fused=True, **options), package_dir)
+    assert type(fused) is type(expected)
+    assert fused == expected
+    if isinstance(expected, VerifiedDataset):
+        assert dict(fused.record_ordinals) == dict(expected.record_ordinals)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize(
+    "path, value",
+    [
+        (("cueSet",), []),
+        (("secondSet", 0, "y"), "1.0"),
+        (("target", "x"), True),
+        (("target", "z"), 1.0),
+        (("strategyRef",), ""),
+        (("extra",), 1),
+    ],
+)
+def test_fused_load_enforces_record_schema(
+    tmp_path: Path, stream: bool, path: tuple, value: object
+) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    data = _large_package_json(5)
+    node = data["dataset"]["records"][2]
+    for key in path[:-1]:
+        node = node[key]
+    node[path[-1]] = value
+    (package_dir / "package.json").write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(LoaderValidationError):
+        _load_dir(create_package_loader(), package_dir)
+    with pytest.raises(LoaderValidationError, match=r"records\[2\]"):
+        _load_dir(create_package_loader(fused=True, stream=stream), package_dir)
+
+
+def test_fused_load_validates_package_shell(tmp_path: Path) -> None:
+    package_dir = _write_package_dir(tmp_path)
+    loader = create_package_loader(fused=True)
+    for mutate in (
+        lambda data: data.update(unexpected=True),
+        lambda data: data.update(datasetIdentity={"x": 1.0, "y": 2.0}),
+        lambda data: data["dataset"].update(records={"x": 1.0, "y": 2.0}),
+        lambda data: data.pop("packageIdentity"),
+    ):
+        data = _large_package_json(5)
+        mutate(data)
+        (package_dir / "package.json").write_text(json.dumps(data), encoding="utf-8")
+        with pytest.raises(LoaderValidationError):
+            _load_dir(loader, package_dir)
+
+    for text in ('{"packageIdentity": "pkg-1", "dataset": {', "[]"):
+        (package_dir / "package.json").write_text(text, encoding="utf-8")
+        with pytest.raises(PackageLoadError):
+            _load_dir(loader, package_dir)
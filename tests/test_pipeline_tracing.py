@@ -0,0 +1,175 @@
+"""
+Unit tests — pipeline stage tracing (StageSpan / StageStatsCollector).
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from grid_corpus import grid_dataset  # noqa: E402
+from membership import MembershipQuery  # noqa: E402
+from models import Point, PublishedDataset  # noqa: E402
+from resolve import Strategy, create_memory_repository  # noqa: E402
+from runtime import create_runtime  # noqa: E402
+from search.runtime import (  # noqa: E402
+    PIPELINE_STAGES,
+    PipelineTracer,
+    StageSpan,
+    StageStatsCollector,
+    StageTrace,
+    create_search_enhancement_orchestrator,
+)
+
+
+def _dataset(n: int = 30, seed: int = 5) -> PublishedDataset:
+    return grid_dataset(n, seed, prefix="trace", dataset_identity="ds-trace")
+
+
+def _hit(dataset: PublishedDataset) -> MembershipQuery:
+    record = dataset.records[0]
+    return MembershipQuery(cue=record.cue_set[0], target=record.target, second=record.second_set[0])
+
+
+_MISS = MembershipQuery(cue=Point(0.0, 0.0), target=Point(79.5, 39.0), second=Point(1.5, 1.5))
+
+
+class _ListTracer:
+    def __init__(self) -> None:
+        self.spans: list[StageSpan] = []
+
+    def record(self, span: StageSpan) -> None:
+        self.spans.append(span)
+
+
+def _repo(dataset: PublishedDataset):
+    return create_memory_repository(
+        {r.strategy_ref: Strategy(strategy_ref=r.strategy_ref) for r in dataset.records}
+    )
+
+
+def test_runtime_emits_one_span_per_stage_in_order() -> None:
+    dataset = _dataset()
+    tracer = _ListTracer()
+    assert isinstance(tracer, PipelineTracer)
+    runtime = create_runtime(repository=_repo(dataset), tracer=tracer)
+    result = runtime.execute(dataset, _hit(dataset))
+
+    assert tuple(span.stage for span in tracer.spans) == PIPELINE_STAGES
+    spans = {span.stage: span for span in tracer.spans}
+    assert spans["spatial_index"].input_count == len(dataset.records)
+    assert spans["spatial_index"].prefilter_hit is True
+    assert spans["kd_tree"].input_count == spans["spatial_index"].output_count
+    assert spans["membership"].output_count == len(result.candidates)
+    assert spans["resolve"].output_count == len(result.candidates)
+    assert all(span.elapsed_ms >= 0.0 for span in tracer.spans)
+
+
+def test_prefilter_miss_is_reported() -> None:
+    dataset = _dataset()
+    tracer = _ListTracer()
+    orchestrator = create_search_enhancement_orchestrator(tracer=tracer)
+    artifacts = orchestrator.run(dataset, _MISS)
+    assert artifacts.membership_candidates == ()
+    stages = [span.stage for span in tracer.spans]
+    assert stages == ["spatial_index", "kd_tree", "membership"]
+    assert all(span.prefilter_hit is False for span in tracer.spans)
+    assert tracer.spans[-1].input_count == len(dataset.records)
+
+
+def test_tracing_does_not_change_results() -> None:
+    dataset = _dataset()
+    queries = [_hit(dataset), _MISS, _hit(dataset)]
+    traced = create_runtime(repository=_repo(dataset), tracer=StageStatsCollector())
+    plain = create_runtime(repository=_repo(dataset))
+    for query in queries:
+        assert traced.execute(dataset, query) == plain.execute(dataset, query)
+    assert traced.execute_many(dataset, queries) == plain.execute_many(dataset, queries)
+
+
+def test_batch_spans_carry_query_count() -> None:
+    dataset = _dataset()
+    tracer = _ListTracer()
+    orchestrator = create_search_enhancement_orchestrator(tracer=tracer)
+    orchestrator.run_many(dataset, [_hit(dataset), _hit(dataset), _MISS])
+    spatial = [span for span in tracer.spans if span.stage == "spatial_index"]
+    # Two cell groups; identical queries share one pass.
+    assert len(spatial) == 2
+    assert sorted(span.query_count for span in spatial) == [1, 1]
+
+
+def test_batch_resolve_span_counts_results_not_lookups() -> None:
+    dataset = _dataset()
+    tracer = _ListTracer()
+    runtime = create_runtime(repository=_repo(dataset), tracer=tracer)
+    # The repeated query reuses the first query's lookups.
+    results = runtime.execute_many(dataset, [_hit(dataset), _hit(dataset)])
+    resolve = [span for span in tracer.spans if span.stage == "resolve"]
+    assert [span.output_count for span in resolve] == [len(r.candidates) for r in results]
+    assert all(span.output_count > 0 for span in resolve)
+
+
+def test_stage_trace_records_only_completed_traced_blocks() -> None:
+    tracer = _ListTracer()
+    with StageTrace(tracer, "spatial_index", input_count=5, query_count=2) as span:
+        span.output_count = 3
+        span.prefilter_hit = True
+    assert tracer.spans == [
+        StageSpan(
+            stage="spatial_index",
+            elapsed_ms=tracer.spans[0].elapsed_ms,
+            input_count=5,
+            output_count=3,
+            prefilter_hit=True,
+            query_count=2,
+        )
+    ]
+    with pytest.raises(ValueError):
+        with StageTrace(tracer, "kd_tree"):
+            raise ValueError("stage failed")
+    with StageTrace(None, "kd_tree") as span:
+        span.output_count = 1
+    assert len(tracer.spans) == 1
+
+
+def test_collector_percentiles_and_totals() -> None:
+    collector = StageStatsCollector()
+    for value in range(1, 101):
+        collector.record(
+            StageSpan(
+                stage="ranking",
+                elapsed_ms=float(value),
+                input_count=4,
+                output_count=2,
+                prefilter_hit=value % 2 == 0,
+            )
+        )
+    stats = collector.stats("ranking")
+    assert stats is not None
+    assert stats.count == 100
+    assert (stats.p50_ms, stats.p95_ms, stats.p99_ms) == (50.0, 95.0, 99.0)
+    assert stats.mean_ms == pytest.approx(50.5)
+    assert stats.selectivity == pytest.approx(0.5)
+    assert (stats.prefilter_hits, stats.prefilter_misses) == (50, 50)
+    assert collector.stats("geometry") is None
+
+
+def test_collector_summary_order_window_and_reset() -> None:
+    collector = StageStatsCollector(max_samples=2)
+    for stage, value in (("custom", 1.0), ("kd_tree", 9.0), ("kd_tree", 1.0), ("kd_tree", 3.0)):
+        collector.record(StageSpan(stage=stage, elapsed_ms=value, input_count=0, output_count=0))
+    summary = collector.summary()
+    assert list(summary) == ["kd_tree", "custom"]
+    assert summary["kd_tree"].count == 3
+    assert summary["kd_tree"].p99_ms == 3.0  # window keeps the last two samples
+    assert summary["kd_tree"].selectivity == 1.0
+    collector.reset()
+    assert collector.summary() == {}
+    with pytest.raises(ValueError):
+        StageStatsCollector(max_samples=0)
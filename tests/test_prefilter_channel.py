@@ -0,0 +1,103 @@
+"""
+Unit tests — orchestrator → Membership prefilter-result channel.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from grid_corpus import grid_dataset, grid_point  # noqa: E402
+from membership import MembershipInputError, MembershipQuery, create_membership_engine  # noqa: E402
+from models import PublishedDataset  # noqa: E402
+from search.kd_tree.builder import DefaultKDTreeBuilder  # noqa: E402
+from search.membership.adapter import ExactMatchPrefilterAdapter  # noqa: E402
+from search.membership.models import PrefilterResult  # noqa: E402
+from search.runtime import SearchEnhancementOrchestrator  # noqa: E402
+from search.spatial_index.builder import DefaultSpatialIndexBuilder  # noqa: E402
+
+
+def _dataset(n: int = 60, seed: int = 12) -> PublishedDataset:
+    return grid_dataset(n, seed, prefix="pc", dataset_identity="ds-pc", ref_count=50)
+
+
+def _queries(dataset: PublishedDataset) -> list[MembershipQuery]:
+    rng = random.Random(4)
+    hits = [
+        MembershipQuery(cue=r.cue_set[0], target=r.target, second=r.second_set[-1])
+        for r in dataset.records[::6]
+    ]
+    return hits + [MembershipQuery(cue=grid_point(rng), target=grid_point(rng), second=grid_point(rng))]
+
+
+class _EvaluateOnly:
+    """Hides the prefilter channel: Membership runs its own prefilter."""
+
+    def __init__(self, inner) -> None:
+        self._inner = inner
+
+    def evaluate(self, dataset, query):
+        return self._inner.evaluate(dataset, query)
+
+
+def _count_builds(monkeypatch: pytest.MonkeyPatch) -> dict:
+    counts = {"spatial": 0, "kd": 0}
+    spatial_build = DefaultSpatialIndexBuilder.build
+    kd_build = DefaultKDTreeBuilder.build
+
+    def count_spatial(self, dataset):
+        counts["spatial"] += 1
+        return spatial_build(self, dataset)
+
+    def count_kd(self, dataset, candidate_ids):
+        counts["kd"] += 1
+        return kd_build(self, dataset, candidate_ids)
+
+    monkeypatch.setattr(DefaultSpatialIndexBuilder, "build", count_spatial)
+    monkeypatch.setattr(DefaultKDTreeBuilder, "build", count_kd)
+    return counts
+
+
+def test_run_builds_prefilter_once_per_query(monkeypatch: pytest.MonkeyPatch) -> None:
+    dataset = _dataset()
+    query = _queries(dataset)[0]
+    counts = _count_builds(monkeypatch)
+    SearchEnhancementOrchestrator(membership=create_membership_engine()).run(dataset, query)
+    assert counts == {"spatial": 1, "kd": 1}
+
+    counts.update(spatial=0, kd=0)
+    SearchEnhancementOrchestrator(membership=_EvaluateOnly(create_membership_engine())).run(
+        dataset, query
+    )
+    assert counts == {"spatial": 2, "kd": 2}
+
+
+def test_channel_returns_same_candidates() -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    channel = SearchEnhancementOrchestrator(membership=create_membership_engine())
+    legacy = SearchEnhancementOrchestrator(membership=_EvaluateOnly(create_membership_engine()))
+    for query in queries:
+        assert channel.run(dataset, query) == legacy.run(dataset, query)
+    assert channel.run_many(dataset, queries) == legacy.run_many(dataset, queries)
+    assert any(artifacts.membership_candidates for artifacts in channel.run_many(dataset, queries))
+
+
+def test_adapters_without_channel_ignore_prefilter() -> None:
+    dataset = _dataset()
+    query = _queries(dataset)[0]
+    engine = create_membership_engine(prefilter_adapter=ExactMatchPrefilterAdapter())
+    # A misleading upstream shortlist cannot change an adapter that selects on its own.
+    empty = PrefilterResult(candidate_ids=(), shortlist=())
+    assert engine.evaluate_with_prefilter(dataset, query, empty) == engine.evaluate(dataset, query)
+    with pytest.raises(MembershipInputError):
+        engine.evaluate_with_prefilter(dataset, query, None)  # type: ignore[arg-type]
+    with pytest.raises(MembershipInputError):
+        engine.evaluate_many(dataset, [query], prefilters=[])
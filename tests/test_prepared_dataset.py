@@ -0,0 +1,541 @@
+"""
+Unit tests — Prepared Dataset (indexes built once per dataset, reused per query).
+"""
+
+from __future__ import annotations
+
+import copy
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from generator.published_dataset_builder.serialize import published_dataset_to_json  # noqa: E402
+from grid_corpus import grid_dataset, grid_point  # noqa: E402
+from loader import create_package_loader  # noqa: E402
+from membership import MembershipQuery, create_membership_engine  # noqa: E402
+from models import (  # noqa: E402
+    ColumnarDataset,
+    DatasetIdentity,
+    EnvelopeRecord,
+    Point,
+    PublishedDataset,
+    RecordIdentity,
+    StrategyRef,
+    VerifiedDataset,
+)
+from resolve import Strategy, create_memory_repository  # noqa: E402
+from runtime import create_runtime  # noqa: E402
+from search.kd_tree import (  # noqa: E402
+    KDTreeQueryInput,
+    create_kd_tree_builder,
+    create_kd_tree_query,
+    table_axis_weights,
+)
+from search.prepared import (  # noqa: E402
+    DefaultDatasetPreparer,
+    InvalidPreparedDataset,
+    PreparedDataset,
+    PreparedDatasetCache,
+    StaleIndexSidecar,
+    create_dataset_preparer,
+    create_prepared_dataset_cache,
+    decode_index_sidecar,
+    edit_dataset,
+    encode_index_sidecar,
+    prepare_dataset,
+)
+from search.runtime import SearchEnhancementOrchestrator  # noqa: E402
+from search.spatial_index import (  # noqa: E402
+    SPATIAL_GRID_ADAPTIVE,
+    SPATIAL_POSTINGS_BITMAP,
+    create_spatial_index_builder,
+)
+
+
+def _random_dataset(n: int = 60, seed: int = 7) -> PublishedDataset:
+    # A few duplicate refs.
+    return grid_dataset(
+        n, seed, prefix="prep", dataset_identity="ds-prep", max_set_size=4, ref_count=n - 5
+    )
+
+
+def _member_queries(dataset: PublishedDataset) -> list[MembershipQuery]:
+    queries = []
+    for record in dataset.records[::3]:
+        queries.append(
+            MembershipQuery(
+                cue=record.cue_set[-1],
+                target=record.target,
+                second=record.second_set[0],
+            )
+        )
+    queries.append(
+        MembershipQuery(cue=Point(0.0, 0.0), target=Point(79.5, 39.0), second=Point(1.5, 1.5))
+    )
+    return queries
+
+
+class _CountingSpatial:
+    def __init__(self) -> None:
+        self._inner = create_spatial_index_builder()
+        self.builds = 0
+
+    def build(self, dataset):
+        self.builds += 1
+        return self._inner.build(dataset)
+
+    def query(self, index, query):
+        return self._inner.query(index, query)
+
+
+class _CountingKDBuilder:
+    def __init__(self) -> None:
+        self._inner = create_kd_tree_builder()
+        self.builds = 0
+
+    def build(self, dataset, candidate_ids):
+        self.builds += 1
+        return self._inner.build(dataset, candidate_ids)
+
+
+def test_prepare_builds_indexes_and_positions() -> None:
+    dataset = _random_dataset()
+    prepared = prepare_dataset(dataset)
+    assert isinstance(prepared, PreparedDataset)
+    assert prepared.dataset is dataset
+    assert prepared.dataset_identity == "ds-prep"
+    assert prepared.spatial_index.record_count == len(dataset.records)
+    assert len(prepared.kd_index.candidates) == len(prepared.record_positions)
+    assert prepared.record_positions[RecordIdentity("prep.s0")] == (0, 55)
+    assert prepare_dataset(prepared) is prepared
+
+
+def test_prepare_rejects_invalid_dataset() -> None:
+    with pytest.raises(InvalidPreparedDataset):
+        prepare_dataset(None)  # type: ignore[arg-type]
+    with pytest.raises(InvalidPreparedDataset):
+        prepare_dataset(PublishedDataset(records=["bad"]))  # type: ignore[list-item]
+
+
+def test_scoped_kd_search_matches_scope_built_tree() -> None:
+    dataset = _random_dataset()
+    prepared = prepare_dataset(dataset)
+    builder = create_kd_tree_builder()
+    query_api = create_kd_tree_query()
+    rng = random.Random(3)
+    ids = sorted(prepared.record_positions)
+    for _ in range(20):
+        scope = rng.sample(ids, rng.randint(1, len(ids)))
+        query = KDTreeQueryInput(
+            cue=grid_point(rng), target=grid_point(rng), second=grid_point(rng)
+        )
+        top_n = rng.randint(1, len(scope))
+        expected = query_api.search(builder.build(dataset, scope), query, top_n=top_n)
+        actual = query_api.search(prepared.kd_index, query, top_n=top_n, scope=scope)
+        assert actual == expected
+
+
+def test_ordinal_scoped_kd_search_matches_identity_scope() -> None:
+    dataset = _random_dataset()
+    prepared = prepare_dataset(dataset)
+    query_api = create_kd_tree_query()
+    rng = random.Random(8)
+    for _ in range(20):
+        ordinals = rng.sample(range(len(dataset.records)), rng.randint(1, len(dataset.records)))
+        scope = {RecordIdentity(str(dataset.records[o].strategy_ref)) for o in ordinals}
+        query = KDTreeQueryInput(
+            cue=grid_point(rng), target=grid_point(rng), second=grid_point(rng)
+        )
+        top_n = rng.randint(1, len(scope))
+        by_ordinal = query_api.search(
+            prepared.kd_index, query, top_n=top_n, scope_ordinals=ordinals
+        )
+        assert by_ordinal == query_api.search(prepared.kd_index, query, top_n=top_n, scope=scope)
+        for item in by_ordinal:
+            assert item.record_ordinals == prepared.record_positions[item.candidate_id]
+
+
+def test_membership_prepared_matches_plain_dataset() -> None:
+    dataset = _random_dataset()
+    prepared = prepare_dataset(dataset)
+    engine = create_membership_engine()
+    for query in _member_queries(dataset):
+        assert engine.evaluate(prepared, query) == engine.evaluate(dataset, query)
+
+
+def test_orchestrator_reuses_prepared_indexes() -> None:
+    dataset = _random_dataset()
+    prepared = prepare_dataset(dataset)
+    spatial = _CountingSpatial()
+    kd_builder = _CountingKDBuilder()
+    orchestrator = SearchEnhancementOrchestrator(
+        membership=create_membership_engine(),
+        spatial_builder=spatial,
+        kd_builder=kd_builder,
+    )
+    baseline = SearchEnhancementOrchestrator(membership=create_membership_engine())
+    for query in _member_queries(dataset):
+        assert orchestrator.run(prepared, query) == baseline.run(dataset, query)
+    assert spatial.builds == 0
+    assert kd_builder.builds == 0
+
+
+def test_runtime_cache_prepares_once_per_dataset_identity() -> None:
+    dataset = _random_dataset()
+    before = copy.deepcopy(dataset)
+    repo = create_memory_repository(
+        {record.strategy_ref: Strategy(strategy_ref=record.strategy_ref) for record in dataset.records}
+    )
+    cache = create_prepared_dataset_cache()
+    cached_runtime = create_runtime(repository=repo, prepared_cache=cache)
+    plain_runtime = create_runtime(repository=repo)
+
+    for query in _member_queries(dataset):
+        assert cached_runtime.execute(dataset, query) == plain_runtime.execute(dataset, query)
+
+    assert len(cache) == 1
+    assert cache.peek(DatasetIdentity("ds-prep")).dataset is dataset
+    assert dataset == before
+
+
+def test_bitmap_postings_cache_matches_plain_runtime() -> None:
+    dataset = _random_dataset()
+    repo = create_memory_repository(
+        {record.strategy_ref: Strategy(strategy_ref=record.strategy_ref) for record in dataset.records}
+    )
+    cache = create_prepared_dataset_cache(spatial_postings=SPATIAL_POSTINGS_BITMAP)
+    cached_runtime = create_runtime(repository=repo, prepared_cache=cache)
+    plain_runtime = create_runtime(repository=repo)
+
+    for query in _member_queries(dataset):
+        assert cached_runtime.execute(dataset, query) == plain_runtime.execute(dataset, query)
+    prepared = cache.peek(DatasetIdentity("ds-prep"))
+    assert prepared.spatial_index.postings == SPATIAL_POSTINGS_BITMAP
+
+
+def test_cache_reuses_last_dataset_without_identity(monkeypatch: pytest.MonkeyPatch) -> None:
+    prepared_for: list[PublishedDataset] = []
+    original_prepare = DefaultDatasetPreparer.prepare
+
+    def counting_prepare(self, dataset):
+        prepared_for.append(dataset)
+        return original_prepare(self, dataset)
+
+    monkeypatch.setattr(DefaultDatasetPreparer, "prepare", counting_prepare)
+    dataset = PublishedDataset(records=_random_dataset().records)
+    repo = create_memory_repository(
+        {record.strategy_ref: Strategy(strategy_ref=record.strategy_ref) for record in dataset.records}
+    )
+    cache = PreparedDatasetCache()
+    runtime = create_runtime(repository=repo, prepared_cache=cache)
+    for query in _member_queries(dataset):
+        runtime.execute(dataset, query)
+
+    assert prepared_for == [dataset]
+    assert cache.get(dataset).dataset is dataset
+    assert len(cache) == 0
+
+    other = PublishedDataset(records=_random_dataset(seed=8).records)
+    assert cache.get(other).dataset is other
+    assert prepared_for == [dataset, other]
+
+
+def test_cache_rebuilds_when_identity_is_reused_for_other_records() -> None:
+    first = _random_dataset(seed=7)
+    second = _random_dataset(seed=8)
+    repo = create_memory_repository(
+        {record.strategy_ref: Strategy(strategy_ref=record.strategy_ref) for record in second.records}
+    )
+    cache = PreparedDatasetCache()
+    cached_runtime = create_runtime(repository=repo, prepared_cache=cache)
+    plain_runtime = create_runtime(repository=repo)
+    assert first.dataset_identity == second.dataset_identity
+
+    cached = cache.get(first)
+    rebuilt = cache.get(second)
+    assert rebuilt is not cached
+    assert rebuilt.dataset is second
+    for query in _member_queries(second):
+        assert cached_runtime.execute(second, query) == plain_runtime.execute(second, query)
+    assert cache.get(second) is rebuilt
+
+
+def test_cache_reuses_indexes_for_equal_records_under_same_identity(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = PreparedDatasetCache()
+    dataset = _random_dataset()
+    cached = cache.get(dataset)
+
+    def failing_prepare(self, dataset):
+        raise AssertionError("equal records must reuse the cached indexes")
+
+    monkeypatch.setattr(DefaultDatasetPreparer, "prepare", failing_prepare)
+    twin = copy.deepcopy(dataset)
+    served = cache.get(twin)
+    assert served.dataset is twin
+    assert served.spatial_index is cached.spatial_index
+    assert served.kd_index is cached.kd_index
+    assert cache.get(twin) is served
+
+
+def test_cache_invalidate_rebuilds() -> None:
+    cache = PreparedDatasetCache()
+    dataset = _random_dataset()
+    first = cache.get(dataset)
+    assert cache.get(dataset) is first
+    cache.invalidate(DatasetIdentity("ds-prep"))
+    assert cache.get(dataset) is not first
+
+
+def _record(ref: str, rng: random.Random) -> EnvelopeRecord:
+    return EnvelopeRecord(
+        strategy_ref=StrategyRef(ref),
+        target=grid_point(rng),
+        cue_set=[grid_point(rng) for _ in range(rng.randint(1, 3))],
+        second_set=[grid_point(rng)],
+    )
+
+
+def _verified(dataset: PublishedDataset) -> VerifiedDataset:
+    ordinals: dict[RecordIdentity, list[int]] = {}
+    for index, record in enumerate(dataset.records):
+        ordinals.setdefault(RecordIdentity(str(record.strategy_ref)), []).append(index)
+    return VerifiedDataset(
+        records=dataset.records,
+        dataset_identity=dataset.dataset_identity,
+        record_ordinals={key: tuple(items) for key, items in ordinals.items()},
+    )
+
+
+def test_edit_dataset_swaps_last_record_into_removed_slot() -> None:
+    rng = random.Random(2)
+    records = [_record(ref, rng) for ref in ("a", "b", "c", "b", "d")]
+    dataset = PublishedDataset(records=list(records), dataset_identity=DatasetIdentity("ds-edit"))
+    replacement = _record("c", rng)
+    added = _record("e", rng)
+
+    edit = edit_dataset(dataset, remove=[StrategyRef("b")], replace=[replacement], add=[added])
+    # b@3 <- d (then popped), b@1 <- d@3; c@2 replaced in place; e appended.
+    assert edit.dataset.records == [records[0], records[4], replacement, added]
+    assert edit.previous == {1: records[1], 2: records[2], 3: records[3], 4: records[4]}
+    assert dict(edit.record_positions) == {"a": (0,), "d": (1,), "c": (2,), "e": (3,)}
+    assert edit.dataset.dataset_identity == DatasetIdentity("ds-edit")
+    assert dataset.records == records
+
+    verified = edit_dataset(_verified(dataset), remove=[StrategyRef("b")], replace=[replacement], add=[added])
+    assert isinstance(verified.dataset, VerifiedDataset)
+    assert verified.dataset.record_identities == ("a", "d", "c", "e")
+    assert dict(verified.dataset.record_ordinals) == dict(edit.record_positions)
+
+    with pytest.raises(InvalidPreparedDataset):
+        edit_dataset(dataset, remove=[StrategyRef("missing")])
+    with pytest.raises(InvalidPreparedDataset):
+        edit_dataset(dataset, add=["not a record"])  # type: ignore[list-item]
+
+
+def test_update_order_matches_republished_edit_not_source_order() -> None:
+    shape = _record("x", random.Random(5))
+    records = [
+        EnvelopeRecord(
+            strategy_ref=StrategyRef(ref),
+            target=shape.target,
+            cue_set=list(shape.cue_set),
+            second_set=list(shape.second_set),
+        )
+        for ref in ("a", "b", "c", "d")
+    ]
+    dataset = PublishedDataset(records=records, dataset_identity=DatasetIdentity("ds-order"))
+    preparer = create_dataset_preparer()
+    updated = preparer.update(preparer.prepare(dataset), remove=[StrategyRef("a")])
+    # d moved into a's ordinal.
+    assert [str(record.strategy_ref) for record in updated.records] == ["d", "b", "c"]
+
+    def package(edited: list[EnvelopeRecord]) -> PublishedDataset:
+        return create_package_loader().load(
+            {
+                "packageIdentity": "pkg-order",
+                "dataset": published_dataset_to_json(edited),
+            }
+        )
+
+    query = MembershipQuery(cue=shape.cue_set[0], target=shape.target, second=shape.second_set[0])
+    engine = create_membership_engine()
+
+    def refs(target: PublishedDataset | PreparedDataset) -> list[str]:
+        return [str(candidate.strategy_ref) for candidate in engine.evaluate(target, query)]
+
+    assert refs(updated) == refs(package(list(updated.records))) == ["d", "b", "c"]
+    # Source order minus the removed record: same candidates, other order.
+    assert refs(package(records[1:])) == ["b", "c", "d"]
+
+
+@pytest.mark.parametrize("verified", [False, True])
+def test_update_answers_like_a_fresh_prepare(verified: bool) -> None:
+    rng = random.Random(21)
+    dataset = _random_dataset()
+    if verified:
+        dataset = _verified(dataset)
+    preparer = create_dataset_preparer(membership_index=True, membership_tolerance=1.0)
+    prepared = preparer.prepare(dataset)
+    assert prepared.membership_index is not None
+    refs = sorted({str(record.strategy_ref) for record in dataset.records})
+
+    updated = preparer.update(
+        prepared,
+        remove=[StrategyRef(refs[0]), StrategyRef(refs[5])],
+        replace=[_record(refs[9], rng)],
+        add=[_record("prep.new", rng), _record(refs[12], rng)],
+    )
+    assert prepared.dataset is dataset
+    fresh = preparer.prepare(
+        _verified(updated.dataset)
+        if verified
+        else PublishedDataset(records=list(updated.records), dataset_identity=DatasetIdentity("ds-prep"))
+    )
+    assert updated.spatial_index == fresh.spatial_index
+    assert updated.kd_index.candidates == fresh.kd_index.candidates
+    assert updated.membership_index == fresh.membership_index
+    assert updated.tolerance_index == fresh.tolerance_index
+    assert dict(updated.record_positions) == dict(fresh.record_positions)
+
+    repo = create_memory_repository(
+        {record.strategy_ref: Strategy(strategy_ref=record.strategy_ref) for record in updated.records}
+    )
+    runtime = create_runtime(repository=repo)
+    for query in _member_queries(updated.dataset):
+        assert runtime.execute(updated, query) == runtime.execute(fresh, query)
+
+
+def test_cache_update_hot_patches_entry() -> None:
+    rng = random.Random(5)
+    dataset = _random_dataset()
+    cache = create_prepared_dataset_cache()
+    first = cache.get(dataset)
+    target = dataset.records[4]
+    replacement = _record(str(target.strategy_ref), rng)
+
+    updated = cache.update(DatasetIdentity("ds-prep"), replace=[replacement])
+    assert cache.peek(DatasetIdentity("ds-prep")) is updated
+    assert updated is not first
+    assert replacement in updated.records
+    # Later lookups by the same identity are served from the patched entry.
+    assert cache.get(dataset) is updated
+    with pytest.raises(InvalidPreparedDataset):
+        cache.update(DatasetIdentity("unknown"), add=[replacement])
+
+
+@pytest.mark.parametrize(
+    "preparer",
+    [
+        create_dataset_preparer(membership_index=True, membership_tolerance=2.0),
+        create_dataset_preparer(kd_encoding="members"),
+        create_dataset_preparer(kd_axis_weights=table_axis_weights(target=4.0)),
+        DefaultDatasetPreparer(
+            spatial_builder=create_spatial_index_builder(
+                postings=SPATIAL_POSTINGS_BITMAP, grid=SPATIAL_GRID_ADAPTIVE, leaf_capacity=4
+            ),
+            kd_builder=create_kd_tree_builder(layout="linked"),
+        ),
+    ],
+)
+@pytest.mark.parametrize("verified", [False, True])
+def test_index_sidecar_roundtrip(preparer: DefaultDatasetPreparer, verified: bool) -> None:
+    dataset = _random_dataset(n=120)
+    if verified:
+        dataset = _verified(dataset)
+    prepared = preparer.prepare(dataset)
+
+    decoded = decode_index_sidecar(bytearray(encode_index_sidecar(prepared)), dataset)
+    assert decoded == prepared
+    assert decoded.dataset is dataset
+
+    repo = create_memory_repository(
+        {record.strategy_ref: Strategy(strategy_ref=record.strategy_ref) for record in dataset.records}
+    )
+    runtime = create_runtime(repository=repo)
+    for query in _member_queries(dataset)[:10]:
+        assert runtime.execute(decoded, query) == runtime.execute(prepared, query)
+
+
+def test_index_sidecar_rejects_other_datasets() -> None:
+    dataset = _random_dataset(n=40)
+    sidecar = encode_index_sidecar(prepare_dataset(dataset))
+
+    renamed = PublishedDataset(records=dataset.records, dataset_identity=DatasetIdentity("other"))
+    reordered = PublishedDataset(
+        records=list(reversed(dataset.records)), dataset_identity=dataset.dataset_identity
+    )
+    shorter = PublishedDataset(records=dataset.records[:-1], dataset_identity=dataset.dataset_identity)
+    for other in (renamed, reordered, shorter):
+        with pytest.raises(StaleIndexSidecar):
+            decode_index_sidecar(sidecar, other)
+
+    corrupt = bytearray(sidecar)
+    corrupt[-1] ^= 0xFF
+    with pytest.raises(StaleIndexSidecar):
+        decode_index_sidecar(corrupt, dataset)
+    with pytest.raises(StaleIndexSidecar):
+        decode_index_sidecar(sidecar[:10], dataset)
+
+
+def test_index_sidecar_rejects_changed_record_contents() -> None:
+    dataset = _random_dataset(n=40)
+    sidecar = encode_index_sidecar(prepare_dataset(dataset))
+
+    # Same identities and order; one cue point moved.
+    records = list(dataset.records)
+    first = records[0]
+    moved = Point(x=first.cue_set[0].x + 1.5, y=first.cue_set[0].y)
+    records[0] = EnvelopeRecord(
+        strategy_ref=first.strategy_ref,
+        target=first.target,
+        cue_set=[moved, *first.cue_set[1:]],
+        second_set=first.second_set,
+    )
+    edited = PublishedDataset(records=records, dataset_identity=dataset.dataset_identity)
+    with pytest.raises(StaleIndexSidecar, match="record contents"):
+        decode_index_sidecar(sidecar, edited)
+
+    # Equal contents match whatever the dataset representation.
+    columnar = ColumnarDataset.from_records(dataset.records, dataset.dataset_identity)
+    assert decode_index_sidecar(sidecar, columnar).dataset is columnar
+
+
+def test_index_sidecar_rejects_other_preparer_options() -> None:
+    dataset = _random_dataset(n=40)
+    preparer = create_dataset_preparer()
+    sidecar = encode_index_sidecar(preparer.prepare(dataset), preparer_options=preparer.options)
+
+    assert decode_index_sidecar(sidecar, dataset, preparer_options=preparer.options)
+    assert decode_index_sidecar(
+        sidecar, dataset, preparer_options=create_dataset_preparer().options
+    )
+    for other in (
+        create_dataset_preparer(membership_tolerance=0.5),
+        create_dataset_preparer(membership_index=True),
+        create_dataset_preparer(spatial_grid=SPATIAL_GRID_ADAPTIVE),
+        create_dataset_preparer(spatial_postings=SPATIAL_POSTINGS_BITMAP),
+        create_dataset_preparer(kd_axis_weights=table_axis_weights()),
+    ):
+        with pytest.raises(StaleIndexSidecar, match="preparer options"):
+            decode_index_sidecar(sidecar, dataset, preparer_options=other.options)
+    # Sidecars written without options only serve readers that do not ask.
+    bare = encode_index_sidecar(preparer.prepare(dataset))
+    assert decode_index_sidecar(bare, dataset)
+    with pytest.raises(StaleIndexSidecar):
+        decode_index_sidecar(bare, dataset, preparer_options=preparer.options)
+
+
+def test_cache_put_seeds_entry() -> None:
+    dataset = _random_dataset(n=30)
+    cache = create_prepared_dataset_cache()
+    prepared = prepare_dataset(dataset)
+    assert cache.put(prepared) is prepared
+    assert cache.get(dataset) is prepared
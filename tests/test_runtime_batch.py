@@ -0,0 +1,224 @@
+"""
+Integration tests — batch Search Runtime (execute_many / run_many / evaluate_many).
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from grid_corpus import grid_dataset  # noqa: E402
+from membership import MembershipQuery, create_membership_engine  # noqa: E402
+from models import Point, PublishedDataset  # noqa: E402
+from resolve import Strategy, create_memory_repository, create_resolve_engine  # noqa: E402
+from runtime import RuntimeConfigurationError, RuntimeExecutionError, create_runtime  # noqa: E402
+from search.prepared import DefaultDatasetPreparer, create_prepared_dataset_cache  # noqa: E402
+from search.membership.adapter import ExactMatchPrefilterAdapter  # noqa: E402
+from search.membership_index.builder import DefaultMembershipIndexBuilder  # noqa: E402
+from search.runtime import create_search_enhancement_orchestrator  # noqa: E402
+from search.spatial_index import SPATIAL_GRID_ADAPTIVE, create_spatial_index_builder  # noqa: E402
+
+
+def _dataset(n: int = 40, seed: int = 11) -> PublishedDataset:
+    dataset = grid_dataset(n, seed, prefix="batch", dataset_identity="ds-batch", ref_count=30)
+    records = dataset.records
+    # Shared positions so several records answer the same query.
+    for record in records[30:]:
+        source = records[int(str(record.strategy_ref).rsplit("s", 1)[1])]
+        record.target = source.target
+        record.cue_set = list(source.cue_set)
+        record.second_set = list(source.second_set)
+    return dataset
+
+
+def _queries(dataset: PublishedDataset) -> list[MembershipQuery]:
+    queries = [
+        MembershipQuery(cue=r.cue_set[0], target=r.target, second=r.second_set[-1])
+        for r in dataset.records
+    ]
+    miss = MembershipQuery(cue=Point(0.0, 0.0), target=Point(79.5, 39.0), second=Point(1.5, 1.5))
+    # Duplicates, a miss, and interleaved cells.
+    return queries[::2] + [miss] + queries[::3] + [queries[0], miss]
+
+
+def _repo(dataset: PublishedDataset):
+    return create_memory_repository(
+        {r.strategy_ref: Strategy(strategy_ref=r.strategy_ref) for r in dataset.records}
+    )
+
+
+class _CountingResolve:
+    def __init__(self, inner) -> None:
+        self._inner = inner
+        self.calls = 0
+
+    def resolve(self, candidate):
+        self.calls += 1
+        return self._inner.resolve(candidate)
+
+
+def test_execute_many_matches_single_query_path() -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    runtime = create_runtime(repository=_repo(dataset))
+    batch = runtime.execute_many(dataset, queries)
+    assert len(batch) == len(queries)
+    assert list(batch) == [runtime.execute(dataset, query) for query in queries]
+    assert any(len(result.candidates) > 1 for result in batch)
+    assert batch[len(queries) - 1].candidate is None
+
+
+def test_execute_many_with_prepared_cache() -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    runtime = create_runtime(
+        repository=_repo(dataset),
+        prepared_cache=create_prepared_dataset_cache(),
+    )
+    plain = create_runtime(repository=_repo(dataset))
+    assert runtime.execute_many(dataset, queries) == tuple(
+        plain.execute(dataset, query) for query in queries
+    )
+
+
+def test_execute_many_deduplicates_resolve_lookups() -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    resolve = _CountingResolve(create_resolve_engine(_repo(dataset)))
+    results = create_runtime(resolve=resolve).execute_many(dataset, queries)
+    distinct = {c.strategy_ref for result in results for c in result.candidates}
+    assert resolve.calls == len(distinct)
+
+
+def test_run_many_matches_run() -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    orchestrator = create_search_enhancement_orchestrator()
+    assert orchestrator.run_many(dataset, queries) == tuple(
+        orchestrator.run(dataset, query) for query in queries
+    )
+
+
+def test_run_many_prepares_a_dataset_once_across_batches(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    prepared = []
+    prepare = DefaultDatasetPreparer.prepare
+
+    def counting_prepare(self, target):
+        prepared.append(target)
+        return prepare(self, target)
+
+    monkeypatch.setattr(DefaultDatasetPreparer, "prepare", counting_prepare)
+    orchestrator = create_search_enhancement_orchestrator()
+    first = orchestrator.run_many(dataset, queries[:5])
+    assert orchestrator.run_many(dataset, queries[:5]) == first
+    orchestrator.run_many(dataset, queries[5:])
+    assert prepared == [dataset]
+    other = _dataset(seed=12)
+    orchestrator.run_many(other, queries[:5])
+    assert prepared == [dataset, other]
+
+
+def test_run_many_builds_membership_index_only_for_adapters_that_read_it(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    built = []
+    prepare = DefaultDatasetPreparer.prepare
+
+    def recording_prepare(self, target):
+        result = prepare(self, target)
+        built.append(result.membership_index is not None)
+        return result
+
+    monkeypatch.setattr(DefaultDatasetPreparer, "prepare", recording_prepare)
+    create_search_enhancement_orchestrator().run_many(dataset, queries)
+    exact = create_membership_engine(prefilter_adapter=ExactMatchPrefilterAdapter())
+    assert exact.prepared_indexes == {"membership_index", "membership_filter"}
+    batch = create_search_enhancement_orchestrator(membership=exact).run_many(dataset, queries)
+    assert built == [False, True]
+    assert batch == create_search_enhancement_orchestrator().run_many(dataset, queries)
+
+
+def test_tolerance_index_is_built_once_per_dataset(monkeypatch: pytest.MonkeyPatch) -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    builds = []
+    build = DefaultMembershipIndexBuilder.build
+
+    def counting_build(self, target, *, epsilon=0.0):
+        if epsilon > 0:
+            builds.append(target)
+        return build(self, target, epsilon=epsilon)
+
+    monkeypatch.setattr(DefaultMembershipIndexBuilder, "build", counting_build)
+    engine = create_membership_engine(tolerance=0.75)
+    assert engine.prepared_indexes == {"membership_tolerance"}
+    assert engine.membership_tolerance == 0.75
+
+    orchestrator = create_search_enhancement_orchestrator(membership=engine)
+    batch = orchestrator.run_many(dataset, queries)
+    assert orchestrator.run_many(dataset, queries) == batch
+    assert builds == [dataset]
+
+    builds.clear()
+    runtime = create_runtime(
+        repository=_repo(dataset),
+        membership=create_membership_engine(tolerance=0.75),
+        prepared_cache=create_prepared_dataset_cache(),
+    )
+    results = runtime.execute_many(dataset, queries)
+    assert results == runtime.execute_many(dataset, queries)
+    assert [runtime.execute(dataset, query) for query in queries] == list(results)
+    assert builds == [dataset]
+
+
+def test_run_many_matches_run_on_adaptive_grid() -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    preparer = DefaultDatasetPreparer(
+        spatial_builder=create_spatial_index_builder(grid=SPATIAL_GRID_ADAPTIVE, leaf_capacity=2)
+    )
+    prepared = preparer.prepare(dataset)
+    assert prepared.spatial_index.cue_splits
+    orchestrator = create_search_enhancement_orchestrator()
+    expected = tuple(orchestrator.run(dataset, query) for query in queries)
+    assert orchestrator.run_many(prepared, queries) == expected
+
+
+def test_evaluate_many_matches_evaluate() -> None:
+    dataset = _dataset()
+    queries = _queries(dataset)
+    engine = create_membership_engine()
+    assert engine.evaluate_many(dataset, queries) == [
+        engine.evaluate(dataset, query) for query in queries
+    ]
+
+
+def test_execute_many_empty_and_invalid_inputs() -> None:
+    dataset = _dataset()
+    runtime = create_runtime(repository=_repo(dataset))
+    assert runtime.execute_many(dataset, []) == ()
+    with pytest.raises(RuntimeConfigurationError):
+        runtime.execute_many(None, [])  # type: ignore[arg-type]
+    with pytest.raises(RuntimeConfigurationError):
+        runtime.execute_many(dataset, None)  # type: ignore[arg-type]
+    with pytest.raises(RuntimeConfigurationError):
+        runtime.execute_many(dataset, ["bad"])  # type: ignore[list-item]
+
+
+def test_execute_many_resolve_failure_is_wrapped() -> None:
+    dataset = _dataset()
+    runtime = create_runtime(repository=create_memory_repository({}))
+    with pytest.raises(RuntimeExecutionError):
+        runtime.execute_many(dataset, _queries(dataset))
@@ -0,0 +1,177 @@
+"""
+Unit tests — synthetic-corpus Search benchmark suite (search.benchmark).
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from search.benchmark import (  # noqa: E402
+    InvalidBenchmarkConfig,
+    LOAD_VARIANTS,
+    dict_backed_twin,
+    generate_queries,
+    generate_synthetic_dataset,
+    report_to_dict,
+    run_benchmark,
+    run_load_size,
+    run_model_footprint,
+    write_report,
+    write_synthetic_package,
+)
+from loader import create_package_loader  # noqa: E402
+from search.benchmark.__main__ import main  # noqa: E402
+from models import MembershipFlags, Point  # noqa: E402
+from search.runtime import PIPELINE_STAGES  # noqa: E402
+from search.spatial_index.contract import GRID_HEIGHT, GRID_WIDTH  # noqa: E402
+
+
+def test_synthetic_dataset_is_deterministic_and_on_table() -> None:
+    first = generate_synthetic_dataset(200, seed=3)
+    second = generate_synthetic_dataset(200, seed=3)
+    other = generate_synthetic_dataset(200, seed=4)
+
+    assert first.records == second.records
+    assert first.records != other.records
+    assert len({str(r.strategy_ref) for r in first.records}) == 200
+    for record in first.records:
+        assert 2 <= len(record.cue_set) <= 12
+        assert 1 <= len(record.second_set) <= 6
+        for point in [record.target, *record.cue_set, *record.second_set]:
+            assert 0.0 <= point.x <= GRID_WIDTH
+            assert 0.0 <= point.y <= GRID_HEIGHT
+
+
+def test_generated_queries_respect_hit_ratio() -> None:
+    dataset = generate_synthetic_dataset(50, seed=1)
+    hits = generate_queries(dataset, 40, seed=1, hit_ratio=1.0)
+    targets = {(r.target.x, r.target.y) for r in dataset.records}
+
+    assert all((q.target.x, q.target.y) in targets for q in hits)
+    assert generate_queries(dataset, 40, seed=1) == generate_queries(dataset, 40, seed=1)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"size": 0}, {"size": 10, "count": 0}, {"size": 10, "hit_ratio": 1.5}],
+)
+def test_invalid_config_is_rejected(kwargs: dict) -> None:
+    with pytest.raises(InvalidBenchmarkConfig):
+        dataset = generate_synthetic_dataset(kwargs["size"])
+        generate_queries(dataset, kwargs.get("count", 5), hit_ratio=kwargs.get("hit_ratio", 0.5))
+
+
+def test_run_benchmark_reports_build_latency_and_stages() -> None:
+    report = run_benchmark(
+        (100, 300), query_count=30, warmup=2, hit_ratio=1.0, load_sizes=()
+    )
+
+    assert [item.record_count for item in report.sizes] == [100, 300]
+    for item in report.sizes:
+        assert item.query_count == 30
+        assert item.hit_count == 30
+        assert item.build_ms > 0.0
+        assert item.execute.count == 30
+        assert item.execute.p50_ms <= item.execute.p99_ms
+        assert item.queries_per_sec > 0.0
+        assert set(item.stages) == set(PIPELINE_STAGES)
+        assert all(stats.count > 0 for stats in item.stages.values())
+        assert set(item.postings) == {
+            "fixed/set", "fixed/bitmap", "adaptive/set", "adaptive/bitmap"
+        }
+        # Postings representations return the same candidates per grid.
+        for grid in ("fixed", "adaptive"):
+            totals = {item.postings[f"{grid}/{p}"].query.output_total for p in ("set", "bitmap")}
+            assert len(totals) == 1
+        assert all(p.memory_bytes > 0 and p.query.count == 30 for p in item.postings.values())
+
+
+def test_report_json_round_trip(tmp_path: Path) -> None:
+    report = run_benchmark((50,), query_count=5, warmup=0, load_sizes=(60,))
+    path = write_report(report, tmp_path / "out" / "bench.json")
+
+    loaded = json.loads(path.read_text(encoding="utf-8"))
+    assert loaded == json.loads(json.dumps(report_to_dict(report)))
+    assert loaded["format"] == "search-benchmark/4"
+    size = loaded["sizes"][0]
+    assert size["recordCount"] == 50
+    assert {"p50Ms", "p99Ms"} <= set(size["execute"])
+    assert "membership" in size["stages"]
+    assert {"memoryBytes", "buildMs", "cellCount", "query"} <= set(
+        size["spatialIndex"]["adaptive/bitmap"]
+    )
+    assert {"model", "instanceBytes", "dictInstanceBytes", "constructsPerSec"} <= set(
+        loaded["models"][0]
+    )
+    assert loaded["loads"][0]["recordCount"] == 60
+    assert set(loaded["loads"][0]["mbPerSec"]) == set(LOAD_VARIANTS)
+
+
+def test_cli_writes_report(tmp_path: Path) -> None:
+    out = tmp_path / "bench.json"
+    assert main(
+        ["--sizes", "40", "--queries", "4", "--warmup", "0", "--load-sizes", "--out", str(out)]
+    ) == 0
+    loaded = json.loads(out.read_text(encoding="utf-8"))
+    assert loaded["sizes"][0]["queryCount"] == 4
+    assert loaded["loads"] == []
+
+
+def test_load_benchmark_reports_throughput_per_decode_path(tmp_path: Path) -> None:
+    path = write_synthetic_package(200, tmp_path / "package.json", seed=2)
+    dataset = generate_synthetic_dataset(200, seed=2)
+    for options in LOAD_VARIANTS.values():
+        assert create_package_loader(**options).load_path(path).records == dataset.records
+
+    result = run_load_size(200, seed=2)
+    assert result.record_count == 200
+    assert result.package_bytes == path.stat().st_size
+    assert set(result.load_ms) == set(result.mb_per_sec) == set(LOAD_VARIANTS)
+    assert all(value > 0.0 for value in result.mb_per_sec.values())
+    with pytest.raises(InvalidBenchmarkConfig):
+        run_load_size(0)
+
+
+def test_slotted_models_are_smaller_than_dict_backed_twins() -> None:
+    footprints = run_model_footprint(2_000)
+    assert [item.model for item in footprints] == [
+        "Point",
+        "EnvelopeRecord",
+        "MembershipFlags",
+        "MembershipCandidate",
+        "RankedCandidate",
+        "RefinedCandidate",
+        "GeometryEvaluatedCandidate",
+    ]
+    for item in footprints:
+        assert 0 < item.instance_bytes < item.dict_instance_bytes
+        assert item.constructs_per_sec > 0 and item.dict_constructs_per_sec > 0
+    with pytest.raises(InvalidBenchmarkConfig):
+        run_model_footprint(0)
+
+
+def test_slotted_models_keep_dataclass_semantics() -> None:
+    point = Point(x=1.0, y=2.0)
+    twin = dict_backed_twin(Point)(x=1.0, y=2.0)
+    assert not hasattr(point, "__dict__") and hasattr(twin, "__dict__")
+    assert point == Point(x=1.0, y=2.0) and point != Point(x=1.0, y=3.0)
+    assert copy.deepcopy(point) == point
+    assert pickle.loads(pickle.dumps(point)) == point
+    point.x = 4.0
+    assert dataclasses.replace(point, y=5.0) == Point(x=4.0, y=5.0)
+    with pytest.raises(AttributeError):
+        point.z = 1.0  # type: ignore[attr-defined]
+    flags = MembershipFlags(target_match=True, cue_membership=True, second_membership=False)
+    assert flags.match_distance is None
+    assert dataclasses.asdict(flags)["second_membership"] is False
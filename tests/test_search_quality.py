@@ -0,0 +1,133 @@
+"""
+Unit tests — approximate KDTree search recall / latency evaluation (search.quality).
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models import (  # noqa: E402
+    EnvelopeRecord,
+    Point,
+    PublishedDataset,
+    RecordIdentity,
+    StrategyRef,
+)
+from search.benchmark import generate_queries, generate_synthetic_dataset  # noqa: E402
+from search.kd_tree import KDTreeQueryInput, create_kd_tree_builder  # noqa: E402
+from search.quality import (  # noqa: E402
+    InvalidQualityConfig,
+    approximate_report_to_dict,
+    evaluate_approximate_recall,
+    run_approximate_recall,
+)
+from search.quality.__main__ import main  # noqa: E402
+
+
+def _index_and_queries(size: int = 400, count: int = 30):
+    dataset = generate_synthetic_dataset(size, seed=1)
+    ids = [RecordIdentity(str(record.strategy_ref)) for record in dataset.records]
+    index = create_kd_tree_builder().build(dataset, ids)
+    queries = [
+        KDTreeQueryInput(cue=query.cue, target=query.target, second=query.second)
+        for query in generate_queries(dataset, count, seed=1)
+    ]
+    return index, queries
+
+
+def test_exact_setting_has_full_recall_and_budgets_trade_recall_for_visits() -> None:
+    index, queries = _index_and_queries()
+    report = evaluate_approximate_recall(
+        index, queries, top_n=5, epsilons=(0.0, 1.0), max_visits=(None, 16)
+    )
+    assert report.record_count == 400 and report.query_count == 30 and report.top_n == 5
+    assert report.exact_latency.count == 30
+    points = {(point.epsilon, point.max_visits): point for point in report.points}
+    assert list(points) == [(0.0, None), (0.0, 16), (1.0, None), (1.0, 16)]
+
+    exact = points[(0.0, None)]
+    assert exact.recall == 1.0 and exact.exact_ratio == 1.0 and exact.max_distance_ratio == 1.0
+    assert exact.mean_visited == report.exact_mean_visited
+    loose = points[(1.0, None)]
+    assert 0.0 < loose.recall <= 1.0
+    assert 1.0 <= loose.max_distance_ratio <= 2.0
+    for budget in (points[(0.0, 16)], points[(1.0, 16)]):
+        assert budget.mean_visited <= 16
+        assert budget.exact_ratio == 0.0
+        assert budget.latency.count == 30
+
+
+def test_one_shot_setting_iterables_cover_every_combination() -> None:
+    index, queries = _index_and_queries(size=100, count=5)
+    report = evaluate_approximate_recall(
+        index,
+        queries,
+        top_n=3,
+        epsilons=(epsilon for epsilon in (0.0, 0.5)),
+        max_visits=iter((None, 8)),
+    )
+    assert [(point.epsilon, point.max_visits) for point in report.points] == [
+        (0.0, None),
+        (0.0, 8),
+        (0.5, None),
+        (0.5, 8),
+    ]
+
+
+def test_recall_counts_candidates_tied_at_the_kth_distance() -> None:
+    # Every record sits on the same point: any 5 candidates are a correct top 5.
+    records = [
+        EnvelopeRecord(
+            strategy_ref=StrategyRef(f"tie.s{i:02d}"),
+            target=Point(10.0, 10.0),
+            cue_set=[Point(5.0, 5.0)],
+            second_set=[Point(20.0, 20.0)],
+        )
+        for i in range(40)
+    ]
+    dataset = PublishedDataset(records=records)
+    ids = [RecordIdentity(str(record.strategy_ref)) for record in records]
+    index = create_kd_tree_builder().build(dataset, ids)
+    query = KDTreeQueryInput(cue=Point(6.0, 5.0), target=Point(10.0, 11.0), second=Point(20.0, 20.0))
+    report = evaluate_approximate_recall(
+        index, [query], top_n=5, epsilons=(1.0,), max_visits=(None, 2)
+    )
+    loose, starved = report.points
+    # Other tied ids than the exact shortlist, still at the k-th distance.
+    assert loose.exact_ratio == 0.0 and loose.recall == 1.0
+    # A budget too small to fill the shortlist still loses recall.
+    assert starved.recall == pytest.approx(2 / 5)
+
+
+def test_report_serializes_and_cli_writes_json(tmp_path: Path) -> None:
+    report = run_approximate_recall(300, query_count=10, epsilons=(0.5,), max_visits=(None, 8))
+    payload = approximate_report_to_dict(report)
+    assert payload["format"] == "search-quality-approximate/1"
+    assert [point["maxVisits"] for point in payload["points"]] == [None, 8]
+    json.dumps(payload, allow_nan=False)
+
+    out = tmp_path / "approximate.json"
+    assert main(["--size", "200", "--queries", "5", "--epsilons", "0", "--max-visits", "none", "4", "--out", str(out)]) == 0
+    written = json.loads(out.read_text(encoding="utf-8"))
+    assert written["recordCount"] == 200
+    assert [(point["epsilon"], point["maxVisits"]) for point in written["points"]] == [(0.0, None), (0.0, 4)]
+
+
+def test_invalid_configs_are_rejected() -> None:
+    index, queries = _index_and_queries(size=50, count=3)
+    with pytest.raises(InvalidQualityConfig):
+        evaluate_approximate_recall(index, [])
+    with pytest.raises(InvalidQualityConfig):
+        evaluate_approximate_recall(index, queries, top_n=0)
+    with pytest.raises(InvalidQualityConfig):
+        evaluate_approximate_recall(index, queries, epsilons=())
+    with pytest.raises(InvalidQualityConfig):
+        run_approximate_recall(0)
@@ -7,6 +7,7 @@ from __future__ import annotations
 import copy
 import importlib
 import inspect
+import random
 import sys
 from pathlib import Path
 
@@ -18,14 +19,22 @@ if str(ROOT) not in sys.path:
 
 from generator.fixtures import make_fixture_corpus, make_fixture_record  # noqa: E402
 from models import EnvelopeRecord, Point, PublishedDataset, StrategyRef  # noqa: E402
+from search.prepared import edit_dataset  # noqa: E402
 from search.spatial_index import (  # noqa: E402
+    SPATIAL_GRID_ADAPTIVE,
+    SPATIAL_GRID_FIXED,
+    SPATIAL_POSTINGS_SET,
+    SPATIAL_POSTINGS_BITMAP,
     InvalidSpatialDataset,
     InvalidSpatialQuery,
+    OrdinalBitmap,
     SpatialCell,
     SpatialIndex,
     SpatialQuery,
     SpatialQueryResult,
+    bitmap_from_ordinals,
     create_spatial_index_builder,
+    intersect_bitmaps,
 )
 
 
@@ -75,6 +84,31 @@ def test_query_miss_returns_empty_tuple() -> None:
     assert result.candidate_ids == ()
 
 
+def test_query_returns_record_ordinals_in_dataset_order() -> None:
+    record = make_fixture_record()
+    other = EnvelopeRecord(
+        strategy_ref=StrategyRef("a.first.by.name"),
+        target=record.target,
+        cue_set=list(record.cue_set),
+        second_set=list(record.second_set),
+    )
+    dataset = _dataset([record, other, record])
+    builder = create_spatial_index_builder()
+    index = builder.build(dataset)
+    assert all(
+        isinstance(ordinal, int)
+        for ordinals in index.target_cells.values()
+        for ordinal in ordinals
+    )
+    result = builder.query(
+        index,
+        SpatialQuery(cue=record.cue_set[0], target=record.target, second=record.second_set[0]),
+    )
+    assert result.candidate_ordinals == (0, 1, 2)
+    # Identities are materialised on access: distinct and sorted.
+    assert result.candidate_ids == tuple(sorted({record.strategy_ref, other.strategy_ref}))
+
+
 def test_spatial_cell_contract_8x4() -> None:
     builder = create_spatial_index_builder()
     index = builder.build(_dataset(make_fixture_corpus()))
@@ -139,8 +173,174 @@ def test_multiple_records_intersection() -> None:
     assert result.candidate_ids == (record_b.strategy_ref,)
 
 
+def test_ordinal_bitmap_and_popcount_across_chunks() -> None:
+    rng = random.Random(4)
+    left = set(rng.sample(range(200_000), 3_000)) | {0, 65_535, 65_536}
+    right = set(rng.sample(range(200_000), 3_000)) | {0, 65_536, 131_071}
+    a, b = bitmap_from_ordinals(left), bitmap_from_ordinals(right)
+
+    assert isinstance(a, OrdinalBitmap)
+    assert a.ordinals() == tuple(sorted(left))
+    assert len(a) == len(left)
+    both = a & b
+    assert both.ordinals() == tuple(sorted(left & right))
+    assert len(both) == len(left & right)
+    assert intersect_bitmaps(a, b, bitmap_from_ordinals([0])).ordinals() == (0,)
+    assert not intersect_bitmaps(a, bitmap_from_ordinals([]))
+    with pytest.raises(ValueError):
+        bitmap_from_ordinals([-1])
+
+
+def test_bitmap_postings_match_frozenset_postings() -> None:
+    rng = random.Random(11)
+
+    def point() -> Point:
+        return Point(x=rng.randrange(0, 54) * 1.5, y=rng.randrange(0, 27) * 1.5)
+
+    records = [
+        EnvelopeRecord(
+            strategy_ref=StrategyRef(f"bitmap.s{i % 150}"),
+            target=point(),
+            cue_set=[point() for _ in range(rng.randint(1, 4))],
+            second_set=[point() for _ in range(rng.randint(1, 4))],
+        )
+        for i in range(200)
+    ]
+    dataset = _dataset(records)
+    plain = create_spatial_index_builder()
+    bitmap = create_spatial_index_builder(postings=SPATIAL_POSTINGS_BITMAP)
+    plain_index = plain.build(dataset)
+    bitmap_index = bitmap.build(dataset)
+    assert bitmap_index.postings == SPATIAL_POSTINGS_BITMAP
+    assert all(isinstance(p, OrdinalBitmap) for p in bitmap_index.cue_cells.values())
+
+    queries = [
+        SpatialQuery(cue=r.cue_set[-1], target=r.target, second=r.second_set[0])
+        for r in records[::7]
+    ] + [SpatialQuery(cue=point(), target=point(), second=point()) for _ in range(20)]
+    for query in queries:
+        expected = plain.query(plain_index, query)
+        assert bitmap.query(bitmap_index, query) == expected
+        # Any builder answers either representation.
+        assert plain.query(bitmap_index, query) == expected
+
+
+def test_unknown_postings_rejected() -> None:
+    with pytest.raises(ValueError):
+        create_spatial_index_builder(postings="roaring")
+
+
+def _dense_records(rng: random.Random, count: int) -> list[EnvelopeRecord]:
+    # Targets crowd one 8x4 cell; cue / second spread over the table.
+    def spread() -> Point:
+        return Point(x=rng.randrange(0, 160) * 0.5, y=rng.randrange(0, 80) * 0.5)
+
+    return [
+        EnvelopeRecord(
+            strategy_ref=StrategyRef(f"dense.s{i}"),
+            target=Point(x=rng.randrange(0, 20) * 0.5, y=rng.randrange(0, 20) * 0.5),
+            cue_set=[spread() for _ in range(rng.randint(1, 3))],
+            second_set=[spread() for _ in range(rng.randint(1, 3))],
+        )
+        for i in range(count)
+    ]
+
+
+def test_adaptive_grid_splits_dense_cells() -> None:
+    rng = random.Random(5)
+    records = _dense_records(rng, 300)
+    dataset = _dataset(records)
+    builder = create_spatial_index_builder(grid=SPATIAL_GRID_ADAPTIVE, leaf_capacity=16)
+    index = builder.build(dataset)
+    assert index.grid == SPATIAL_GRID_ADAPTIVE
+    assert SpatialCell(col=0, row=0) in index.target_splits
+    assert SpatialCell(col=0, row=0) not in index.target_cells
+
+    occupancy = builder.occupancy(index)
+    assert occupancy.record_count == 300
+    assert occupancy.target.split_count == len(index.target_splits)
+    assert occupancy.target.max_level >= 1
+    assert occupancy.target.cell_count == len(index.target_cells)
+    assert occupancy.target.max_records >= occupancy.target.p95_records
+    # Every record sits in exactly one target leaf.
+    assert sum(occupancy.target.cells.values()) == 300
+
+    fixed = create_spatial_index_builder()
+    fixed_occupancy = fixed.occupancy(fixed.build(dataset))
+    assert fixed_occupancy.target.split_count == 0
+    assert fixed_occupancy.target.max_records == 300
+    assert occupancy.target.max_records < fixed_occupancy.target.max_records
+
+
+def test_adaptive_grid_candidates_cover_exact_members() -> None:
+    rng = random.Random(9)
+    records = _dense_records(rng, 200)
+    dataset = _dataset(records)
+    fixed = create_spatial_index_builder()
+    fixed_index = fixed.build(dataset)
+    adaptive = create_spatial_index_builder(
+        grid=SPATIAL_GRID_ADAPTIVE, postings=SPATIAL_POSTINGS_BITMAP, leaf_capacity=8
+    )
+    adaptive_index = adaptive.build(dataset)
+
+    for ordinal, record in enumerate(records):
+        query = SpatialQuery(cue=record.cue_set[0], target=record.target, second=record.second_set[-1])
+        narrowed = adaptive.query(adaptive_index, query).candidate_ordinals
+        assert ordinal in narrowed
+        assert set(narrowed) <= set(fixed.query(fixed_index, query).candidate_ordinals)
+
+
+def test_adaptive_max_depth_zero_matches_fixed_grid() -> None:
+    dataset = _dataset(_dense_records(random.Random(3), 80))
+    fixed = create_spatial_index_builder().build(dataset)
+    flat = create_spatial_index_builder(
+        grid=SPATIAL_GRID_ADAPTIVE, leaf_capacity=1, max_depth=0
+    ).build(dataset)
+    assert flat.target_cells == fixed.target_cells
+    assert flat.cue_cells == fixed.cue_cells
+    assert not flat.target_splits
+
+
+@pytest.mark.parametrize("grid", [SPATIAL_GRID_FIXED, SPATIAL_GRID_ADAPTIVE])
+@pytest.mark.parametrize("postings", [SPATIAL_POSTINGS_SET, SPATIAL_POSTINGS_BITMAP])
+def test_update_equals_rebuild(grid: str, postings: str) -> None:
+    rng = random.Random(17)
+    dataset = _dataset(_dense_records(rng, 150))
+    builder = create_spatial_index_builder(grid=grid, postings=postings, leaf_capacity=8)
+    index = builder.build(dataset)
+    fresh = _dense_records(rng, 20)
+    for step in range(6):
+        refs = sorted({str(r.strategy_ref) for r in dataset.records})
+        edit = edit_dataset(
+            dataset,
+            remove=[StrategyRef(refs[step])],
+            replace=[
+                EnvelopeRecord(
+                    strategy_ref=StrategyRef(refs[-1 - step]),
+                    target=fresh[step].target,
+                    cue_set=fresh[step].cue_set,
+                    second_set=fresh[step].second_set,
+                )
+            ],
+            add=fresh[10 + step : 12 + step],
+        )
+        index = builder.update(index, edit.dataset, edit.previous)
+        dataset = edit.dataset
+        assert index == builder.build(dataset)
+
+
+def test_invalid_grid_options_rejected() -> None:
+    with pytest.raises(ValueError):
+        create_spatial_index_builder(grid="kd")
+    with pytest.raises(ValueError):
+        create_spatial_index_builder(grid=SPATIAL_GRID_ADAPTIVE, leaf_capacity=0)
+    with pytest.raises(ValueError):
+        create_spatial_index_builder(grid=SPATIAL_GRID_ADAPTIVE, max_depth=-1)
+
+
 def test_no_forbidden_layer_calls() -> None:
     modules = (
+        "search.spatial_index.bitmap",
         "search.spatial_index.builder",
         "search.spatial_index.cell",
         "search.spatial_index.contract",
@@ -5,6 +5,7 @@ Smoke tests for Validation Layer (Schema contract only).
 from __future__ import annotations
 
 import sys
+import threading
 from pathlib import Path
 
 import pytest
@@ -14,9 +15,15 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import validation.schema_registry as schema_registry_module  # noqa: E402
+import validation.validator as validator_module  # noqa: E402
 from validation import (  # noqa: E402
     ValidationFailed,
+    build_default_registry,
+    get_default_registry,
+    reset_default_registry,
     validate_dataset,
+    validate_envelope_record,
     validate_membership_candidate,
     validate_package,
 )
@@ -90,3 +97,73 @@ def test_membership_candidate_ok() -> None:
     }
     out = validate_membership_candidate(candidate)
     assert out is candidate
+
+
+def _count_compiles(monkeypatch: pytest.MonkeyPatch) -> list:
+    compiled: list = []
+    real = validator_module.Draft202012Validator
+
+    def counting(schema, **kwargs):  # noqa: ANN001, ANN202
+        compiled.append(schema)
+        return real(schema, **kwargs)
+
+    monkeypatch.setattr(validator_module, "Draft202012Validator", counting)
+    return compiled
+
+
+def test_validators_compiled_once_per_registry_and_schema(monkeypatch: pytest.MonkeyPatch) -> None:
+    compiled = _count_compiles(monkeypatch)
+    registry = build_default_registry()
+    record = _valid_dataset()["records"][0]
+    for _ in range(3):
+        validate_dataset(_valid_dataset(), registry=registry)
+        validate_envelope_record(record, registry=registry)
+    assert len(compiled) == 2
+    with pytest.raises(ValidationFailed):
+        validate_envelope_record({**record, "cueSet": []}, registry=registry)
+    assert len(compiled) == 2
+
+    # Another registry compiles its own; re-registering drops the cache.
+    validate_dataset(_valid_dataset(), registry=build_default_registry())
+    assert len(compiled) == 3
+    registry.register("published_dataset", registry.get("published_dataset"))
+    validate_dataset(_valid_dataset(), registry=registry)
+    assert len(compiled) == 4
+
+
+def test_concurrent_first_use_builds_registry_and_validator_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    compiled = _count_compiles(monkeypatch)
+    built: list = []
+    real_build = schema_registry_module.build_default_registry
+
+    def counting_build():  # noqa: ANN202
+        built.append(1)
+        return real_build()
+
+    monkeypatch.setattr(schema_registry_module, "build_default_registry", counting_build)
+    reset_default_registry()
+    barrier = threading.Barrier(8)
+    registries: list = []
+    failures: list = []
+
+    def worker() -> None:
+        barrier.wait()
+        try:
+            registries.append(get_default_registry())
+            validate_dataset(_valid_dataset())
+        except Exception as exc:  # noqa: BLE001
+            failures.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        reset_default_registry()
+    assert not failures
+    assert len(built) == 1 and len(compiled) == 1
+    assert len(registries) == 8 and all(reg is registries[0] for reg in registries)
@@ -0,0 +1,127 @@
+"""
+Unit tests — VerifiedDataset from the Package Loader (records checked once).
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from loader import create_package_loader  # noqa: E402
+from membership import MembershipQuery, create_membership_engine  # noqa: E402
+from models import PublishedDataset, RecordIdentity, VerifiedDataset  # noqa: E402
+from search.kd_tree import KDTreeQueryInput, create_kd_tree_builder, create_kd_tree_query  # noqa: E402
+from search.prepared import prepare_dataset  # noqa: E402
+from search.runtime import create_search_enhancement_orchestrator  # noqa: E402
+from search.spatial_index import create_spatial_index_builder  # noqa: E402
+
+
+def _point(rng: random.Random) -> dict:
+    return {"x": rng.randrange(0, 54) * 1.5, "y": rng.randrange(0, 27) * 1.5}
+
+
+def _package_json(n: int = 80, seed: int = 6) -> dict:
+    rng = random.Random(seed)
+    records = [
+        {
+            "strategyRef": f"ver.s{i % 70}",
+            "target": _point(rng),
+            "cueSet": [_point(rng) for _ in range(rng.randint(1, 3))],
+            "secondSet": [_point(rng) for _ in range(rng.randint(1, 3))],
+        }
+        for i in range(n)
+    ]
+    return {
+        "packageIdentity": "pkg-ver",
+        "datasetIdentity": "ds-ver",
+        "dataset": {"records": records},
+    }
+
+
+def _queries(dataset: PublishedDataset) -> list[MembershipQuery]:
+    queries = [
+        MembershipQuery(cue=r.cue_set[-1], target=r.target, second=r.second_set[0])
+        for r in dataset.records[::4]
+    ]
+    rng = random.Random(2)
+    return queries + [
+        MembershipQuery(cue=r.cue_set[0], target=r.target, second=r.second_set[-1])
+        for r in rng.sample(dataset.records, 5)
+    ]
+
+
+def test_loader_returns_verified_dataset_on_request() -> None:
+    verified = create_package_loader(verified=True).load(_package_json())
+    plain = create_package_loader().load(_package_json())
+    assert isinstance(verified, VerifiedDataset)
+    assert isinstance(verified, PublishedDataset)
+    assert type(plain) is PublishedDataset
+    assert verified.dataset_identity == plain.dataset_identity == "ds-ver"
+    assert list(verified.records) == plain.records
+    assert verified.record_ordinals[RecordIdentity("ver.s3")] == (3, 73)
+
+
+def test_verified_dataset_is_frozen_and_copyable() -> None:
+    verified = create_package_loader(verified=True).load(_package_json())
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        verified.records = []  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        verified.record_ordinals[RecordIdentity("x")] = (0,)  # type: ignore[index]
+    assert copy.deepcopy(verified) == verified
+
+
+def test_engines_match_plain_dataset() -> None:
+    verified = create_package_loader(verified=True).load(_package_json())
+    plain = create_package_loader().load(_package_json())
+    engine = create_membership_engine()
+    orchestrator = create_search_enhancement_orchestrator()
+    for query in _queries(plain):
+        assert engine.evaluate(verified, query) == engine.evaluate(plain, query)
+        assert orchestrator.run(verified, query) == orchestrator.run(plain, query)
+    assert orchestrator.run_many(verified, _queries(plain)) == orchestrator.run_many(
+        plain, _queries(plain)
+    )
+
+    spatial = create_spatial_index_builder()
+    assert spatial.build(verified) == spatial.build(plain)
+    ids = sorted(verified.record_ordinals)[::3]
+    kd_query = KDTreeQueryInput(
+        cue=plain.records[0].cue_set[0], target=plain.records[0].target, second=plain.records[0].second_set[0]
+    )
+    builder = create_kd_tree_builder()
+    assert create_kd_tree_query().search(
+        builder.build(verified, ids), kd_query, top_n=5
+    ) == create_kd_tree_query().search(builder.build(plain, ids), kd_query, top_n=5)
+
+    prepared = prepare_dataset(verified)
+    assert dict(prepared.record_positions) == dict(prepare_dataset(plain).record_positions)
+
+
+def test_verified_dataset_without_tables_derives_them() -> None:
+    plain = create_package_loader().load(_package_json())
+    loaded = create_package_loader(verified=True).load(_package_json())
+    verified = VerifiedDataset(plain.records, plain.dataset_identity)
+    assert dict(verified.record_ordinals) == dict(loaded.record_ordinals)
+    assert verified.record_identities == loaded.record_identities
+
+    orchestrator = create_search_enhancement_orchestrator()
+    queries = _queries(plain)
+    expected = orchestrator.run_many(plain, queries)
+    assert any(artifacts.resolve_candidates for artifacts in expected)
+    assert orchestrator.run_many(prepare_dataset(verified), queries) == expected
+    assert [orchestrator.run(verified, query) for query in queries] == list(expected)
+
+
+def test_membership_skips_record_scan_for_verified() -> None:
+    verified = create_package_loader(verified=True).load(_package_json())
+    engine = create_membership_engine()
+    assert engine._validated_records(verified) is verified.records  # type: ignore[attr-defined]
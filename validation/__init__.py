@@ -17,8 +17,10 @@ from .schema_registry import (
     reset_default_registry,
 )
 from .validator import (
+    ENVELOPE_RECORD_SCHEMA,
     validate,
     validate_dataset,
+    validate_envelope_record,
     validate_manifest,
     validate_membership_candidate,
     validate_package,
@@ -34,8 +36,10 @@ __all__ = [
     "build_default_registry",
     "get_default_registry",
     "reset_default_registry",
+    "ENVELOPE_RECORD_SCHEMA",
     "validate",
     "validate_dataset",
+    "validate_envelope_record",
     "validate_package",
     "validate_manifest",
     "validate_version",
@@ -3,12 +3,15 @@ Schema Registry.
 
 Explicit registration only — no auto-discovery.
 Maps schema_name → schema document and builds a referencing Registry for $ref.
+Also holds the compiled validators built from it (see validator.py), so a
+schema is compiled once per (registry, schema_name).
 """
 
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from referencing import Registry, Resource
 from referencing.jsonschema import DRAFT202012
@@ -20,11 +23,17 @@ from .loaders import default_schemas_dir, load_all_schema_documents
 class SchemaRegistry:
     """
     Holds named schemas and a shared referencing.Registry for cross-file $ref.
+
+    Compiled validators are cached per key until the next register() /
+    clear(); registration and cache fills are serialized by one lock, so
+    concurrent callers compile each key once.
     """
 
     def __init__(self) -> None:
         self._schemas: Dict[str, Dict[str, Any]] = {}
         self._registry: Registry = Registry()
+        self._validators: Dict[str, Any] = {}
+        self._lock = threading.RLock()
 
     @property
     def schema_names(self) -> tuple[str, ...]:
@@ -32,11 +41,14 @@ class SchemaRegistry:
 
     def register(self, schema_name: str, schema: Dict[str, Any]) -> None:
         """Register one schema document under an explicit name."""
-        self._schemas[schema_name] = schema
-        schema_id = schema.get("$id")
-        if isinstance(schema_id, str) and schema_id:
-            resource = Resource.from_contents(schema, default_specification=DRAFT202012)
-            self._registry = self._registry.with_resource(schema_id, resource)
+        with self._lock:
+            self._schemas[schema_name] = schema
+            schema_id = schema.get("$id")
+            if isinstance(schema_id, str) and schema_id:
+                resource = Resource.from_contents(schema, default_specification=DRAFT202012)
+                self._registry = self._registry.with_resource(schema_id, resource)
+            # Any cached validator may $ref the replaced document.
+            self._validators = {}
 
     def get(self, schema_name: str) -> Dict[str, Any]:
         try:
@@ -47,9 +59,25 @@ class SchemaRegistry:
     def get_registry(self) -> Registry:
         return self._registry
 
+    def cached_validator(self, key: str, compile_validator: Callable[[], Any]) -> Any:
+        """
+        Validator cached under ``key``; ``compile_validator()`` builds it on
+        first use (under the registry lock, against the current schemas).
+        """
+        validator = self._validators.get(key)
+        if validator is None:
+            with self._lock:
+                validator = self._validators.get(key)
+                if validator is None:
+                    validator = compile_validator()
+                    self._validators[key] = validator
+        return validator
+
     def clear(self) -> None:
-        self._schemas.clear()
-        self._registry = Registry()
+        with self._lock:
+            self._schemas.clear()
+            self._registry = Registry()
+            self._validators = {}
 
 
 def build_default_registry(schemas_dir: Optional[Path] = None) -> SchemaRegistry:
@@ -64,18 +92,25 @@ def build_default_registry(schemas_dir: Optional[Path] = None) -> SchemaRegistry
     return registry
 
 
-# Process-level default registry (lazy).
+# Process-level default registry (lazy; built once under the lock).
 _default_registry: Optional[SchemaRegistry] = None
+_default_registry_lock = threading.Lock()
 
 
 def get_default_registry() -> SchemaRegistry:
     global _default_registry
-    if _default_registry is None:
-        _default_registry = build_default_registry()
-    return _default_registry
+    registry = _default_registry
+    if registry is None:
+        with _default_registry_lock:
+            registry = _default_registry
+            if registry is None:
+                registry = build_default_registry()
+                _default_registry = registry
+    return registry
 
 
 def reset_default_registry() -> None:
-    """Test helper: clear cached default registry."""
+    """Test helper: clear cached default registry (and its compiled validators)."""
     global _default_registry
-    _default_registry = None
+    with _default_registry_lock:
+        _default_registry = None
@@ -4,11 +4,14 @@ JSON Schema Validator API.
 Validates instance data against registered schemas.
 Returns the original data on success.
 Does not construct domain models.
+Validators are compiled once per (registry, schema_name) and cached on the
+SchemaRegistry; iter_errors on a compiled validator is safe to share
+between threads.
 """
 
 from __future__ import annotations
 
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from jsonschema import Draft202012Validator
 from jsonschema.exceptions import SchemaError
@@ -17,6 +20,10 @@ from .exceptions import InvalidSchema, ValidationFailed
 from .schema_registry import SchemaRegistry, get_default_registry
 
 
+# Schema name reported by validate_envelope_record failures.
+ENVELOPE_RECORD_SCHEMA = "published_dataset#/$defs/EnvelopeRecord"
+
+
 def _format_error(error: Any) -> str:
     path = ".".join(str(p) for p in error.absolute_path) if error.absolute_path else "(root)"
     return f"{path}: {error.message}"
@@ -35,12 +42,33 @@ def validate(
     On failure: raises ValidationFailed.
     """
     reg = registry if registry is not None else get_default_registry()
-    schema = reg.get(schema_name)
+    return _validate_against(
+        schema_name,
+        lambda: reg.get(schema_name),
+        data,
+        reg,
+    )
+
+
+def _compile(
+    schema_name: str,
+    schema: Callable[[], Dict[str, Any]],
+    reg: SchemaRegistry,
+) -> Draft202012Validator:
     try:
-        validator = Draft202012Validator(schema, registry=reg.get_registry())
+        return Draft202012Validator(schema(), registry=reg.get_registry())
     except SchemaError as exc:
         raise InvalidSchema(schema_name, str(exc)) from exc
 
+
+def _validate_against(
+    schema_name: str,
+    schema: Callable[[], Dict[str, Any]],
+    data: Any,
+    reg: SchemaRegistry,
+) -> Any:
+    validator = reg.cached_validator(schema_name, lambda: _compile(schema_name, schema, reg))
+
     errors: List[str] = []
     for error in sorted(validator.iter_errors(data), key=lambda e: list(e.absolute_path)):
         errors.append(_format_error(error))
@@ -57,6 +85,24 @@ def validate_dataset(
     return validate("published_dataset", data, registry=registry)
 
 
+def validate_envelope_record(
+    data: Any, *, registry: Optional[SchemaRegistry] = None
+) -> Any:
+    """
+    Validate one EnvelopeRecord against published_dataset ``$defs/EnvelopeRecord``.
+
+    For record-at-a-time (streaming) loads; a dataset whose records all pass
+    and whose other members pass validate_dataset is a valid dataset.
+    """
+    reg = registry if registry is not None else get_default_registry()
+    return _validate_against(
+        ENVELOPE_RECORD_SCHEMA,
+        lambda: {"$ref": f"{reg.get('published_dataset')['$id']}#/$defs/EnvelopeRecord"},
+        data,
+        reg,
+    )
+
+
 def validate_package(
     data: Any, *, registry: Optional[SchemaRegistry] = None
 ) -> Any: